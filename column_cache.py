@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+HHS Live Events Dashboard - Columnar Source Cache
+
+Shared loader for the model's CSV-backed tables (ga4-*, gsc-*). Each raw
+export is parsed once with csv_pipeline's reader, typed from the TMDL
+dataType of its columns, and written to a binary cache file of typed
+column arrays. Later loads memory-map that file and hand out zero-copy
+views, so repeated local tooling (previews, validation, aggregation) skips
+the text parsing entirely.
+
+Cache files are keyed by the SHA-256 of the source file together with its
+load spec and column types, so an edited export or a changed dataType
+rebuilds the cache. File hashes are remembered per (mtime, size) stamp in
+the cache folder, so unchanged exports are not re-hashed either.
+
+Column encodings (native-endian arrays, 8-byte aligned in the file):
+    int64     -> 'q' values      double/decimal -> 'd' values
+    dateTime  -> 'i' day ordinals boolean       -> 'b' values
+    string    -> 'i' dictionary codes (-1 = blank) + UTF-8 dictionary
+Every column also carries a validity byte per row (0 = blank).
+
+Usage:
+    python column_cache.py --input datasets             # Build / refresh every cache
+    python column_cache.py --input datasets --table ga4-daily2
+    python column_cache.py --input datasets --list
+    python column_cache.py --input datasets --clear
+"""
+
+import sys
+import json
+import mmap
+import time
+import struct
+import hashlib
+import argparse
+from array import array
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+from csv_pipeline import DEFAULT_INPUT_DIR, column_converters, read_chunks, table_specs
+from tmdl_index import DEFAULT_MODEL_PATH
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Cache folder name (created inside the input folder unless given)
+CACHE_DIRNAME = ".column_cache"
+
+# Remembers source file hashes by (mtime, size) stamp (stored in the cache folder)
+HASH_INDEX_FILENAME = "hashes.json"
+
+# Bump whenever the file layout or typing rules change so existing caches are rebuilt
+CACHE_VERSION = 1
+
+MAGIC = b"HHSCOLS\n"
+
+# TMDL dataType -> array typecode of the stored values
+TYPECODES = {
+    "int64": "q",
+    "double": "d",
+    "decimal": "d",
+    "dateTime": "i",
+    "boolean": "b",
+    "string": "i"
+}
+
+# =============================================================================
+# COLUMN TABLE
+# =============================================================================
+
+class ColumnTable:
+    """
+    Typed columns of one source table, backed by a memory-mapped cache file.
+
+    `array(name)` and `valid(name)` are zero-copy views into the file;
+    `values(name)` decodes a column to Python values (None for blanks,
+    datetime.date for dates, str for strings) and keeps the result.
+    """
+
+    def __init__(self, path: Optional[Path], header: Dict[str, Any], buffer: Any, base: int = 0, handle: Any = None):
+        self.path = path
+        self.name = header["table"]
+        self.length = header["rows"]
+        self.columns: Dict[str, Dict[str, Any]] = {column["name"]: column for column in header["columns"]}
+        self._buffer = buffer
+        self._base = base
+        self._handle = handle
+        self._decoded: Dict[str, List[Any]] = {}
+        self._dictionaries: Dict[str, List[str]] = {}
+
+    def _view(self, offset: int, size: int, typecode: str) -> memoryview:
+        if not size:
+            return memoryview(array(typecode))
+        start = self._base + offset
+        return memoryview(self._buffer)[start:start + size].cast(typecode)
+
+    def data_type(self, name: str) -> str:
+        return self.columns[name]["dataType"]
+
+    def array(self, name: str) -> memoryview:
+        """Stored values of a column (see the module docstring for encodings)."""
+        column = self.columns[name]
+        return self._view(column["offset"], column["size"], TYPECODES[column["dataType"]])
+
+    def valid(self, name: str) -> memoryview:
+        """One byte per row: 1 where the column has a value, 0 for blanks."""
+        column = self.columns[name]
+        return self._view(column["valid_offset"], self.length, "B")
+
+    def dictionary(self, name: str) -> List[str]:
+        """Distinct strings of a string column, indexed by code."""
+        if name not in self._dictionaries:
+            column = self.columns[name]
+            offsets = self._view(column["dict_offsets"], 8 * (column["dict_size"] + 1), "q")
+            start = self._base + column["dict_offset"]
+            blob = bytes(memoryview(self._buffer)[start:start + offsets[-1]])
+            self._dictionaries[name] = [
+                blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(column["dict_size"])
+            ]
+        return self._dictionaries[name]
+
+    def values(self, name: str) -> List[Any]:
+        """Column decoded to Python values."""
+        if name in self._decoded:
+            return self._decoded[name]
+        data_type = self.data_type(name)
+        stored = self.array(name)
+        valid = self.valid(name)
+        if data_type == "string":
+            words = self.dictionary(name)
+            values = [words[code] if code >= 0 else None for code in stored]
+        elif data_type == "dateTime":
+            values = [date.fromordinal(day) if ok else None for day, ok in zip(stored, valid)]
+        elif data_type == "boolean":
+            values = [bool(flag) if ok else None for flag, ok in zip(stored, valid)]
+        else:
+            values = [value if ok else None for value, ok in zip(stored.tolist(), valid)]
+        self._decoded[name] = values
+        return values
+
+    def close(self) -> None:
+        """Release the memory map (views handed out become invalid)."""
+        self._decoded.clear()
+        if isinstance(self._buffer, mmap.mmap) and not self._buffer.closed:
+            try:
+                self._buffer.close()
+            except BufferError:
+                pass  # A caller still holds a view; the map is freed with it
+        if self._handle is not None:
+            self._handle.close()
+
+# =============================================================================
+# BUILDING
+# =============================================================================
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _align(size: int) -> int:
+    return (size + 7) & ~7
+
+def build_columns(source: Path, spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Parse a raw export into typed arrays: {"header", "types", "arrays", "valid", "dictionaries"}."""
+    header, chunks = read_chunks(source, spec)
+    types = [data_type if data_type in TYPECODES else "string" for data_type, _ in column_converters(header, spec)]
+    arrays = [array(TYPECODES[data_type]) for data_type in types]
+    valid = [bytearray() for _ in header]
+    codes: List[Dict[str, int]] = [{} for _ in header]
+
+    for chunk in chunks:
+        for row in chunk:
+            for position, value in enumerate(row[:len(header)]):
+                data_type = types[position]
+                if value is None:
+                    valid[position].append(0)
+                    arrays[position].append(-1 if data_type == "string" else 0)
+                    continue
+                valid[position].append(1)
+                if data_type == "string":
+                    code = codes[position].setdefault(value, len(codes[position]))
+                    arrays[position].append(code)
+                elif data_type == "dateTime":
+                    arrays[position].append(value.toordinal())
+                elif data_type == "boolean":
+                    arrays[position].append(1 if value else 0)
+                elif data_type == "int64":
+                    arrays[position].append(int(value))
+                else:
+                    arrays[position].append(float(value))
+
+    return {
+        "header": header,
+        "types": types,
+        "arrays": arrays,
+        "valid": valid,
+        "dictionaries": [list(mapping) for mapping in codes]
+    }
+
+def encode_columns(table_name: str, key: str, built: Dict[str, Any]) -> List[bytes]:
+    """Serialize built columns: magic, header length, JSON header, then 8-byte aligned buffers."""
+    buffers: List[bytes] = []
+    columns = []
+    position = 0
+
+    def add(data: bytes) -> int:
+        nonlocal position
+        offset = position
+        padded = data + b"\0" * (_align(len(data)) - len(data))
+        buffers.append(padded)
+        position += len(padded)
+        return offset
+
+    for name, data_type, values, valid, words in zip(built["header"], built["types"], built["arrays"],
+                                                     built["valid"], built["dictionaries"]):
+        column = {"name": name, "dataType": data_type}
+        data = values.tobytes()
+        column["offset"] = add(data)
+        column["size"] = len(data)
+        column["valid_offset"] = add(bytes(valid))
+        if data_type == "string":
+            encoded = [word.encode("utf-8") for word in words]
+            offsets = array("q", [0])
+            for word in encoded:
+                offsets.append(offsets[-1] + len(word))
+            column["dict_offset"] = add(b"".join(encoded))
+            column["dict_offsets"] = add(offsets.tobytes())
+            column["dict_size"] = len(words)
+        columns.append(column)
+
+    rows = len(built["valid"][0]) if built["valid"] else 0
+    header = json.dumps({
+        "version": CACHE_VERSION, "key": key, "table": table_name, "rows": rows,
+        "byteorder": sys.byteorder, "columns": columns
+    }).encode("utf-8")
+    # Offsets in the header are relative to the data start, which follows the padded prefix
+    prefix = MAGIC + struct.pack("<Q", len(header)) + header
+    prefix += b"\0" * (_align(len(prefix)) - len(prefix))
+    return [prefix] + buffers
+
+def write_cache(path: Path, parts: List[bytes]) -> None:
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "wb") as f:
+        for data in parts:
+            f.write(data)
+    temp_path.replace(path)
+
+def _open_table(buffer: Any, path: Optional[Path] = None, handle: Any = None) -> Optional[ColumnTable]:
+    """ColumnTable over a serialized buffer (memory map or bytes), or None if foreign or outdated."""
+    if bytes(buffer[:len(MAGIC)]) != MAGIC:
+        return None
+    (header_size,) = struct.unpack("<Q", bytes(buffer[len(MAGIC):len(MAGIC) + 8]))
+    header = json.loads(bytes(buffer[len(MAGIC) + 8:len(MAGIC) + 8 + header_size]).decode("utf-8"))
+    if header.get("version") != CACHE_VERSION or header.get("byteorder") != sys.byteorder:
+        return None
+    return ColumnTable(path, header, buffer, _align(len(MAGIC) + 8 + header_size), handle)
+
+def read_cache(path: Path) -> Optional[ColumnTable]:
+    """Memory-map a cache file, or None if it is missing, foreign or from another version."""
+    try:
+        handle = open(path, "rb")
+    except OSError:
+        return None
+    try:
+        buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        table = _open_table(buffer, path, handle)
+    except (OSError, ValueError, struct.error):
+        table = None
+    if table is None:
+        handle.close()
+    return table
+
+# =============================================================================
+# LOADING
+# =============================================================================
+
+class ColumnCache:
+    """Cache folder of typed column files, keyed by source hash, load spec and column types."""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self._hashes: Dict[str, Any] = {}
+        self._hashes_dirty = False
+        index_path = cache_dir / HASH_INDEX_FILENAME
+        if index_path.exists():
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    self._hashes = json.load(f)
+            except (OSError, ValueError):
+                self._hashes = {}
+
+    def source_hash(self, source: Path) -> str:
+        """SHA-256 of a source file, reused while its mtime and size are unchanged."""
+        stat = source.stat()
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        key = str(source.resolve())
+        entry = self._hashes.get(key)
+        if entry is None or entry.get("stamp") != stamp:
+            entry = {"stamp": stamp, "hash": _file_hash(source)}
+            self._hashes[key] = entry
+            self._hashes_dirty = True
+        return entry["hash"]
+
+    def cache_key(self, source: Path, spec: Dict[str, Any]) -> str:
+        payload = json.dumps({"file": self.source_hash(source), "spec": spec, "version": CACHE_VERSION},
+                             sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def load(self, table_name: str, source: Path, spec: Dict[str, Any], rebuild: bool = False) -> ColumnTable:
+        """Typed columns of a raw export, parsed on a cache miss and memory-mapped otherwise."""
+        key = self.cache_key(source, spec)
+        path = self.cache_dir / f"{table_name}-{key[:20]}.cols"
+        if not rebuild:
+            table = read_cache(path)
+            if table is not None:
+                self.save_hashes()
+                return table
+
+        parts = encode_columns(table_name, key, build_columns(source, spec))
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for stale in self.cache_dir.glob(f"{table_name}-*.cols"):
+                if stale != path:
+                    stale.unlink()
+            write_cache(path, parts)
+        except OSError:
+            # Read-only input folder: the parsed columns are still usable for this run
+            return _open_table(b"".join(parts))
+        self.save_hashes()
+        return read_cache(path)
+
+    def save_hashes(self) -> None:
+        if not self._hashes_dirty:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_dir / HASH_INDEX_FILENAME, "w", encoding="utf-8") as f:
+                json.dump(self._hashes, f, indent=2)
+        except OSError:
+            return  # Read-only input folder: sources are re-hashed next run
+        self._hashes_dirty = False
+
+def default_cache_dir(input_dir: Path) -> Path:
+    return input_dir / CACHE_DIRNAME
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build and inspect the typed column cache of the model's CSV exports"
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default=str(DEFAULT_MODEL_PATH),
+        metavar="PATH",
+        help="Path to the .SemanticModel folder"
+    )
+    parser.add_argument(
+        "--input",
+        type=str,
+        default=str(DEFAULT_INPUT_DIR),
+        metavar="DIR",
+        help="Folder holding the raw exports (the model's pDatasetsFolder)"
+    )
+    parser.add_argument(
+        "--cache",
+        type=str,
+        metavar="DIR",
+        help=f"Cache folder (default: <input>/{CACHE_DIRNAME})"
+    )
+    parser.add_argument(
+        "--table",
+        action="append",
+        help="Only this table (repeatable)"
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Re-parse sources even when a cache file matches"
+    )
+    parser.add_argument(
+        "--list",
+        action="store_true",
+        help="List cache files and their columns"
+    )
+    parser.add_argument(
+        "--clear",
+        action="store_true",
+        help="Delete every cache file"
+    )
+
+    args = parser.parse_args()
+    input_dir = Path(args.input)
+    cache_dir = Path(args.cache) if args.cache else default_cache_dir(input_dir)
+
+    if args.clear:
+        removed = 0
+        for path in cache_dir.glob("*.cols"):
+            path.unlink()
+            removed += 1
+        hash_index = cache_dir / HASH_INDEX_FILENAME
+        if hash_index.exists():
+            hash_index.unlink()
+        print(f"Removed {removed} cache file(s) from {cache_dir}")
+        return
+
+    if args.list:
+        for path in sorted(cache_dir.glob("*.cols")):
+            table = read_cache(path)
+            if table is None:
+                print(f"  {path.name}: stale or unreadable")
+                continue
+            types = ", ".join(f"{name}:{column['dataType']}" for name, column in table.columns.items())
+            print(f"  {table.name:34} {table.length:>10,} rows  {path.stat().st_size:>12,} bytes  {types}")
+            table.close()
+        return
+
+    specs = table_specs(Path(args.model))
+    cache = ColumnCache(cache_dir)
+    for table_name, spec in specs.items():
+        if args.table and table_name not in args.table:
+            continue
+        source = input_dir / spec["file"]
+        if spec["unsupported"]:
+            print(f"  SKIP: {table_name} (reshaped in Power Query: {', '.join(spec['unsupported'])})")
+            continue
+        if not source.exists():
+            print(f"  MISSING: {source}")
+            continue
+        started = time.perf_counter()
+        table = cache.load(table_name, source, spec, rebuild=args.rebuild)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"  {table_name:34} {table.length:>10,} rows  {len(table.columns):3} columns  {elapsed:8.1f} ms")
+        table.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,674 @@
+#!/usr/bin/env python3
+"""
+HHS Live Events Dashboard - Blueprint Compiler (1920x1080)
+
+Compiles the full-canvas layout spec (hhs_live_events_1920x1080.json) into
+a complete PBIR report tree: pages.json, one page.json per page, every
+visual.json, and the expand/collapse bookmarks.
+
+The spec's repeated parts are expanded once and stamped onto every page:
+- globalElements (nav rail, header divider, date slicer, reset/info buttons)
+- actionsPanel (container, accent bar, title, action cards, disclaimer,
+  expand/collapse buttons)
+- kpiRowTemplate (fills in position and formatting for each kpi_row item)
+
+Shared visuals are built and serialized a single time; only page sections
+and the bookmark buttons (which target their own page's bookmark) are built
+per page. Bookmarks with "currentPage" set are captured per page, so the
+panel toggles on whichever page is showing.
+
+Blueprint elements are translated to generate_visuals configs and built
+through its visual type registry, so bindings and formatting match the
+1280x720 generator. Visuals are named by their blueprint id and IDs inside
+them are deterministic, so recompiling an unchanged spec rewrites nothing.
+
+Usage:
+    python compile_blueprint.py --list
+    python compile_blueprint.py --dry-run
+    python compile_blueprint.py --check
+    python compile_blueprint.py --output "LiveEventsGenerated/LiveEventsGenerated.Report"
+    python compile_blueprint.py --blueprint my_layout.json --output-format compact
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+from generate_visuals import (
+    BOOKMARKS_SCHEMA_URL,
+    DEFAULT_MEASURE_ENTITY,
+    OUTPUT_FORMATS,
+    VISUAL_SCHEMA_URL,
+    ConfigValidationError,
+    bookmark_groups,
+    build_bookmark_json,
+    build_field_ref,
+    build_position,
+    build_title,
+    build_visual,
+    check_visual_fields,
+    deterministic_ids,
+    file_matches,
+    generate_visual_group,
+    generate_visual_id,
+    page_bookmark_name,
+    parse_field_reference,
+    register_visual_type,
+    serialize_visual,
+    validate_visual_config,
+    write_file_atomic,
+)
+from tmdl_index import DEFAULT_MODEL_PATH, load_model_index
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+SCRIPT_DIR = Path(__file__).parent
+DEFAULT_BLUEPRINT_PATH = SCRIPT_DIR / "hhs_live_events_1920x1080.json"
+DEFAULT_OUTPUT_PATH = SCRIPT_DIR / "LiveEventsGenerated" / "LiveEventsGenerated.Report"
+
+# Report whose definition.pbir, report.json, version.json and theme resources
+# seed a new output tree (existing files in the output are left alone)
+DEFAULT_TEMPLATE_REPORT = SCRIPT_DIR / "HHS Live Events Performance Dashboard.Report"
+
+PAGE_SCHEMA_URL = "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/page/2.0.0/schema.json"
+PAGES_SCHEMA_URL = "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/pagesMetadata/1.0.0/schema.json"
+
+# Stacking bands: global chrome at the back, page content above it, the
+# actions panel on top. Each element takes the next Z_STEP within its band.
+Z_BANDS = {"global": 0, "page": 10000, "panel": 50000}
+Z_STEP = 100
+
+# Action for buttons that carry no bookmark, by blueprint id
+BUTTON_ACTIONS = {
+    "reset_button": "clearSlicers",
+    "info_button": "info",
+}
+
+# Blueprint slicerType -> slicer data mode
+SLICER_MODES = {
+    "between": "Between",
+    "dropdown": "Dropdown",
+    "list": "Basic",
+    "basic": "Basic",
+}
+
+# Visual types with no generate_visuals builder: blueprint field well ->
+# query role, built generically by generate_role_visual()
+ROLE_VISUALS = {
+    "donutChart": {"legend": "Category", "values": "Y"},
+    "pieChart": {"legend": "Category", "values": "Y"},
+    "keyInfluencersVisual": {"analyze": "Target", "explainBy": "EV"},
+    "decompositionTreeVisual": {"analyze": "Analyze", "explainBy": "ExplainBy"},
+}
+
+
+class BlueprintError(ValueError):
+    """Raised when a blueprint element cannot be compiled."""
+
+# =============================================================================
+# GENERIC ROLE VISUAL
+# =============================================================================
+
+def generate_role_visual(
+    visual_type: str,
+    roles: Dict[str, List[str]],
+    title: str,
+    position: Dict,
+    visual_id: Optional[str] = None
+) -> Dict:
+    """
+    Generate a data visual from query roles alone (no type-specific formatting).
+
+    Args:
+        visual_type: Power BI visual type (e.g., "donutChart")
+        roles: Query role -> field references ("[Measure]" or "Table[Column]")
+        title: Visual title text
+        position: Dict with x, y, z, height, width
+        visual_id: Optional custom visual ID
+
+    Returns:
+        Complete visual.json structure
+    """
+    vid = visual_id or generate_visual_id()
+
+    query_state = {}
+    for role, fields in roles.items():
+        projections = []
+        for field in fields:
+            entity, prop, _ = parse_field_reference(field)
+            projections.append({
+                "field": build_field_ref(field),
+                "queryRef": f"{entity}.{prop}",
+                "nativeQueryRef": prop
+            })
+        query_state[role] = {"projections": projections}
+
+    return {
+        "$schema": VISUAL_SCHEMA_URL,
+        "name": vid,
+        "position": build_position(position, 0, 0, 1000, 200, 300, tab_order=0),
+        "visual": {
+            "visualType": visual_type,
+            "query": {"queryState": query_state},
+            "visualContainerObjects": {
+                "title": build_title(title)
+            },
+            "drillFilterOtherVisuals": True
+        }
+    }
+
+register_visual_type("role_visual", generate_role_visual,
+                     {"visual_type": str, "roles": dict, "title": str, "position": dict})
+
+# =============================================================================
+# TEMPLATE EXPANSION
+# =============================================================================
+
+def load_blueprint(blueprint_path: Path) -> Dict[str, Any]:
+    """Load a layout spec from JSON."""
+    with open(blueprint_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def expand_global_elements(blueprint: Dict[str, Any]) -> List[Dict]:
+    """Elements stamped onto every page behind the page content."""
+    return list(blueprint.get("globalElements", {}).values())
+
+def expand_actions_panel(blueprint: Dict[str, Any]) -> List[Dict]:
+    """The actions panel flattened into elements, in stacking order."""
+    elements = []
+    for key, value in blueprint.get("actionsPanel", {}).items():
+        if isinstance(value, list):
+            elements.extend(value)
+        elif isinstance(value, dict) and "visualType" in value:
+            elements.append(value)
+    return elements
+
+def expand_kpi_row(section: Dict, template: Dict[str, Any]) -> List[Dict]:
+    """
+    Fill each kpi_row item from kpiRowTemplate.
+
+    Item i takes the template's i-th position, the section's y (falling
+    back to the template's) and the template height and formatting; keys
+    set on the item itself win.
+    """
+    positions = template.get("positions", [])
+    items = []
+    for i, item in enumerate(section.get("items", [])):
+        slot = positions[i] if i < len(positions) else {}
+        expanded = {
+            "x": slot.get("x"),
+            "w": slot.get("w"),
+            "y": section.get("y", template.get("y")),
+            "h": template.get("height"),
+        }
+        expanded.update(item)
+        expanded["formatting"] = {**template.get("formatting", {}), **item.get("formatting", {})}
+        items.append(expanded)
+    return items
+
+def page_elements(page: Dict[str, Any], blueprint: Dict[str, Any]) -> List[Dict]:
+    """A page's own elements in section order, with KPI rows expanded."""
+    template = blueprint.get("kpiRowTemplate", {})
+    elements = []
+    for section in page.get("sections", []):
+        if section.get("type") == "kpi_row":
+            elements.extend(expand_kpi_row(section, template))
+        else:
+            elements.extend(section.get("items", []))
+    return elements
+
+# =============================================================================
+# ELEMENT TRANSLATION
+# =============================================================================
+
+def split_fields(fields: List[str], measure_entity: str) -> Tuple[List[Dict], List[str]]:
+    """Split field references into column dicts and measure names."""
+    columns, measures = [], []
+    for field in fields:
+        entity, prop, is_measure = parse_field_reference(field, measure_entity)
+        if is_measure or entity == measure_entity:
+            measures.append(prop)
+        else:
+            columns.append({"entity": entity, "column": prop})
+    return columns, measures
+
+def element_position(element: Dict, z: int) -> Dict:
+    """Visual position block for a blueprint element."""
+    for key in ("x", "y", "w", "h"):
+        if element.get(key) is None:
+            raise BlueprintError(f"{element.get('id', '?')}: missing '{key}'")
+    return {
+        "x": element["x"],
+        "y": element["y"],
+        "z": z,
+        "width": element["w"],
+        "height": element["h"],
+        "tabOrder": z,
+    }
+
+def element_config(element: Dict, z: int, measure_entity: str = DEFAULT_MEASURE_ENTITY,
+                   bookmark: Optional[str] = None) -> Dict:
+    """
+    Translate a blueprint element into a generate_visuals visual config.
+
+    Field wells are read by role rather than axis name, so a bar chart
+    binds its first column and first measure whichever axis holds them.
+    """
+    visual_type = element.get("visualType")
+    element_id = element.get("id", "?")
+    formatting = element.get("formatting", {})
+    fields = element.get("fields", {})
+    title = element.get("title", "")
+    position = element_position(element, z)
+    every_field = [field for well in fields.values() for field in well]
+    columns, measures = split_fields(every_field, measure_entity)
+
+    def need(kind: str, items: List) -> Any:
+        if not items:
+            raise BlueprintError(f"{element_id}: {visual_type} needs at least one {kind}")
+        return items[0]
+
+    if visual_type == "card":
+        return {"type": "kpi_card", "measure": need("measure", measures), "title": title, "position": position}
+
+    if visual_type == "barChart":
+        category = need("column", columns)
+        return {"type": "bar_chart", "category_column": category["column"], "category_entity": category["entity"],
+                "measure": need("measure", measures), "title": title, "position": position}
+
+    if visual_type == "lineChart":
+        axis_columns, _ = split_fields(fields.get("xAxis", []), measure_entity)
+        _, value_measures = split_fields(fields.get("yAxis", []), measure_entity)
+        axis = need("axis column", axis_columns)
+        return {"type": "line_chart", "axis_column": axis["column"], "axis_entity": axis["entity"],
+                "measures": value_measures or [need("measure", measures)], "title": title, "position": position}
+
+    if visual_type == "table":
+        return {"type": "table", "columns": columns, "measures": measures, "title": title, "position": position}
+
+    if visual_type == "matrix":
+        rows, _ = split_fields(fields.get("rows", []), measure_entity)
+        grouping, _ = split_fields(fields.get("columns", []), measure_entity)
+        _, values = split_fields(fields.get("values", []), measure_entity)
+        need("row column", rows)
+        return {"type": "matrix", "rows": rows, "values": values, "columns": grouping or None,
+                "title": title, "position": position}
+
+    if visual_type == "slicer":
+        column = need("column", columns)
+        mode = str(formatting.get("slicerType", "Between"))
+        return {"type": "slicer", "column": column["column"], "entity": column["entity"], "title": title,
+                "slicer_mode": SLICER_MODES.get(mode.lower(), mode), "position": position}
+
+    if visual_type == "actionButton":
+        if bookmark:
+            return {"type": "action_button", "button_type": "bookmark", "bookmark": bookmark,
+                    "text": title or None, "position": position}
+        button_type = BUTTON_ACTIONS.get(element_id, "navigation")
+        return {"type": "action_button", "button_type": button_type,
+                "text": title if button_type != "info" else None, "tooltip": title or None, "position": position}
+
+    if visual_type == "shape":
+        border = formatting.get("border", "borderColor" in formatting)
+        return {"type": "shape", "fill_color": formatting.get("background", "#FFFFFF"),
+                "border_color": formatting.get("borderColor", "#DFE1E2") if border else None,
+                "position": position}
+
+    if visual_type == "textbox":
+        return {"type": "textbox", "text": title, "font_size": formatting.get("fontSize", 9),
+                "font_color": formatting.get("color", "#565C65"), "position": position}
+
+    if visual_type in ROLE_VISUALS:
+        wells = ROLE_VISUALS[visual_type]
+        roles = {wells.get(well, well): list(refs) for well, refs in fields.items()}
+        return {"type": "role_visual", "visual_type": visual_type, "roles": roles, "title": title,
+                "position": position}
+
+    raise BlueprintError(f"{element_id}: unsupported visualType {visual_type!r}")
+
+# =============================================================================
+# COMPILATION
+# =============================================================================
+
+def page_folder_name(blueprint: Dict[str, Any], page: Dict[str, Any]) -> str:
+    """Stable 20-character page name derived from the spec and page names."""
+    seed = f"{blueprint.get('name', '')}|{page['name']}"
+    return hashlib.sha1(seed.encode("utf-8")).hexdigest()[:20]
+
+def compile_element(element: Dict, z: int, seed: str, measure_entity: str, output_format: str,
+                    bookmark: Optional[str] = None, parent_group: Optional[str] = None) -> Tuple[str, bytes, Dict]:
+    """Build one element's visual.json; returns (visual name, bytes, visual json)."""
+    config = element_config(element, z, measure_entity, bookmark)
+    errors = validate_visual_config(config)
+    if errors:
+        raise ConfigValidationError([f"{element.get('id')}: {error}" for error in errors])
+    if parent_group:
+        config["parent_group"] = parent_group
+    with deterministic_ids(seed):
+        visual_json = build_visual(config, visual_id=element["id"])
+    return element["id"], serialize_visual(visual_json, output_format), visual_json
+
+def build_page_json(page: Dict[str, Any], name: str, canvas: Dict[str, Any]) -> Dict:
+    """page.json for a compiled page."""
+    page_json = {
+        "$schema": PAGE_SCHEMA_URL,
+        "name": name,
+        "displayName": page.get("displayName", page["name"]),
+        "displayOption": "FitToPage",
+        "height": canvas.get("height", 1080),
+        "width": canvas.get("width", 1920),
+    }
+    color = page.get("background", {}).get("color")
+    if color:
+        page_json["objects"] = {
+            "background": [
+                {
+                    "properties": {
+                        "color": {"solid": {"color": {"expr": {"Literal": {"Value": f"'{color}'"}}}}},
+                        "transparency": {"expr": {"Literal": {"Value": "0D"}}}
+                    }
+                }
+            ]
+        }
+    return page_json
+
+def compile_blueprint(blueprint: Dict[str, Any], output_format: str = "pretty") -> Dict[str, Any]:
+    """
+    Compile a layout spec into report files held in memory.
+
+    Returns {"pages": [{"name", "displayName", "page_json", "visuals":
+    {visual name: bytes}, "visual_json": {visual name: dict}}],
+    "bookmarks": [bookmark json]}. Each bookmark's visible elements are
+    grouped (see generate_visuals.bookmark_groups) and the group containers
+    are emitted alongside the page's visuals.
+    """
+    canvas = blueprint.get("canvas", {})
+    measure_entity = blueprint.get("semanticModel", {}).get("tables", {}).get("measures") or DEFAULT_MEASURE_ENTITY
+    bookmarks = blueprint.get("bookmarks", [])
+    groups = bookmark_groups(bookmarks)
+    element_group = {element: group for group, members in groups.items() for element in members}
+
+    # Buttons that apply a bookmark are rebuilt per page (their target is
+    # page-scoped); every other template element is built exactly once.
+    bookmark_buttons = {}
+    for key in ("globalElements", "actionsPanel"):
+        for element in blueprint.get(key, {}).values():
+            if isinstance(element, dict) and element.get("bookmark"):
+                bookmark_buttons[element["id"]] = element["bookmark"]
+
+    layers = [("global", expand_global_elements(blueprint)), ("panel", expand_actions_panel(blueprint))]
+    shared: Dict[str, List[Tuple[Dict, int, Optional[Tuple[str, bytes, Dict]]]]] = {}
+    for band, elements in layers:
+        entries = []
+        for i, element in enumerate(elements):
+            z = Z_BANDS[band] + (i + 1) * Z_STEP
+            built = None
+            if element["id"] not in bookmark_buttons:
+                built = compile_element(element, z, f"blueprint|{element['id']}", measure_entity,
+                                        output_format, parent_group=element_group.get(element["id"]))
+            entries.append((element, z, built))
+        shared[band] = entries
+
+    by_name = {bookmark["name"]: bookmark for bookmark in bookmarks}
+    pages = []
+    bookmark_files = []
+    for page in blueprint.get("pages", []):
+        folder = page_folder_name(blueprint, page)
+        visuals: Dict[str, bytes] = {}
+        visual_json: Dict[str, Dict] = {}
+
+        def stamp(element: Dict, z: int, built: Optional[Tuple[str, bytes, Dict]]) -> None:
+            if built is None:
+                target = by_name.get(bookmark_buttons.get(element["id"], ""))
+                target_name = page_bookmark_name(target, page["name"]) if target else bookmark_buttons.get(element["id"])
+                built = compile_element(element, z, f"{page['name']}|{element['id']}", measure_entity,
+                                        output_format, bookmark=target_name,
+                                        parent_group=element_group.get(element["id"]))
+            name, data, vjson = built
+            if name in visuals:
+                raise BlueprintError(f"{page['name']}: duplicate element id {name!r}")
+            visuals[name] = data
+            visual_json[name] = vjson
+
+        for element, z, built in shared["global"]:
+            stamp(element, z, built)
+        for i, element in enumerate(page_elements(page, blueprint)):
+            if element["id"] in element_group:
+                raise BlueprintError(f"{page['name']}: page element {element['id']!r} is a bookmark group member")
+            stamp(element, Z_BANDS["page"] + (i + 1) * Z_STEP, None)
+        for element, z, built in shared["panel"]:
+            stamp(element, z, built)
+
+        elements = {name: (name, vjson["visual"]["visualType"]) for name, vjson in visual_json.items()}
+        page_groups = {}
+        for group, members in groups.items():
+            present = [member for member in members if member in elements]
+            if present:
+                page_groups[group] = present
+                group_json = generate_visual_group(group, [visual_json[member]["position"] for member in present])
+                visuals[group] = serialize_visual(group_json, output_format)
+                visual_json[group] = group_json
+
+        for bookmark in bookmarks:
+            bookmark_json = build_bookmark_json(bookmark, page_bookmark_name(bookmark, page["name"]),
+                                                folder, elements, page_groups)
+            if bookmark_json is not None:
+                bookmark_files.append(bookmark_json)
+
+        pages.append({
+            "name": folder,
+            "displayName": page.get("displayName", page["name"]),
+            "page_json": build_page_json(page, folder, canvas),
+            "visuals": visuals,
+            "visual_json": visual_json,
+        })
+
+    # Page-independent bookmarks would otherwise be emitted once per page
+    unique = {}
+    for bookmark_json in bookmark_files:
+        unique.setdefault(bookmark_json["name"], bookmark_json)
+    return {"pages": pages, "bookmarks": list(unique.values())}
+
+# =============================================================================
+# OUTPUT
+# =============================================================================
+
+def _write_if_changed(file_path: Path, data: bytes) -> bool:
+    """Atomically write data unless the file already holds it; True if written."""
+    if file_matches(file_path, data):
+        return False
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    write_file_atomic(file_path, data)
+    return True
+
+def seed_report(output_dir: Path, template_dir: Path, model_path: Path) -> None:
+    """Copy report-level files from the template report where the output lacks them."""
+    pbir = output_dir / "definition.pbir"
+    fresh_pbir = not pbir.exists()
+    for relative in ("definition.pbir", "definition/report.json", "definition/version.json"):
+        target = output_dir / relative
+        source = template_dir / relative
+        if not target.exists() and source.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(source, target)
+    resources = template_dir / "StaticResources"
+    if resources.is_dir() and not (output_dir / "StaticResources").exists():
+        shutil.copytree(resources, output_dir / "StaticResources")
+
+    # Point a freshly seeded report at the model by relative path
+    if fresh_pbir and pbir.exists():
+        with open(pbir, 'r', encoding='utf-8') as f:
+            definition = json.load(f)
+        relative_model = os.path.relpath(model_path.resolve(), output_dir.resolve()).replace(os.sep, "/")
+        definition.setdefault("datasetReference", {})["byPath"] = {"path": relative_model}
+        _write_if_changed(pbir, json.dumps(definition, indent=2).encode("utf-8"))
+
+def write_report(compiled: Dict[str, Any], output_dir: Path, output_format: str = "pretty") -> Dict[str, int]:
+    """
+    Write compiled pages and bookmarks under output_dir/definition.
+
+    The compiler owns the pages and bookmarks folders: visuals, pages and
+    bookmarks no longer in the spec are removed. Unchanged files are not
+    rewritten.
+    """
+    stats = {"written": 0, "unchanged": 0, "removed": 0}
+
+    def put(file_path: Path, data: bytes) -> None:
+        stats["written" if _write_if_changed(file_path, data) else "unchanged"] += 1
+
+    pages_dir = output_dir / "definition" / "pages"
+    page_names = [page["name"] for page in compiled["pages"]]
+    for page in compiled["pages"]:
+        page_dir = pages_dir / page["name"]
+        put(page_dir / "page.json", serialize_visual(page["page_json"], output_format))
+        for name, data in page["visuals"].items():
+            put(page_dir / "visuals" / name / "visual.json", data)
+        visuals_dir = page_dir / "visuals"
+        for stale in (visuals_dir.iterdir() if visuals_dir.is_dir() else ()):
+            if stale.is_dir() and stale.name not in page["visuals"]:
+                shutil.rmtree(stale)
+                stats["removed"] += 1
+
+    if pages_dir.is_dir():
+        for stale in pages_dir.iterdir():
+            if stale.is_dir() and stale.name not in page_names and (stale / "page.json").exists():
+                shutil.rmtree(stale)
+                stats["removed"] += 1
+    put(pages_dir / "pages.json", serialize_visual({
+        "$schema": PAGES_SCHEMA_URL,
+        "pageOrder": page_names,
+        "activePageName": page_names[0] if page_names else "",
+    }, output_format))
+
+    bookmarks_dir = output_dir / "definition" / "bookmarks"
+    names = [bookmark["name"] for bookmark in compiled["bookmarks"]]
+    for bookmark in compiled["bookmarks"]:
+        put(bookmarks_dir / f"{bookmark['name']}.bookmark.json", serialize_visual(bookmark, output_format))
+    if bookmarks_dir.is_dir():
+        for stale in bookmarks_dir.glob("*.bookmark.json"):
+            if stale.name[:-len(".bookmark.json")] not in names:
+                stale.unlink()
+                stats["removed"] += 1
+    if names:
+        put(bookmarks_dir / "bookmarks.json", serialize_visual({
+            "$schema": BOOKMARKS_SCHEMA_URL,
+            "items": [{"name": name} for name in names],
+        }, output_format))
+    return stats
+
+def check_fields(compiled: Dict[str, Any], model_path: Path) -> List[str]:
+    """Fields bound by compiled visuals that the semantic model does not define."""
+    index = load_model_index(model_path)
+    errors = []
+    seen = set()
+    for page in compiled["pages"]:
+        for name, visual_json in page["visual_json"].items():
+            for error in check_visual_fields(visual_json, index):
+                if error not in seen:
+                    seen.add(error)
+                    errors.append(f"{page['displayName']}/{name}: {error}")
+    return errors
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compile the 1920x1080 layout spec into a PBIR report tree (pages, visuals, bookmarks)"
+    )
+    parser.add_argument(
+        "--blueprint",
+        type=str,
+        default=str(DEFAULT_BLUEPRINT_PATH),
+        metavar="PATH",
+        help="Layout spec JSON (default: hhs_live_events_1920x1080.json)"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=str(DEFAULT_OUTPUT_PATH),
+        metavar="DIR",
+        help="Target .Report folder (created and seeded from --template if missing)"
+    )
+    parser.add_argument(
+        "--template",
+        type=str,
+        default=str(DEFAULT_TEMPLATE_REPORT),
+        metavar="DIR",
+        help="Report folder whose definition.pbir, report.json and theme seed a new output"
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default=str(DEFAULT_MODEL_PATH),
+        metavar="PATH",
+        help="Path to the .SemanticModel folder"
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=OUTPUT_FORMATS,
+        default="pretty",
+        help="JSON layout of written files (default: pretty)"
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Check every bound field against the semantic model and exit non-zero on unknown fields"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Compile and summarize without writing files"
+    )
+    parser.add_argument(
+        "--list",
+        action="store_true",
+        help="List the spec's pages with their visual and bookmark counts"
+    )
+
+    args = parser.parse_args()
+    blueprint = load_blueprint(Path(args.blueprint))
+    try:
+        compiled = compile_blueprint(blueprint, args.output_format)
+    except (BlueprintError, ConfigValidationError) as e:
+        parser.exit(1, f"error: {e}\n")
+
+    if args.list or args.dry_run:
+        for page in compiled["pages"]:
+            count = sum(1 for bookmark in compiled["bookmarks"]
+                        if bookmark["explorationState"]["activeSection"] == page["name"])
+            print(f"  {page['name']}  {page['displayName']:28} {len(page['visuals']):3} visuals  {count} bookmarks")
+        total = sum(len(page["visuals"]) for page in compiled["pages"])
+        print(f"\n{len(compiled['pages'])} pages, {total} visuals, {len(compiled['bookmarks'])} bookmarks")
+        if args.list:
+            return
+
+    if args.check:
+        errors = check_fields(compiled, Path(args.model))
+        for error in errors:
+            print(f"  {error}")
+        if errors:
+            parser.exit(1, f"\n{len(errors)} unknown field reference(s)\n")
+        print("All field references resolve against the model")
+        return
+
+    if args.dry_run:
+        return
+
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    seed_report(output_dir, Path(args.template), Path(args.model))
+    stats = write_report(compiled, output_dir, args.output_format)
+    print(f"Compiled {args.blueprint} -> {output_dir}")
+    print(f"  {stats['written']} written, {stats['unchanged']} unchanged, {stats['removed']} removed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+"""
+HHS Live Events Dashboard - CSV Pre-Processing Pipeline
+
+Reads the raw GA4 / Search Console CSV exports that the model's partitions
+load through Csv.Document(File.Contents(pDatasetsFolder & "...csv")), and
+applies the parsing Power Query otherwise repeats on every refresh:
+metadata-row skipping, header promotion, text trimming, comma-grouped
+numbers, fxTransformCTR percent normalization and typing from each
+column's TMDL dataType. Output is one typed file per table: Parquet when
+pyarrow is installed, otherwise a clean UTF-8 CSV.
+
+Files are streamed in fixed-size row chunks, so multi-GB exports never sit
+in memory. Unchanged sources (same mtime and size) are skipped.
+
+The load options (file name, encoding, column count, quote style, skipped
+rows, CTR columns) are read from each table's partition M code. Tables
+loaded from the GA4 connector, and sources that Power Query reshapes
+with any step not replayed here (row filters, column removal or splitting,
+renames, value replacement, transpose/unpivot), are reported and left to
+Power Query.
+
+Usage:
+    python csv_pipeline.py --list
+    python csv_pipeline.py --input datasets --output datasets/clean
+    python csv_pipeline.py --table gsc-chart --format csv
+    python csv_pipeline.py --print-m gsc-chart      # Partition M for the clean file
+"""
+
+import re
+import csv
+import json
+import argparse
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+
+from tmdl_index import DEFAULT_MODEL_PATH, load_model_index
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+SCRIPT_DIR = Path(__file__).parent
+DEFAULT_INPUT_DIR = SCRIPT_DIR / "datasets"
+
+# Rows per streamed chunk (one Parquet row group per chunk)
+CHUNK_ROWS = 50_000
+
+OUTPUT_FORMATS = ("auto", "parquet", "csv")
+
+# Records source stamps so unchanged inputs are skipped (stored in the output folder)
+PIPELINE_MANIFEST_FILENAME = ".pipeline_manifest.json"
+
+# Bump whenever cleaning rules change so existing outputs are rebuilt
+PIPELINE_VERSION = 1
+
+# Power Query Csv.Document Encoding code page -> Python codec
+ENCODINGS = {"65001": "utf-8-sig", "1252": "cp1252", "1200": "utf-16"}
+
+# Table.* steps this pipeline replays (skips, header promotion, trimming,
+# comma-grouped numbers, CTR and typing); any other Table.* call marks the
+# source as reshaped in Power Query and it is not pre-processed here
+REPLAYED_STEPS = (
+    "Table.Skip",
+    "Table.PromoteHeaders",
+    "Table.TransformColumnNames",
+    "Table.TransformColumnTypes",
+    "Table.TransformColumns",
+    "Table.ReorderColumns"
+)
+
+# Calls of other steps that are replayed all the same: dropping blank rows,
+# and turning empty cells into nulls
+REPLAYED_CALLS = (
+    re.compile(
+        r"Table\.SelectRows\([^,()]+,\s*each\s+not\s+List\.IsEmpty\(\s*List\.RemoveMatchingItems\(\s*"
+        r"Record\.FieldValues\(_\)\s*,\s*\{\s*\"\"\s*,\s*null\s*\}\s*\)\s*\)"
+    ),
+    re.compile(r"Table\.ReplaceValue\(\s*[^,()]+,\s*\"\"\s*,\s*null\s*,\s*Replacer\.ReplaceValue\s*,")
+)
+
+# Date layouts seen in GA4 / Search Console exports
+DATE_FORMATS = ("%Y%m%d", "%Y-%m-%d", "%m/%d/%Y", "%Y-%m-%dT%H:%M:%S")
+
+# Partition annotation holding the raw export's load spec (JSON); written on
+# the monthly partitions generated by incremental_partitions.py, whose own M
+# code only loads one cleaned slice
+RAW_EXPORT_ANNOTATION = "RawExportSpec"
+
+# =============================================================================
+# SOURCE SPECS (from partition M code)
+# =============================================================================
+
+def parse_csv_source(source: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract Csv.Document load options from a partition's M expression.
+
+    Returns None when the partition does not read a CSV file.
+    """
+    file_match = re.search(r'"([^"]+\.csv)"', source, re.IGNORECASE)
+    if "Csv.Document" not in source or file_match is None:
+        return None
+
+    promote = source.find("Table.PromoteHeaders")
+    skips = [(m.start(), int(m.group(1))) for m in re.finditer(r"Table\.Skip\([^,()]+,\s*(\d+)\s*\)", source)]
+    encoding = re.search(r"Encoding\s*=\s*(\d+)", source)
+    columns = re.search(r"Columns\s*=\s*(\d+)", source)
+
+    return {
+        "file": re.split(r"[\\/]", file_match.group(1))[-1],
+        "encoding": ENCODINGS.get(encoding.group(1) if encoding else "65001", "utf-8-sig"),
+        "columns": int(columns.group(1)) if columns else None,
+        "quote_none": "QuoteStyle=QuoteStyle.None" in source.replace(" ", ""),
+        "skip_rows": sum(n for pos, n in skips if promote < 0 or pos < promote),
+        "skip_after_header": sum(n for pos, n in skips if 0 <= promote < pos),
+        "ctr_columns": re.findall(r'\{\s*"([^"]+)"\s*,\s*each\s+fxTransformCTR', source),
+        "unsupported": unreplayed_steps(source)
+    }
+
+def unreplayed_steps(source: str) -> List[str]:
+    """Table.* functions in a partition's M code that this pipeline does not replay."""
+    for pattern in REPLAYED_CALLS:
+        source = pattern.sub("", source)
+    steps = re.findall(r"\bTable\.[A-Za-z]+", source)
+    return sorted(set(steps) - set(REPLAYED_STEPS))
+
+def raw_export_spec(spec: Dict[str, Any]) -> str:
+    """RAW_EXPORT_ANNOTATION value for a table spec (load options only, no types)."""
+    return json.dumps({key: value for key, value in spec.items() if key != "types"}, sort_keys=True)
+
+def table_specs(model_path: Path = DEFAULT_MODEL_PATH) -> Dict[str, Dict[str, Any]]:
+    """
+    CSV load spec plus column dataTypes for every CSV-backed table in the model.
+
+    Partitions carrying RAW_EXPORT_ANNOTATION (monthly slices) resolve to the
+    raw export recorded there, not to the slice their M code loads.
+    """
+    index = load_model_index(model_path)
+    specs = {}
+    for table_name, table in sorted(index.tables.items()):
+        for partition in table["partitions"]:
+            if partition["kind"] != "m":
+                continue
+            raw = partition.get("annotations", {}).get(RAW_EXPORT_ANNOTATION)
+            if raw is not None:
+                try:
+                    spec = json.loads(raw)
+                except ValueError:
+                    spec = None
+            else:
+                spec = parse_csv_source(partition["source"])
+            if spec is None:
+                continue
+            # Imported columns keyed by their source column name
+            spec["types"] = {
+                column.get("sourceColumn", name).strip("[]"): column.get("dataType", "string")
+                for name, column in table["columns"].items()
+                if not column.get("expression")
+            }
+            specs[table_name] = spec
+    return specs
+
+# =============================================================================
+# VALUE CLEANING
+# =============================================================================
+
+def transform_ctr(value: Optional[str]) -> Optional[float]:
+    """Python port of the model's fxTransformCTR: '4.5%', '4.5' and '0.045' all become 0.045."""
+    if value is None:
+        return None
+    text = value.strip().replace("%", "").replace(",", "")
+    try:
+        number = float(text)
+    except ValueError:
+        return None
+    return number if number <= 1 else number / 100
+
+def _to_number(value: str) -> Optional[float]:
+    try:
+        return float(value.replace(",", ""))
+    except ValueError:
+        return None
+
+def _to_int(value: str) -> Optional[int]:
+    # Int64.Type rounds fractional values rather than rejecting them
+    number = _to_number(value)
+    return int(round(number)) if number is not None else None
+
+def _to_date(value: str) -> Optional[date]:
+    for layout in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, layout).date()
+        except ValueError:
+            continue
+    return None
+
+def _to_bool(value: str) -> Optional[bool]:
+    lowered = value.lower()
+    if lowered in ("true", "yes", "1"):
+        return True
+    if lowered in ("false", "no", "0"):
+        return False
+    return None
+
+CONVERTERS = {
+    "int64": _to_int,
+    "double": _to_number,
+    "decimal": _to_number,
+    "dateTime": _to_date,
+    "boolean": _to_bool,
+    "string": lambda value: value
+}
+
+def column_converters(header: List[str], spec: Dict[str, Any]) -> List[Tuple[str, Any]]:
+    """(dataType, converter) per CSV column, from the TMDL types and CTR columns."""
+    ctr = set(spec["ctr_columns"])
+    result = []
+    for name in header:
+        if name in ctr:
+            result.append(("double", transform_ctr))
+            continue
+        data_type = spec["types"].get(name, "string")
+        result.append((data_type, CONVERTERS.get(data_type, CONVERTERS["string"])))
+    return result
+
+# =============================================================================
+# STREAMING
+# =============================================================================
+
+def _open_export(path: Path, spec: Dict[str, Any]):
+    """
+    Open a raw export positioned at its first data row.
+
+    Mirrors the partition's Csv.Document options: fixed column count,
+    QuoteStyle.None (quotes are literal characters), skipped metadata rows
+    and rows skipped after the promoted header.
+
+    Returns (file handle, csv reader, header, row fitter).
+    """
+    handle = open(path, "r", encoding=spec["encoding"], newline="")
+    reader = csv.reader(handle, quoting=csv.QUOTE_NONE) if spec["quote_none"] else csv.reader(handle)
+    width = spec["columns"]
+
+    def fit(row: List[str]) -> List[str]:
+        if width is None:
+            return row
+        return (row + [""] * width)[:width]
+
+    for _ in range(spec["skip_rows"]):
+        next(reader, None)
+    header = [name.strip() for name in fit(next(reader, []))]
+    # Power Query names blank header cells Column<n>
+    header = [name or f"Column{i + 1}" for i, name in enumerate(header)]
+    for _ in range(spec["skip_after_header"]):
+        next(reader, None)
+    return handle, reader, header, fit
+
+def read_header(path: Path, spec: Dict[str, Any]) -> List[str]:
+    """Promoted header of a raw export."""
+    handle, _, header, _ = _open_export(path, spec)
+    handle.close()
+    return header
+
+def read_chunks(path: Path, spec: Dict[str, Any], chunk_rows: int = CHUNK_ROWS) -> Tuple[List[str], Iterator[List[List[Any]]]]:
+    """
+    Open a raw export and return (header, iterator of typed row chunks).
+
+    Blank rows are dropped; empty cells become None. The file is closed
+    once the iterator is exhausted.
+    """
+    handle, reader, header, fit = _open_export(path, spec)
+    converters = column_converters(header, spec)
+
+    def chunks() -> Iterator[List[List[Any]]]:
+        try:
+            chunk = []
+            for row in reader:
+                row = fit(row)
+                if not any(cell.strip() for cell in row):
+                    continue
+                values = []
+                for cell, (_, convert) in zip(row, converters):
+                    cell = cell.strip()
+                    values.append(convert(cell) if cell else None)
+                chunk.append(values)
+                if len(chunk) >= chunk_rows:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        finally:
+            handle.close()
+
+    return header, chunks()
+
+def _arrow_type(data_type: str):
+    return {
+        "int64": pa.int64(),
+        "double": pa.float64(),
+        "decimal": pa.float64(),
+        "dateTime": pa.date32(),
+        "boolean": pa.bool_()
+    }.get(data_type, pa.string())
+
+def write_table(
+    source: Path,
+    destination: Path,
+    spec: Dict[str, Any],
+    output_format: str,
+    chunk_rows: int = CHUNK_ROWS
+) -> int:
+    """Stream one raw export into a typed output file; returns the row count."""
+    header, chunks = read_chunks(source, spec, chunk_rows)
+    types = [data_type for data_type, _ in column_converters(header, spec)]
+    temp_path = destination.with_name(destination.name + ".tmp")
+    rows = 0
+
+    if output_format == "parquet":
+        schema = pa.schema([(name, _arrow_type(data_type)) for name, data_type in zip(header, types)])
+        with pq.ParquetWriter(temp_path, schema, compression="zstd") as writer:
+            for chunk in chunks:
+                columns = [pa.array([row[i] for row in chunk], type=schema.field(i).type) for i in range(len(header))]
+                writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+                rows += len(chunk)
+    else:
+        with open(temp_path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            for chunk in chunks:
+                writer.writerows(
+                    ["" if value is None else value.isoformat() if isinstance(value, date) else value
+                     for value in row]
+                    for row in chunk
+                )
+                rows += len(chunk)
+
+    temp_path.replace(destination)
+    return rows
+
+# =============================================================================
+# M PARTITION OUTPUT
+# =============================================================================
+
+M_TYPES = {
+    "int64": "Int64.Type",
+    "double": "type number",
+    "decimal": "type number",
+    "dateTime": "type date",
+    "boolean": "type logical",
+    "string": "type text"
+}
+
+def partition_m(header: List[str], types: List[str], relative_path: str, output_format: str) -> str:
+    """M expression that loads a processed file (relative to pDatasetsFolder)."""
+    if output_format == "parquet":
+        load = f'Parquet.Document(File.Contents(pDatasetsFolder & "{relative_path}"))'
+        return f"let\n    Source = {load}\nin\n    Source"
+
+    type_list = ", ".join(f'{{"{name}", {M_TYPES.get(t, "type text")}}}' for name, t in zip(header, types))
+    return (
+        "let\n"
+        f'    Source = Csv.Document(File.Contents(pDatasetsFolder & "{relative_path}"), '
+        '[Delimiter=",", Encoding=65001, QuoteStyle=QuoteStyle.Csv]),\n'
+        '    #"Promoted Headers" = Table.PromoteHeaders(Source, [PromoteAllScalars=true]),\n'
+        f'    #"Changed Type" = Table.TransformColumnTypes(#"Promoted Headers", {{{type_list}}})\n'
+        "in\n"
+        '    #"Changed Type"'
+    )
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def resolve_format(requested: str) -> str:
+    if requested == "auto":
+        return "parquet" if pa is not None else "csv"
+    if requested == "parquet" and pa is None:
+        raise SystemExit("ERROR: --format parquet needs pyarrow (pip install pyarrow); use --format csv")
+    return requested
+
+def _file_stamp(path: Path) -> List[int]:
+    stat = path.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pre-process the model's raw CSV exports into typed files"
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default=str(DEFAULT_MODEL_PATH),
+        metavar="PATH",
+        help="Path to the .SemanticModel folder"
+    )
+    parser.add_argument(
+        "--input",
+        type=str,
+        default=str(DEFAULT_INPUT_DIR),
+        metavar="DIR",
+        help="Folder holding the raw exports (the model's pDatasetsFolder)"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        metavar="DIR",
+        help="Folder for the processed files (default: <input>/clean)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="auto",
+        help="Output format; auto = parquet if pyarrow is installed, else csv"
+    )
+    parser.add_argument(
+        "--table",
+        action="append",
+        help="Only process this table (repeatable)"
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=CHUNK_ROWS,
+        metavar="N",
+        help=f"Rows per streamed chunk (default: {CHUNK_ROWS})"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild outputs even if the source is unchanged"
+    )
+    parser.add_argument(
+        "--list",
+        action="store_true",
+        help="List CSV-backed tables and their load options"
+    )
+    parser.add_argument(
+        "--print-m",
+        type=str,
+        metavar="TABLE",
+        help="Print partition M that loads TABLE's processed file"
+    )
+
+    args = parser.parse_args()
+    specs = table_specs(Path(args.model))
+    output_format = resolve_format(args.format)
+    input_dir = Path(args.input)
+    output_dir = Path(args.output) if args.output else input_dir / "clean"
+    extension = ".parquet" if output_format == "parquet" else ".csv"
+
+    if args.list:
+        for table_name, spec in specs.items():
+            note = f"  (left to Power Query: {', '.join(spec['unsupported'])})" if spec["unsupported"] else ""
+            print(f"  {table_name:34} {spec['file']:40} skip {spec['skip_rows']}+{spec['skip_after_header']}"
+                  f"  ctr {spec['ctr_columns'] or '-'}{note}")
+        return
+
+    if args.print_m:
+        spec = specs.get(args.print_m)
+        if spec is None:
+            parser.error(f"not a CSV-backed table: {args.print_m}")
+        if spec["unsupported"]:
+            parser.error(f"{args.print_m} is reshaped in Power Query ({', '.join(spec['unsupported'])}); no clean file is written")
+        source = input_dir / spec["file"]
+        if source.exists():
+            header = read_header(source, spec)
+        else:
+            header = list(spec["types"])
+        types = [data_type for data_type, _ in column_converters(header, spec)]
+        relative_path = f"{output_dir.name}\\{Path(spec['file']).stem}{extension}"
+        print(partition_m(header, types, relative_path, output_format))
+        return
+
+    selected = {name: spec for name, spec in specs.items() if not args.table or name in args.table}
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / PIPELINE_MANIFEST_FILENAME
+    manifest: Dict[str, Any] = {}
+    if manifest_path.exists():
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+
+    processed = skipped = missing = 0
+    for table_name, spec in selected.items():
+        source = input_dir / spec["file"]
+        destination = output_dir / (Path(spec["file"]).stem + extension)
+        if spec["unsupported"]:
+            print(f"  SKIP: {table_name} (reshaped in Power Query: {', '.join(spec['unsupported'])})")
+            continue
+        if not source.exists():
+            print(f"  MISSING: {source}")
+            missing += 1
+            continue
+
+        entry = {"stamp": _file_stamp(source), "format": output_format, "version": PIPELINE_VERSION}
+        if not args.force and destination.exists() and manifest.get(table_name) == entry:
+            print(f"  UNCHANGED: {table_name}")
+            skipped += 1
+            continue
+
+        rows = write_table(source, destination, spec, output_format, args.chunk_rows)
+        manifest[table_name] = entry
+        processed += 1
+        print(f"  Wrote: {destination} ({rows:,} rows)")
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"\nProcessed: {processed}  Unchanged: {skipped}  Missing: {missing}  Format: {output_format}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1599 @@
+#!/usr/bin/env python3
+"""
+HHS Live Events Dashboard - Offline DAX Evaluator
+
+Evaluates the DAX subset the model's measures are written in (aggregations,
+DIVIDE, IF/SWITCH, VAR blocks, CALCULATE with column and table filters,
+the X-iterators, TOPN, time intelligence on DimDate) over the dataset CSVs,
+so a generated page's KPI values can be checked without opening the .pbip
+in Power BI Desktop.
+
+Data is held column-wise: each table is a dict of column lists, and a
+filter context resolves to row-index lists per table (filters on the one
+side of a relationship flow to the many side, as in the model). Aggregates
+scan only the visible rows of one column at a time. Imported tables come
+from column_cache.py (parsed once with each partition's load options, then
+memory-mapped); calculated columns and calculated tables are evaluated
+from their own DAX.
+Tables fed by the GA4 connector load from their CSV twin where one exists
+(SOURCE_TABLES), otherwise they are empty and their measures are blank.
+
+The Power Query steps beyond what csv_pipeline mirrors are not replayed,
+so values are a preview, not a reconciliation.
+
+Usage:
+    python dax_eval.py --input datasets
+    python dax_eval.py --input datasets --page executive_summary
+    python dax_eval.py --input datasets --measure "Engagement Rate" --measure "Trend Indicator"
+    python dax_eval.py --input datasets --filter "DimDate[Year]=2025"
+"""
+
+import re
+import json
+import math
+import argparse
+import calendar
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+from column_cache import ColumnCache, default_cache_dir
+from csv_pipeline import DEFAULT_INPUT_DIR, table_specs
+from generate_visuals import PAGE_CONFIGS
+from measure_graph import tokenize_dax, visual_label, visual_measures
+from tmdl_index import DEFAULT_MODEL_PATH, ModelIndex, load_model_index
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Tables loaded by the GA4 connector -> CSV-backed table holding the same export
+SOURCE_TABLES = {
+    "ga4-daily": "ga4-daily2"
+}
+
+# Visual types whose values are printed per page
+CARD_TYPES = ("kpi_card", "card", "multi_row_card", "gauge")
+
+# Functions that return tables (decides how CALCULATE treats a filter argument)
+TABLE_FUNCTIONS = {
+    "ALL", "ALLSELECTED", "REMOVEFILTERS", "VALUES", "DISTINCT", "FILTER", "TOPN",
+    "ADDCOLUMNS", "SELECTCOLUMNS", "SUMMARIZE", "CALENDAR", "DATATABLE", "UNION",
+    "CALCULATETABLE", "DATEADD", "SAMEPERIODLASTYEAR", "DATESYTD", "KEEPFILTERS"
+}
+
+# Two-character operators (the tokenizer emits single characters)
+_OPERATORS = {"<=", ">=", "<>", "&&", "||", "=="}
+
+_COMPARISONS = {"=", "==", "<>", "<", ">", "<=", ">="}
+
+# =============================================================================
+# ERRORS
+# =============================================================================
+
+class DaxError(Exception):
+    """Evaluation error (bad reference, type mismatch, circular dependency)."""
+
+class DaxUnsupported(DaxError):
+    """Expression outside the supported DAX subset."""
+
+# =============================================================================
+# PARSER
+# =============================================================================
+
+def _merge_operators(tokens: List[Tuple[str, str, int]]) -> List[Tuple[str, str, int]]:
+    merged = []
+    for token in tokens:
+        if (merged and token[0] == "op" and merged[-1][0] == "op"
+                and merged[-1][1] + token[1] in _OPERATORS):
+            merged[-1] = ("op", merged[-1][1] + token[1], merged[-1][2])
+        else:
+            merged.append(token)
+    return merged
+
+class _Parser:
+    """
+    Recursive-descent parser producing tuple nodes:
+
+        ("num", v) ("str", s) ("call", NAME, [args]) ("col", table, column)
+        ("table", name) ("ref", name) ("name", name) ("binop", op, a, b)
+        ("unary", op, a) ("let", [(name, expr)], body) ("list", [items])
+        ("tuple", [items]) ("empty",)
+    """
+
+    def __init__(self, expression: str):
+        self.tokens = _merge_operators(tokenize_dax(expression))
+        self.pos = 0
+
+    def peek(self, offset: int = 0) -> Tuple[str, str]:
+        index = self.pos + offset
+        if index < len(self.tokens):
+            return self.tokens[index][:2]
+        return ("end", "")
+
+    def take(self) -> Tuple[str, str]:
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def expect(self, value: str) -> None:
+        kind, actual = self.take()
+        if actual != value:
+            raise DaxError(f"expected {value!r}, found {actual or 'end of expression'!r}")
+
+    def is_keyword(self, word: str) -> bool:
+        kind, value = self.peek()
+        return kind == "name" and value.upper() == word
+
+    def parse(self) -> Tuple:
+        node = self.expression()
+        if self.peek()[0] != "end":
+            raise DaxError(f"unexpected {self.peek()[1]!r}")
+        return node
+
+    def expression(self) -> Tuple:
+        if not self.is_keyword("VAR"):
+            return self.logical_or()
+        bindings = []
+        while self.is_keyword("VAR"):
+            self.take()
+            kind, name = self.take()
+            self.expect("=")
+            bindings.append((name, self.expression()))
+        if not self.is_keyword("RETURN"):
+            raise DaxError("VAR block without RETURN")
+        self.take()
+        return ("let", bindings, self.expression())
+
+    def logical_or(self) -> Tuple:
+        node = self.logical_and()
+        while self.peek() == ("op", "||"):
+            self.take()
+            node = ("binop", "||", node, self.logical_and())
+        return node
+
+    def logical_and(self) -> Tuple:
+        node = self.logical_not()
+        while self.peek() == ("op", "&&"):
+            self.take()
+            node = ("binop", "&&", node, self.logical_not())
+        return node
+
+    def logical_not(self) -> Tuple:
+        if self.is_keyword("NOT"):
+            self.take()
+            return ("unary", "NOT", self.logical_not())
+        return self.comparison()
+
+    def comparison(self) -> Tuple:
+        node = self.concatenation()
+        while True:
+            kind, value = self.peek()
+            if kind == "op" and value in _COMPARISONS:
+                self.take()
+                node = ("binop", value, node, self.concatenation())
+            elif self.is_keyword("IN"):
+                self.take()
+                node = ("binop", "IN", node, self.concatenation())
+            else:
+                return node
+
+    def concatenation(self) -> Tuple:
+        node = self.additive()
+        while self.peek() == ("op", "&"):
+            self.take()
+            node = ("binop", "&", node, self.additive())
+        return node
+
+    def additive(self) -> Tuple:
+        node = self.multiplicative()
+        while self.peek() in (("op", "+"), ("op", "-")):
+            op = self.take()[1]
+            node = ("binop", op, node, self.multiplicative())
+        return node
+
+    def multiplicative(self) -> Tuple:
+        node = self.unary()
+        while self.peek() in (("op", "*"), ("op", "/")):
+            op = self.take()[1]
+            node = ("binop", op, node, self.unary())
+        return node
+
+    def unary(self) -> Tuple:
+        if self.peek() in (("op", "-"), ("op", "+")):
+            op = self.take()[1]
+            return ("unary", op, self.unary())
+        node = self.primary()
+        if self.peek() == ("op", "^"):
+            self.take()
+            node = ("binop", "^", node, self.unary())
+        return node
+
+    def primary(self) -> Tuple:
+        kind, value = self.take()
+        if kind == "number":
+            return ("num", float(value) if "." in value else int(value))
+        if kind == "string":
+            return ("str", value[1:-1].replace('""', '"'))
+        if kind == "function":
+            self.expect("(")
+            return ("call", value, self.arguments(")"))
+        if kind in ("table", "name"):
+            if self.peek()[0] == "bracket":
+                return ("col", value, self.take()[1])
+            return ("table", value) if kind == "table" else ("name", value)
+        if kind == "bracket":
+            return ("ref", value)
+        if value == "(":
+            items = self.arguments(")")
+            return items[0] if len(items) == 1 else ("tuple", items)
+        if value == "{":
+            return ("list", self.arguments("}"))
+        raise DaxError(f"unexpected {value or 'end of expression'!r}")
+
+    def arguments(self, closing: str) -> List[Tuple]:
+        items: List[Tuple] = []
+        if self.peek() == ("op", closing):
+            self.take()
+            return items
+        while True:
+            if self.peek() in (("op", ","), ("op", closing)):
+                items.append(("empty",))
+            else:
+                items.append(self.expression())
+            kind, value = self.take()
+            if value == closing:
+                return items
+            if value != ",":
+                raise DaxError(f"expected ',' or {closing!r}, found {value or 'end of expression'!r}")
+
+def parse_dax(expression: str) -> Tuple:
+    """Parse a DAX expression into a tuple tree (see _Parser)."""
+    return _Parser(expression).parse()
+
+# =============================================================================
+# VALUES
+# =============================================================================
+
+class TableValue:
+    """
+    Result of a table expression.
+
+    Either rows of a model table (`table` set, `rows` are row indices) or
+    materialized rows (`rows` are tuples aligned with `columns`, a list of
+    (table or None, column name) pairs; None marks columns added by
+    ADDCOLUMNS / SELECTCOLUMNS / DATATABLE).
+    """
+
+    def __init__(self, columns: List[Tuple[Optional[str], str]], rows: List[Any], table: Optional[str] = None):
+        self.columns = columns
+        self.rows = rows
+        self.table = table
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def frames(self) -> Iterable[Tuple]:
+        """One row-context frame per row."""
+        if self.table is not None:
+            for index in self.rows:
+                yield ("model", self.table, index)
+        else:
+            for row in self.rows:
+                yield ("tuple", self.columns, row)
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _to_number(value: Any) -> float:
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return int(value)
+    if _is_number(value):
+        return value
+    if isinstance(value, date):
+        return (value - date(1899, 12, 30)).days
+    try:
+        return float(str(value).replace(",", ""))
+    except ValueError:
+        raise DaxError(f"cannot convert {value!r} to a number")
+
+def _truthy(value: Any) -> bool:
+    if value is None:
+        return False
+    if isinstance(value, str):
+        if value.lower() in ("true", "false"):
+            return value.lower() == "true"
+        raise DaxError(f"cannot convert {value!r} to True/False")
+    return bool(value)
+
+def _blank_as(value: Any, other: Any) -> Any:
+    """BLANK compared with another value behaves as that type's zero."""
+    if value is not None:
+        return value
+    if isinstance(other, str):
+        return ""
+    if isinstance(other, date):
+        return date(1899, 12, 30)
+    return 0
+
+def compare(op: str, left: Any, right: Any) -> bool:
+    """DAX comparison, including BLANK coercion (BLANK = 0 and BLANK = "" are TRUE)."""
+    if op == "==":
+        if left is None or right is None:
+            return left is None and right is None
+        op = "="
+    left, right = _blank_as(left, right), _blank_as(right, left)
+    if isinstance(left, str) != isinstance(right, str):
+        raise DaxError(f"cannot compare {left!r} with {right!r}")
+    if isinstance(left, str):
+        left, right = left.lower(), right.lower()
+    elif isinstance(left, date) != isinstance(right, date):
+        left, right = _to_number(left), _to_number(right)
+    if op == "=":
+        return left == right
+    if op == "<>":
+        return left != right
+    if op == "<":
+        return left < right
+    if op == ">":
+        return left > right
+    if op == "<=":
+        return left <= right
+    return left >= right
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "True" if value else "False"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, date):
+        return value.strftime("%m/%d/%Y")
+    return str(value)
+
+def arithmetic(op: str, left: Any, right: Any) -> Any:
+    """+ - * / ^ with DAX BLANK rules (BLANK op BLANK is BLANK, otherwise BLANK acts as 0)."""
+    if left is None and right is None:
+        return None
+    if op in ("+", "-") and isinstance(left, date) and not isinstance(right, date):
+        days = _to_number(right)
+        return left + timedelta(days=days if op == "+" else -days)
+    if op == "/":
+        numerator, denominator = _to_number(left), _to_number(right)
+        if denominator == 0:
+            if left is None:
+                return None
+            return math.nan if numerator == 0 else math.copysign(math.inf, numerator)
+        return numerator / denominator
+    a, b = _to_number(left), _to_number(right)
+    if op == "+":
+        return a + b
+    if op == "-":
+        return a - b
+    if op == "*":
+        return a * b
+    return float(a) ** b
+
+# =============================================================================
+# FORMAT STRINGS
+# =============================================================================
+
+_DATE_TOKENS = [
+    ("yyyy", "%Y"), ("yy", "%y"), ("mmmm", "%B"), ("mmm", "%b"), ("mm", "%m"),
+    ("dddd", "%A"), ("ddd", "%a"), ("dd", "%d"), ("hh", "%H"), ("nn", "%M"), ("ss", "%S")
+]
+
+_NAMED_FORMATS = {
+    "general number": "0.############", "fixed": "0.00", "standard": "#,0.00",
+    "percent": "0.00%", "long date": "dddd, mmmm dd, yyyy", "short date": "mm/dd/yyyy"
+}
+
+def _format_date(value: date, fmt: str) -> str:
+    if fmt.lower() == "q":
+        return str((value.month - 1) // 3 + 1)
+    result = []
+    i = 0
+    while i < len(fmt):
+        for token, code in _DATE_TOKENS:
+            if fmt[i:i + len(token)].lower() == token:
+                result.append(value.strftime(code))
+                i += len(token)
+                break
+        else:
+            lowered = fmt[i].lower()
+            if lowered == "m":
+                result.append(str(value.month))
+            elif lowered == "d":
+                result.append(str(value.day))
+            elif lowered == "q":
+                result.append(str((value.month - 1) // 3 + 1))
+            else:
+                result.append(fmt[i])
+            i += 1
+    return "".join(result)
+
+def _format_number(value: float, fmt: str) -> str:
+    sections = fmt.split(";")
+    if value < 0 and len(sections) > 1:
+        fmt, value, sign = sections[1], -value, ""
+    else:
+        fmt, sign = sections[0], "-" if value < 0 else ""
+        value = abs(value)
+    core = re.search(r"[#0,]*\.?[#0]+%?|[#0,]+", fmt)
+    if core is None:
+        return fmt.replace('"', "").replace("\\", "")
+    prefix = fmt[:core.start()].replace('"', "").replace("\\", "")
+    suffix = fmt[core.end():].replace('"', "").replace("\\", "")
+    pattern = core.group()
+    if pattern.endswith("%") or "%" in suffix:
+        value *= 100
+    pattern = pattern.rstrip("%")
+    integer, _, fraction = pattern.partition(".")
+    required = fraction.count("0")
+    optional = fraction.count("#")
+    text = f"{value:{',' if ',' in integer else ''}.{required + optional}f}"
+    if optional and "." in text:
+        whole, _, digits = text.partition(".")
+        digits = digits[:required] + digits[required:].rstrip("0")
+        text = whole + ("." + digits if digits else "")
+    if integer.replace(",", "").startswith("#") and text.startswith("0") and value < 1 and "0" not in integer:
+        text = text[1:]
+    return sign + prefix + text + (("%" if core.group().endswith("%") else "") + suffix)
+
+def format_value(value: Any, fmt: Optional[str]) -> str:
+    """Apply a DAX / TMDL format string (numeric, percent and date patterns)."""
+    if value is None:
+        return ""
+    if not fmt or fmt == "@" or isinstance(value, str):
+        return _text(value)
+    fmt = _NAMED_FORMATS.get(fmt.lower(), fmt)
+    if isinstance(value, date):
+        return _format_date(value, fmt)
+    if isinstance(value, bool):
+        return _text(value)
+    if isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
+        return "NaN" if math.isnan(value) else ("Infinity" if value > 0 else "-Infinity")
+    return _format_number(float(value), fmt)
+
+# =============================================================================
+# EVALUATOR
+# =============================================================================
+
+class Env:
+    """Evaluation state: filter context, row-context frames and VAR bindings."""
+
+    __slots__ = ("filters", "rows", "variables")
+
+    def __init__(self, filters: Dict, rows: Tuple = (), variables: Optional[Dict[str, Any]] = None):
+        # filters: {(table, column): frozenset of values} / {(table, None): frozenset of row indices}
+        self.filters = filters
+        self.rows = rows
+        self.variables = variables or {}
+
+    def push(self, frame: Tuple) -> "Env":
+        return Env(self.filters, self.rows + (frame,), self.variables)
+
+def _freeze(filters: Dict) -> frozenset:
+    return frozenset(filters.items())
+
+class DaxEvaluator:
+    """Evaluates model measures over table data loaded from the dataset CSVs."""
+
+    def __init__(self, index: ModelIndex, input_dir: Path, model_path: Path = DEFAULT_MODEL_PATH):
+        self.index = index
+        self.input_dir = input_dir
+        self.specs = table_specs(model_path)
+        self.cache = ColumnCache(default_cache_dir(input_dir))
+        self.warnings: List[str] = []
+        self._tables: Dict[str, Dict[str, Any]] = {}
+        self._loading: set = set()
+        self._parsed: Dict[str, Tuple] = {}
+        self._visible: Dict[Tuple, Any] = {}
+        self._measures: Dict[Tuple, Any] = {}
+        self._measure_stack: List[str] = []
+        self._relationships = []
+        for relationship in index.relationships:
+            from_table = index.resolve_table(relationship["fromTable"])
+            to_table = index.resolve_table(relationship["toTable"])
+            if from_table and to_table:
+                self._relationships.append((from_table, self._model_column(from_table, relationship["fromColumn"]),
+                                            to_table, self._model_column(to_table, relationship["toColumn"])))
+
+    # -------------------------------------------------------------------------
+    # Table data
+    # -------------------------------------------------------------------------
+
+    def _model_column(self, table_name: str, name: str) -> str:
+        for column in self.index.tables[table_name]["columns"]:
+            if column.lower() == name.lower():
+                return column
+        return name
+
+    def _parse(self, expression: str) -> Tuple:
+        node = self._parsed.get(expression)
+        if node is None:
+            node = self._parsed[expression] = parse_dax(expression)
+        return node
+
+    def _warn(self, message: str) -> None:
+        if message not in self.warnings:
+            self.warnings.append(message)
+
+    def table_data(self, table_name: str) -> Dict[str, Any]:
+        """{"length": n, "columns": {name: values}} for a model table (loaded on first use)."""
+        data = self._tables.get(table_name)
+        if data is not None:
+            return data
+        if table_name in self._loading:
+            raise DaxError(f"circular dependency while loading '{table_name}'")
+        self._loading.add(table_name)
+        try:
+            data = self._load_table(table_name)
+        finally:
+            self._loading.discard(table_name)
+        self._tables[table_name] = data
+        return data
+
+    def _load_table(self, table_name: str) -> Dict[str, Any]:
+        table = self.index.tables[table_name]
+        for partition in table["partitions"]:
+            if partition["kind"] == "calculated":
+                try:
+                    result = self.evaluate_table(self._parse(partition["source"]), Env({}))
+                except DaxError as e:
+                    self._warn(f"'{table_name}': calculated table not evaluated ({e})")
+                    return {"length": 0, "columns": {}}
+                result = self._materialize(result)
+                columns = {}
+                for position, (_, name) in enumerate(result.columns):
+                    columns[self._model_column(table_name, name)] = [row[position] for row in result.rows]
+                return {"length": len(result), "columns": columns}
+
+        source_table = table_name if table_name in self.specs else SOURCE_TABLES.get(table_name)
+        spec = self.specs.get(source_table) if source_table else None
+        if spec is None:
+            self._warn(f"'{table_name}': no CSV source (GA4 connector or Power Query only); treated as empty")
+            return {"length": 0, "columns": {}}
+        path = self.input_dir / spec["file"]
+        if not path.exists():
+            self._warn(f"'{table_name}': {path} not found; treated as empty")
+            return {"length": 0, "columns": {}}
+        if spec["unsupported"]:
+            self._warn(f"'{table_name}': reshaped in Power Query ({', '.join(spec['unsupported'])}); raw export loaded without those steps")
+
+        # Source column name -> model column name (through the source table when substituted)
+        source_columns = self.index.tables[source_table]["columns"]
+        names = {
+            column.get("sourceColumn", name): self._model_column(table_name, name)
+            for name, column in source_columns.items() if not column.get("expression")
+        }
+        source = self.cache.load(source_table, path, spec)
+        columns = {}
+        for header_name in source.columns:
+            name = names.get(header_name, header_name)
+            column_values = source.values(header_name)
+            definition = table["columns"].get(name, {})
+            if definition.get("dataType") == "dateTime":
+                column_values = [_as_date(value) for value in column_values]
+            columns[name] = column_values
+        return {"length": source.length, "columns": columns}
+
+    def column(self, table_name: str, column: str) -> List[Any]:
+        """All values of a column (calculated columns are evaluated on first use)."""
+        data = self.table_data(table_name)
+        values = data["columns"].get(column)
+        if values is not None:
+            return values
+        definition = self.index.tables[table_name]["columns"].get(column)
+        if definition is None or not definition.get("expression"):
+            if definition is None:
+                raise DaxError(f"unknown column '{table_name}'[{column}]")
+            if data["columns"]:
+                source_column = definition.get("sourceColumn", column)
+                self._warn(f"'{table_name}'[{column}]: source column {source_column} not in the loaded data; treated as blank")
+            values = [None] * data["length"]
+            data["columns"][column] = values
+            return values
+
+        key = (table_name, column)
+        if key in self._loading:
+            raise DaxError(f"circular dependency in '{table_name}'[{column}]")
+        self._loading.add(key)
+        try:
+            node = self._parse(definition["expression"])
+            values = [self.evaluate(node, Env({}, (("model", table_name, i),))) for i in range(data["length"])]
+        except DaxError as e:
+            self._warn(f"'{table_name}'[{column}]: calculated column not evaluated ({e})")
+            values = [None] * data["length"]
+        finally:
+            self._loading.discard(key)
+        data["columns"][column] = values
+        return values
+
+    def resolve_column(self, table_ref: str, name: str) -> Tuple[str, str]:
+        table_name = self.index.resolve_table(table_ref)
+        if table_name is None:
+            raise DaxError(f"unknown table '{table_ref}'")
+        for column in list(self.index.tables[table_name]["columns"]) + list(self.table_data(table_name)["columns"]):
+            if column.lower() == name.lower():
+                return table_name, column
+        raise DaxError(f"unknown column '{table_name}'[{name}]")
+
+    # -------------------------------------------------------------------------
+    # Filter context
+    # -------------------------------------------------------------------------
+
+    def _is_filtered(self, table_name: str, filters: Dict, depth: int = 0) -> bool:
+        if any(key[0] == table_name for key in filters):
+            return True
+        if depth > len(self._relationships):
+            return False
+        return any(
+            from_table == table_name and self._is_filtered(to_table, filters, depth + 1)
+            for from_table, _, to_table, _ in self._relationships
+        )
+
+    def visible_rows(self, table_name: str, filters: Dict) -> Any:
+        """Row indices of a table visible under a filter context (relationships included)."""
+        length = self.table_data(table_name)["length"]
+        if not filters:
+            return range(length)
+        key = (table_name, _freeze(filters))
+        rows = self._visible.get(key)
+        if rows is not None:
+            return rows
+
+        rows = range(length)
+        for (filtered_table, column), allowed in filters.items():
+            if filtered_table != table_name:
+                continue
+            if column is None:
+                rows = [i for i in rows if i in allowed]
+            else:
+                values = self.column(table_name, column)
+                rows = [i for i in rows if values[i] in allowed]
+        for from_table, from_column, to_table, to_column in self._relationships:
+            if from_table != table_name or not self._is_filtered(to_table, filters):
+                continue
+            to_values = self.column(to_table, to_column)
+            keys = {to_values[i] for i in self.visible_rows(to_table, filters)}
+            from_values = self.column(table_name, from_column)
+            rows = [i for i in rows if from_values[i] in keys]
+
+        self._visible[key] = rows
+        return rows
+
+    def column_values(self, table_name: str, column: str, filters: Dict) -> List[Any]:
+        """Values of a column over the visible rows."""
+        values = self.column(table_name, column)
+        rows = self.visible_rows(table_name, filters)
+        if isinstance(rows, range) and len(rows) == len(values):
+            return values
+        return [values[i] for i in rows]
+
+    @staticmethod
+    def context_transition(filters: Dict, rows: Tuple) -> Dict:
+        """Turn row-context frames into equivalent filters."""
+        if not rows:
+            return filters
+        filters = dict(filters)
+        for frame in rows:
+            if frame[0] == "model":
+                filters[(frame[1], None)] = frozenset((frame[2],))
+            else:
+                for (table_name, column), value in zip(frame[1], frame[2]):
+                    if table_name is not None:
+                        filters[(table_name, column)] = frozenset((value,))
+        return filters
+
+    # -------------------------------------------------------------------------
+    # Measures
+    # -------------------------------------------------------------------------
+
+    def measure(self, name: str, env: Env) -> Any:
+        """Evaluate a measure (with context transition when called in a row context)."""
+        home = self.index.find_measure(name)
+        if home is None:
+            raise DaxError(f"unknown measure [{name}]")
+        filters = self.context_transition(env.filters, env.rows)
+        key = (home[1], _freeze(filters))
+        if key in self._measures:
+            return self._measures[key]
+        if home[1] in self._measure_stack:
+            raise DaxError(f"circular measure reference [{home[1]}]")
+        self._measure_stack.append(home[1])
+        try:
+            expression = self.index.tables[home[0]]["measures"][home[1]]["expression"]
+            result = self.evaluate(self._parse(expression), Env(filters))
+        finally:
+            self._measure_stack.pop()
+        if isinstance(result, TableValue):
+            result = self._scalar(result)
+        self._measures[key] = result
+        return result
+
+    def format_measure(self, name: str, value: Any) -> str:
+        home = self.index.find_measure(name)
+        fmt = self.index.tables[home[0]]["measures"][home[1]].get("formatString") if home else None
+        return format_value(value, fmt.strip('"') if fmt else None)
+
+    # -------------------------------------------------------------------------
+    # Expressions
+    # -------------------------------------------------------------------------
+
+    def _scalar(self, value: Any) -> Any:
+        if isinstance(value, TableValue):
+            if len(value) == 0:
+                return None
+            if len(value) > 1 or (value.table is None and len(value.columns) != 1):
+                raise DaxError("a table of multiple values was supplied where a single value was expected")
+            frame = next(iter(value.frames()))
+            if frame[0] == "model":
+                raise DaxError("a table was supplied where a single value was expected")
+            return frame[2][0]
+        return value
+
+    def evaluate(self, node: Tuple, env: Env) -> Any:
+        kind = node[0]
+        if kind in ("num", "str"):
+            return node[1]
+        if kind == "empty":
+            return None
+        if kind == "call":
+            return self._call(node[1], node[2], env)
+        if kind == "col":
+            table_name, column = self.resolve_column(node[1], node[2])
+            return self._row_value(table_name, column, env)
+        if kind == "ref":
+            return self._bare_reference(node[1], env)
+        if kind == "name":
+            if node[1] in env.variables:
+                return env.variables[node[1]]
+            if node[1].upper() in ("TRUE", "FALSE"):
+                return node[1].upper() == "TRUE"
+            if self.index.resolve_table(node[1]):
+                return self.evaluate_table(node, env)
+            raise DaxError(f"unknown name {node[1]!r}")
+        if kind == "table":
+            return self.evaluate_table(node, env)
+        if kind == "let":
+            variables = dict(env.variables)
+            for name, expression in node[1]:
+                variables[name] = self.evaluate(expression, Env(env.filters, env.rows, variables))
+            return self.evaluate(node[2], Env(env.filters, env.rows, variables))
+        if kind == "unary":
+            value = self._scalar(self.evaluate(node[2], env))
+            if node[1] == "NOT":
+                return not _truthy(value)
+            if node[1] == "-":
+                return None if value is None else -_to_number(value)
+            return value
+        if kind == "binop":
+            return self._binop(node, env)
+        if kind in ("list", "tuple"):
+            return self.evaluate_table(node, env)
+        raise DaxUnsupported(f"expression {kind!r}")
+
+    def _binop(self, node: Tuple, env: Env) -> Any:
+        op = node[1]
+        if op == "&&":
+            return _truthy(self._scalar(self.evaluate(node[2], env))) and _truthy(self._scalar(self.evaluate(node[3], env)))
+        if op == "||":
+            return _truthy(self._scalar(self.evaluate(node[2], env))) or _truthy(self._scalar(self.evaluate(node[3], env)))
+        left = self._scalar(self.evaluate(node[2], env))
+        if op == "IN":
+            table = self.evaluate_table(node[3], env)
+            return any(compare("=", left, row[0]) for row in self._materialize(table).rows)
+        right = self._scalar(self.evaluate(node[3], env))
+        if op in _COMPARISONS:
+            return compare(op, left, right)
+        if op == "&":
+            return _text(left) + _text(right)
+        return arithmetic(op, left, right)
+
+    def _row_value(self, table_name: str, column: str, env: Env) -> Any:
+        for frame in reversed(env.rows):
+            if frame[0] == "model" and frame[1] == table_name:
+                return self.column(table_name, column)[frame[2]]
+            if frame[0] == "tuple":
+                for position, (frame_table, frame_column) in enumerate(frame[1]):
+                    if frame_table == table_name and frame_column.lower() == column.lower():
+                        return frame[2][position]
+        raise DaxError(f"'{table_name}'[{column}] used without a row context")
+
+    def _bare_reference(self, name: str, env: Env) -> Any:
+        if self.index.find_measure(name) is not None:
+            return self.measure(name, env)
+        for frame in reversed(env.rows):
+            if frame[0] == "model":
+                for column in self.index.tables[frame[1]]["columns"]:
+                    if column.lower() == name.lower():
+                        return self.column(frame[1], column)[frame[2]]
+            else:
+                for position, (_, frame_column) in enumerate(frame[1]):
+                    if frame_column.lower() == name.lower():
+                        return frame[2][position]
+        raise DaxError(f"[{name}] is neither a measure nor a column in the row context")
+
+    def _column_argument(self, node: Tuple, env: Optional[Env] = None, table_name: Optional[str] = None) -> Tuple[str, str]:
+        if node[0] == "col":
+            return self.resolve_column(node[1], node[2])
+        if node[0] == "ref" and table_name is not None:
+            return self.resolve_column(table_name, node[1])
+        raise DaxError("expected a column reference")
+
+    # -------------------------------------------------------------------------
+    # Tables
+    # -------------------------------------------------------------------------
+
+    def evaluate_table(self, node: Tuple, env: Env) -> TableValue:
+        kind = node[0]
+        if kind == "name" and node[1] in env.variables:
+            value = env.variables[node[1]]
+            if not isinstance(value, TableValue):
+                raise DaxError(f"variable {node[1]!r} is not a table")
+            return value
+        if kind in ("table", "name"):
+            table_name = self.index.resolve_table(node[1])
+            if table_name is None:
+                raise DaxError(f"unknown table '{node[1]}'")
+            return TableValue(self._model_columns(table_name), list(self.visible_rows(table_name, env.filters)), table_name)
+        if kind == "list":
+            rows = []
+            for item in node[1]:
+                values = item[1] if item[0] in ("tuple", "list") else [item]
+                rows.append(tuple(self._scalar(self.evaluate(value, env)) for value in values))
+            width = max((len(row) for row in rows), default=1)
+            names = ["Value"] + [f"Value{i}" for i in range(2, width + 1)]
+            return TableValue([(None, name) for name in names], rows)
+        if kind == "call":
+            value = self._call(node[1], node[2], env)
+            if isinstance(value, TableValue):
+                return value
+            raise DaxError(f"{node[1]} does not return a table")
+        if kind == "col":
+            raise DaxError("a column reference was supplied where a table was expected")
+        value = self.evaluate(node, env)
+        if isinstance(value, TableValue):
+            return value
+        raise DaxError("expected a table expression")
+
+    def _model_columns(self, table_name: str) -> List[Tuple[str, str]]:
+        names = list(self.index.tables[table_name]["columns"])
+        names += [name for name in self.table_data(table_name)["columns"] if name not in names]
+        return [(table_name, name) for name in names]
+
+    def _materialize(self, table: TableValue) -> TableValue:
+        """Tuple rows for any table value."""
+        if table.table is None:
+            return table
+        columns = table.columns
+        values = [self.column(table_name, name) for table_name, name in columns]
+        return TableValue(columns, [tuple(column[i] for column in values) for i in table.rows])
+
+    def _distinct(self, table_name: str, column: str, filters: Dict) -> TableValue:
+        seen = dict.fromkeys(self.column_values(table_name, column, filters))
+        return TableValue([(table_name, column)], [(value,) for value in seen])
+
+    # -------------------------------------------------------------------------
+    # CALCULATE
+    # -------------------------------------------------------------------------
+
+    def _filter_operations(self, node: Tuple, env: Env) -> List[Tuple]:
+        """
+        Translate one CALCULATE filter argument into operations:
+        ("clear",), ("remove", table, column or None), ("set", key, allowed), ("keep", key, allowed).
+        """
+        if node[0] == "call" and node[1] in ("ALL", "REMOVEFILTERS", "ALLSELECTED"):
+            if not node[2]:
+                return [("clear",)]
+            operations = []
+            for argument in node[2]:
+                if argument[0] == "col":
+                    operations.append(("remove",) + self.resolve_column(argument[1], argument[2]))
+                else:
+                    table_name = self.index.resolve_table(argument[1]) if argument[0] in ("table", "name") else None
+                    if table_name is None:
+                        raise DaxUnsupported(f"{node[1]} over a table expression")
+                    operations.append(("remove", table_name, None))
+            return operations
+        if node[0] == "call" and node[1] == "KEEPFILTERS":
+            return [("keep",) + operation[1:] if operation[0] == "set" else operation
+                    for operation in self._filter_operations(node[2][0], env)]
+        if node[0] == "call" and node[1] in ("USERELATIONSHIP", "CROSSFILTER"):
+            raise DaxUnsupported(node[1])
+
+        if self._is_table_expression(node, env):
+            table = self.evaluate_table(node, env)
+            if table.table is not None:
+                return [("remove", table.table, None), ("set", (table.table, None), frozenset(table.rows))]
+            operations = []
+            for position, (table_name, column) in enumerate(table.columns):
+                if table_name is not None:
+                    operations.append(("set", (table_name, column), frozenset(row[position] for row in table.rows)))
+            return operations
+
+        # Boolean filter: FILTER(ALL(column), condition) over the one column it names
+        columns = set(self._column_refs(node))
+        tables = {table_name for table_name, _ in columns}
+        if len(tables) != 1:
+            raise DaxUnsupported("boolean filter must reference columns of exactly one table")
+        table_name = tables.pop()
+        if len(columns) == 1:
+            key = columns.pop()
+            allowed = frozenset(
+                value for value in dict.fromkeys(self.column(*key))
+                if _truthy(self._scalar(self.evaluate(node, env.push(("tuple", [key], (value,))))))
+            )
+            return [("set", key, allowed)]
+        allowed = frozenset(
+            i for i in range(self.table_data(table_name)["length"])
+            if _truthy(self._scalar(self.evaluate(node, env.push(("model", table_name, i)))))
+        )
+        return [("remove", table_name, column) for _, column in columns] + [("set", (table_name, None), allowed)]
+
+    def _is_table_expression(self, node: Tuple, env: Env) -> bool:
+        if node[0] == "call":
+            return node[1] in TABLE_FUNCTIONS
+        if node[0] == "table":
+            return True
+        if node[0] == "name":
+            return isinstance(env.variables.get(node[1]), TableValue) or (
+                node[1] not in env.variables and self.index.resolve_table(node[1]) is not None)
+        return False
+
+    def _column_refs(self, node: Any) -> Iterable[Tuple[str, str]]:
+        if isinstance(node, tuple) and node:
+            if node[0] == "col":
+                yield self.resolve_column(node[1], node[2])
+                return
+            for part in node[1:]:
+                yield from self._column_refs(part)
+        elif isinstance(node, list):
+            for part in node:
+                yield from self._column_refs(part)
+
+    def calculate_filters(self, arguments: List[Tuple], env: Env) -> Dict:
+        """Filter context for CALCULATE / CALCULATETABLE filter arguments."""
+        operations = []
+        for argument in arguments:
+            if argument[0] != "empty":
+                operations.extend(self._filter_operations(argument, env))
+        filters = self.context_transition(env.filters, env.rows)
+        filters = dict(filters)
+        for operation in operations:
+            if operation[0] == "clear":
+                filters = {}
+            elif operation[0] == "remove":
+                _, table_name, column = operation
+                filters = {key: allowed for key, allowed in filters.items()
+                           if key[0] != table_name or (column is not None and key[1] != column)}
+        for operation in operations:
+            if operation[0] == "set":
+                filters[operation[1]] = operation[2]
+            elif operation[0] == "keep":
+                existing = filters.get(operation[1])
+                filters[operation[1]] = operation[2] if existing is None else operation[2] & existing
+        return filters
+
+    # -------------------------------------------------------------------------
+    # Functions
+    # -------------------------------------------------------------------------
+
+    def _call(self, name: str, args: List[Tuple], env: Env) -> Any:
+        handler = getattr(self, "_fn_" + name.replace(".", "_"), None)
+        if handler is None:
+            raise DaxUnsupported(f"function {name}")
+        return handler(args, env)
+
+    def _arg(self, args: List[Tuple], position: int, env: Env, default: Any = None) -> Any:
+        if position >= len(args) or args[position][0] == "empty":
+            return default
+        return self._scalar(self.evaluate(args[position], env))
+
+    # Logical -----------------------------------------------------------------
+
+    def _fn_IF(self, args, env):
+        if _truthy(self._arg(args, 0, env)):
+            return self.evaluate(args[1], env)
+        return self.evaluate(args[2], env) if len(args) > 2 else None
+
+    def _fn_SWITCH(self, args, env):
+        value = self._arg(args, 0, env)
+        for position in range(1, len(args) - 1, 2):
+            if compare("=", value, self._arg(args, position, env)):
+                return self.evaluate(args[position + 1], env)
+        return self.evaluate(args[-1], env) if len(args) % 2 == 0 else None
+
+    def _fn_AND(self, args, env):
+        return _truthy(self._arg(args, 0, env)) and _truthy(self._arg(args, 1, env))
+
+    def _fn_OR(self, args, env):
+        return _truthy(self._arg(args, 0, env)) or _truthy(self._arg(args, 1, env))
+
+    def _fn_NOT(self, args, env):
+        return not _truthy(self._arg(args, 0, env))
+
+    def _fn_TRUE(self, args, env):
+        return True
+
+    def _fn_FALSE(self, args, env):
+        return False
+
+    def _fn_BLANK(self, args, env):
+        return None
+
+    def _fn_ISBLANK(self, args, env):
+        return self._arg(args, 0, env) is None
+
+    def _fn_COALESCE(self, args, env):
+        for position in range(len(args)):
+            value = self._arg(args, position, env)
+            if value is not None:
+                return value
+        return None
+
+    def _fn_IFERROR(self, args, env):
+        try:
+            value = self._arg(args, 0, env)
+        except DaxUnsupported:
+            raise
+        except DaxError:
+            return self._arg(args, 1, env)
+        if isinstance(value, float) and (math.isnan(value) or math.isinf(value)):
+            return self._arg(args, 1, env)
+        return value
+
+    # Math --------------------------------------------------------------------
+
+    def _fn_DIVIDE(self, args, env):
+        numerator = self._arg(args, 0, env)
+        denominator = self._arg(args, 1, env)
+        if denominator is None or _to_number(denominator) == 0:
+            return self._arg(args, 2, env)
+        if numerator is None:
+            return None
+        return _to_number(numerator) / _to_number(denominator)
+
+    def _fn_ABS(self, args, env):
+        value = self._arg(args, 0, env)
+        return None if value is None else abs(_to_number(value))
+
+    def _fn_ROUND(self, args, env):
+        value = self._arg(args, 0, env)
+        digits = int(_to_number(self._arg(args, 1, env, 0)))
+        if value is None:
+            return None
+        scaled = _to_number(value) * 10 ** digits
+        return math.floor(abs(scaled) + 0.5) * (1 if scaled >= 0 else -1) / 10 ** digits
+
+    def _fn_INT(self, args, env):
+        value = self._arg(args, 0, env)
+        return None if value is None else math.floor(_to_number(value))
+
+    # Aggregations ------------------------------------------------------------
+
+    def _aggregate_column(self, args, env):
+        table_name, column = self._column_argument(args[0])
+        return [value for value in self.column_values(table_name, column, env.filters) if value is not None]
+
+    def _fn_SUM(self, args, env):
+        values = self._aggregate_column(args, env)
+        return sum(_to_number(value) for value in values) if values else None
+
+    def _fn_AVERAGE(self, args, env):
+        values = [_to_number(value) for value in self._aggregate_column(args, env) if not isinstance(value, str)]
+        return sum(values) / len(values) if values else None
+
+    def _fn_COUNT(self, args, env):
+        values = self._aggregate_column(args, env)
+        return len(values) or None
+
+    def _min_max(self, args, env, pick):
+        if len(args) == 2:
+            values = [value for value in (self._arg(args, 0, env), self._arg(args, 1, env)) if value is not None]
+        else:
+            values = self._aggregate_column(args, env)
+        if not values:
+            return None
+        if not all(isinstance(value, (str, date)) for value in values):
+            values = [_to_number(value) for value in values]
+        return pick(values)
+
+    def _fn_MIN(self, args, env):
+        return self._min_max(args, env, min)
+
+    def _fn_MAX(self, args, env):
+        return self._min_max(args, env, max)
+
+    def _fn_COUNTROWS(self, args, env):
+        count = len(self.evaluate_table(args[0], env)) if args else 0
+        return count or None
+
+    def _fn_DISTINCTCOUNT(self, args, env):
+        table_name, column = self._column_argument(args[0])
+        count = len(set(self.column_values(table_name, column, env.filters)))
+        return count or None
+
+    def _fn_SELECTEDVALUE(self, args, env):
+        table_name, column = self._column_argument(args[0])
+        values = set(self.column_values(table_name, column, env.filters))
+        return values.pop() if len(values) == 1 else self._arg(args, 1, env)
+
+    def _fn_HASONEVALUE(self, args, env):
+        table_name, column = self._column_argument(args[0])
+        return len(set(self.column_values(table_name, column, env.filters))) == 1
+
+    def _fn_ISFILTERED(self, args, env):
+        if args[0][0] == "col":
+            table_name, column = self._column_argument(args[0])
+            return (table_name, column) in env.filters or (table_name, None) in env.filters
+        table_name = self.index.resolve_table(args[0][1])
+        return any(key[0] == table_name for key in env.filters)
+
+    # Iterators ---------------------------------------------------------------
+
+    def _iterate(self, args, env) -> List[Any]:
+        table = self.evaluate_table(args[0], env)
+        return [self._scalar(self.evaluate(args[1], env.push(frame))) for frame in table.frames()]
+
+    def _fn_SUMX(self, args, env):
+        values = [value for value in self._iterate(args, env) if value is not None]
+        return sum(_to_number(value) for value in values) if values else None
+
+    def _fn_AVERAGEX(self, args, env):
+        values = [_to_number(value) for value in self._iterate(args, env) if value is not None]
+        return sum(values) / len(values) if values else None
+
+    def _fn_MINX(self, args, env):
+        values = [value for value in self._iterate(args, env) if value is not None]
+        return min(values) if values else None
+
+    def _fn_MAXX(self, args, env):
+        values = [value for value in self._iterate(args, env) if value is not None]
+        return max(values) if values else None
+
+    def _fn_COUNTX(self, args, env):
+        return sum(1 for value in self._iterate(args, env) if value is not None) or None
+
+    def _fn_STDEVX_P(self, args, env):
+        values = [_to_number(value) for value in self._iterate(args, env) if value is not None]
+        if not values:
+            return None
+        mean = sum(values) / len(values)
+        return math.sqrt(sum((value - mean) ** 2 for value in values) / len(values))
+
+    def _fn_CONCATENATEX(self, args, env):
+        table = self.evaluate_table(args[0], env)
+        delimiter = _text(self._arg(args, 2, env, ""))
+        items = []
+        for frame in table.frames():
+            row_env = env.push(frame)
+            order = self._arg(args, 3, row_env) if len(args) > 3 else None
+            items.append((order, _text(self._scalar(self.evaluate(args[1], row_env)))))
+        if len(args) > 3:
+            descending = len(args) > 4 and args[4][0] == "name" and args[4][1].upper() == "DESC"
+            items.sort(key=lambda item: _blank_as(item[0], 0), reverse=descending)
+        return delimiter.join(text for _, text in items)
+
+    def _fn_RANKX(self, args, env):
+        table = self.evaluate_table(args[0], env)
+        values = [self._scalar(self.evaluate(args[1], env.push(frame))) for frame in table.frames()]
+        value = self._arg(args, 2, env) if len(args) > 2 and args[2][0] != "empty" else self._scalar(self.evaluate(args[1], env))
+        ascending = len(args) > 3 and args[3][0] == "name" and args[3][1].upper() == "ASC"
+        dense = len(args) > 4 and args[4][0] == "name" and args[4][1].upper() == "DENSE"
+        ahead = [v for v in values if compare("<" if ascending else ">", v, value)]
+        return 1 + (len(set(ahead)) if dense else len(ahead))
+
+    # Table functions ---------------------------------------------------------
+
+    def _fn_FILTER(self, args, env):
+        table = self.evaluate_table(args[0], env)
+        kept = [
+            row for row, frame in zip(table.rows, table.frames())
+            if _truthy(self._scalar(self.evaluate(args[1], env.push(frame))))
+        ]
+        return TableValue(table.columns, kept, table.table)
+
+    def _fn_ALL(self, args, env):
+        if not args:
+            raise DaxUnsupported("ALL() outside CALCULATE")
+        if args[0][0] != "col":
+            table_name = self.index.resolve_table(args[0][1]) if args[0][0] in ("table", "name") else None
+            if table_name is None:
+                raise DaxUnsupported("ALL over a table expression")
+            return TableValue(self._model_columns(table_name), list(range(self.table_data(table_name)["length"])), table_name)
+        keys = [self._column_argument(arg) for arg in args]
+        seen = dict.fromkeys(zip(*(self.column(*key) for key in keys)))
+        return TableValue(keys, list(seen))
+
+    _fn_REMOVEFILTERS = _fn_ALL
+    _fn_ALLSELECTED = _fn_ALL
+
+    def _fn_VALUES(self, args, env):
+        if args[0][0] == "col":
+            return self._distinct(*self._column_argument(args[0]), env.filters)
+        return self.evaluate_table(args[0], env)
+
+    def _fn_DISTINCT(self, args, env):
+        if args[0][0] == "col":
+            return self._distinct(*self._column_argument(args[0]), env.filters)
+        table = self._materialize(self.evaluate_table(args[0], env))
+        return TableValue(table.columns, list(dict.fromkeys(table.rows)))
+
+    def _fn_KEEPFILTERS(self, args, env):
+        return self.evaluate_table(args[0], env)
+
+    def _fn_TOPN(self, args, env):
+        count = int(_to_number(self._arg(args, 0, env)))
+        table = self.evaluate_table(args[1], env)
+        frames = list(table.frames())
+        if len(args) < 3:
+            return TableValue(table.columns, table.rows[:count], table.table)
+        descending = not (len(args) > 3 and args[3][0] == "name" and args[3][1].upper() == "ASC")
+        keys = [self._scalar(self.evaluate(args[2], env.push(frame))) for frame in frames]
+        order = sorted(range(len(frames)), key=lambda i: _to_number(keys[i]) if not isinstance(keys[i], str) else keys[i],
+                       reverse=descending)
+        if count <= 0 or not order:
+            return TableValue(table.columns, [], table.table)
+        if count >= len(order):
+            return TableValue(table.columns, [table.rows[i] for i in order], table.table)
+        # Ties with the last row kept are returned too
+        cutoff = keys[order[count - 1]]
+        kept = [i for i in order[:count]] + [i for i in order[count:] if compare("=", keys[i], cutoff)]
+        return TableValue(table.columns, [table.rows[i] for i in kept], table.table)
+
+    def _fn_ADDCOLUMNS(self, args, env):
+        table = self._materialize(self.evaluate_table(args[0], env))
+        names = [self._arg(args, position, env) for position in range(1, len(args), 2)]
+        rows = []
+        for row in table.rows:
+            row_env = env.push(("tuple", table.columns, row))
+            rows.append(row + tuple(self._scalar(self.evaluate(args[position], row_env))
+                                    for position in range(2, len(args), 2)))
+        return TableValue(table.columns + [(None, name) for name in names], rows)
+
+    def _fn_SELECTCOLUMNS(self, args, env):
+        table = self.evaluate_table(args[0], env)
+        names = [self._arg(args, position, env) for position in range(1, len(args), 2)]
+        rows = []
+        for frame in table.frames():
+            row_env = env.push(frame)
+            rows.append(tuple(self._scalar(self.evaluate(args[position], row_env))
+                              for position in range(2, len(args), 2)))
+        return TableValue([(None, name) for name in names], rows)
+
+    def _fn_SUMMARIZE(self, args, env):
+        table = self.evaluate_table(args[0], env)
+        group_by = []
+        position = 1
+        while position < len(args) and args[position][0] in ("col", "ref"):
+            group_by.append(self._column_argument(args[position], table_name=table.table))
+            position += 1
+        groups = dict.fromkeys(
+            tuple(self._row_value(table_name, column, env.push(frame)) for table_name, column in group_by)
+            for frame in table.frames()
+        )
+        names = [self._arg(args, i, env) for i in range(position, len(args), 2)]
+        rows = []
+        for group in groups:
+            extra = ()
+            if names:
+                filters = dict(env.filters)
+                filters.update({key: frozenset((value,)) for key, value in zip(group_by, group)})
+                group_env = Env(filters, (), env.variables)
+                extra = tuple(self._scalar(self.evaluate(args[i], group_env)) for i in range(position + 1, len(args), 2))
+            rows.append(group + extra)
+        return TableValue(group_by + [(None, name) for name in names], rows)
+
+    def _fn_UNION(self, args, env):
+        tables = [self._materialize(self.evaluate_table(arg, env)) for arg in args]
+        return TableValue(tables[0].columns, [row for table in tables for row in table.rows])
+
+    def _fn_CALENDAR(self, args, env):
+        start, end = _as_date(self._arg(args, 0, env)), _as_date(self._arg(args, 1, env))
+        if start is None or end is None:
+            raise DaxError("CALENDAR needs two dates")
+        return TableValue([(None, "Date")], [(start + timedelta(days=i),) for i in range((end - start).days + 1)])
+
+    def _fn_DATATABLE(self, args, env):
+        names = [self._arg(args, position, env) for position in range(0, len(args) - 1, 2)]
+        table = self.evaluate_table(args[-1], env)
+        return TableValue([(None, name) for name in names], table.rows)
+
+    def _fn_CALCULATE(self, args, env):
+        filters = self.calculate_filters(args[1:], env)
+        result = self.evaluate(args[0], Env(filters, (), env.variables))
+        return self._scalar(result)
+
+    def _fn_CALCULATETABLE(self, args, env):
+        filters = self.calculate_filters(args[1:], env)
+        return self.evaluate_table(args[0], Env(filters, (), env.variables))
+
+    # Time intelligence -------------------------------------------------------
+
+    def _shifted_dates(self, args, env, shift) -> TableValue:
+        table_name, column = self._column_argument(args[0])
+        existing = set(self.column(table_name, column))
+        visible = sorted(value for value in set(self.column_values(table_name, column, env.filters)) if value is not None)
+        shifted = dict.fromkeys(day for day in shift(visible) if day in existing)
+        return TableValue([(table_name, column)], [(day,) for day in sorted(shifted)])
+
+    def _fn_DATEADD(self, args, env):
+        amount = int(_to_number(self._arg(args, 1, env)))
+        interval = args[2][1].upper() if args[2][0] == "name" else str(self._arg(args, 2, env)).upper()
+        months = {"MONTH": amount, "QUARTER": 3 * amount, "YEAR": 12 * amount}.get(interval)
+        if interval == "DAY":
+            return self._shifted_dates(args, env, lambda days: [day + timedelta(days=amount) for day in days])
+        if months is None:
+            raise DaxUnsupported(f"DATEADD interval {interval}")
+        return self._shifted_dates(args, env, lambda days: [_add_months(day, months) for day in days])
+
+    def _fn_SAMEPERIODLASTYEAR(self, args, env):
+        return self._shifted_dates(args, env, lambda days: [_add_months(day, -12) for day in days])
+
+    def _fn_DATESYTD(self, args, env):
+        def year_to_date(days):
+            if not days:
+                return []
+            last = days[-1]
+            first = date(last.year, 1, 1)
+            return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+        return self._shifted_dates(args, env, year_to_date)
+
+    # Dates -------------------------------------------------------------------
+
+    def _fn_DATE(self, args, env):
+        year, month, day = (int(_to_number(self._arg(args, i, env))) for i in range(3))
+        return _add_months(date(year, 1, 1), month - 1) + timedelta(days=day - 1)
+
+    def _fn_TODAY(self, args, env):
+        return date.today()
+
+    _fn_NOW = _fn_TODAY
+
+    def _date_part(self, args, env, part):
+        value = _as_date(self._arg(args, 0, env))
+        return None if value is None else part(value)
+
+    def _fn_YEAR(self, args, env):
+        return self._date_part(args, env, lambda value: value.year)
+
+    def _fn_MONTH(self, args, env):
+        return self._date_part(args, env, lambda value: value.month)
+
+    def _fn_DAY(self, args, env):
+        return self._date_part(args, env, lambda value: value.day)
+
+    def _fn_QUARTER(self, args, env):
+        return self._date_part(args, env, lambda value: (value.month - 1) // 3 + 1)
+
+    def _fn_WEEKDAY(self, args, env):
+        kind = int(_to_number(self._arg(args, 1, env, 1)))
+        offset = {1: lambda d: (d.weekday() + 1) % 7 + 1, 2: lambda d: d.weekday() + 1, 3: lambda d: d.weekday()}
+        if kind not in offset:
+            raise DaxUnsupported(f"WEEKDAY return type {kind}")
+        return self._date_part(args, env, offset[kind])
+
+    def _fn_WEEKNUM(self, args, env):
+        kind = int(_to_number(self._arg(args, 1, env, 1)))
+        start = 6 if kind == 1 else 0  # Week starts on Sunday (1) or Monday (2)
+
+        def week(value: date) -> int:
+            first = date(value.year, 1, 1)
+            lead = (first.weekday() - start) % 7
+            return (value.timetuple().tm_yday + lead - 1) // 7 + 1
+        return self._date_part(args, env, week)
+
+    def _fn_EOMONTH(self, args, env):
+        value = _as_date(self._arg(args, 0, env))
+        if value is None:
+            return None
+        shifted = _add_months(value.replace(day=1), int(_to_number(self._arg(args, 1, env, 0))))
+        return shifted.replace(day=calendar.monthrange(shifted.year, shifted.month)[1])
+
+    def _fn_EDATE(self, args, env):
+        value = _as_date(self._arg(args, 0, env))
+        return None if value is None else _add_months(value, int(_to_number(self._arg(args, 1, env, 0))))
+
+    # Text --------------------------------------------------------------------
+
+    def _fn_FORMAT(self, args, env):
+        return format_value(self._arg(args, 0, env), _text(self._arg(args, 1, env)))
+
+    def _fn_UNICHAR(self, args, env):
+        return chr(int(_to_number(self._arg(args, 0, env))))
+
+    def _fn_UPPER(self, args, env):
+        return _text(self._arg(args, 0, env)).upper()
+
+    def _fn_LOWER(self, args, env):
+        return _text(self._arg(args, 0, env)).lower()
+
+    def _fn_LEN(self, args, env):
+        return len(_text(self._arg(args, 0, env)))
+
+    def _fn_LEFT(self, args, env):
+        return _text(self._arg(args, 0, env))[:max(0, int(_to_number(self._arg(args, 1, env, 1))))]
+
+    def _fn_RIGHT(self, args, env):
+        count = max(0, int(_to_number(self._arg(args, 1, env, 1))))
+        return _text(self._arg(args, 0, env))[-count:] if count else ""
+
+    def _fn_MID(self, args, env):
+        start = int(_to_number(self._arg(args, 1, env))) - 1
+        return _text(self._arg(args, 0, env))[max(0, start):max(0, start) + int(_to_number(self._arg(args, 2, env)))]
+
+    def _fn_TRIM(self, args, env):
+        return " ".join(_text(self._arg(args, 0, env)).split())
+
+    def _fn_SUBSTITUTE(self, args, env):
+        return _text(self._arg(args, 0, env)).replace(_text(self._arg(args, 1, env)), _text(self._arg(args, 2, env)))
+
+    def _fn_CONCATENATE(self, args, env):
+        return _text(self._arg(args, 0, env)) + _text(self._arg(args, 1, env))
+
+    def _fn_CONTAINSSTRING(self, args, env):
+        return _text(self._arg(args, 1, env)).lower() in _text(self._arg(args, 0, env)).lower()
+
+    def _find(self, args, env, fold):
+        needle, haystack = _text(self._arg(args, 0, env)), _text(self._arg(args, 1, env))
+        start = int(_to_number(self._arg(args, 2, env, 1))) - 1
+        position = (haystack.lower().find(needle.lower(), start) if fold else haystack.find(needle, start))
+        if position >= 0:
+            return position + 1
+        if len(args) > 3:
+            return self._arg(args, 3, env)
+        raise DaxError(f"{needle!r} not found")
+
+    def _fn_SEARCH(self, args, env):
+        return self._find(args, env, True)
+
+    def _fn_FIND(self, args, env):
+        return self._find(args, env, False)
+
+    def _fn_VALUE(self, args, env):
+        return _to_number(self._arg(args, 0, env))
+
+def _as_date(value: Any) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    if isinstance(value, int) and 10000101 <= value <= 99991231:
+        try:
+            return datetime.strptime(str(value), "%Y%m%d").date()
+        except ValueError:
+            return None
+    if isinstance(value, str):
+        for layout in ("%Y-%m-%d", "%m/%d/%Y", "%Y%m%d"):
+            try:
+                return datetime.strptime(value, layout).date()
+            except ValueError:
+                continue
+    return None
+
+def _add_months(value: date, months: int) -> date:
+    total = value.year * 12 + value.month - 1 + months
+    year, month = divmod(total, 12)
+    return date(year, month + 1, min(value.day, calendar.monthrange(year, month + 1)[1]))
+
+# =============================================================================
+# PAGE PREVIEW
+# =============================================================================
+
+def parse_filter(evaluator: DaxEvaluator, text: str) -> Tuple[Tuple[str, str], frozenset]:
+    """'Table[Column]=value' -> filter matching the column values whose text equals value."""
+    match = re.fullmatch(r"\s*'?([^'\[]+)'?\[([^\]]+)\]\s*=\s*(.*)", text)
+    if match is None:
+        raise ValueError(f"expected Table[Column]=value, got {text!r}")
+    key = evaluator.resolve_column(match.group(1).strip(), match.group(2))
+    wanted = match.group(3).strip().strip('"')
+    allowed = frozenset(
+        value for value in set(evaluator.column(*key))
+        if _text(value) == wanted or (isinstance(value, date) and value.isoformat() == wanted)
+    )
+    return key, allowed
+
+def page_card_values(evaluator: DaxEvaluator, page_config: Dict, filters: Dict) -> List[Dict[str, Any]]:
+    """Value of every measure on every card-type visual on a page."""
+    results = []
+    for config in page_config.get("visuals", []):
+        if config["type"] not in CARD_TYPES:
+            continue
+        for name in visual_measures(config):
+            results.append(evaluate_measure(evaluator, name, filters, label=visual_label(config)))
+    return results
+
+def evaluate_measure(evaluator: DaxEvaluator, name: str, filters: Dict, label: str = "") -> Dict[str, Any]:
+    """{"label", "measure", "value", "formatted"} or an "error" entry."""
+    result: Dict[str, Any] = {"label": label or name, "measure": name}
+    try:
+        value = evaluator.measure(name, Env(filters))
+        result["value"] = value.isoformat() if isinstance(value, date) else value
+        result["formatted"] = evaluator.format_measure(name, value) if value is not None else "(blank)"
+    except DaxError as e:
+        result["error"] = str(e)
+    return result
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Evaluate the model's DAX measures over the dataset CSVs and print page KPI values"
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default=str(DEFAULT_MODEL_PATH),
+        metavar="PATH",
+        help="Path to the .SemanticModel folder"
+    )
+    parser.add_argument(
+        "--input",
+        type=str,
+        default=str(DEFAULT_INPUT_DIR),
+        metavar="DIR",
+        help="Folder holding the dataset CSVs (the model's pDatasetsFolder)"
+    )
+    parser.add_argument(
+        "--page",
+        type=str,
+        help="Only preview this PAGE_CONFIGS page"
+    )
+    parser.add_argument(
+        "--measure",
+        action="append",
+        help="Evaluate this measure instead of page cards (repeatable)"
+    )
+    parser.add_argument(
+        "--filter",
+        action="append",
+        metavar="TABLE[COLUMN]=VALUE",
+        help="Apply a slicer-style filter (repeatable)"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the values as JSON"
+    )
+
+    args = parser.parse_args()
+    model_path = Path(args.model)
+    evaluator = DaxEvaluator(load_model_index(model_path), Path(args.input), model_path)
+
+    filters: Dict = {}
+    for text in args.filter or []:
+        try:
+            key, allowed = parse_filter(evaluator, text)
+        except (ValueError, DaxError) as e:
+            parser.error(str(e))
+        filters[key] = allowed
+
+    if args.measure:
+        report = {"measures": [evaluate_measure(evaluator, name, filters) for name in args.measure]}
+    else:
+        if args.page and args.page not in PAGE_CONFIGS:
+            parser.error(f"unknown page: {args.page} (available: {', '.join(PAGE_CONFIGS)})")
+        pages = [args.page] if args.page else list(PAGE_CONFIGS)
+        report = {page_key: page_card_values(evaluator, PAGE_CONFIGS[page_key], filters) for page_key in pages}
+
+    if args.json:
+        print(json.dumps({"results": report, "warnings": evaluator.warnings}, indent=2, default=str))
+        return
+
+    for section, results in report.items():
+        print(f"\n{section}")
+        for result in results:
+            shown = result["formatted"] if "formatted" in result else f"ERROR: {result['error']}"
+            print(f"  {result['label'][:30]:30} [{result['measure']}]".ljust(78) + f" {shown}")
+    if evaluator.warnings:
+        print(f"\nNotes ({len(evaluator.warnings)}):")
+        for warning in evaluator.warnings:
+            print(f"  {warning}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+HHS Live Events Dashboard - DAX Anti-Pattern Linter
+
+Static checks over the measure bodies in the semantic model's TMDL files,
+flagging patterns known to be slow in the formula engine. Every finding
+carries the .tmdl file and line, and the report can be written as JSON for
+CI, so measure regressions are caught before publish. Runs fully offline.
+
+Rules:
+    DAX001 filter-whole-table   FILTER over an entire table inside CALCULATE/CALCULATETABLE
+    DAX002 repeated-expression  Same measure or sub-expression evaluated more than once (use a VAR)
+    DAX003 nested-fact-iterator Iterator over a ga4-*/gsc-* fact table nested in another iterator
+    DAX004 eager-branches       IF/SWITCH with several non-trivial branches that may all be evaluated
+    DAX005 html-concatenatex    CONCATENATEX building HTML markup row by row
+
+Usage:
+    python dax_lint.py                                  # Lint the report's semantic model
+    python dax_lint.py Measures_Livecast.tmdl           # Lint specific .tmdl files
+    python dax_lint.py --json --output dax_lint.json    # Machine-readable report
+    python dax_lint.py --fail-on warning                # Non-zero exit for CI
+"""
+
+import sys
+import json
+import argparse
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Set, Tuple
+
+from measure_graph import ITERATOR_FUNCTIONS, MeasureGraph, tokenize_dax
+from tmdl_index import DEFAULT_MODEL_PATH, ModelIndex, parse_tmdl_tables, tables_dir_for
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+SEVERITIES = ("info", "warning", "error")
+
+RULES = {
+    "DAX001": ("filter-whole-table", "warning"),
+    "DAX002": ("repeated-expression", "info"),
+    "DAX003": ("nested-fact-iterator", "warning"),
+    "DAX004": ("eager-branches", "info"),
+    "DAX005": ("html-concatenatex", "warning"),
+}
+
+# Tables whose names start with these are GA4/Search Console fact tables
+FACT_TABLE_PREFIXES = ("ga4-", "gsc-")
+
+# Row iterators (table functions such as TOPN/SUMMARIZE are not row-by-row expressions)
+ROW_ITERATORS = {"SUMX", "AVERAGEX", "MINX", "MAXX", "COUNTX", "COUNTAX", "PRODUCTX",
+                 "RANKX", "CONCATENATEX", "FILTER", "ADDCOLUMNS", "GENERATE", "GENERATEALL"}
+
+# A repeated call must span at least this many tokens to be worth a VAR
+MIN_REPEATED_TOKENS = 6
+
+# =============================================================================
+# CALL TREE
+# =============================================================================
+
+def parse_calls(tokens: List[Tuple[str, str, int]]) -> List[Dict[str, Any]]:
+    """
+    Find every function call in a token list.
+
+    Each call is {"name", "start", "end", "args", "parent", "parent_arg"}:
+    start/end are token indices of the function name and closing ')',
+    args are (start, end) half-open token spans, parent is the enclosing
+    call's index in the returned list (or None) and parent_arg is the
+    argument of the parent the call sits in.
+    """
+    calls: List[Dict[str, Any]] = []
+    stack: List[Optional[int]] = []  # Call index, or None for a grouping parenthesis
+
+    def innermost() -> Optional[int]:
+        for entry in reversed(stack):
+            if entry is not None:
+                return entry
+        return None
+
+    i = 0
+    while i < len(tokens):
+        kind, value, _ = tokens[i]
+        if kind == "function" and i + 1 < len(tokens) and tokens[i + 1][1] == "(":
+            parent = innermost()
+            calls.append({
+                "name": value,
+                "start": i,
+                "end": len(tokens) - 1,
+                "args": [],
+                "arg_start": i + 2,
+                "parent": parent,
+                "parent_arg": len(calls[parent]["args"]) if parent is not None else None
+            })
+            stack.append(len(calls) - 1)
+            i += 2
+            continue
+        if kind == "op" and value == "(":
+            stack.append(None)
+        elif kind == "op" and value == "," and stack and stack[-1] is not None:
+            call = calls[stack[-1]]
+            call["args"].append((call["arg_start"], i))
+            call["arg_start"] = i + 1
+        elif kind == "op" and value == ")" and stack:
+            entry = stack.pop()
+            if entry is not None:
+                call = calls[entry]
+                if i > call["arg_start"] or call["args"]:
+                    call["args"].append((call["arg_start"], i))
+                call["end"] = i
+        i += 1
+
+    for call in calls:
+        del call["arg_start"]
+    return calls
+
+def _span_text(tokens: List[Tuple[str, str, int]], span: Tuple[int, int]) -> str:
+    """Normalized text of a token span (for comparing sub-expressions)."""
+    return " ".join(f"{kind}:{value}" for kind, value, _ in tokens[span[0]:span[1]])
+
+def _token_owners(calls: List[Dict[str, Any]], count: int) -> List[Optional[Tuple[int, int]]]:
+    """(innermost call index, argument index) enclosing each token, or None at top level."""
+    owners: List[Optional[Tuple[int, int]]] = [None] * count
+    # Calls are ordered by start, so inner calls overwrite their enclosing call
+    for index, call in enumerate(calls):
+        for arg, (start, end) in enumerate(call["args"]):
+            for i in range(start, end):
+                owners[i] = (index, arg)
+    return owners
+
+def _evaluation_context(calls: List[Dict[str, Any]], owner: Optional[Tuple[int, int]]) -> Tuple[int, ...]:
+    """
+    Key for the filter/row context a token is evaluated in.
+
+    Two uses share a context unless one sits inside a CALCULATE modifier
+    scope or an iterator's row expression that the other does not.
+    """
+    key = []
+    while owner is not None:
+        call = calls[owner[0]]
+        if call["name"] in ("CALCULATE", "CALCULATETABLE") or (call["name"] in ROW_ITERATORS and owner[1] > 0):
+            key.append(call["start"])
+        owner = (call["parent"], call["parent_arg"]) if call["parent"] is not None else None
+    return tuple(key)
+
+def _ancestors(calls: List[Dict[str, Any]], index: int):
+    """Yield (ancestor call, argument of that ancestor containing `index`)."""
+    arg = calls[index]["parent_arg"]
+    parent = calls[index]["parent"]
+    while parent is not None:
+        yield calls[parent], arg
+        arg = calls[parent]["parent_arg"]
+        parent = calls[parent]["parent"]
+
+# =============================================================================
+# RULES
+# =============================================================================
+
+class DaxLinter:
+    """Runs every rule over the measures of a set of parsed TMDL tables."""
+
+    def __init__(self, index: ModelIndex):
+        self.index = index
+        self.graph = MeasureGraph(index)
+        # Fact tables each measure iterates directly; transitive lookups go through the graph
+        self._fact_iterations = {
+            name: self._direct_fact_iterations(self._measure(name)["expression"])
+            for name in self.graph.nodes
+        }
+
+    def _measure(self, name: str) -> Dict[str, Any]:
+        return self.index.tables[self.graph.nodes[name]["table"]]["measures"][name]
+
+    def _fact_table(self, tokens, span: Tuple[int, int]) -> Optional[str]:
+        """First fact table referenced in a token span, if any."""
+        for kind, value, _ in tokens[span[0]:span[1]]:
+            if kind in ("table", "name"):
+                table_name = self.index.resolve_table(value)
+                if table_name and table_name.lower().startswith(FACT_TABLE_PREFIXES):
+                    return table_name
+        return None
+
+    def _direct_fact_iterations(self, expression: str) -> Set[str]:
+        tokens = tokenize_dax(expression)
+        found = set()
+        for call in parse_calls(tokens):
+            if call["name"] in ROW_ITERATORS and call["args"]:
+                table_name = self._fact_table(tokens, call["args"][0])
+                if table_name:
+                    found.add(table_name)
+        return found
+
+    def fact_iterations(self, measure: str) -> Dict[str, str]:
+        """Fact table -> measure iterating it, for a measure and everything beneath it."""
+        found = {}
+        for name in [measure, *sorted(self.graph.closure(measure))]:
+            for table_name in self._fact_iterations.get(name, ()):
+                found.setdefault(table_name, name)
+        return found
+
+    def lint_measure(self, name: str, measure: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """All findings for one measure; lines are offsets into its expression."""
+        tokens = tokenize_dax(measure["expression"])
+        calls = parse_calls(tokens)
+        findings: List[Dict[str, Any]] = []
+
+        def add(rule: str, token_index: int, message: str) -> None:
+            findings.append({"rule": rule, "offset": tokens[token_index][2], "message": message})
+
+        for position, call in enumerate(calls):
+            name_upper = call["name"]
+
+            # DAX001: CALCULATE(..., FILTER('Table', ...)) scans and materializes the whole table
+            if name_upper == "FILTER" and call["args"]:
+                first = tokens[call["args"][0][0]:call["args"][0][1]]
+                whole_table = len(first) == 1 and first[0][0] in ("table", "name") \
+                    and self.index.resolve_table(first[0][1]) is not None
+                if whole_table and any(
+                    ancestor["name"] in ("CALCULATE", "CALCULATETABLE") and arg and arg > 0
+                    for ancestor, arg in _ancestors(calls, position)
+                ):
+                    add("DAX001", call["start"],
+                        f"FILTER over the whole table '{first[0][1]}' as a CALCULATE filter; "
+                        "filter the needed columns (KEEPFILTERS / column predicates) instead")
+
+            # DAX003: iterator over a fact table inside another iterator's row expression
+            if name_upper in ROW_ITERATORS and call["args"]:
+                table_name = self._fact_table(tokens, call["args"][0])
+                outer = next((ancestor for ancestor, arg in _ancestors(calls, position)
+                              if ancestor["name"] in ROW_ITERATORS and arg and arg > 0), None)
+                if table_name and outer:
+                    add("DAX003", call["start"],
+                        f"{name_upper} over '{table_name}' runs once per row of the outer {outer['name']}")
+
+            # DAX003 (via measures): context transition into a measure that iterates a fact table
+            if name_upper in ROW_ITERATORS and len(call["args"]) > 1:
+                for start, end in call["args"][1:]:
+                    for i in range(start, end):
+                        kind, value, _ = tokens[i]
+                        if kind != "bracket" or (i > 0 and tokens[i - 1][0] in ("table", "name")):
+                            continue
+                        home = self.index.find_measure(value)
+                        if home is None:
+                            continue
+                        for table_name, owner in sorted(self.fact_iterations(home[1]).items()):
+                            via = f"[{owner}]" if owner == home[1] else f"[{home[1]}] -> [{owner}]"
+                            add("DAX003", i,
+                                f"{name_upper} evaluates {via} per row, which iterates '{table_name}'")
+                    break
+
+            # DAX004: expensive IF/SWITCH branches may be evaluated eagerly
+            if name_upper in ("IF", "SWITCH") and len(call["args"]) >= 3:
+                if name_upper == "IF":
+                    branches = call["args"][1:]
+                else:
+                    rest = call["args"][1:]
+                    branches = rest[1::2] + ([rest[-1]] if len(rest) % 2 else [])
+                heavy = [span for span in branches if self._is_heavy(tokens, span)]
+                if len(heavy) >= 2:
+                    add("DAX004", call["start"],
+                        f"{name_upper} has {len(heavy)} branches that evaluate measures or iterators; "
+                        "the engine may compute all of them - hoist shared work into VARs")
+
+            # DAX005: HTML assembled row by row
+            if name_upper == "CONCATENATEX" and len(call["args"]) > 1:
+                start, end = call["args"][1]
+                if any(kind == "string" and "<" in value and ">" in value
+                       for kind, value, _ in tokens[start:end]):
+                    add("DAX005", call["start"],
+                        "CONCATENATEX builds HTML markup per row; precompute static markup "
+                        "and keep the iterated table small")
+
+        findings.extend(self._repeated_expressions(tokens, calls))
+        return findings
+
+    def _is_heavy(self, tokens, span: Tuple[int, int]) -> bool:
+        """True if a branch evaluates a measure or a non-trivial function."""
+        for i in range(span[0], span[1]):
+            kind, value, _ = tokens[i]
+            if kind == "bracket" and self.index.find_measure(value) is not None:
+                return True
+            if kind == "function" and (value in ITERATOR_FUNCTIONS or value in ("CALCULATE", "CALCULATETABLE")):
+                return True
+        return False
+
+    def _repeated_expressions(self, tokens, calls) -> List[Dict[str, Any]]:
+        """DAX002: measures and sizeable calls evaluated more than once."""
+        findings = []
+        owners = _token_owners(calls, len(tokens))
+
+        # Uses only repeat work when they are evaluated in the same context
+        measure_uses: Dict[Tuple[str, Tuple[int, ...]], List[int]] = {}
+        for i, (kind, value, _) in enumerate(tokens):
+            if kind == "bracket" and (i == 0 or tokens[i - 1][0] not in ("table", "name")):
+                home = self.index.find_measure(value)
+                if home is not None:
+                    key = (home[1], _evaluation_context(calls, owners[i]))
+                    measure_uses.setdefault(key, []).append(i)
+        for (name, _), uses in measure_uses.items():
+            if len(uses) > 1:
+                findings.append({
+                    "rule": "DAX002", "offset": tokens[uses[1]][2],
+                    "message": f"[{name}] is evaluated {len(uses)} times; store it in a VAR"
+                })
+
+        call_uses: Dict[Tuple[str, Tuple[int, ...]], List[Dict[str, Any]]] = {}
+        for call in calls:
+            if call["end"] - call["start"] + 1 >= MIN_REPEATED_TOKENS:
+                key = (_span_text(tokens, (call["start"], call["end"] + 1)),
+                       _evaluation_context(calls, owners[call["start"]]))
+                call_uses.setdefault(key, []).append(call)
+        reported: List[Tuple[int, int]] = []
+        for uses in sorted(call_uses.values(), key=lambda u: u[0]["start"] - u[0]["end"]):
+            if len(uses) < 2:
+                continue
+            # Report only the outermost repeated expression
+            if any(start <= uses[0]["start"] and uses[0]["end"] <= end for start, end in reported):
+                continue
+            reported.extend((use["start"], use["end"]) for use in uses)
+            findings.append({
+                "rule": "DAX002", "offset": tokens[uses[1]["start"]][2],
+                "message": f"{uses[0]['name']}(...) sub-expression repeated {len(uses)} times; store it in a VAR"
+            })
+        return findings
+
+# =============================================================================
+# RUNNING
+# =============================================================================
+
+def _display_path(path: Path) -> str:
+    """Path relative to the working directory when possible (stable across machines in CI)."""
+    try:
+        return path.resolve().relative_to(Path.cwd().resolve()).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+def collect_tables(paths: List[Path]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+    """
+    Parse .tmdl files (or .SemanticModel folders) into tables.
+
+    Returns (tables by name, table name -> display path of its file).
+    """
+    tables: Dict[str, Dict[str, Any]] = {}
+    sources: Dict[str, str] = {}
+    for path in paths:
+        files = sorted(tables_dir_for(path).glob("*.tmdl")) if path.is_dir() else [path]
+        for tmdl_path in files:
+            for table in parse_tmdl_tables(tmdl_path.read_text(encoding="utf-8-sig"), tmdl_path.name):
+                tables[table["name"]] = table
+                sources[table["name"]] = _display_path(tmdl_path)
+    return tables, sources
+
+def lint(paths: List[Path], model_path: Path = DEFAULT_MODEL_PATH) -> Dict[str, Any]:
+    """
+    Lint the measures in the given files.
+
+    Names are resolved against the model at model_path, with the linted
+    files' own tables taking precedence, so a standalone .tmdl copy is
+    checked against the model it belongs to.
+    """
+    model_tables, _ = collect_tables([model_path]) if tables_dir_for(model_path).exists() else ({}, {})
+    tables, sources = collect_tables(paths)
+    linter = DaxLinter(ModelIndex({**model_tables, **tables}))
+
+    findings = []
+    for table_name, table in tables.items():
+        for measure_name, measure in table["measures"].items():
+            for finding in linter.lint_measure(measure_name, measure):
+                rule, severity = finding["rule"], RULES[finding["rule"]][1]
+                findings.append({
+                    "rule": rule,
+                    "name": RULES[rule][0],
+                    "severity": severity,
+                    "file": sources[table_name],
+                    "line": measure["expression_line"] + finding.pop("offset"),
+                    "table": table_name,
+                    "measure": measure_name,
+                    "message": finding["message"]
+                })
+
+    findings.sort(key=lambda f: (f["file"], f["line"], f["rule"]))
+    return {
+        "files": sorted(set(sources.values())),
+        "measures": sum(len(table["measures"]) for table in tables.values()),
+        "summary": dict(sorted(Counter(f["rule"] for f in findings).items())),
+        "findings": findings
+    }
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Flag slow DAX patterns in TMDL measure definitions"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        metavar="PATH",
+        help=".tmdl files or .SemanticModel folders to lint (default: the report's model)"
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default=str(DEFAULT_MODEL_PATH),
+        metavar="PATH",
+        help="Semantic model used to resolve measure and table names"
+    )
+    parser.add_argument(
+        "--rule",
+        action="append",
+        choices=sorted(RULES),
+        help="Only report these rules (repeatable)"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the report as JSON"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        metavar="FILE",
+        help="Also write the JSON report to FILE"
+    )
+    parser.add_argument(
+        "--fail-on",
+        choices=SEVERITIES,
+        help="Exit with status 1 if any finding has this severity or higher"
+    )
+
+    args = parser.parse_args()
+    model_path = Path(args.model)
+    report = lint([Path(p) for p in args.paths] or [model_path], model_path)
+
+    if args.rule:
+        report["findings"] = [f for f in report["findings"] if f["rule"] in args.rule]
+        report["summary"] = dict(sorted(Counter(f["rule"] for f in report["findings"]).items()))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for finding in report["findings"]:
+            print(f"{finding['file']}:{finding['line']}: {finding['severity']} {finding['rule']} "
+                  f"[{finding['measure']}] {finding['message']}")
+        print(f"\n{report['measures']} measures in {len(report['files'])} file(s), "
+              f"{len(report['findings'])} finding(s)")
+        for rule, count in report["summary"].items():
+            print(f"  {rule} {RULES[rule][0]:22} {count}")
+
+    if args.fail_on:
+        threshold = SEVERITIES.index(args.fail_on)
+        if any(SEVERITIES.index(f["severity"]) >= threshold for f in report["findings"]):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+HHS Live Events Dashboard - Field Usage Index
+
+Reverse index from every model field (measure or column) to the visuals
+that use it, across the report folders (visual.json, page.json, report.json
+and bookmarks) and the visuals in PAGE_CONFIGS. Each use records its page,
+visual and role: the query role it is projected in (Values, Category, Y...),
+"sort", "filter" or "format" (measure-driven formatting).
+
+The index is kept on disk (.field_index.json next to this script) as
+field -> source -> uses, plus the fields each source contributed. Every run
+stats the report files and fingerprints PAGE_CONFIGS, and only re-reads the
+sources that changed, so a lookup after editing one visual re-parses one
+file. Use --no-refresh to answer straight from the stored index.
+
+Usage:
+    python field_index.py "Sessions"                        # Every visual using a field
+    python field_index.py "Measures_Livecast[Sessions]"     # Only that table's field
+    python field_index.py "Sessions" --json
+    python field_index.py --summary                         # Fields by number of uses
+    python field_index.py --rebuild
+"""
+
+import sys
+import json
+import hashlib
+import argparse
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+from generate_visuals import GENERATOR_VERSION, PAGE_CONFIGS, build_visual
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+SCRIPT_DIR = Path(__file__).parent
+
+# Report folders indexed by default (every .Report folder in the repository)
+DEFAULT_REPORTS = sorted(SCRIPT_DIR.glob("**/*.Report"))
+
+INDEX_FILENAME = ".field_index.json"
+
+# Bump whenever the stored structure changes so stale indexes are discarded
+INDEX_VERSION = 1
+
+# Source key prefix for PAGE_CONFIGS pages (report files use their relative path)
+PAGE_CONFIGS_SOURCE = "PAGE_CONFIGS:"
+
+# Keys below which every field reference takes a fixed role
+ROLE_KEYS = {
+    "sortDefinition": "sort",
+    "filterConfig": "filter",
+    "filters": "filter",
+    "objects": "format",
+    "visualContainerObjects": "format",
+}
+
+# =============================================================================
+# EXTRACTION
+# =============================================================================
+
+def iter_field_uses(node: Any, role: str = "other") -> Iterable[Tuple[str, str, bool, str]]:
+    """
+    Yield (entity, property, is_measure, role) for every field reference.
+
+    Same references as generate_visuals.iter_field_refs; the role is the
+    queryState role a projection sits under, or the ROLE_KEYS role of the
+    nearest enclosing sort, filter or formatting block.
+    """
+    if isinstance(node, dict):
+        for key in ("Measure", "Column"):
+            ref = node.get(key)
+            if isinstance(ref, dict):
+                entity = ref.get("Expression", {}).get("SourceRef", {}).get("Entity")
+                if entity is not None and "Property" in ref:
+                    yield entity, ref["Property"], key == "Measure", role
+        for key, value in node.items():
+            if key == "queryState" and isinstance(value, dict):
+                for query_role, projections in value.items():
+                    yield from iter_field_uses(projections, query_role)
+            else:
+                yield from iter_field_uses(value, ROLE_KEYS.get(key, role))
+    elif isinstance(node, list):
+        for item in node:
+            yield from iter_field_uses(item, role)
+
+def field_key(entity: str, prop: str) -> str:
+    """Index key for a field: Entity[Property]."""
+    return f"{entity}[{prop}]"
+
+def parse_lookup(text: str) -> Tuple[Optional[str], str]:
+    """(entity or None, property) from "Table[Field]", "'Table'[Field]" or a bare name."""
+    text = text.strip()
+    if text.endswith("]") and "[" in text:
+        entity, prop = text[:-1].split("[", 1)
+        return entity.strip().strip("'"), prop
+    return None, text.strip("[]")
+
+def file_location(relative: Path) -> Tuple[str, str]:
+    """(page, visual) a report file belongs to ("" where it applies report- or page-wide)."""
+    parts = relative.parts
+    page = visual = ""
+    if "pages" in parts[:-1]:
+        index = parts.index("pages")
+        page = parts[index + 1] if index + 2 < len(parts) else ""
+    if "visuals" in parts[:-1]:
+        index = parts.index("visuals")
+        visual = parts[index + 1]
+    elif "bookmarks" in parts[:-1]:
+        visual = relative.name
+    return page, visual
+
+def collect_uses(document: Any, page: str, visual: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Field key -> uses (page, visual, role, kind) found in one document."""
+    uses: Dict[str, List[Dict[str, Any]]] = {}
+    seen = set()
+    for entity, prop, is_measure, role in iter_field_uses(document):
+        key = field_key(entity, prop)
+        if (key, visual, role) in seen:
+            continue
+        seen.add((key, visual, role))
+        uses.setdefault(key, []).append({
+            "page": page,
+            "visual": visual,
+            "role": role,
+            "kind": "measure" if is_measure else "column"
+        })
+    return uses
+
+def page_config_uses(page_key: str, page_config: Dict) -> Dict[str, List[Dict[str, Any]]]:
+    """Field uses of every visual in one PAGE_CONFIGS page."""
+    uses: Dict[str, List[Dict[str, Any]]] = {}
+    for index, config in enumerate(page_config.get("visuals", [])):
+        label = f"[{index}] {config['type']}"
+        if config.get("title"):
+            label += f" '{config['title']}'"
+        for key, entries in collect_uses(build_visual(config), page_key, label).items():
+            uses.setdefault(key, []).extend(entries)
+    return uses
+
+def page_config_stamp(page_config: Dict) -> str:
+    """Fingerprint of a PAGE_CONFIGS page (changes whenever its visuals could)."""
+    payload = json.dumps({"generator_version": GENERATOR_VERSION, "config": page_config},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _file_stamp(path: Path) -> List[int]:
+    stat = path.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+class FieldIndex:
+    """
+    Persistent field -> visual reverse index.
+
+    `fields` maps field key -> source key -> uses; `sources` records each
+    source's stamp and the fields it contributed, so replacing a changed
+    source only touches its own fields' postings.
+    """
+
+    def __init__(self, index_path: Path):
+        self.index_path = index_path
+        self.sources: Dict[str, Dict[str, Any]] = {}
+        self.fields: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        self.changed = False
+
+    @classmethod
+    def load(cls, index_path: Path = SCRIPT_DIR / INDEX_FILENAME) -> "FieldIndex":
+        """Load the stored index (empty if missing, unreadable or from an older version)."""
+        index = cls(index_path)
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return index
+        if stored.get("version") == INDEX_VERSION:
+            index.sources = stored.get("sources", {})
+            index.fields = stored.get("fields", {})
+        return index
+
+    def save(self) -> None:
+        """Write the index if anything changed since it was loaded."""
+        if not self.changed:
+            return
+        try:
+            with open(self.index_path, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "sources": self.sources, "fields": self.fields}, f)
+        except OSError:
+            pass  # Read-only checkout: the refreshed index still answers this run
+        self.changed = False
+
+    def remove_source(self, source: str) -> None:
+        """Drop a source and its postings."""
+        entry = self.sources.pop(source, None)
+        if entry is None:
+            return
+        for key in entry["fields"]:
+            postings = self.fields.get(key, {})
+            postings.pop(source, None)
+            if not postings:
+                self.fields.pop(key, None)
+        self.changed = True
+
+    def put_source(self, source: str, stamp: Any, uses: Dict[str, List[Dict[str, Any]]],
+                   **metadata: Any) -> None:
+        """Replace a source's postings with `uses`."""
+        self.remove_source(source)
+        self.sources[source] = {"stamp": stamp, "fields": sorted(uses), **metadata}
+        for key, entries in uses.items():
+            self.fields.setdefault(key, {})[source] = entries
+        self.changed = True
+
+    def refresh(self, reports: List[Path], page_configs: Optional[Dict[str, Dict]] = None) -> Dict[str, int]:
+        """
+        Bring the index up to date with the reports and page configs.
+
+        Report files are re-read only when their mtime/size changed and
+        PAGE_CONFIGS pages only when their fingerprint did; sources that no
+        longer exist (or are no longer indexed) are dropped.
+        """
+        stats = {"updated": 0, "unchanged": 0, "removed": 0}
+        current = set()
+
+        for report_path in reports:
+            definition = report_path / "definition"
+            for json_path in sorted(definition.rglob("*.json")):
+                relative = json_path.relative_to(definition)
+                source = f"{report_path.name}/{relative.as_posix()}"
+                current.add(source)
+                try:
+                    stamp = _file_stamp(json_path)
+                except OSError:
+                    continue
+                if self.sources.get(source, {}).get("stamp") == stamp:
+                    stats["unchanged"] += 1
+                    continue
+                try:
+                    with open(json_path, 'r', encoding='utf-8') as f:
+                        document = json.load(f)
+                except (OSError, ValueError):
+                    print(f"  WARNING: Could not read {json_path}")
+                    continue
+                page, visual = file_location(relative)
+                metadata = {"report": report_path.name}
+                if relative.name == "page.json" and isinstance(document, dict):
+                    metadata["displayName"] = document.get("displayName", page)
+                self.put_source(source, stamp, collect_uses(document, page, visual), **metadata)
+                stats["updated"] += 1
+
+        for page_key, page_config in (page_configs or {}).items():
+            source = PAGE_CONFIGS_SOURCE + page_key
+            current.add(source)
+            stamp = page_config_stamp(page_config)
+            if self.sources.get(source, {}).get("stamp") == stamp:
+                stats["unchanged"] += 1
+                continue
+            self.put_source(source, stamp, page_config_uses(page_key, page_config),
+                            report="PAGE_CONFIGS", displayName=page_config.get("display_name", page_key))
+            stats["updated"] += 1
+
+        for source in [s for s in self.sources if s not in current]:
+            self.remove_source(source)
+            stats["removed"] += 1
+        return stats
+
+    def page_names(self) -> Dict[Tuple[str, str], str]:
+        """(report, page id) -> page display name, from the indexed page.json files."""
+        names = {}
+        for source, entry in self.sources.items():
+            if "displayName" in entry:
+                page = source[len(PAGE_CONFIGS_SOURCE):] if source.startswith(PAGE_CONFIGS_SOURCE) \
+                    else Path(source).parent.name
+                names[(entry["report"], page)] = entry["displayName"]
+        return names
+
+    def matching_fields(self, text: str) -> List[str]:
+        """Field keys matching "Table[Field]" exactly, or a bare field name in any table."""
+        entity, prop = parse_lookup(text)
+        exact = field_key(entity, prop) if entity is not None else None
+        if exact in self.fields:
+            return [exact]
+        matches = []
+        for key in self.fields:
+            key_entity, key_prop = parse_lookup(key)
+            if key_prop.lower() != prop.lower():
+                continue
+            # Report visuals sometimes leave the entity blank on measures
+            if entity is None or key_entity.lower() in (entity.lower(), ""):
+                matches.append(key)
+        return sorted(matches)
+
+    def lookup(self, text: str) -> List[Dict[str, Any]]:
+        """Every use of the matching fields, with report and page display name."""
+        page_names = self.page_names()
+        results = []
+        for key in self.matching_fields(text):
+            for source, entries in sorted(self.fields[key].items()):
+                report = self.sources[source]["report"]
+                for entry in entries:
+                    results.append({
+                        "field": key,
+                        "report": report,
+                        "page": page_names.get((report, entry["page"]), entry["page"]),
+                        "source": source,
+                        **{k: v for k, v in entry.items() if k != "page"}
+                    })
+        return results
+
+    def summary(self) -> List[Tuple[str, int]]:
+        """(field key, number of uses) for every indexed field, most used first."""
+        counts = Counter({key: sum(len(entries) for entries in postings.values())
+                          for key, postings in self.fields.items()})
+        return counts.most_common()
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Find every visual that uses a measure or column"
+    )
+    parser.add_argument(
+        "field",
+        nargs="*",
+        help="Field to look up: a bare name (any table) or Table[Field]"
+    )
+    parser.add_argument(
+        "--report",
+        action="append",
+        metavar="PATH",
+        help="Report folder to index (repeatable; default: every .Report folder in the repo)"
+    )
+    parser.add_argument(
+        "--no-page-configs",
+        action="store_true",
+        help="Do not index PAGE_CONFIGS visuals"
+    )
+    parser.add_argument(
+        "--index",
+        type=str,
+        default=str(SCRIPT_DIR / INDEX_FILENAME),
+        metavar="PATH",
+        help=f"Index file (default: {INDEX_FILENAME} next to this script)"
+    )
+    parser.add_argument(
+        "--no-refresh",
+        action="store_true",
+        help="Answer from the stored index without checking sources for changes"
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Discard the stored index and re-read every source"
+    )
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="List every indexed field with its number of uses"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print results as JSON"
+    )
+
+    args = parser.parse_args()
+    index_path = Path(args.index)
+    index = FieldIndex(index_path) if args.rebuild else FieldIndex.load(index_path)
+
+    if not args.no_refresh:
+        reports = [Path(p) for p in args.report] if args.report else DEFAULT_REPORTS
+        stats = index.refresh(reports, None if args.no_page_configs else PAGE_CONFIGS)
+        index.save()
+        if not args.json:
+            print(f"Index: {stats['updated']} updated, {stats['unchanged']} unchanged, "
+                  f"{stats['removed']} removed ({len(index.fields)} fields, {len(index.sources)} sources)")
+
+    if args.summary:
+        summary = index.summary()
+        if args.json:
+            print(json.dumps([{"field": key, "uses": count} for key, count in summary], indent=2))
+        else:
+            for key, count in summary:
+                print(f"  {count:5}  {key}")
+        return 0
+
+    if not args.field:
+        if not args.json:
+            parser.print_help()
+        return 0
+
+    results = {text: index.lookup(text) for text in args.field}
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0 if all(results.values()) else 1
+
+    for text, uses in results.items():
+        fields = sorted({use["field"] for use in uses})
+        print(f"\n{text}: {len(uses)} use(s)" + (f" of {', '.join(fields)}" if fields else ""))
+        for use in uses:
+            where = f"{use['report']} / {use['page'] or '(report)'}"
+            visual = use["visual"] or "(page)"
+            print(f"  {where:60} {visual:40} {use['role']:10} {use['kind']}")
+    return 0 if all(results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,15 +15,35 @@ Usage:
     python generate_visuals.py --all
     python generate_visuals.py --dry-run --page explorer
     python generate_visuals.py --blueprint path/to/blueprint.json
+    python generate_visuals.py --blueprints blueprints/ --jobs 4
+    python generate_visuals.py --all --incremental
+    python generate_visuals.py --all --id-mode deterministic
+    python generate_visuals.py --all --jobs 4
+    python generate_visuals.py --batch variants.json
+    python generate_visuals.py --all --output-format compact --fsync
+    python generate_visuals.py --all --grid 1080p --layout-mode collapsed
 """
 
 import json
+import hashlib
 import secrets
 import os
 import argparse
 import copy
+import glob
+import io
+import shutil
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, redirect_stdout
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, List, Optional, Any, Tuple
+
+from layout_engine import DEFAULT_GRID, DEFAULT_MODE, LAYOUT_GRIDS, LAYOUT_MODES, LayoutError, apply_layout
+from tmdl_index import ModelIndex, find_semantic_model, load_model_index
 
 # =============================================================================
 # CONFIGURATION
@@ -35,11 +55,39 @@ BLUEPRINTS_DIR = SCRIPT_DIR / "blueprints"  # Optional: external blueprint files
 
 # Visual schema (Power BI PBIP format)
 VISUAL_SCHEMA_URL = "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/2.4.0/schema.json"
+BOOKMARK_SCHEMA_URL = "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/bookmark/1.2.0/schema.json"
+BOOKMARKS_SCHEMA_URL = "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/bookmarksMetadata/1.0.0/schema.json"
 
 # Default measure entity
 DEFAULT_MEASURE_ENTITY = "Measures_Livecast"
 
-# Grid positions from V5_PIXEL_GRID_REFERENCE.md (EXACT VALUES)
+# Generator version - bump whenever template output changes so incremental
+# runs regenerate every visual instead of trusting stale fingerprints
+GENERATOR_VERSION = "1.2.0"
+
+# Incremental manifest (stored next to pages.json)
+MANIFEST_FILENAME = ".visuals_manifest.json"
+
+# Cached displayName -> page ID index (stored next to pages.json)
+PAGE_INDEX_FILENAME = ".page_index.json"
+
+# Layout spec whose "bookmarks" drive the expand/collapse bookmarks and groups
+BOOKMARK_SPEC_PATH = SCRIPT_DIR / "hhs_live_events_1920x1080.json"
+GROUP_PREFIX = "grp_"
+
+# Bookmark whose visibility a page starts in, per layout mode
+LAYOUT_MODE_BOOKMARKS = {"expanded": "Actions_Expanded", "collapsed": "Actions_Collapsed"}
+
+# visual.json output formats: "pretty" (indent=2, matches Desktop-saved files),
+# "compact" (no whitespace) and "canonical" (sorted keys, stable separators)
+OUTPUT_FORMATS = ("pretty", "compact", "canonical")
+
+# ID generation modes: "random" draws from secrets, "deterministic" derives
+# IDs from page key + visual role + position so reruns reproduce the same tree
+ID_MODES = ("random", "deterministic")
+
+# Grid positions from V5_PIXEL_GRID_REFERENCE.md (EXACT VALUES). Visual slots are
+# solved from layout_engine.LAYOUT_GRIDS["720p"], which mirrors these values.
 GRID = {
     "canvas": {"width": 1280, "height": 720},
     "content_start_x": 56,
@@ -112,17 +160,75 @@ def parse_field_reference(field_name: str, default_entity: str = DEFAULT_MEASURE
 # HELPER FUNCTIONS
 # =============================================================================
 
+# Per-thread deterministic ID scope (seed + counter); unset means random IDs
+_ID_STATE = threading.local()
+
+@contextmanager
+def deterministic_ids(seed: str):
+    """
+    Derive every ID generated inside this block from `seed`.
+
+    The visual ID is a hash of the seed itself; filter and field IDs hash
+    the seed plus a per-kind counter, so the same builder call sequence
+    always yields the same IDs.
+    """
+    previous = getattr(_ID_STATE, "scope", None)
+    _ID_STATE.scope = {"seed": seed, "counters": {}}
+    try:
+        yield
+    finally:
+        _ID_STATE.scope = previous
+
+def _token_hex(nbytes: int, kind: str) -> str:
+    """Random hex token, or a seeded one inside a deterministic_ids() block."""
+    scope = getattr(_ID_STATE, "scope", None)
+    if scope is None:
+        return secrets.token_hex(nbytes)
+    counter = scope["counters"].get(kind, 0)
+    scope["counters"][kind] = counter + 1
+    digest = hashlib.sha256(f"{scope['seed']}|{kind}|{counter}".encode("utf-8")).hexdigest()
+    return digest[:nbytes * 2]
+
 def generate_visual_id() -> str:
     """Generate a unique 24-character hex visual ID."""
-    return secrets.token_hex(12)
+    return _token_hex(12, "visual")
 
 def generate_filter_id() -> str:
     """Generate a unique filter ID."""
-    return secrets.token_hex(10)
+    return _token_hex(10, "filter")
 
 def generate_field_id() -> str:
     """Generate a unique field ID for reference labels."""
-    return f"field-{secrets.token_hex(4)}-{secrets.token_hex(2)}-{secrets.token_hex(2)}-{secrets.token_hex(2)}-{secrets.token_hex(6)}"
+    token = _token_hex(16, "field")
+    return f"field-{token[:8]}-{token[8:12]}-{token[12:16]}-{token[16:20]}-{token[20:]}"
+
+def visual_id_seed(page_key: str, config: Dict) -> str:
+    """
+    Build the deterministic ID seed for a visual: page key + role + position.
+
+    The role is the visual type plus its most descriptive field (title,
+    measure, text or button type); the position is its x/y/z on the canvas.
+    """
+    role = next(
+        (str(config[key]) for key in ("title", "measure", "text", "button_type") if config.get(key)),
+        ""
+    )
+    position = config.get("position", {})
+    return (
+        f"{page_key}|{config.get('type', 'unknown')}|{role}|"
+        f"{position.get('x', '')},{position.get('y', '')},{position.get('z', '')}"
+    )
+
+def page_id_seeds(page_key: str, visuals: List[Dict]) -> List[str]:
+    """Deterministic ID seeds for every visual on a page, disambiguating duplicates."""
+    seeds = []
+    seen: Dict[str, int] = {}
+    for config in visuals:
+        seed = visual_id_seed(page_key, config)
+        occurrence = seen.get(seed, 0)
+        seen[seed] = occurrence + 1
+        seeds.append(seed if occurrence == 0 else f"{seed}#{occurrence}")
+    return seeds
 
 def build_measure_ref(measure_name: str, entity: str = "Measures_Livecast") -> Dict:
     """Build a measure reference object."""
@@ -178,6 +284,69 @@ def build_field_ref(field_name: str, default_entity: str = DEFAULT_MEASURE_ENTIT
     else:
         return build_column_ref(prop, entity)
 
+def iter_field_refs(node: Any):
+    """
+    Yield (entity, property, is_measure) for every model field a visual references.
+
+    Covers projections, sort definitions, filters and measure-driven
+    formatting (any Measure/Column expression bound to an Entity).
+    Filter-local references (SourceRef.Source aliases) are skipped; their
+    field is also listed on the filter itself.
+    """
+    if isinstance(node, dict):
+        for key in ("Measure", "Column"):
+            ref = node.get(key)
+            if isinstance(ref, dict):
+                entity = ref.get("Expression", {}).get("SourceRef", {}).get("Entity")
+                if entity is not None and "Property" in ref:
+                    yield entity, ref["Property"], key == "Measure"
+        for value in node.values():
+            yield from iter_field_refs(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from iter_field_refs(item)
+
+def check_visual_fields(visual_json: Dict, model_index: ModelIndex) -> List[str]:
+    """Check every field a visual references against the model index."""
+    errors = []
+    seen = set()
+    for entity, prop, is_measure in iter_field_refs(visual_json):
+        if (entity, prop, is_measure) in seen:
+            continue
+        seen.add((entity, prop, is_measure))
+        error = model_index.check_field(entity, prop, is_measure)
+        if error:
+            errors.append(error)
+    return errors
+
+def load_report_model_index(base_path: Path) -> Optional[ModelIndex]:
+    """Model index for the semantic model a report's pages folder is bound to, if found."""
+    model_path = find_semantic_model(base_path)
+    return load_model_index(model_path) if model_path else None
+
+def remap_entities(node: Any, entity_map: Dict[str, str]) -> Any:
+    """
+    Return a copy of a visual.json tree with table/entity names remapped.
+
+    Rewrites every "Entity" value (SourceRef and filter From clauses) plus
+    the "Entity.Property" prefixes used by queryRef and selector metadata.
+    Always returns a fresh structure, so it doubles as a cheap deep copy.
+    """
+    if isinstance(node, dict):
+        remapped = {}
+        for key, value in node.items():
+            if key == "Entity" and isinstance(value, str):
+                remapped[key] = entity_map.get(value, value)
+            elif key in ("queryRef", "metadata") and isinstance(value, str) and "." in value:
+                entity, _, prop = value.partition(".")
+                remapped[key] = f"{entity_map.get(entity, entity)}.{prop}"
+            else:
+                remapped[key] = remap_entities(value, entity_map)
+        return remapped
+    if isinstance(node, list):
+        return [remap_entities(item, entity_map) for item in node]
+    return node
+
 # =============================================================================
 # BLUEPRINT LOADING (from older version)
 # =============================================================================
@@ -187,18 +356,84 @@ def load_blueprint(blueprint_path: Path) -> Dict[str, Any]:
     with open(blueprint_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
-def get_page_id_mapping() -> Dict[str, str]:
+def find_blueprints(pattern: str) -> List[Path]:
     """
-    Get mapping of page display names to actual page IDs from pages.json.
+    Resolve a blueprint argument to a sorted list of JSON files.
 
-    Returns:
-        Dict mapping display name -> page folder ID
+    Accepts a directory (all *.json inside), a single file, or a glob
+    pattern such as "blueprints/**/*.json".
     """
-    pages_json_path = BASE_PATH / "pages.json"
-    if not pages_json_path.exists():
-        return {}
+    path = Path(pattern)
+    if path.is_dir():
+        return sorted(path.glob("*.json"))
+    if path.is_file():
+        return [path]
+    return sorted(Path(match) for match in glob.glob(pattern, recursive=True) if match.endswith(".json"))
+
+def load_blueprint_pages(blueprint_paths: List[Path], base_path: Optional[Path] = None,
+                         persist_index: bool = True) -> Dict[str, Dict]:
+    """
+    Load blueprints and turn each into a page config keyed by file stem.
+
+    Page IDs come from the blueprint's 'page_id' or, failing that, from its
+    displayName via a single get_page_id_mapping() lookup shared by all
+    blueprints. Raises ConfigValidationError if any page cannot be resolved,
+    two blueprints target the same page or share a file stem (e.g. the same
+    file name in different folders matched by one glob).
+    """
+    blueprints = [(path, load_blueprint(path)) for path in blueprint_paths]
+    mapping = None
+    page_configs = {}
+    owners: Dict[str, Path] = {}
+    stems: Dict[str, Path] = {}
+    errors = []
+
+    for path, blueprint in blueprints:
+        if path.stem in stems:
+            errors.append(f"{path}: page key '{path.stem}' is already used by {stems[path.stem]}; "
+                          f"rename one of the blueprints")
+            continue
+        stems[path.stem] = path
+
+        page_spec = blueprint.get("page", blueprint)
+        display_name = page_spec.get("displayName", "")
+        page_id = page_spec.get("page_id", "")
 
-    with open(pages_json_path, 'r', encoding='utf-8') as f:
+        if not page_id and display_name:
+            if mapping is None:
+                mapping = get_page_id_mapping(base_path, persist=persist_index)
+            page_id = mapping.get(display_name) or mapping.get(display_name.lower().replace(" ", "_"))
+
+        if not page_id:
+            errors.append(f"{path}: could not determine page ID. Specify 'page_id' in blueprint "
+                          f"or ensure displayName matches pages.json")
+            continue
+        if page_id in owners:
+            errors.append(f"{path}: targets page {page_id}, already targeted by {owners[page_id]}")
+            continue
+        owners[page_id] = path
+
+        page_configs[path.stem] = {
+            "page_id": page_id,
+            "display_name": display_name or "Blueprint Page",
+            "visuals": page_spec.get("visuals", [])
+        }
+
+    if errors:
+        raise ConfigValidationError(errors)
+    return page_configs
+
+def _file_stamp(path: Path) -> Optional[List[int]]:
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+def _scan_page_id_mapping(base_path: Path) -> Tuple[Dict[str, str], List[str]]:
+    """Read pages.json and every page's page.json; returns (mapping, page order)."""
+    with open(base_path / "pages.json", 'r', encoding='utf-8') as f:
         pages_metadata = json.load(f)
 
     page_order = pages_metadata.get("pageOrder", [])
@@ -206,7 +441,7 @@ def get_page_id_mapping() -> Dict[str, str]:
     # Build mapping by reading each page's page.json
     mapping = {}
     for page_id in page_order:
-        page_json_path = BASE_PATH / page_id / "page.json"
+        page_json_path = base_path / page_id / "page.json"
         if page_json_path.exists():
             with open(page_json_path, 'r', encoding='utf-8') as f:
                 page_data = json.load(f)
@@ -216,16 +451,417 @@ def get_page_id_mapping() -> Dict[str, str]:
                     # Also add lowercase/normalized versions
                     mapping[display_name.lower().replace(" ", "_")] = page_id
 
-    return mapping
+    return mapping, page_order
+
+def _page_index_stamps(base_path: Path, page_order: List[str]) -> Dict[str, Optional[List[int]]]:
+    """Stamps of pages.json and each listed page.json, used to invalidate the index."""
+    stamps = {"pages.json": _file_stamp(base_path / "pages.json")}
+    for page_id in page_order:
+        stamps[page_id] = _file_stamp(base_path / page_id / "page.json")
+    return stamps
+
+# In-process copy of each pages folder's index: base_path -> index dict
+_PAGE_INDEX_MEMO: Dict[Path, Dict[str, Any]] = {}
+
+def get_page_id_mapping(base_path: Optional[Path] = None, persist: bool = True) -> Dict[str, str]:
+    """
+    Get mapping of page display names to actual page IDs from pages.json.
+
+    The mapping is cached in PAGE_INDEX_FILENAME next to pages.json, keyed
+    by the mtime/size of pages.json and every page's page.json. A lookup
+    only stats those files; the pages are re-read when any of them changes.
+
+    Args:
+        base_path: Report pages folder (default: BASE_PATH)
+        persist: Write a refreshed index to disk (False for dry runs and
+                 read-only inspection; the in-process memo still applies)
+
+    Returns:
+        Dict mapping display name -> page folder ID
+    """
+    base_path = base_path or BASE_PATH
+    if not (base_path / "pages.json").exists():
+        return {}
+
+    index_path = base_path / PAGE_INDEX_FILENAME
+    index = _PAGE_INDEX_MEMO.get(base_path)
+    if index is None and index_path.exists():
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = None
+
+    if index and index.get("stamps") == _page_index_stamps(base_path, index.get("page_order", [])):
+        _PAGE_INDEX_MEMO[base_path] = index
+        return dict(index["mapping"])
+
+    mapping, page_order = _scan_page_id_mapping(base_path)
+    index = {
+        "page_order": page_order,
+        "stamps": _page_index_stamps(base_path, page_order),
+        "mapping": mapping
+    }
+    _PAGE_INDEX_MEMO[base_path] = index
+    if not persist:
+        return dict(mapping)
+    try:
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+    except OSError:
+        pass  # Read-only report folder: the in-process cache still applies
+
+    return dict(mapping)
+
+# =============================================================================
+# OUTPUT WRITING
+# =============================================================================
+
+def serialize_visual(visual_json: Dict, output_format: str = "pretty") -> bytes:
+    """Serialize a visual.json structure in the requested output format."""
+    if output_format == "compact":
+        text = json.dumps(visual_json, separators=(",", ":"))
+    elif output_format == "canonical":
+        text = json.dumps(visual_json, sort_keys=True, separators=(",", ":"))
+    elif output_format == "pretty":
+        text = json.dumps(visual_json, indent=2)
+    else:
+        raise ValueError(f"Unknown output format: {output_format}. Available: {list(OUTPUT_FORMATS)}")
+    return text.encode("utf-8")
+
+def file_matches(file_path: Path, data: bytes) -> bool:
+    """True if file_path already holds exactly `data` (size checked before content)."""
+    try:
+        if file_path.stat().st_size != len(data):
+            return False
+        with open(file_path, "rb") as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+def write_file_atomic(file_path: Path, data: bytes) -> None:
+    """
+    Write a file via a temp file + rename.
+
+    The target is either the complete old file or the complete new one, so
+    an interrupted run never leaves a half-written visual.json behind.
+    """
+    tmp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+def fsync_paths(file_paths: List[Path]) -> None:
+    """
+    Flush a batch of written files (and their folders) to disk.
+
+    Issued once per page rather than per file; folder fsync makes the
+    renames durable and is skipped where unsupported (Windows).
+    """
+    folders = []
+    for file_path in file_paths:
+        with open(file_path, "rb+") as f:
+            os.fsync(f.fileno())
+        if file_path.parent not in folders:
+            folders.append(file_path.parent)
+
+    if os.name != "posix":
+        return
+    for folder in folders:
+        fd = os.open(folder, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+# =============================================================================
+# INCREMENTAL MANIFEST
+# =============================================================================
+
+def fingerprint_visual_config(config: Dict, context: Optional[Dict] = None) -> str:
+    """
+    Fingerprint a visual config together with the generator version.
+
+    Two configs with the same fingerprint produce equivalent visual.json
+    output, so an unchanged fingerprint means the file on disk can be kept.
+    `context` carries generator-level settings that also affect the output
+    (e.g. entity overrides in batch mode).
+    """
+    payload = json.dumps(
+        {"generator_version": GENERATOR_VERSION, "config": config, "context": context or {}},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+# Config keys that identify an unplaced visual (no element or slot) by its content
+SLOT_IDENTITY_KEYS = ("title", "measure", "text", "column", "button_type")
+
+def content_slot_key(config: Dict) -> str:
+    """
+    Key from what a visual shows: its "element" name, else the type plus its
+    title (or measure, text, ...). Also the key format of manifests written
+    before slots were preferred.
+    """
+    if config.get("element"):
+        return config["element"]
+    visual_type = config.get("type", "unknown")
+    for key in SLOT_IDENTITY_KEYS + ("slot",):
+        value = config.get(key)
+        if value:
+            return f"{visual_type}:{value}"
+    return visual_type
+
+def visual_slot_key(config: Dict) -> str:
+    """
+    Key identifying a visual within its page config, independent of its index.
+
+    The "element" name when present, else its layout slot, so inserting or
+    removing a visual does not shift the keys of the others and retitling
+    or retyping one keeps its visual ID. Visuals with neither are keyed by
+    content_slot_key, so editing their title gives them a new ID.
+    """
+    if config.get("element"):
+        return config["element"]
+    if config.get("slot"):
+        return f"slot:{config['slot']}"
+    return content_slot_key(config)
+
+def visual_slot_keys(visuals: List[Dict], key_function: Callable[[Dict], str] = visual_slot_key) -> List[str]:
+    """Slot keys for a page's visuals; repeated identities get a #2, #3... suffix."""
+    seen: Counter = Counter()
+    keys = []
+    for config in visuals:
+        key = key_function(config)
+        seen[key] += 1
+        keys.append(key if seen[key] == 1 else f"{key}#{seen[key]}")
+    return keys
+
+def legacy_slot_key(index: int, config: Dict) -> str:
+    """Index-based slot key used by manifests written before visual_slot_key."""
+    return f"{index:03d}:{config.get('type', 'unknown')}"
+
+def load_manifest(base_path: Path) -> Dict[str, Any]:
+    """Load the incremental manifest, or an empty one if missing/corrupt."""
+    manifest_path = base_path / MANIFEST_FILENAME
+    if manifest_path.exists():
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if isinstance(manifest.get("pages"), dict):
+                return manifest
+        except (OSError, ValueError):
+            pass
+    return {"generator_version": GENERATOR_VERSION, "pages": {}}
+
+def save_manifest(base_path: Path, manifest: Dict[str, Any]) -> None:
+    """Write the incremental manifest next to pages.json."""
+    manifest["generator_version"] = GENERATOR_VERSION
+    base_path.mkdir(parents=True, exist_ok=True)
+    with open(base_path / MANIFEST_FILENAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
 
 def convert_visual_type(friendly_type: str) -> str:
     """Convert a friendly visual type name to Power BI internal type."""
     return VISUAL_TYPE_MAP.get(friendly_type, friendly_type)
 
+# =============================================================================
+# PRECOMPILED TEMPLATES
+# =============================================================================
+#
+# Each visual type's static skeleton (the large objects/visualContainerObjects
+# trees that never vary between visuals) is built once and memoized. Builders
+# then take a structural copy: fresh dicts down to the object-name level, with
+# the static per-object entry lists shared between visuals. Only the parts that
+# vary (measure refs, position, title) are built per call.
+#
+# Shared entry lists are read-only. Code that edits a generated visual in place
+# below the object-name level must copy.deepcopy() it first.
+
+def precompiled(builder: Callable[[], Dict]) -> Callable[[], Dict]:
+    """Memoize a zero-argument template skeleton builder."""
+    return lru_cache(maxsize=None)(builder)
+
+def fill_template(template: Dict, **varying: Any) -> Dict:
+    """
+    Structural copy of a template's object groups with varying entries replaced.
+
+    Returns a new {object_name: entries} dict sharing the template's static
+    entry lists; each keyword replaces (or adds) one object group.
+    """
+    filled = dict(template)
+    filled.update(varying)
+    return filled
+
+def build_position(position: Dict, x: int, y: int, z: int, height: int, width: int,
+                   tab_order: Optional[int] = None) -> Dict:
+    """Build a visual position block from a partial position dict and defaults."""
+    return {
+        "x": position.get("x", x),
+        "y": position.get("y", y),
+        "z": position.get("z", z),
+        "height": position.get("height", height),
+        "width": position.get("width", width),
+        "tabOrder": position.get("tabOrder", position.get("z", z) if tab_order is None else tab_order)
+    }
+
+def build_title(title: str) -> List[Dict]:
+    """Build the standard visualContainerObjects title entry."""
+    return [{"properties": {"text": literal(title)}}]
+
 # =============================================================================
 # KPI CARD TEMPLATE
 # =============================================================================
 
+@precompiled
+def _kpi_card_objects() -> Dict:
+    """Static cardVisual objects shared by every KPI card."""
+    return {
+        "cardCalloutArea": [
+            {
+                "properties": {
+                    "paddingIndividual": literal(True),
+                    "paddingLeft": {"expr": {"Literal": {"Value": "5L"}}},
+                    "paddingBottom": {"expr": {"Literal": {"Value": "0L"}}}
+                },
+                "selector": {"id": "default"}
+            }
+        ],
+        "divider": [{"properties": {"show": literal(False)}, "selector": {"id": "default"}}],
+        "fillCustom": [{"properties": {"show": literal(False)}}],
+        "glowCustom": [{"properties": {"show": literal(False)}, "selector": {"id": "default"}}],
+        "image": [{"properties": {"show": literal(False)}, "selector": {"id": "default"}}],
+        "label": [
+            {
+                "properties": {
+                    "show": literal(False),
+                    "position": literal("aboveValue"),
+                    "textWrap": literal(False),
+                    "matchValueAlignment": literal(False),
+                    "horizontalAlignment": literal("center")
+                },
+                "selector": {"id": "default"}
+            }
+        ],
+        "layout": [
+            {
+                "properties": {
+                    "orientation": {"expr": {"Literal": {"Value": "1D"}}},
+                    "rowCount": {"expr": {"Literal": {"Value": "1L"}}},
+                    "cellPadding": {"expr": {"Literal": {"Value": "0L"}}},
+                    "calloutSize": {"expr": {"Literal": {"Value": "50D"}}},
+                    "style": literal("Cards")
+                }
+            },
+            {
+                "properties": {
+                    "backgroundShow": literal(False),
+                    "rectangleRoundedCurve": {"expr": {"Literal": {"Value": "5L"}}},
+                    "leftOuterMargin": {"expr": {"Literal": {"Value": "5L"}}},
+                    "topOuterMargin": {"expr": {"Literal": {"Value": "0L"}}},
+                    "paddingUniform": {"expr": {"Literal": {"Value": "0L"}}},
+                    "paddingIndividual": literal(True)
+                },
+                "selector": {"id": "default"}
+            }
+        ],
+        "outline": [{"properties": {"show": literal(False)}, "selector": {"id": "default"}}],
+        "padding": [
+            {
+                "properties": {
+                    "topMargin": {"expr": {"Literal": {"Value": "0L"}}},
+                    "bottomMargin": {"expr": {"Literal": {"Value": "0L"}}},
+                    "paddingIndividual": literal(True)
+                },
+                "selector": {"id": "default"}
+            }
+        ],
+        "shadowCustom": [{"properties": {"show": literal(False)}, "selector": {"id": "default"}}],
+        "spacing": [
+            {
+                "properties": {"verticalSpacing": {"expr": {"Literal": {"Value": "0L"}}}},
+                "selector": {"id": "default"}
+            }
+        ],
+        "value": [
+            {"properties": {"show": literal(True)}},
+            {
+                "properties": {
+                    "fontFamily": literal("'Segoe UI', wf_segoe-ui_normal, helvetica, arial, sans-serif"),
+                    "fontSize": {"expr": {"Literal": {"Value": "19D"}}},
+                    "horizontalAlignment": literal("left")
+                },
+                "selector": {"id": "default"}
+            }
+        ],
+        "referenceLabel": [
+            {
+                "properties": {
+                    "backgroundShow": literal(False),
+                    "paddingUniform": {"expr": {"Literal": {"Value": "5L"}}},
+                    "paddingIndividual": literal(True)
+                },
+                "selector": {"id": "default"}
+            }
+        ],
+        "referenceLabelTitle": [],
+        "referenceLabelValue": []
+    }
+
+@precompiled
+def _kpi_card_container_objects() -> Dict:
+    """Static visualContainerObjects shared by every KPI card (title text varies)."""
+    return {
+        "title": [],
+        "spacing": [
+            {
+                "properties": {"verticalSpacing": {"expr": {"Literal": {"Value": "2D"}}}},
+                "selector": {"id": "default"}
+            },
+            {
+                "properties": {
+                    "customizeSpacing": literal(False),
+                    "verticalSpacing": {"expr": {"Literal": {"Value": "0D"}}}
+                }
+            }
+        ],
+        "background": [
+            {
+                "properties": {
+                    "show": literal(True),
+                    "color": {"solid": {"color": {"expr": {"Literal": {"Value": "'#FFFFFF'"}}}}},
+                    "transparency": {"expr": {"Literal": {"Value": "0D"}}}
+                }
+            }
+        ],
+        "border": [
+            {
+                "properties": {
+                    "show": literal(False),
+                    "color": {"solid": {"color": {"expr": {"Literal": {"Value": "'#DFE1E2'"}}}}},
+                    "radius": {"expr": {"Literal": {"Value": "4D"}}},
+                    "width": {"expr": {"Literal": {"Value": "1D"}}}
+                }
+            }
+        ],
+        "visualHeader": [{"properties": {"show": literal(False)}}],
+        "padding": [
+            {
+                "properties": {
+                    "top": {"expr": {"Literal": {"Value": "0D"}}},
+                    "bottom": {"expr": {"Literal": {"Value": "0D"}}},
+                    "left": {"expr": {"Literal": {"Value": "0D"}}},
+                    "right": {"expr": {"Literal": {"Value": "0D"}}}
+                }
+            }
+        ],
+        "general": [{"properties": {}}]
+    }
+
 def generate_kpi_card(
     measure: str,
     title: str,
@@ -251,18 +887,86 @@ def generate_kpi_card(
         Complete visual.json structure
     """
     vid = visual_id or generate_visual_id()
+    metadata = f"Measures_Livecast.{measure}"
 
-    visual = {
-        "$schema": "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/2.4.0/schema.json",
+    reference_labels = list(_kpi_card_objects()["referenceLabel"])
+    reference_label_values = []
+
+    # Add MoM label reference if provided
+    if mom_label:
+        field_id = generate_field_id()
+        reference_labels.append({
+            "properties": {
+                "value": {"expr": build_measure_ref(mom_label)}
+            },
+            "selector": {
+                "data": [{"dataViewWildcard": {"matchingOption": 0}}],
+                "metadata": metadata,
+                "id": field_id,
+                "order": 0
+            }
+        })
+
+        # Add MoM color if provided
+        if mom_color:
+            reference_label_values.append({
+                "properties": {
+                    "valueFontColor": {
+                        "solid": {
+                            "color": {"expr": build_measure_ref(mom_color)}
+                        }
+                    }
+                },
+                "selector": {
+                    "data": [{"dataViewWildcard": {"matchingOption": 0}}],
+                    "metadata": metadata
+                }
+            })
+
+    objects = fill_template(
+        _kpi_card_objects(),
+        referenceLabel=reference_labels,
+        referenceLabelTitle=[
+            {
+                "properties": {"show": literal(False)},
+                "selector": {"metadata": metadata}
+            }
+        ],
+        referenceLabelValue=reference_label_values
+    )
+
+    container_objects = fill_template(
+        _kpi_card_container_objects(),
+        title=[
+            {
+                "properties": {
+                    "text": literal(title),
+                    "show": literal(True),
+                    "heading": literal("Normal"),
+                    "titleWrap": literal(True),
+                    "fontColor": {"solid": {"color": {"expr": {"Literal": {"Value": "'#1B1B1B'"}}}}},
+                    "alignment": literal("center"),
+                    "fontSize": literal("14"),
+                    "fontFamily": literal("Segoe UI Semibold")
+                }
+            }
+        ]
+    )
+
+    # Add alt text if provided
+    if alt_text:
+        container_objects["general"] = [
+            {
+                "properties": {
+                    "altText": {"expr": build_measure_ref(alt_text)}
+                }
+            }
+        ]
+
+    return {
+        "$schema": VISUAL_SCHEMA_URL,
         "name": vid,
-        "position": {
-            "x": position.get("x", 56),
-            "y": position.get("y", 96),
-            "z": position.get("z", 1000),
-            "height": position.get("height", 67),
-            "width": position.get("width", 197),
-            "tabOrder": position.get("tabOrder", position.get("z", 1000))
-        },
+        "position": build_position(position, 56, 96, 1000, 67, 197),
         "visual": {
             "visualType": "cardVisual",
             "query": {
@@ -271,7 +975,7 @@ def generate_kpi_card(
                         "projections": [
                             {
                                 "field": build_measure_ref(measure),
-                                "queryRef": f"Measures_Livecast.{measure}",
+                                "queryRef": metadata,
                                 "nativeQueryRef": measure
                             }
                         ]
@@ -287,161 +991,8 @@ def generate_kpi_card(
                     "isDefaultSort": True
                 }
             },
-            "objects": {
-                "cardCalloutArea": [
-                    {
-                        "properties": {
-                            "paddingIndividual": literal(True),
-                            "paddingLeft": {"expr": {"Literal": {"Value": "5L"}}},
-                            "paddingBottom": {"expr": {"Literal": {"Value": "0L"}}}
-                        },
-                        "selector": {"id": "default"}
-                    }
-                ],
-                "divider": [{"properties": {"show": literal(False)}, "selector": {"id": "default"}}],
-                "fillCustom": [{"properties": {"show": literal(False)}}],
-                "glowCustom": [{"properties": {"show": literal(False)}, "selector": {"id": "default"}}],
-                "image": [{"properties": {"show": literal(False)}, "selector": {"id": "default"}}],
-                "label": [
-                    {
-                        "properties": {
-                            "show": literal(False),
-                            "position": literal("aboveValue"),
-                            "textWrap": literal(False),
-                            "matchValueAlignment": literal(False),
-                            "horizontalAlignment": literal("center")
-                        },
-                        "selector": {"id": "default"}
-                    }
-                ],
-                "layout": [
-                    {
-                        "properties": {
-                            "orientation": {"expr": {"Literal": {"Value": "1D"}}},
-                            "rowCount": {"expr": {"Literal": {"Value": "1L"}}},
-                            "cellPadding": {"expr": {"Literal": {"Value": "0L"}}},
-                            "calloutSize": {"expr": {"Literal": {"Value": "50D"}}},
-                            "style": literal("Cards")
-                        }
-                    },
-                    {
-                        "properties": {
-                            "backgroundShow": literal(False),
-                            "rectangleRoundedCurve": {"expr": {"Literal": {"Value": "5L"}}},
-                            "leftOuterMargin": {"expr": {"Literal": {"Value": "5L"}}},
-                            "topOuterMargin": {"expr": {"Literal": {"Value": "0L"}}},
-                            "paddingUniform": {"expr": {"Literal": {"Value": "0L"}}},
-                            "paddingIndividual": literal(True)
-                        },
-                        "selector": {"id": "default"}
-                    }
-                ],
-                "outline": [{"properties": {"show": literal(False)}, "selector": {"id": "default"}}],
-                "padding": [
-                    {
-                        "properties": {
-                            "topMargin": {"expr": {"Literal": {"Value": "0L"}}},
-                            "bottomMargin": {"expr": {"Literal": {"Value": "0L"}}},
-                            "paddingIndividual": literal(True)
-                        },
-                        "selector": {"id": "default"}
-                    }
-                ],
-                "shadowCustom": [{"properties": {"show": literal(False)}, "selector": {"id": "default"}}],
-                "spacing": [
-                    {
-                        "properties": {"verticalSpacing": {"expr": {"Literal": {"Value": "0L"}}}},
-                        "selector": {"id": "default"}
-                    }
-                ],
-                "value": [
-                    {"properties": {"show": literal(True)}},
-                    {
-                        "properties": {
-                            "fontFamily": literal("'Segoe UI', wf_segoe-ui_normal, helvetica, arial, sans-serif"),
-                            "fontSize": {"expr": {"Literal": {"Value": "19D"}}},
-                            "horizontalAlignment": literal("left")
-                        },
-                        "selector": {"id": "default"}
-                    }
-                ],
-                "referenceLabel": [
-                    {
-                        "properties": {
-                            "backgroundShow": literal(False),
-                            "paddingUniform": {"expr": {"Literal": {"Value": "5L"}}},
-                            "paddingIndividual": literal(True)
-                        },
-                        "selector": {"id": "default"}
-                    }
-                ],
-                "referenceLabelTitle": [
-                    {
-                        "properties": {"show": literal(False)},
-                        "selector": {"metadata": f"Measures_Livecast.{measure}"}
-                    }
-                ],
-                "referenceLabelValue": []
-            },
-            "visualContainerObjects": {
-                "title": [
-                    {
-                        "properties": {
-                            "text": literal(title),
-                            "show": literal(True),
-                            "heading": literal("Normal"),
-                            "titleWrap": literal(True),
-                            "fontColor": {"solid": {"color": {"expr": {"Literal": {"Value": "'#1B1B1B'"}}}}},
-                            "alignment": literal("center"),
-                            "fontSize": literal("14"),
-                            "fontFamily": literal("Segoe UI Semibold")
-                        }
-                    }
-                ],
-                "spacing": [
-                    {
-                        "properties": {"verticalSpacing": {"expr": {"Literal": {"Value": "2D"}}}},
-                        "selector": {"id": "default"}
-                    },
-                    {
-                        "properties": {
-                            "customizeSpacing": literal(False),
-                            "verticalSpacing": {"expr": {"Literal": {"Value": "0D"}}}
-                        }
-                    }
-                ],
-                "background": [
-                    {
-                        "properties": {
-                            "show": literal(True),
-                            "color": {"solid": {"color": {"expr": {"Literal": {"Value": "'#FFFFFF'"}}}}},
-                            "transparency": {"expr": {"Literal": {"Value": "0D"}}}
-                        }
-                    }
-                ],
-                "border": [
-                    {
-                        "properties": {
-                            "show": literal(False),
-                            "color": {"solid": {"color": {"expr": {"Literal": {"Value": "'#DFE1E2'"}}}}},
-                            "radius": {"expr": {"Literal": {"Value": "4D"}}},
-                            "width": {"expr": {"Literal": {"Value": "1D"}}}
-                        }
-                    }
-                ],
-                "visualHeader": [{"properties": {"show": literal(False)}}],
-                "padding": [
-                    {
-                        "properties": {
-                            "top": {"expr": {"Literal": {"Value": "0D"}}},
-                            "bottom": {"expr": {"Literal": {"Value": "0D"}}},
-                            "left": {"expr": {"Literal": {"Value": "0D"}}},
-                            "right": {"expr": {"Literal": {"Value": "0D"}}}
-                        }
-                    }
-                ],
-                "general": [{"properties": {}}]
-            },
+            "objects": objects,
+            "visualContainerObjects": container_objects,
             "drillFilterOtherVisuals": True
         },
         "filterConfig": {
@@ -455,52 +1006,32 @@ def generate_kpi_card(
         }
     }
 
-    # Add MoM label reference if provided
-    if mom_label:
-        field_id = generate_field_id()
-        visual["visual"]["objects"]["referenceLabel"].append({
-            "properties": {
-                "value": {"expr": build_measure_ref(mom_label)}
-            },
-            "selector": {
-                "data": [{"dataViewWildcard": {"matchingOption": 0}}],
-                "metadata": f"Measures_Livecast.{measure}",
-                "id": field_id,
-                "order": 0
-            }
-        })
+# =============================================================================
+# BAR CHART TEMPLATE
+# =============================================================================
 
-        # Add MoM color if provided
-        if mom_color:
-            visual["visual"]["objects"]["referenceLabelValue"].append({
+@precompiled
+def _bar_chart_objects() -> Dict:
+    """Static objects for clustered bar charts (Top N filter is added per chart)."""
+    return {
+        "labels": [{"properties": {"show": literal(True)}}],
+        "categoryAxis": [
+            {
                 "properties": {
-                    "valueFontColor": {
-                        "solid": {
-                            "color": {"expr": build_measure_ref(mom_color)}
-                        }
-                    }
-                },
-                "selector": {
-                    "data": [{"dataViewWildcard": {"matchingOption": 0}}],
-                    "metadata": f"Measures_Livecast.{measure}"
+                    "show": literal(True),
+                    "showAxisTitle": literal(False)
                 }
-            })
-
-    # Add alt text if provided
-    if alt_text:
-        visual["visual"]["visualContainerObjects"]["general"] = [
+            }
+        ],
+        "valueAxis": [
             {
                 "properties": {
-                    "altText": {"expr": build_measure_ref(alt_text)}
+                    "showAxisTitle": literal(False),
+                    "show": literal(False)
                 }
             }
         ]
-
-    return visual
-
-# =============================================================================
-# BAR CHART TEMPLATE
-# =============================================================================
+    }
 
 def generate_bar_chart(
     category_column: str,
@@ -600,25 +1131,7 @@ def generate_bar_chart(
         })
 
     # Build objects with optional Top N
-    objects = {
-        "labels": [{"properties": {"show": literal(True)}}],
-        "categoryAxis": [
-            {
-                "properties": {
-                    "show": literal(True),
-                    "showAxisTitle": literal(False)
-                }
-            }
-        ],
-        "valueAxis": [
-            {
-                "properties": {
-                    "showAxisTitle": literal(False),
-                    "show": literal(False)
-                }
-            }
-        ]
-    }
+    objects = fill_template(_bar_chart_objects())
 
     # Add Top N filter if specified
     if top_n:
@@ -650,16 +1163,9 @@ def generate_bar_chart(
         ]
 
     return {
-        "$schema": "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/2.4.0/schema.json",
+        "$schema": VISUAL_SCHEMA_URL,
         "name": vid,
-        "position": {
-            "x": position.get("x", 56),
-            "y": position.get("y", 466),
-            "z": position.get("z", 7000),
-            "height": position.get("height", 220),
-            "width": position.get("width", 444),
-            "tabOrder": position.get("tabOrder", position.get("z", 7000))
-        },
+        "position": build_position(position, 56, 466, 7000, 220, 444),
         "visual": {
             "visualType": "clusteredBarChart",
             "query": {
@@ -695,15 +1201,7 @@ def generate_bar_chart(
                 }
             },
             "objects": objects,
-            "visualContainerObjects": {
-                "title": [
-                    {
-                        "properties": {
-                            "text": literal(title)
-                        }
-                    }
-                ]
-            },
+            "visualContainerObjects": {"title": build_title(title)},
             "drillFilterOtherVisuals": True
         },
         "filterConfig": {
@@ -820,16 +1318,9 @@ def generate_table(
         })
 
     return {
-        "$schema": "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/2.4.0/schema.json",
+        "$schema": VISUAL_SCHEMA_URL,
         "name": vid,
-        "position": {
-            "x": position.get("x", 508),
-            "y": position.get("y", 466),
-            "z": position.get("z", 6000),
-            "height": position.get("height", 220),
-            "width": position.get("width", 445),
-            "tabOrder": position.get("tabOrder", position.get("z", 6000))
-        },
+        "position": build_position(position, 508, 466, 6000, 220, 445),
         "visual": {
             "visualType": "tableEx",
             "query": {
@@ -840,15 +1331,7 @@ def generate_table(
                 }
             },
             "objects": {},
-            "visualContainerObjects": {
-                "title": [
-                    {
-                        "properties": {
-                            "text": literal(title)
-                        }
-                    }
-                ]
-            },
+            "visualContainerObjects": {"title": build_title(title)},
             "drillFilterOtherVisuals": True
         },
         "filterConfig": {
@@ -860,6 +1343,29 @@ def generate_table(
 # 100% STACKED BAR CHART TEMPLATE
 # =============================================================================
 
+@precompiled
+def _stacked_bar_chart_objects() -> Dict:
+    """Static objects for 100% stacked bar charts."""
+    return {
+        "legend": [{"properties": {"show": literal(True)}}],
+        "labels": [{"properties": {"show": literal(True)}}],
+        "valueAxis": [
+            {
+                "properties": {
+                    "show": literal(False),
+                    "showAxisTitle": literal(False)
+                }
+            }
+        ],
+        "categoryAxis": [
+            {
+                "properties": {
+                    "showAxisTitle": literal(False)
+                }
+            }
+        ]
+    }
+
 def generate_stacked_bar_chart(
     category_column: str,
     category_entity: str,
@@ -874,16 +1380,9 @@ def generate_stacked_bar_chart(
     vid = visual_id or generate_visual_id()
 
     return {
-        "$schema": "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/2.4.0/schema.json",
+        "$schema": VISUAL_SCHEMA_URL,
         "name": vid,
-        "position": {
-            "x": position.get("x", 508),
-            "y": position.get("y", 188),
-            "z": position.get("z", 5000),
-            "height": position.get("height", 254),
-            "width": position.get("width", 445),
-            "tabOrder": position.get("tabOrder", position.get("z", 5000))
-        },
+        "position": build_position(position, 508, 188, 5000, 254, 445),
         "visual": {
             "visualType": "hundredPercentStackedBarChart",
             "query": {
@@ -918,34 +1417,8 @@ def generate_stacked_bar_chart(
                     "isDefaultSort": True
                 }
             },
-            "objects": {
-                "legend": [{"properties": {"show": literal(True)}}],
-                "labels": [{"properties": {"show": literal(True)}}],
-                "valueAxis": [
-                    {
-                        "properties": {
-                            "show": literal(False),
-                            "showAxisTitle": literal(False)
-                        }
-                    }
-                ],
-                "categoryAxis": [
-                    {
-                        "properties": {
-                            "showAxisTitle": literal(False)
-                        }
-                    }
-                ]
-            },
-            "visualContainerObjects": {
-                "title": [
-                    {
-                        "properties": {
-                            "text": literal(title)
-                        }
-                    }
-                ]
-            },
+            "objects": fill_template(_stacked_bar_chart_objects()),
+            "visualContainerObjects": {"title": build_title(title)},
             "drillFilterOtherVisuals": True
         },
         "filterConfig": {
@@ -968,6 +1441,13 @@ def generate_stacked_bar_chart(
 # MAP VISUAL TEMPLATE (Azure Maps)
 # =============================================================================
 
+@precompiled
+def _map_visual_objects() -> Dict:
+    """Static objects for Azure Map bubble visuals."""
+    return {
+        "legend": [{"properties": {"show": literal(False)}}]
+    }
+
 def generate_map_visual(
     location_column: str,
     location_entity: str,
@@ -982,16 +1462,9 @@ def generate_map_visual(
     vid = visual_id or generate_visual_id()
 
     return {
-        "$schema": "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/2.4.0/schema.json",
+        "$schema": VISUAL_SCHEMA_URL,
         "name": vid,
-        "position": {
-            "x": position.get("x", 56),
-            "y": position.get("y", 188),
-            "z": position.get("z", 5000),
-            "height": position.get("height", 254),
-            "width": position.get("width", 444),
-            "tabOrder": position.get("tabOrder", position.get("z", 5000))
-        },
+        "position": build_position(position, 56, 188, 5000, 254, 444),
         "visual": {
             "visualType": "azureMap",
             "query": {
@@ -1026,18 +1499,8 @@ def generate_map_visual(
                     "isDefaultSort": True
                 }
             },
-            "objects": {
-                "legend": [{"properties": {"show": literal(False)}}]
-            },
-            "visualContainerObjects": {
-                "title": [
-                    {
-                        "properties": {
-                            "text": literal(title)
-                        }
-                    }
-                ]
-            },
+            "objects": fill_template(_map_visual_objects()),
+            "visualContainerObjects": {"title": build_title(title)},
             "drillFilterOtherVisuals": True
         },
         "filterConfig": {
@@ -1078,16 +1541,9 @@ def generate_line_chart(
         })
 
     return {
-        "$schema": "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/2.4.0/schema.json",
+        "$schema": VISUAL_SCHEMA_URL,
         "name": vid,
-        "position": {
-            "x": position.get("x", 56),
-            "y": position.get("y", 188),
-            "z": position.get("z", 5000),
-            "height": position.get("height", 254),
-            "width": position.get("width", 444),
-            "tabOrder": position.get("tabOrder", position.get("z", 5000))
-        },
+        "position": build_position(position, 56, 188, 5000, 254, 444),
         "visual": {
             "visualType": "lineChart",
             "query": {
@@ -1125,15 +1581,7 @@ def generate_line_chart(
                     }
                 ]
             },
-            "visualContainerObjects": {
-                "title": [
-                    {
-                        "properties": {
-                            "text": literal(title)
-                        }
-                    }
-                ]
-            },
+            "visualContainerObjects": {"title": build_title(title)},
             "drillFilterOtherVisuals": True
         },
         "filterConfig": {
@@ -1145,6 +1593,28 @@ def generate_line_chart(
 # AREA CHART TEMPLATE
 # =============================================================================
 
+@precompiled
+def _area_chart_objects() -> Dict:
+    """Static objects for area charts."""
+    return {
+        "legend": [{"properties": {"show": literal(False)}}],
+        "labels": [{"properties": {"show": literal(False)}}],
+        "categoryAxis": [
+            {
+                "properties": {
+                    "showAxisTitle": literal(False)
+                }
+            }
+        ],
+        "valueAxis": [
+            {
+                "properties": {
+                    "showAxisTitle": literal(False)
+                }
+            }
+        ]
+    }
+
 def generate_area_chart(
     axis_column: str,
     axis_entity: str,
@@ -1159,16 +1629,9 @@ def generate_area_chart(
     vid = visual_id or generate_visual_id()
 
     return {
-        "$schema": "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/2.4.0/schema.json",
-        "name": vid,
-        "position": {
-            "x": position.get("x", 56),
-            "y": position.get("y", 188),
-            "z": position.get("z", 5000),
-            "height": position.get("height", 254),
-            "width": position.get("width", 444),
-            "tabOrder": position.get("tabOrder", position.get("z", 5000))
-        },
+        "$schema": VISUAL_SCHEMA_URL,
+        "name": vid,
+        "position": build_position(position, 56, 188, 5000, 254, 444),
         "visual": {
             "visualType": "areaChart",
             "query": {
@@ -1194,33 +1657,8 @@ def generate_area_chart(
                     }
                 }
             },
-            "objects": {
-                "legend": [{"properties": {"show": literal(False)}}],
-                "labels": [{"properties": {"show": literal(False)}}],
-                "categoryAxis": [
-                    {
-                        "properties": {
-                            "showAxisTitle": literal(False)
-                        }
-                    }
-                ],
-                "valueAxis": [
-                    {
-                        "properties": {
-                            "showAxisTitle": literal(False)
-                        }
-                    }
-                ]
-            },
-            "visualContainerObjects": {
-                "title": [
-                    {
-                        "properties": {
-                            "text": literal(title)
-                        }
-                    }
-                ]
-            },
+            "objects": fill_template(_area_chart_objects()),
+            "visualContainerObjects": {"title": build_title(title)},
             "drillFilterOtherVisuals": True
         },
         "filterConfig": {
@@ -1232,6 +1670,14 @@ def generate_area_chart(
 # TREEMAP TEMPLATE
 # =============================================================================
 
+@precompiled
+def _treemap_objects() -> Dict:
+    """Static objects for treemaps."""
+    return {
+        "legend": [{"properties": {"show": literal(False)}}],
+        "labels": [{"properties": {"show": literal(True)}}]
+    }
+
 def generate_treemap(
     category_column: str,
     category_entity: str,
@@ -1246,16 +1692,9 @@ def generate_treemap(
     vid = visual_id or generate_visual_id()
 
     return {
-        "$schema": "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/2.4.0/schema.json",
+        "$schema": VISUAL_SCHEMA_URL,
         "name": vid,
-        "position": {
-            "x": position.get("x", 56),
-            "y": position.get("y", 188),
-            "z": position.get("z", 5000),
-            "height": position.get("height", 254),
-            "width": position.get("width", 444),
-            "tabOrder": position.get("tabOrder", position.get("z", 5000))
-        },
+        "position": build_position(position, 56, 188, 5000, 254, 444),
         "visual": {
             "visualType": "treemap",
             "query": {
@@ -1290,19 +1729,8 @@ def generate_treemap(
                     "isDefaultSort": True
                 }
             },
-            "objects": {
-                "legend": [{"properties": {"show": literal(False)}}],
-                "labels": [{"properties": {"show": literal(True)}}]
-            },
-            "visualContainerObjects": {
-                "title": [
-                    {
-                        "properties": {
-                            "text": literal(title)
-                        }
-                    }
-                ]
-            },
+            "objects": fill_template(_treemap_objects()),
+            "visualContainerObjects": {"title": build_title(title)},
             "drillFilterOtherVisuals": True
         },
         "filterConfig": {
@@ -1314,6 +1742,34 @@ def generate_treemap(
 # MATRIX TEMPLATE (pivotTable)
 # =============================================================================
 
+@precompiled
+def _matrix_objects() -> Dict:
+    """Static objects for matrix (pivotTable) visuals."""
+    return {
+        "grid": [
+            {
+                "properties": {
+                    "stylePreset": literal("None"),
+                    "rowPadding": {"expr": {"Literal": {"Value": "2L"}}}
+                }
+            }
+        ],
+        "columnHeaders": [
+            {
+                "properties": {
+                    "bold": literal(True)
+                }
+            }
+        ],
+        "rowHeaders": [
+            {
+                "properties": {
+                    "bold": literal(False)
+                }
+            }
+        ]
+    }
+
 def generate_matrix(
     rows: List[Dict],  # [{"entity": "ga4-titles", "column": "Page title"}, ...]
     values: List[str],  # Measure names
@@ -1374,54 +1830,16 @@ def generate_matrix(
         query_state["Columns"] = {"projections": col_projections}
 
     return {
-        "$schema": "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/2.4.0/schema.json",
+        "$schema": VISUAL_SCHEMA_URL,
         "name": vid,
-        "position": {
-            "x": position.get("x", 56),
-            "y": position.get("y", 176),
-            "z": position.get("z", 5000),
-            "height": position.get("height", 254),
-            "width": position.get("width", 897),
-            "tabOrder": position.get("tabOrder", position.get("z", 5000))
-        },
+        "position": build_position(position, 56, 176, 5000, 254, 897),
         "visual": {
             "visualType": "pivotTable",
             "query": {
                 "queryState": query_state
             },
-            "objects": {
-                "grid": [
-                    {
-                        "properties": {
-                            "stylePreset": literal("None"),
-                            "rowPadding": {"expr": {"Literal": {"Value": "2L"}}}
-                        }
-                    }
-                ],
-                "columnHeaders": [
-                    {
-                        "properties": {
-                            "bold": literal(True)
-                        }
-                    }
-                ],
-                "rowHeaders": [
-                    {
-                        "properties": {
-                            "bold": literal(False)
-                        }
-                    }
-                ]
-            },
-            "visualContainerObjects": {
-                "title": [
-                    {
-                        "properties": {
-                            "text": literal(title)
-                        }
-                    }
-                ]
-            },
+            "objects": fill_template(_matrix_objects()),
+            "visualContainerObjects": {"title": build_title(title)},
             "drillFilterOtherVisuals": True
         },
         "filterConfig": {
@@ -1494,31 +1912,16 @@ def generate_gauge(
         ]
 
     return {
-        "$schema": "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/2.4.0/schema.json",
+        "$schema": VISUAL_SCHEMA_URL,
         "name": vid,
-        "position": {
-            "x": position.get("x", 56),
-            "y": position.get("y", 456),
-            "z": position.get("z", 6000),
-            "height": position.get("height", 220),
-            "width": position.get("width", 444),
-            "tabOrder": position.get("tabOrder", position.get("z", 6000))
-        },
+        "position": build_position(position, 56, 456, 6000, 220, 444),
         "visual": {
             "visualType": "gauge",
             "query": {
                 "queryState": query_state
             },
             "objects": objects,
-            "visualContainerObjects": {
-                "title": [
-                    {
-                        "properties": {
-                            "text": literal(title)
-                        }
-                    }
-                ]
-            },
+            "visualContainerObjects": {"title": build_title(title)},
             "drillFilterOtherVisuals": True
         },
         "filterConfig": {
@@ -1605,16 +2008,9 @@ def generate_scatter(
         }
 
     return {
-        "$schema": "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/2.4.0/schema.json",
+        "$schema": VISUAL_SCHEMA_URL,
         "name": vid,
-        "position": {
-            "x": position.get("x", 508),
-            "y": position.get("y", 456),
-            "z": position.get("z", 6500),
-            "height": position.get("height", 220),
-            "width": position.get("width", 445),
-            "tabOrder": position.get("tabOrder", position.get("z", 6500))
-        },
+        "position": build_position(position, 508, 456, 6500, 220, 445),
         "visual": {
             "visualType": "scatterChart",
             "query": {
@@ -1637,15 +2033,7 @@ def generate_scatter(
                 ],
                 "legend": [{"properties": {"show": literal(legend_column is not None)}}]
             },
-            "visualContainerObjects": {
-                "title": [
-                    {
-                        "properties": {
-                            "text": literal(title)
-                        }
-                    }
-                ]
-            },
+            "visualContainerObjects": {"title": build_title(title)},
             "drillFilterOtherVisuals": True
         },
         "filterConfig": {
@@ -1657,6 +2045,35 @@ def generate_scatter(
 # COMBO CHART TEMPLATE (Line + Clustered Column)
 # =============================================================================
 
+@precompiled
+def _combo_chart_objects() -> Dict:
+    """Static objects for line + clustered column combo charts."""
+    return {
+        "legend": [{"properties": {"show": literal(True)}}],
+        "labels": [{"properties": {"show": literal(False)}}],
+        "categoryAxis": [
+            {
+                "properties": {
+                    "showAxisTitle": literal(False)
+                }
+            }
+        ],
+        "valueAxis": [
+            {
+                "properties": {
+                    "showAxisTitle": literal(False)
+                }
+            }
+        ],
+        "lineY2Axis": [
+            {
+                "properties": {
+                    "showAxisTitle": literal(False)
+                }
+            }
+        ]
+    }
+
 def generate_combo_chart(
     axis_column: str,
     axis_entity: str,
@@ -1702,16 +2119,9 @@ def generate_combo_chart(
         })
 
     return {
-        "$schema": "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/2.4.0/schema.json",
+        "$schema": VISUAL_SCHEMA_URL,
         "name": vid,
-        "position": {
-            "x": position.get("x", 56),
-            "y": position.get("y", 176),
-            "z": position.get("z", 5000),
-            "height": position.get("height", 254),
-            "width": position.get("width", 897),
-            "tabOrder": position.get("tabOrder", position.get("z", 5000))
-        },
+        "position": build_position(position, 56, 176, 5000, 254, 897),
         "visual": {
             "visualType": "lineClusteredColumnComboChart",
             "query": {
@@ -1734,40 +2144,8 @@ def generate_combo_chart(
                     }
                 }
             },
-            "objects": {
-                "legend": [{"properties": {"show": literal(True)}}],
-                "labels": [{"properties": {"show": literal(False)}}],
-                "categoryAxis": [
-                    {
-                        "properties": {
-                            "showAxisTitle": literal(False)
-                        }
-                    }
-                ],
-                "valueAxis": [
-                    {
-                        "properties": {
-                            "showAxisTitle": literal(False)
-                        }
-                    }
-                ],
-                "lineY2Axis": [
-                    {
-                        "properties": {
-                            "showAxisTitle": literal(False)
-                        }
-                    }
-                ]
-            },
-            "visualContainerObjects": {
-                "title": [
-                    {
-                        "properties": {
-                            "text": literal(title)
-                        }
-                    }
-                ]
-            },
+            "objects": fill_template(_combo_chart_objects()),
+            "visualContainerObjects": {"title": build_title(title)},
             "drillFilterOtherVisuals": True
         },
         "filterConfig": {
@@ -1779,6 +2157,14 @@ def generate_combo_chart(
 # FUNNEL CHART TEMPLATE
 # =============================================================================
 
+@precompiled
+def _funnel_objects() -> Dict:
+    """Static objects for funnel charts."""
+    return {
+        "labels": [{"properties": {"show": literal(True)}}],
+        "percentBarLabel": [{"properties": {"show": literal(True)}}]
+    }
+
 def generate_funnel(
     category_column: str,
     category_entity: str,
@@ -1804,16 +2190,9 @@ def generate_funnel(
     vid = visual_id or generate_visual_id()
 
     return {
-        "$schema": "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/2.4.0/schema.json",
+        "$schema": VISUAL_SCHEMA_URL,
         "name": vid,
-        "position": {
-            "x": position.get("x", 508),
-            "y": position.get("y", 456),
-            "z": position.get("z", 6500),
-            "height": position.get("height", 220),
-            "width": position.get("width", 445),
-            "tabOrder": position.get("tabOrder", position.get("z", 6500))
-        },
+        "position": build_position(position, 508, 456, 6500, 220, 445),
         "visual": {
             "visualType": "funnel",
             "query": {
@@ -1848,19 +2227,8 @@ def generate_funnel(
                     "isDefaultSort": True
                 }
             },
-            "objects": {
-                "labels": [{"properties": {"show": literal(True)}}],
-                "percentBarLabel": [{"properties": {"show": literal(True)}}]
-            },
-            "visualContainerObjects": {
-                "title": [
-                    {
-                        "properties": {
-                            "text": literal(title)
-                        }
-                    }
-                ]
-            },
+            "objects": fill_template(_funnel_objects()),
+            "visualContainerObjects": {"title": build_title(title)},
             "drillFilterOtherVisuals": True
         },
         "filterConfig": {
@@ -1893,16 +2261,9 @@ def generate_html_visual(
     vid = visual_id or generate_visual_id()
 
     return {
-        "$schema": "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/2.4.0/schema.json",
+        "$schema": VISUAL_SCHEMA_URL,
         "name": vid,
-        "position": {
-            "x": position.get("x", 978),
-            "y": position.get("y", 169),
-            "z": position.get("z", 15000),
-            "height": position.get("height", 230),
-            "width": position.get("width", 241),
-            "tabOrder": position.get("tabOrder", position.get("z", 15000))
-        },
+        "position": build_position(position, 978, 169, 15000, 230, 241),
         "visual": {
             "visualType": "htmlContent443BE3AD55E043BF878BED274D3A6855",
             "query": {
@@ -1933,6 +2294,7 @@ def generate_action_button(
     text: Optional[str] = None,
     tooltip: Optional[str] = None,
     navigation_page: Optional[str] = None,
+    bookmark: Optional[str] = None,
     visual_id: Optional[str] = None
 ) -> Dict:
     """
@@ -1945,6 +2307,7 @@ def generate_action_button(
         text: Button text (optional)
         tooltip: Tooltip text (optional)
         navigation_page: Page ID to navigate to (for navigation buttons)
+        bookmark: Bookmark name to apply (for bookmark buttons)
         visual_id: Optional custom visual ID
 
     Returns:
@@ -1962,21 +2325,17 @@ def generate_action_button(
     elif button_type == "navigation":
         icon = icon or "blank"
         action_type = "PageNavigation"
+    elif button_type == "bookmark":
+        icon = icon or "blank"
+        action_type = "Bookmark"
     else:
         icon = icon or "blank"
         action_type = "PageNavigation"
 
     visual = {
-        "$schema": "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/2.4.0/schema.json",
+        "$schema": VISUAL_SCHEMA_URL,
         "name": vid,
-        "position": {
-            "x": position.get("x", 0),
-            "y": position.get("y", 0),
-            "z": position.get("z", 10000),
-            "height": position.get("height", 28),
-            "width": position.get("width", 28),
-            "tabOrder": position.get("tabOrder", 1000)
-        },
+        "position": build_position(position, 0, 0, 10000, 28, 28, tab_order=1000),
         "visual": {
             "visualType": "actionButton",
             "objects": {
@@ -2012,6 +2371,10 @@ def generate_action_button(
     if navigation_page:
         visual["visual"]["visualContainerObjects"]["visualLink"][0]["properties"]["navigationSection"] = literal(navigation_page)
 
+    # Add bookmark target if provided
+    if bookmark:
+        visual["visual"]["visualContainerObjects"]["visualLink"][0]["properties"]["bookmark"] = literal(bookmark)
+
     # Add text if provided
     if text:
         visual["visual"]["objects"]["text"] = [
@@ -2029,6 +2392,26 @@ def generate_action_button(
 # TEXTBOX TEMPLATE
 # =============================================================================
 
+@precompiled
+def _textbox_container_objects() -> Dict:
+    """Static visualContainerObjects for textboxes."""
+    return {
+        "background": [
+            {
+                "properties": {
+                    "show": literal(False)
+                }
+            }
+        ],
+        "visualHeader": [
+            {
+                "properties": {
+                    "show": literal(False)
+                }
+            }
+        ]
+    }
+
 def generate_textbox(
     text: str,
     position: Dict,
@@ -2052,16 +2435,9 @@ def generate_textbox(
     vid = visual_id or generate_visual_id()
 
     return {
-        "$schema": "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/2.4.0/schema.json",
+        "$schema": VISUAL_SCHEMA_URL,
         "name": vid,
-        "position": {
-            "x": position.get("x", 0),
-            "y": position.get("y", 0),
-            "z": position.get("z", 9000),
-            "height": position.get("height", 16),
-            "width": position.get("width", 100),
-            "tabOrder": position.get("tabOrder", 0)
-        },
+        "position": build_position(position, 0, 0, 9000, 16, 100, tab_order=0),
         "visual": {
             "visualType": "textbox",
             "objects": {
@@ -2082,22 +2458,7 @@ def generate_textbox(
                     }
                 ]
             },
-            "visualContainerObjects": {
-                "background": [
-                    {
-                        "properties": {
-                            "show": literal(False)
-                        }
-                    }
-                ],
-                "visualHeader": [
-                    {
-                        "properties": {
-                            "show": literal(False)
-                        }
-                    }
-                ]
-            },
+            "visualContainerObjects": fill_template(_textbox_container_objects()),
             "drillFilterOtherVisuals": True
         }
     }
@@ -2106,6 +2467,33 @@ def generate_textbox(
 # SHAPE TEMPLATE (using actionButton with blank icon)
 # =============================================================================
 
+@precompiled
+def _shape_container_objects() -> Dict:
+    """Static visualContainerObjects for shapes (border is added per shape)."""
+    return {
+        "visualLink": [
+            {
+                "properties": {
+                    "show": literal(False)
+                }
+            }
+        ],
+        "background": [
+            {
+                "properties": {
+                    "show": literal(False)
+                }
+            }
+        ],
+        "visualHeader": [
+            {
+                "properties": {
+                    "show": literal(False)
+                }
+            }
+        ]
+    }
+
 def generate_shape(
     position: Dict,
     fill_color: str = "#FFFFFF",
@@ -2129,67 +2517,38 @@ def generate_shape(
     vid = visual_id or generate_visual_id()
 
     visual = {
-        "$schema": "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/2.4.0/schema.json",
+        "$schema": VISUAL_SCHEMA_URL,
         "name": vid,
-        "position": {
-            "x": position.get("x", 0),
-            "y": position.get("y", 0),
-            "z": position.get("z", 100),
-            "height": position.get("height", 100),
-            "width": position.get("width", 100),
-            "tabOrder": position.get("tabOrder", 0)
-        },
+        "position": build_position(position, 0, 0, 100, 100, 100, tab_order=0),
         "visual": {
             "visualType": "actionButton",
             "objects": {
                 "icon": [
                     {
                         "properties": {
-                            "shapeType": literal("blank")
-                        },
-                        "selector": {"id": "default"}
-                    }
-                ],
-                "fill": [
-                    {
-                        "properties": {
-                            "show": literal(True),
-                            "fillColor": {"solid": {"color": {"expr": {"Literal": {"Value": f"'{fill_color}'"}}}}}
-                        },
-                        "selector": {"id": "default"}
-                    }
-                ],
-                "outline": [
-                    {
-                        "properties": {
-                            "show": literal(border_color is not None)
-                        }
-                    }
-                ]
-            },
-            "visualContainerObjects": {
-                "visualLink": [
-                    {
-                        "properties": {
-                            "show": literal(False)
-                        }
+                            "shapeType": literal("blank")
+                        },
+                        "selector": {"id": "default"}
                     }
                 ],
-                "background": [
+                "fill": [
                     {
                         "properties": {
-                            "show": literal(False)
-                        }
+                            "show": literal(True),
+                            "fillColor": {"solid": {"color": {"expr": {"Literal": {"Value": f"'{fill_color}'"}}}}}
+                        },
+                        "selector": {"id": "default"}
                     }
                 ],
-                "visualHeader": [
+                "outline": [
                     {
                         "properties": {
-                            "show": literal(False)
+                            "show": literal(border_color is not None)
                         }
                     }
                 ]
             },
+            "visualContainerObjects": fill_template(_shape_container_objects()),
             "drillFilterOtherVisuals": True
         },
         "howCreated": "InsertVisualButton"
@@ -2240,16 +2599,9 @@ def generate_slicer(
     vid = visual_id or generate_visual_id()
 
     visual = {
-        "$schema": "https://developer.microsoft.com/json-schemas/fabric/item/report/definition/visualContainer/2.4.0/schema.json",
+        "$schema": VISUAL_SCHEMA_URL,
         "name": vid,
-        "position": {
-            "x": position.get("x", 728),
-            "y": position.get("y", 34),
-            "z": position.get("z", 8000),
-            "height": position.get("height", 28),
-            "width": position.get("width", 120),
-            "tabOrder": position.get("tabOrder", 0)
-        },
+        "position": build_position(position, 728, 34, 8000, 28, 120, tab_order=0),
         "visual": {
             "visualType": "slicer",
             "query": {
@@ -2303,6 +2655,348 @@ def generate_slicer(
 
     return visual
 
+# =============================================================================
+# VISUAL TYPE REGISTRY
+# =============================================================================
+#
+# Maps each PAGE_CONFIGS "type" to its builder and parameter schema. Config
+# keys are passed to the builder under the same name: required keys must be
+# present with the listed type, optional keys fall back to their default.
+
+VISUAL_BUILDERS: Dict[str, Dict[str, Any]] = {}
+
+class ConfigValidationError(ValueError):
+    """Raised when one or more visual configs fail schema validation."""
+
+    summary = "invalid visual config(s)"
+
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        super().__init__(f"{len(errors)} {self.summary}:\n  " + "\n  ".join(errors))
+
+class QueryBudgetError(ConfigValidationError):
+    """Raised when valid configs put a page over the --max-queries budget."""
+
+    summary = "page(s) over the query budget"
+
+def register_visual_type(
+    visual_type: str,
+    builder: Callable[..., Dict],
+    required: Dict[str, type],
+    optional: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Register a builder for a visual config type.
+
+    Args:
+        visual_type: Config "type" value (e.g., "kpi_card")
+        builder: generate_* function accepting the config keys plus visual_id
+        required: Required config keys -> expected Python type
+        optional: Optional config keys -> default value
+    """
+    VISUAL_BUILDERS[visual_type] = {
+        "builder": builder,
+        "required": dict(required),
+        "optional": dict(optional or {})
+    }
+
+def validate_visual_config(config: Dict) -> List[str]:
+    """Check a single visual config against its registered schema."""
+    visual_type = config.get("type")
+    spec = VISUAL_BUILDERS.get(visual_type)
+    if spec is None:
+        return [f"unknown visual type {visual_type!r} (available: {sorted(VISUAL_BUILDERS)})"]
+
+    errors = []
+    for key, expected_type in spec["required"].items():
+        if key not in config:
+            errors.append(f"{visual_type}: missing required key '{key}'")
+        elif not isinstance(config[key], expected_type):
+            errors.append(
+                f"{visual_type}: '{key}' must be {expected_type.__name__}, "
+                f"got {type(config[key]).__name__}"
+            )
+    return errors
+
+def build_visual(config: Dict, visual_id: Optional[str] = None) -> Dict:
+    """
+    Build visual.json content for a (validated) visual config via the registry.
+
+    Any config may also carry the container-level keys "parent_group"
+    (visual group name) and "hidden" (start hidden); see bind_bookmarks.
+    """
+    spec = VISUAL_BUILDERS[config["type"]]
+    kwargs = {key: config[key] for key in spec["required"]}
+    for key, default in spec["optional"].items():
+        kwargs[key] = config.get(key, default)
+    visual_json = spec["builder"](visual_id=visual_id, **kwargs)
+    if config.get("parent_group"):
+        visual_json["parentGroupName"] = config["parent_group"]
+    if config.get("hidden"):
+        visual_json["isHidden"] = True
+    return visual_json
+
+def validate_page_configs(page_configs: Dict[str, Dict]) -> List[str]:
+    """Validate every visual on every page; returns all errors found."""
+    errors = []
+    for page_key, page_config in page_configs.items():
+        for index, visual_config in enumerate(page_config.get("visuals", [])):
+            for error in validate_visual_config(visual_config):
+                errors.append(f"{page_key}[{index}] {error}")
+    return errors
+
+def page_queries(page_config: Dict, built: Optional[List[Dict]] = None) -> List[Tuple[int, List[Tuple[str, str, bool]]]]:
+    """
+    (visual index, field references) for every visual that queries on page load.
+
+    Every visual bound to at least one model field (data visuals and
+    slicers) sends its own query; textboxes, shapes and buttons do not.
+    `built` holds the page's already built visual.json (in config order),
+    so callers that have built them do not build them again.
+    """
+    if built is None:
+        built = [build_visual(config) for config in page_config.get("visuals", [])]
+    queries = []
+    for index, visual_json in enumerate(built):
+        refs = list(iter_field_refs(visual_json)) if visual_json is not None else []
+        if refs:
+            queries.append((index, refs))
+    return queries
+
+def page_query_count(page_config: Dict, built: Optional[List[Dict]] = None) -> int:
+    """Estimate the DAX queries a page issues on load (see page_queries)."""
+    return len(page_queries(page_config, built))
+
+def check_query_budget(page_configs: Dict[str, Dict], max_queries: int,
+                       built: Optional[Dict[str, List[Dict]]] = None) -> List[str]:
+    """Flag pages whose load would issue more than max_queries DAX queries."""
+    errors = []
+    for page_key, page_config in page_configs.items():
+        count = page_query_count(page_config, (built or {}).get(page_key))
+        if count > max_queries:
+            errors.append(f"{page_key}: {count} queries on page load (budget {max_queries})")
+    return errors
+
+register_visual_type("kpi_card", generate_kpi_card,
+                     {"measure": str, "title": str, "position": dict},
+                     {"mom_label": None, "mom_color": None, "alt_text": None})
+register_visual_type("bar_chart", generate_bar_chart,
+                     {"category_column": str, "category_entity": str, "measure": str, "title": str, "position": dict},
+                     {"exclude_blanks": True, "top_n": None})
+register_visual_type("stacked_bar_chart", generate_stacked_bar_chart,
+                     {"category_column": str, "category_entity": str, "measure": str, "title": str, "position": dict})
+register_visual_type("stacked_bar_100", generate_stacked_bar_chart,
+                     {"category_column": str, "category_entity": str, "measure": str, "title": str, "position": dict})
+register_visual_type("table", generate_table,
+                     {"columns": list, "measures": list, "title": str, "position": dict})
+register_visual_type("map", generate_map_visual,
+                     {"location_column": str, "location_entity": str, "size_measure": str, "title": str, "position": dict})
+register_visual_type("line_chart", generate_line_chart,
+                     {"axis_column": str, "axis_entity": str, "measures": list, "title": str, "position": dict})
+register_visual_type("area_chart", generate_area_chart,
+                     {"axis_column": str, "axis_entity": str, "measure": str, "title": str, "position": dict})
+register_visual_type("treemap", generate_treemap,
+                     {"category_column": str, "category_entity": str, "measure": str, "title": str, "position": dict})
+register_visual_type("html", generate_html_visual,
+                     {"measure": str, "position": dict},
+                     {"title": ""})
+register_visual_type("slicer", generate_slicer,
+                     {"column": str, "entity": str, "position": dict},
+                     {"title": "", "slicer_mode": "Between", "sync_group": None})
+register_visual_type("action_button", generate_action_button,
+                     {"button_type": str, "position": dict},
+                     {"icon": None, "text": None, "tooltip": None, "navigation_page": None, "bookmark": None})
+register_visual_type("textbox", generate_textbox,
+                     {"text": str, "position": dict},
+                     {"font_size": 9, "font_color": "#565C65"})
+register_visual_type("shape", generate_shape,
+                     {"position": dict},
+                     {"fill_color": "#FFFFFF", "border_color": "#DFE1E2", "border_width": 1})
+register_visual_type("matrix", generate_matrix,
+                     {"rows": list, "values": list, "title": str, "position": dict},
+                     {"columns": None})
+register_visual_type("gauge", generate_gauge,
+                     {"measure": str, "title": str, "position": dict},
+                     {"min_value": 0, "max_value": 100, "target_value": None})
+register_visual_type("scatter", generate_scatter,
+                     {"x_measure": str, "y_measure": str, "title": str, "position": dict},
+                     {"legend_column": None, "legend_entity": None, "size_measure": None})
+register_visual_type("combo_chart", generate_combo_chart,
+                     {"axis_column": str, "axis_entity": str, "column_measures": list, "line_measures": list,
+                      "title": str, "position": dict})
+register_visual_type("funnel", generate_funnel,
+                     {"category_column": str, "category_entity": str, "measure": str, "title": str, "position": dict})
+
+# =============================================================================
+# BOOKMARKS & VISUAL GROUPS
+# =============================================================================
+#
+# The expand/collapse bookmarks come from the layout spec's "bookmarks" list,
+# which names elements (a config's "element" key, or a blueprint id) rather
+# than visual IDs. Each bookmark's visible elements also form a visual group
+# (grp_<bookmark name>), so the actions panel toggles as one unit. Bookmarks
+# marked "currentPage" are emitted once per page.
+
+def load_bookmark_specs(spec_path: Path = BOOKMARK_SPEC_PATH) -> List[Dict[str, Any]]:
+    """Bookmark definitions from a layout spec (empty if the spec is missing)."""
+    try:
+        with open(spec_path, 'r', encoding='utf-8') as f:
+            return json.load(f).get("bookmarks", [])
+    except (OSError, ValueError):
+        return []
+
+def bookmark_groups(bookmarks: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Visual group name -> member elements (each bookmark's visible elements)."""
+    groups: Dict[str, List[str]] = {}
+    grouped = set()
+    for bookmark in bookmarks:
+        members = [element for element in bookmark.get("visibleElements", []) if element not in grouped]
+        if members:
+            groups[f"{GROUP_PREFIX}{bookmark['name']}"] = members
+            grouped.update(members)
+    return groups
+
+def page_bookmark_name(bookmark: Dict[str, Any], page_label: str) -> str:
+    """Bookmark name on one page (page-scoped bookmarks get one per page)."""
+    if bookmark.get("options", {}).get("currentPage", True):
+        return f"{bookmark['name']}_{page_label}"
+    return bookmark["name"]
+
+def bind_bookmarks(page_key: str, config: Dict, bookmarks: List[Dict[str, Any]],
+                   layout_mode: str = DEFAULT_MODE) -> Dict:
+    """
+    Page config with bookmark names and visual groups filled in.
+
+    Bookmark buttons are pointed at this page's copy of their bookmark,
+    elements belonging to a bookmark's group get a "parent_group", and
+    elements hidden in the layout mode's starting bookmark start hidden.
+    """
+    if not bookmarks:
+        return config
+    specs = {bookmark["name"]: bookmark for bookmark in bookmarks}
+    groups = bookmark_groups(bookmarks)
+    element_group = {element: group for group, members in groups.items() for element in members}
+    start_hidden = set(specs.get(LAYOUT_MODE_BOOKMARKS.get(layout_mode), {}).get("hiddenElements", []))
+
+    visuals = []
+    for visual_config in config["visuals"]:
+        element = visual_config.get("element")
+        bookmark = visual_config.get("bookmark")
+        if element is None and bookmark not in specs:
+            visuals.append(visual_config)
+            continue
+        visual_config = dict(visual_config)
+        if bookmark in specs:
+            visual_config["bookmark"] = page_bookmark_name(specs[bookmark], page_key)
+        if element in element_group:
+            visual_config["parent_group"] = element_group[element]
+        if element in start_hidden:
+            visual_config["hidden"] = True
+        visuals.append(visual_config)
+    return {**config, "visuals": visuals}
+
+def generate_visual_group(name: str, member_positions: List[Dict], display_name: Optional[str] = None) -> Dict:
+    """
+    Generate a visual group container spanning its members.
+
+    Members point at the group through "parentGroupName"; the group's
+    position is their bounding box, stacked at its lowest member.
+    """
+    x = min(p["x"] for p in member_positions)
+    y = min(p["y"] for p in member_positions)
+    return {
+        "$schema": VISUAL_SCHEMA_URL,
+        "name": name,
+        "position": {
+            "x": x,
+            "y": y,
+            "z": min(p.get("z", 0) for p in member_positions),
+            "height": max(p["y"] + p["height"] for p in member_positions) - y,
+            "width": max(p["x"] + p["width"] for p in member_positions) - x,
+            "tabOrder": min(p.get("tabOrder", p.get("z", 0)) for p in member_positions)
+        },
+        "visualGroup": {
+            "displayName": display_name or name,
+            "groupMode": "ScaleMode"
+        }
+    }
+
+def build_bookmark_json(
+    bookmark: Dict[str, Any],
+    name: str,
+    page_name: str,
+    elements: Dict[str, Tuple[str, str]],
+    groups: Optional[Dict[str, List[str]]] = None
+) -> Optional[Dict]:
+    """
+    Bookmark JSON that shows/hides elements on one page.
+
+    Args:
+        bookmark: Spec entry (name, displayName, options, visibleElements, hiddenElements)
+        name: Bookmark name to emit (see page_bookmark_name)
+        page_name: Page (section) name the bookmark captures
+        elements: Element name -> (visual name, visual type) for visuals on the page
+        groups: Visual group name -> member elements present on the page
+
+    Returns:
+        Bookmark JSON, or None if none of its elements are on the page.
+        Only the listed visuals are captured (applyOnlyToTargetVisuals), so
+        slicer and filter state elsewhere on the page is left untouched.
+    """
+    options = bookmark.get("options", {})
+    visible = [e for e in bookmark.get("visibleElements", []) if e in elements]
+    hidden = [e for e in bookmark.get("hiddenElements", []) if e in elements]
+    if not visible and not hidden:
+        return None
+
+    containers = {}
+    for element in visible + hidden:
+        visual_name, visual_type = elements[element]
+        state: Dict[str, Any] = {"visualType": visual_type, "objects": {}}
+        if element in hidden:
+            state["display"] = {"mode": "hidden"}
+        containers[visual_name] = {"singleVisual": state}
+
+    section: Dict[str, Any] = {"visualContainers": containers}
+    group_states = {}
+    for group, members in (groups or {}).items():
+        if members and all(member in hidden for member in members):
+            group_states[group] = {"isHidden": True}
+        elif members and all(member in visible for member in members):
+            group_states[group] = {"isHidden": False}
+    if group_states:
+        section["visualContainerGroups"] = group_states
+
+    bookmark_options: Dict[str, Any] = {
+        "targetVisualNames": [elements[e][0] for e in visible + hidden] + list(group_states),
+        "applyOnlyToTargetVisuals": True,
+    }
+    if not options.get("display", True):
+        bookmark_options["suppressDisplay"] = True
+    if not options.get("data", True):
+        bookmark_options["suppressData"] = True
+    if not options.get("currentPage", True):
+        bookmark_options["suppressActiveSection"] = True
+
+    return {
+        "$schema": BOOKMARK_SCHEMA_URL,
+        "displayName": bookmark.get("displayName", bookmark["name"]),
+        "name": name,
+        "options": bookmark_options,
+        "explorationState": {
+            "version": "1.3",
+            "activeSection": page_name,
+            "sections": {page_name: section}
+        }
+    }
+
+def merge_bookmarks_metadata(existing: Optional[Dict], names: List[str]) -> Dict:
+    """bookmarks.json with `names` added after any bookmarks already listed."""
+    items = list((existing or {}).get("items", []))
+    listed = {item.get("name") for item in items}
+    items.extend({"name": name} for name in names if name not in listed)
+    return {"$schema": BOOKMARKS_SCHEMA_URL, "items": items}
+
 # =============================================================================
 # PAGE CONFIGURATIONS
 # =============================================================================
@@ -2317,25 +3011,29 @@ PAGE_CONFIGS = {
                 "type": "kpi_card",
                 "measure": "Sessions",
                 "title": "Sessions",
-                "position": {"x": 56, "y": 83, "z": 1000, "height": 67, "width": 197}
+                "slot": "kpi[0]",
+                "position": {"z": 1000}
             },
             {
                 "type": "kpi_card",
                 "measure": "Page Views",
                 "title": "Page Views",
-                "position": {"x": 261, "y": 83, "z": 2000, "height": 67, "width": 197}
+                "slot": "kpi[1]",
+                "position": {"z": 2000}
             },
             {
                 "type": "kpi_card",
                 "measure": "Top Device Category",
                 "title": "Top Device",
-                "position": {"x": 465, "y": 83, "z": 3000, "height": 67, "width": 197}
+                "slot": "kpi[2]",
+                "position": {"z": 3000}
             },
             {
                 "type": "kpi_card",
                 "measure": "Avg Pages per Session",
                 "title": "Avg Pages/Session",
-                "position": {"x": 670, "y": 83, "z": 4000, "height": 67, "width": 197}
+                "slot": "kpi[3]",
+                "position": {"z": 4000}
             },
             # Section 1 (Y=176, H=254 per V5_PIXEL_GRID_REFERENCE.md) - Sessions by City Map (Left)
             {
@@ -2344,7 +3042,8 @@ PAGE_CONFIGS = {
                 "location_entity": "ga4-geography-livecast-play",
                 "size_measure": "Sessions by City",
                 "title": "Sessions by City",
-                "position": {"x": 56, "y": 176, "z": 5000, "height": 254, "width": 444}
+                "slot": "section_1.left",
+                "position": {"z": 5000}
             },
             # Section 1 (Y=176, H=254) - Device Breakdown (Right) - 100% Stacked Bar per spec
             {
@@ -2353,7 +3052,8 @@ PAGE_CONFIGS = {
                 "category_entity": "DimDevice",
                 "measure": "Device Sessions",
                 "title": "Device Breakdown",
-                "position": {"x": 508, "y": 176, "z": 5500, "height": 254, "width": 445}
+                "slot": "section_1.right",
+                "position": {"z": 5500}
             },
             # Section 2 (Y=456, H=220 per V5_PIXEL_GRID_REFERENCE.md) - Top Livecast Videos (Left)
             {
@@ -2362,7 +3062,8 @@ PAGE_CONFIGS = {
                 "category_entity": "DimLivecast",
                 "measure": "Total Events",
                 "title": "Top Livecast Videos",
-                "position": {"x": 56, "y": 456, "z": 6000, "height": 220, "width": 444},
+                "slot": "section_2.left",
+                "position": {"z": 6000},
                 "exclude_blanks": True,
                 "top_n": 5
             },
@@ -2372,14 +3073,17 @@ PAGE_CONFIGS = {
                 "columns": [{"entity": "ga4-titles", "column": "Page title"}],
                 "measures": ["Page Views", "Sessions"],
                 "title": "Top Pages",
-                "position": {"x": 508, "y": 456, "z": 7000, "height": 220, "width": 445}
+                "slot": "section_2.right",
+                "position": {"z": 7000}
             },
             # Actions Panel - HTML Visual (per V5_PIXEL_GRID_REFERENCE.md: X=978, Y=169, W=241, H=230)
             {
                 "type": "html",
                 "measure": "Recommended Actions HTML (Dynamic)",
                 "title": "Recommended Actions",
-                "position": {"x": 978, "y": 169, "z": 15000, "height": 230, "width": 241}
+                "element": "actions_html",
+                "slot": "panel.body",
+                "position": {"z": 15000}
             },
             # Date Slicer (per DASHBOARD_BUILD_GUIDE.md: Y=34, right-aligned)
             {
@@ -2387,7 +3091,8 @@ PAGE_CONFIGS = {
                 "column": "Date",
                 "entity": "DimDate",
                 "title": "Date",
-                "position": {"x": 728, "y": 34, "z": 8000, "height": 28, "width": 120},
+                "slot": "header.date_slicer",
+                "position": {"z": 8000},
                 "slicer_mode": "Between",
                 "sync_group": "Date"
             },
@@ -2397,40 +3102,48 @@ PAGE_CONFIGS = {
                 "column": "Page path",
                 "entity": "ga4-pages",
                 "title": "Page path",
-                "position": {"x": 600, "y": 34, "z": 8001, "height": 28, "width": 120},
+                "slot": "header.page_slicer",
+                "position": {"z": 8001},
                 "slicer_mode": "Basic"
             },
             # Info Button (per DASHBOARD_BUILD_GUIDE.md: W=28, H=28)
             {
                 "type": "action_button",
                 "button_type": "info",
-                "position": {"x": 856, "y": 34, "z": 8002, "height": 28, "width": 28},
+                "slot": "header.info",
+                "position": {"z": 8002},
                 "tooltip": "View page information"
             },
             # Reset Filters Button (per DASHBOARD_BUILD_GUIDE.md)
             {
                 "type": "action_button",
                 "button_type": "clearSlicers",
-                "position": {"x": 892, "y": 34, "z": 8003, "height": 28, "width": 28},
+                "slot": "header.reset",
+                "position": {"z": 8003},
                 "tooltip": "Clear all slicers on this page"
             },
             # Last Refresh Text (per DASHBOARD_BUILD_GUIDE.md)
             {
                 "type": "textbox",
                 "text": "Last refresh: Just Now",
-                "position": {"x": 1083, "y": 31, "z": 9000, "height": 10, "width": 133}
+                "slot": "header.refresh",
+                "position": {"z": 9000}
             },
             # Actions Panel Container (per V5_PIXEL_GRID_REFERENCE.md: X=965, Y=134, W=267, H=275)
             {
                 "type": "shape",
-                "position": {"x": 965, "y": 134, "z": 14000, "height": 275, "width": 267},
+                "element": "actions_panel_container",
+                "slot": "panel.container",
+                "position": {"z": 14000},
                 "fill_color": "#FFFFFF",
                 "border_color": "#DFE1E2"
             },
             # Actions Panel Accent Bar (per V5_PIXEL_GRID_REFERENCE.md: X=965, Y=134, W=3, H=275)
             {
                 "type": "shape",
-                "position": {"x": 965, "y": 134, "z": 14500, "height": 275, "width": 3},
+                "element": "actions_accent_bar",
+                "slot": "panel.accent",
+                "position": {"z": 14500},
                 "fill_color": "#005EA2",
                 "border_color": None
             },
@@ -2438,7 +3151,30 @@ PAGE_CONFIGS = {
             {
                 "type": "textbox",
                 "text": "Recommended Actions",
-                "position": {"x": 978, "y": 144, "z": 14600, "height": 19, "width": 248}
+                "element": "actions_title",
+                "slot": "panel.title",
+                "position": {"z": 14600}
+            },
+            # Actions Panel Toggle Buttons (apply the Actions_Expanded/Collapsed bookmarks)
+            {
+                "type": "action_button",
+                "element": "expand_button",
+                "button_type": "bookmark",
+                "bookmark": "Actions_Expanded",
+                "text": "Actions \u276f",
+                "slot": "panel.expand_button",
+                "position": {"z": 14700},
+                "tooltip": "Show recommended actions"
+            },
+            {
+                "type": "action_button",
+                "element": "collapse_button",
+                "button_type": "bookmark",
+                "bookmark": "Actions_Collapsed",
+                "text": "\u276e Collapse",
+                "slot": "panel.collapse_button",
+                "position": {"z": 14800},
+                "tooltip": "Hide recommended actions"
             },
         ]
     },
@@ -2451,25 +3187,29 @@ PAGE_CONFIGS = {
                 "type": "kpi_card",
                 "measure": "Active Livecasts",  # Count of distinct pages/livecasts
                 "title": "Active Pages",
-                "position": {"x": 56, "y": 83, "z": 1000, "height": 67, "width": 197}
+                "slot": "kpi[0]",
+                "position": {"z": 1000}
             },
             {
                 "type": "kpi_card",
                 "measure": "Avg Engagement per Viewer (Minutes)",
                 "title": "Avg Engagement",
-                "position": {"x": 261, "y": 83, "z": 2000, "height": 67, "width": 197}
+                "slot": "kpi[1]",
+                "position": {"z": 2000}
             },
             {
                 "type": "kpi_card",
                 "measure": "Bounce Rate",
                 "title": "Bounce Rate",
-                "position": {"x": 465, "y": 83, "z": 3000, "height": 67, "width": 197}
+                "slot": "kpi[2]",
+                "position": {"z": 3000}
             },
             {
                 "type": "kpi_card",
                 "measure": "Top Event Type",  # Returns top traffic source text
                 "title": "Top Source",
-                "position": {"x": 670, "y": 83, "z": 4000, "height": 67, "width": 197}
+                "slot": "kpi[3]",
+                "position": {"z": 4000}
             },
             # Section 1 - Full width Matrix (pivotTable) per spec
             {
@@ -2479,7 +3219,8 @@ PAGE_CONFIGS = {
                 ],
                 "values": ["Total Users", "Engagement Rate by Page"],
                 "title": "Page Performance Matrix",
-                "position": {"x": 56, "y": 176, "z": 5000, "height": 254, "width": 897}
+                "slot": "section_1.full",
+                "position": {"z": 5000}
             },
             # Section 2 - Left: Treemap
             {
@@ -2488,7 +3229,8 @@ PAGE_CONFIGS = {
                 "category_entity": "DimSource",
                 "measure": "Sessions",
                 "title": "Traffic Source Breakdown",
-                "position": {"x": 56, "y": 456, "z": 6000, "height": 220, "width": 444}
+                "slot": "section_2.left",
+                "position": {"z": 6000}
             },
             # Section 2 - Right: Bar chart
             {
@@ -2497,7 +3239,8 @@ PAGE_CONFIGS = {
                 "category_entity": "ga4-titles",
                 "measure": "Page Views",
                 "title": "Most Viewed Pages",
-                "position": {"x": 508, "y": 456, "z": 6500, "height": 220, "width": 445},
+                "slot": "section_2.right",
+                "position": {"z": 6500},
                 "top_n": 10
             },
             # Date Slicer (synced)
@@ -2506,7 +3249,8 @@ PAGE_CONFIGS = {
                 "column": "Date",
                 "entity": "DimDate",
                 "title": "Date",
-                "position": {"x": 728, "y": 34, "z": 8000, "height": 28, "width": 120},
+                "slot": "header.date_slicer",
+                "position": {"z": 8000},
                 "slicer_mode": "Between",
                 "sync_group": "Date"
             },
@@ -2514,14 +3258,16 @@ PAGE_CONFIGS = {
             {
                 "type": "action_button",
                 "button_type": "clearSlicers",
-                "position": {"x": 892, "y": 34, "z": 8003, "height": 28, "width": 28},
+                "slot": "header.reset",
+                "position": {"z": 8003},
                 "tooltip": "Clear all slicers on this page"
             },
             # Info button
             {
                 "type": "action_button",
                 "button_type": "info",
-                "position": {"x": 856, "y": 34, "z": 8002, "height": 28, "width": 28},
+                "slot": "header.info",
+                "position": {"z": 8002},
                 "tooltip": "View page information"
             },
             # Actions Panel
@@ -2529,19 +3275,25 @@ PAGE_CONFIGS = {
                 "type": "html",
                 "measure": "Recommended Actions HTML (Dynamic)",
                 "title": "Recommended Actions",
-                "position": {"x": 978, "y": 169, "z": 15000, "height": 230, "width": 241}
+                "element": "actions_html",
+                "slot": "panel.body",
+                "position": {"z": 15000}
             },
             # Actions Panel Container
             {
                 "type": "shape",
-                "position": {"x": 965, "y": 134, "z": 14000, "height": 275, "width": 267},
+                "element": "actions_panel_container",
+                "slot": "panel.container",
+                "position": {"z": 14000},
                 "fill_color": "#FFFFFF",
                 "border_color": "#DFE1E2"
             },
             # Actions Panel Accent Bar
             {
                 "type": "shape",
-                "position": {"x": 965, "y": 134, "z": 14500, "height": 275, "width": 3},
+                "element": "actions_accent_bar",
+                "slot": "panel.accent",
+                "position": {"z": 14500},
                 "fill_color": "#005EA2",
                 "border_color": None
             },
@@ -2549,7 +3301,30 @@ PAGE_CONFIGS = {
             {
                 "type": "textbox",
                 "text": "Recommended Actions",
-                "position": {"x": 978, "y": 144, "z": 14600, "height": 19, "width": 248}
+                "element": "actions_title",
+                "slot": "panel.title",
+                "position": {"z": 14600}
+            },
+            # Actions Panel Toggle Buttons (apply the Actions_Expanded/Collapsed bookmarks)
+            {
+                "type": "action_button",
+                "element": "expand_button",
+                "button_type": "bookmark",
+                "bookmark": "Actions_Expanded",
+                "text": "Actions \u276f",
+                "slot": "panel.expand_button",
+                "position": {"z": 14700},
+                "tooltip": "Show recommended actions"
+            },
+            {
+                "type": "action_button",
+                "element": "collapse_button",
+                "button_type": "bookmark",
+                "bookmark": "Actions_Collapsed",
+                "text": "\u276e Collapse",
+                "slot": "panel.collapse_button",
+                "position": {"z": 14800},
+                "tooltip": "Hide recommended actions"
             },
         ]
     },
@@ -2562,25 +3337,29 @@ PAGE_CONFIGS = {
                 "type": "kpi_card",
                 "measure": "Sessions",
                 "title": "Total Sessions",
-                "position": {"x": 56, "y": 83, "z": 1000, "height": 67, "width": 197}
+                "slot": "kpi[0]",
+                "position": {"z": 1000}
             },
             {
                 "type": "kpi_card",
                 "measure": "Page Views",
                 "title": "Page Views",
-                "position": {"x": 261, "y": 83, "z": 2000, "height": 67, "width": 197}
+                "slot": "kpi[1]",
+                "position": {"z": 2000}
             },
             {
                 "type": "kpi_card",
                 "measure": "Total Users",
                 "title": "Total Users",
-                "position": {"x": 465, "y": 83, "z": 3000, "height": 67, "width": 197}
+                "slot": "kpi[2]",
+                "position": {"z": 3000}
             },
             {
                 "type": "kpi_card",
                 "measure": "Engagement Rate",
                 "title": "Engagement Rate",
-                "position": {"x": 670, "y": 83, "z": 4000, "height": 67, "width": 197}
+                "slot": "kpi[3]",
+                "position": {"z": 4000}
             },
             # Section 1 - Full width Stacked Column Chart
             {
@@ -2589,7 +3368,8 @@ PAGE_CONFIGS = {
                 "category_entity": "DimDate",
                 "measure": "Sessions",
                 "title": "Traffic Sources Over Time",
-                "position": {"x": 56, "y": 176, "z": 5000, "height": 254, "width": 897}
+                "slot": "section_1.full",
+                "position": {"z": 5000}
             },
             # Section 2 - Left: Top Sources Bar
             {
@@ -2598,7 +3378,8 @@ PAGE_CONFIGS = {
                 "category_entity": "DimSource",
                 "measure": "Sessions",
                 "title": "Top Traffic Sources",
-                "position": {"x": 56, "y": 456, "z": 6000, "height": 220, "width": 444},
+                "slot": "section_2.left",
+                "position": {"z": 6000},
                 "top_n": 10
             },
             # Section 2 - Right: Channel breakdown by Medium
@@ -2608,7 +3389,8 @@ PAGE_CONFIGS = {
                 "category_entity": "DimSource",
                 "measure": "Sessions",
                 "title": "Sessions by Medium",
-                "position": {"x": 508, "y": 456, "z": 6500, "height": 220, "width": 445}
+                "slot": "section_2.right",
+                "position": {"z": 6500}
             },
             # Date Slicer
             {
@@ -2616,7 +3398,8 @@ PAGE_CONFIGS = {
                 "column": "Date",
                 "entity": "DimDate",
                 "title": "Date",
-                "position": {"x": 728, "y": 34, "z": 8000, "height": 28, "width": 120},
+                "slot": "header.date_slicer",
+                "position": {"z": 8000},
                 "slicer_mode": "Between",
                 "sync_group": "Date"
             },
@@ -2624,14 +3407,16 @@ PAGE_CONFIGS = {
             {
                 "type": "action_button",
                 "button_type": "clearSlicers",
-                "position": {"x": 892, "y": 34, "z": 8003, "height": 28, "width": 28},
+                "slot": "header.reset",
+                "position": {"z": 8003},
                 "tooltip": "Clear all slicers on this page"
             },
             # Info button
             {
                 "type": "action_button",
                 "button_type": "info",
-                "position": {"x": 856, "y": 34, "z": 8002, "height": 28, "width": 28},
+                "slot": "header.info",
+                "position": {"z": 8002},
                 "tooltip": "View page information"
             },
             # Actions Panel
@@ -2639,19 +3424,25 @@ PAGE_CONFIGS = {
                 "type": "html",
                 "measure": "Recommended Actions HTML (Dynamic)",
                 "title": "Recommended Actions",
-                "position": {"x": 978, "y": 169, "z": 15000, "height": 230, "width": 241}
+                "element": "actions_html",
+                "slot": "panel.body",
+                "position": {"z": 15000}
             },
             # Actions Panel Container
             {
                 "type": "shape",
-                "position": {"x": 965, "y": 134, "z": 14000, "height": 275, "width": 267},
+                "element": "actions_panel_container",
+                "slot": "panel.container",
+                "position": {"z": 14000},
                 "fill_color": "#FFFFFF",
                 "border_color": "#DFE1E2"
             },
             # Actions Panel Accent Bar
             {
                 "type": "shape",
-                "position": {"x": 965, "y": 134, "z": 14500, "height": 275, "width": 3},
+                "element": "actions_accent_bar",
+                "slot": "panel.accent",
+                "position": {"z": 14500},
                 "fill_color": "#005EA2",
                 "border_color": None
             },
@@ -2659,7 +3450,30 @@ PAGE_CONFIGS = {
             {
                 "type": "textbox",
                 "text": "Recommended Actions",
-                "position": {"x": 978, "y": 144, "z": 14600, "height": 19, "width": 248}
+                "element": "actions_title",
+                "slot": "panel.title",
+                "position": {"z": 14600}
+            },
+            # Actions Panel Toggle Buttons (apply the Actions_Expanded/Collapsed bookmarks)
+            {
+                "type": "action_button",
+                "element": "expand_button",
+                "button_type": "bookmark",
+                "bookmark": "Actions_Expanded",
+                "text": "Actions \u276f",
+                "slot": "panel.expand_button",
+                "position": {"z": 14700},
+                "tooltip": "Show recommended actions"
+            },
+            {
+                "type": "action_button",
+                "element": "collapse_button",
+                "button_type": "bookmark",
+                "bookmark": "Actions_Collapsed",
+                "text": "\u276e Collapse",
+                "slot": "panel.collapse_button",
+                "position": {"z": 14800},
+                "tooltip": "Hide recommended actions"
             },
         ]
     },
@@ -2672,25 +3486,29 @@ PAGE_CONFIGS = {
                 "type": "kpi_card",
                 "measure": "Video Plays",
                 "title": "Play Events",
-                "position": {"x": 56, "y": 83, "z": 1000, "height": 67, "width": 197}
+                "slot": "kpi[0]",
+                "position": {"z": 1000}
             },
             {
                 "type": "kpi_card",
                 "measure": "Play Conversion Rate",
                 "title": "Completion Rate",
-                "position": {"x": 261, "y": 83, "z": 2000, "height": 67, "width": 197}
+                "slot": "kpi[1]",
+                "position": {"z": 2000}
             },
             {
                 "type": "kpi_card",
                 "measure": "Avg Engagement per Viewer (Minutes)",
                 "title": "Avg Watch Time",
-                "position": {"x": 465, "y": 83, "z": 3000, "height": 67, "width": 197}
+                "slot": "kpi[2]",
+                "position": {"z": 3000}
             },
             {
                 "type": "kpi_card",
                 "measure": "Unique Viewers",
                 "title": "Unique Viewers",
-                "position": {"x": 670, "y": 83, "z": 4000, "height": 67, "width": 197}
+                "slot": "kpi[3]",
+                "position": {"z": 4000}
             },
             # Section 1 - Full width Area Chart
             {
@@ -2699,7 +3517,8 @@ PAGE_CONFIGS = {
                 "axis_entity": "DimDate",
                 "measure": "Video Plays",
                 "title": "Play Events Timeline",
-                "position": {"x": 56, "y": 176, "z": 5000, "height": 254, "width": 897}
+                "slot": "section_1.full",
+                "position": {"z": 5000}
             },
             # Section 2 - Left: Avg Watch Time by Video
             {
@@ -2708,7 +3527,8 @@ PAGE_CONFIGS = {
                 "category_entity": "DimLivecast",
                 "measure": "Avg Engagement per Viewer (Minutes)",
                 "title": "Avg Watch Time by Video",
-                "position": {"x": 56, "y": 456, "z": 6000, "height": 220, "width": 444},
+                "slot": "section_2.left",
+                "position": {"z": 6000},
                 "exclude_blanks": True,
                 "top_n": 5
             },
@@ -2719,7 +3539,8 @@ PAGE_CONFIGS = {
                 "category_entity": "ga4-events",
                 "measure": "Total Events",
                 "title": "Events by Type",
-                "position": {"x": 508, "y": 456, "z": 6500, "height": 220, "width": 445}
+                "slot": "section_2.right",
+                "position": {"z": 6500}
             },
             # Date Slicer
             {
@@ -2727,7 +3548,8 @@ PAGE_CONFIGS = {
                 "column": "Date",
                 "entity": "DimDate",
                 "title": "Date",
-                "position": {"x": 728, "y": 34, "z": 8000, "height": 28, "width": 120},
+                "slot": "header.date_slicer",
+                "position": {"z": 8000},
                 "slicer_mode": "Between",
                 "sync_group": "Date"
             },
@@ -2735,14 +3557,16 @@ PAGE_CONFIGS = {
             {
                 "type": "action_button",
                 "button_type": "clearSlicers",
-                "position": {"x": 892, "y": 34, "z": 8003, "height": 28, "width": 28},
+                "slot": "header.reset",
+                "position": {"z": 8003},
                 "tooltip": "Clear all slicers on this page"
             },
             # Info button
             {
                 "type": "action_button",
                 "button_type": "info",
-                "position": {"x": 856, "y": 34, "z": 8002, "height": 28, "width": 28},
+                "slot": "header.info",
+                "position": {"z": 8002},
                 "tooltip": "View page information"
             },
             # Actions Panel
@@ -2750,19 +3574,25 @@ PAGE_CONFIGS = {
                 "type": "html",
                 "measure": "Recommended Actions HTML (Dynamic)",
                 "title": "Recommended Actions",
-                "position": {"x": 978, "y": 169, "z": 15000, "height": 230, "width": 241}
+                "element": "actions_html",
+                "slot": "panel.body",
+                "position": {"z": 15000}
             },
             # Actions Panel Container
             {
                 "type": "shape",
-                "position": {"x": 965, "y": 134, "z": 14000, "height": 275, "width": 267},
+                "element": "actions_panel_container",
+                "slot": "panel.container",
+                "position": {"z": 14000},
                 "fill_color": "#FFFFFF",
                 "border_color": "#DFE1E2"
             },
             # Actions Panel Accent Bar
             {
                 "type": "shape",
-                "position": {"x": 965, "y": 134, "z": 14500, "height": 275, "width": 3},
+                "element": "actions_accent_bar",
+                "slot": "panel.accent",
+                "position": {"z": 14500},
                 "fill_color": "#005EA2",
                 "border_color": None
             },
@@ -2770,7 +3600,30 @@ PAGE_CONFIGS = {
             {
                 "type": "textbox",
                 "text": "Recommended Actions",
-                "position": {"x": 978, "y": 144, "z": 14600, "height": 19, "width": 248}
+                "element": "actions_title",
+                "slot": "panel.title",
+                "position": {"z": 14600}
+            },
+            # Actions Panel Toggle Buttons (apply the Actions_Expanded/Collapsed bookmarks)
+            {
+                "type": "action_button",
+                "element": "expand_button",
+                "button_type": "bookmark",
+                "bookmark": "Actions_Expanded",
+                "text": "Actions \u276f",
+                "slot": "panel.expand_button",
+                "position": {"z": 14700},
+                "tooltip": "Show recommended actions"
+            },
+            {
+                "type": "action_button",
+                "element": "collapse_button",
+                "button_type": "bookmark",
+                "bookmark": "Actions_Collapsed",
+                "text": "\u276e Collapse",
+                "slot": "panel.collapse_button",
+                "position": {"z": 14800},
+                "tooltip": "Hide recommended actions"
             },
         ]
     },
@@ -2783,25 +3636,29 @@ PAGE_CONFIGS = {
                 "type": "kpi_card",
                 "measure": "GSC Clicks",
                 "title": "Clicks",
-                "position": {"x": 56, "y": 83, "z": 1000, "height": 67, "width": 197}
+                "slot": "kpi[0]",
+                "position": {"z": 1000}
             },
             {
                 "type": "kpi_card",
                 "measure": "GSC Impressions",
                 "title": "Impressions",
-                "position": {"x": 261, "y": 83, "z": 2000, "height": 67, "width": 197}
+                "slot": "kpi[1]",
+                "position": {"z": 2000}
             },
             {
                 "type": "kpi_card",
                 "measure": "GSC CTR",
                 "title": "Avg CTR",
-                "position": {"x": 465, "y": 83, "z": 3000, "height": 67, "width": 197}
+                "slot": "kpi[2]",
+                "position": {"z": 3000}
             },
             {
                 "type": "kpi_card",
                 "measure": "GSC Avg Position",
                 "title": "Avg Position",
-                "position": {"x": 670, "y": 83, "z": 4000, "height": 67, "width": 197}
+                "slot": "kpi[3]",
+                "position": {"z": 4000}
             },
             # Section 1 - Full width Line Chart
             {
@@ -2810,7 +3667,8 @@ PAGE_CONFIGS = {
                 "axis_entity": "DimDate",
                 "measures": ["GSC Clicks", "GSC Impressions"],
                 "title": "Clicks & Impressions Trend",
-                "position": {"x": 56, "y": 176, "z": 5000, "height": 254, "width": 897}
+                "slot": "section_1.full",
+                "position": {"z": 5000}
             },
             # Section 2 - Left: Top Queries Table - uses query-specific measures per spec
             {
@@ -2818,7 +3676,8 @@ PAGE_CONFIGS = {
                 "columns": [{"entity": "gsc-queries", "column": "Top queries"}],
                 "measures": ["Impressions by Query", "Clicks by Query", "CTR by Query", "Position by Query"],
                 "title": "Top Search Queries",
-                "position": {"x": 56, "y": 456, "z": 6000, "height": 220, "width": 444}
+                "slot": "section_2.left",
+                "position": {"z": 6000}
             },
             # Section 2 - Right: Top Pages by Clicks
             {
@@ -2827,7 +3686,8 @@ PAGE_CONFIGS = {
                 "category_entity": "gsc-pages",
                 "measure": "GSC Clicks",
                 "title": "Top Pages by Clicks",
-                "position": {"x": 508, "y": 456, "z": 6500, "height": 220, "width": 445},
+                "slot": "section_2.right",
+                "position": {"z": 6500},
                 "top_n": 10
             },
             # Date Slicer
@@ -2836,7 +3696,8 @@ PAGE_CONFIGS = {
                 "column": "Date",
                 "entity": "DimDate",
                 "title": "Date",
-                "position": {"x": 728, "y": 34, "z": 8000, "height": 28, "width": 120},
+                "slot": "header.date_slicer",
+                "position": {"z": 8000},
                 "slicer_mode": "Between",
                 "sync_group": "Date"
             },
@@ -2844,14 +3705,16 @@ PAGE_CONFIGS = {
             {
                 "type": "action_button",
                 "button_type": "clearSlicers",
-                "position": {"x": 892, "y": 34, "z": 8003, "height": 28, "width": 28},
+                "slot": "header.reset",
+                "position": {"z": 8003},
                 "tooltip": "Clear all slicers on this page"
             },
             # Info button
             {
                 "type": "action_button",
                 "button_type": "info",
-                "position": {"x": 856, "y": 34, "z": 8002, "height": 28, "width": 28},
+                "slot": "header.info",
+                "position": {"z": 8002},
                 "tooltip": "View page information"
             },
             # Actions Panel
@@ -2859,19 +3722,25 @@ PAGE_CONFIGS = {
                 "type": "html",
                 "measure": "Recommended Actions HTML (Dynamic)",
                 "title": "Recommended Actions",
-                "position": {"x": 978, "y": 169, "z": 15000, "height": 230, "width": 241}
+                "element": "actions_html",
+                "slot": "panel.body",
+                "position": {"z": 15000}
             },
             # Actions Panel Container
             {
                 "type": "shape",
-                "position": {"x": 965, "y": 134, "z": 14000, "height": 275, "width": 267},
+                "element": "actions_panel_container",
+                "slot": "panel.container",
+                "position": {"z": 14000},
                 "fill_color": "#FFFFFF",
                 "border_color": "#DFE1E2"
             },
             # Actions Panel Accent Bar
             {
                 "type": "shape",
-                "position": {"x": 965, "y": 134, "z": 14500, "height": 275, "width": 3},
+                "element": "actions_accent_bar",
+                "slot": "panel.accent",
+                "position": {"z": 14500},
                 "fill_color": "#005EA2",
                 "border_color": None
             },
@@ -2879,7 +3748,30 @@ PAGE_CONFIGS = {
             {
                 "type": "textbox",
                 "text": "Recommended Actions",
-                "position": {"x": 978, "y": 144, "z": 14600, "height": 19, "width": 248}
+                "element": "actions_title",
+                "slot": "panel.title",
+                "position": {"z": 14600}
+            },
+            # Actions Panel Toggle Buttons (apply the Actions_Expanded/Collapsed bookmarks)
+            {
+                "type": "action_button",
+                "element": "expand_button",
+                "button_type": "bookmark",
+                "bookmark": "Actions_Expanded",
+                "text": "Actions \u276f",
+                "slot": "panel.expand_button",
+                "position": {"z": 14700},
+                "tooltip": "Show recommended actions"
+            },
+            {
+                "type": "action_button",
+                "element": "collapse_button",
+                "button_type": "bookmark",
+                "bookmark": "Actions_Collapsed",
+                "text": "\u276e Collapse",
+                "slot": "panel.collapse_button",
+                "position": {"z": 14800},
+                "tooltip": "Hide recommended actions"
             },
         ]
     },
@@ -2892,25 +3784,29 @@ PAGE_CONFIGS = {
                 "type": "kpi_card",
                 "measure": "Active Livecasts",  # Proxy for anomaly count
                 "title": "Anomalies",
-                "position": {"x": 56, "y": 83, "z": 1000, "height": 67, "width": 197}
+                "slot": "kpi[0]",
+                "position": {"z": 1000}
             },
             {
                 "type": "kpi_card",
                 "measure": "Model Confidence Score",  # Exists in measures
                 "title": "Forecast Conf.",
-                "position": {"x": 261, "y": 83, "z": 2000, "height": 67, "width": 197}
+                "slot": "kpi[1]",
+                "position": {"z": 2000}
             },
             {
                 "type": "kpi_card",
                 "measure": "Trend Indicator",  # Exists - returns up/down/stable
                 "title": "Trend",
-                "position": {"x": 465, "y": 83, "z": 3000, "height": 67, "width": 197}
+                "slot": "kpi[2]",
+                "position": {"z": 3000}
             },
             {
                 "type": "kpi_card",
                 "measure": "Total Users",  # Proxy for data points
                 "title": "Data Points",
-                "position": {"x": 670, "y": 83, "z": 4000, "height": 67, "width": 197}
+                "slot": "kpi[3]",
+                "position": {"z": 4000}
             },
             # Section 1 - Full width Line Chart (Anomaly Detection) - Power BI anomaly feature
             {
@@ -2919,7 +3815,8 @@ PAGE_CONFIGS = {
                 "axis_entity": "DimDate",
                 "measures": ["Sessions"],
                 "title": "Anomaly Detection Timeline",
-                "position": {"x": 56, "y": 176, "z": 5000, "height": 254, "width": 897}
+                "slot": "section_1.full",
+                "position": {"z": 5000}
             },
             # Section 2 - Left: Forecast Chart (Power BI forecast feature)
             {
@@ -2928,14 +3825,16 @@ PAGE_CONFIGS = {
                 "axis_entity": "DimDate",
                 "measures": ["Sessions"],
                 "title": "Forecasted Traffic",
-                "position": {"x": 56, "y": 456, "z": 6000, "height": 220, "width": 444}
+                "slot": "section_2.left",
+                "position": {"z": 6000}
             },
             # Section 2 - Right: Health Score Gauge per spec
             {
                 "type": "gauge",
                 "measure": "Health Score",
                 "title": "Health Score",
-                "position": {"x": 508, "y": 456, "z": 6500, "height": 220, "width": 445},
+                "slot": "section_2.right",
+                "position": {"z": 6500},
                 "min_value": 0,
                 "max_value": 100,
                 "target_value": 75
@@ -2946,7 +3845,8 @@ PAGE_CONFIGS = {
                 "column": "Date",
                 "entity": "DimDate",
                 "title": "Date",
-                "position": {"x": 728, "y": 34, "z": 8000, "height": 28, "width": 120},
+                "slot": "header.date_slicer",
+                "position": {"z": 8000},
                 "slicer_mode": "Between",
                 "sync_group": "Date"
             },
@@ -2954,14 +3854,16 @@ PAGE_CONFIGS = {
             {
                 "type": "action_button",
                 "button_type": "clearSlicers",
-                "position": {"x": 892, "y": 34, "z": 8003, "height": 28, "width": 28},
+                "slot": "header.reset",
+                "position": {"z": 8003},
                 "tooltip": "Clear all slicers on this page"
             },
             # Info button
             {
                 "type": "action_button",
                 "button_type": "info",
-                "position": {"x": 856, "y": 34, "z": 8002, "height": 28, "width": 28},
+                "slot": "header.info",
+                "position": {"z": 8002},
                 "tooltip": "View page information"
             },
             # Actions Panel
@@ -2969,19 +3871,25 @@ PAGE_CONFIGS = {
                 "type": "html",
                 "measure": "Recommended Actions HTML (Dynamic)",
                 "title": "Recommended Actions",
-                "position": {"x": 978, "y": 169, "z": 15000, "height": 230, "width": 241}
+                "element": "actions_html",
+                "slot": "panel.body",
+                "position": {"z": 15000}
             },
             # Actions Panel Container
             {
                 "type": "shape",
-                "position": {"x": 965, "y": 134, "z": 14000, "height": 275, "width": 267},
+                "element": "actions_panel_container",
+                "slot": "panel.container",
+                "position": {"z": 14000},
                 "fill_color": "#FFFFFF",
                 "border_color": "#DFE1E2"
             },
             # Actions Panel Accent Bar
             {
                 "type": "shape",
-                "position": {"x": 965, "y": 134, "z": 14500, "height": 275, "width": 3},
+                "element": "actions_accent_bar",
+                "slot": "panel.accent",
+                "position": {"z": 14500},
                 "fill_color": "#005EA2",
                 "border_color": None
             },
@@ -2989,7 +3897,30 @@ PAGE_CONFIGS = {
             {
                 "type": "textbox",
                 "text": "Recommended Actions",
-                "position": {"x": 978, "y": 144, "z": 14600, "height": 19, "width": 248}
+                "element": "actions_title",
+                "slot": "panel.title",
+                "position": {"z": 14600}
+            },
+            # Actions Panel Toggle Buttons (apply the Actions_Expanded/Collapsed bookmarks)
+            {
+                "type": "action_button",
+                "element": "expand_button",
+                "button_type": "bookmark",
+                "bookmark": "Actions_Expanded",
+                "text": "Actions \u276f",
+                "slot": "panel.expand_button",
+                "position": {"z": 14700},
+                "tooltip": "Show recommended actions"
+            },
+            {
+                "type": "action_button",
+                "element": "collapse_button",
+                "button_type": "bookmark",
+                "bookmark": "Actions_Collapsed",
+                "text": "\u276e Collapse",
+                "slot": "panel.collapse_button",
+                "position": {"z": 14800},
+                "tooltip": "Hide recommended actions"
             },
         ]
     },
@@ -3002,25 +3933,29 @@ PAGE_CONFIGS = {
                 "type": "kpi_card",
                 "measure": "Active Livecasts",  # Proxy for active segments
                 "title": "Segments",
-                "position": {"x": 56, "y": 83, "z": 1000, "height": 67, "width": 197}
+                "slot": "kpi[0]",
+                "position": {"z": 1000}
             },
             {
                 "type": "kpi_card",
                 "measure": "Top Device Category",  # Top segment identifier
                 "title": "Top Segment",
-                "position": {"x": 261, "y": 83, "z": 2000, "height": 67, "width": 197}
+                "slot": "kpi[1]",
+                "position": {"z": 2000}
             },
             {
                 "type": "kpi_card",
                 "measure": "Engagement Rate",  # Sessions-engagement correlation proxy
                 "title": "Correlation",
-                "position": {"x": 465, "y": 83, "z": 3000, "height": 67, "width": 197}
+                "slot": "kpi[2]",
+                "position": {"z": 3000}
             },
             {
                 "type": "kpi_card",
                 "measure": "Return Rate",  # Cohort retention proxy
                 "title": "Cohorts",
-                "position": {"x": 670, "y": 83, "z": 4000, "height": 67, "width": 197}
+                "slot": "kpi[3]",
+                "position": {"z": 4000}
             },
             # Section 1 - Full width Matrix (Decomposition/Segmentation) per spec
             {
@@ -3031,7 +3966,8 @@ PAGE_CONFIGS = {
                 ],
                 "values": ["Sessions", "Page Views", "Total Users", "Engagement Rate"],
                 "title": "Segmentation Matrix",
-                "position": {"x": 56, "y": 176, "z": 5000, "height": 254, "width": 897}
+                "slot": "section_1.full",
+                "position": {"z": 5000}
             },
             # Section 2 - Left: Cohort Analysis Matrix per spec
             {
@@ -3039,7 +3975,8 @@ PAGE_CONFIGS = {
                 "rows": [{"entity": "DimDate", "column": "Month"}],
                 "values": ["Sessions", "Return Rate"],
                 "title": "Cohort Analysis",
-                "position": {"x": 56, "y": 456, "z": 6000, "height": 220, "width": 444}
+                "slot": "section_2.left",
+                "position": {"z": 6000}
             },
             # Section 2 - Right: Correlation Scatter per spec
             {
@@ -3047,7 +3984,8 @@ PAGE_CONFIGS = {
                 "x_measure": "Sessions",
                 "y_measure": "Engagement Rate",
                 "title": "Correlation Explorer",
-                "position": {"x": 508, "y": 456, "z": 6500, "height": 220, "width": 445},
+                "slot": "section_2.right",
+                "position": {"z": 6500},
                 "legend_column": "deviceCategory",
                 "legend_entity": "DimDevice",
                 "size_measure": "Total Users"
@@ -3058,7 +3996,8 @@ PAGE_CONFIGS = {
                 "column": "Date",
                 "entity": "DimDate",
                 "title": "Date",
-                "position": {"x": 728, "y": 34, "z": 8000, "height": 28, "width": 120},
+                "slot": "header.date_slicer",
+                "position": {"z": 8000},
                 "slicer_mode": "Between",
                 "sync_group": "Date"
             },
@@ -3066,14 +4005,16 @@ PAGE_CONFIGS = {
             {
                 "type": "action_button",
                 "button_type": "clearSlicers",
-                "position": {"x": 892, "y": 34, "z": 8003, "height": 28, "width": 28},
+                "slot": "header.reset",
+                "position": {"z": 8003},
                 "tooltip": "Clear all slicers on this page"
             },
             # Info button
             {
                 "type": "action_button",
                 "button_type": "info",
-                "position": {"x": 856, "y": 34, "z": 8002, "height": 28, "width": 28},
+                "slot": "header.info",
+                "position": {"z": 8002},
                 "tooltip": "View page information"
             },
             # Actions Panel
@@ -3081,19 +4022,25 @@ PAGE_CONFIGS = {
                 "type": "html",
                 "measure": "Recommended Actions HTML (Dynamic)",
                 "title": "Recommended Actions",
-                "position": {"x": 978, "y": 169, "z": 15000, "height": 230, "width": 241}
+                "element": "actions_html",
+                "slot": "panel.body",
+                "position": {"z": 15000}
             },
             # Actions Panel Container
             {
                 "type": "shape",
-                "position": {"x": 965, "y": 134, "z": 14000, "height": 275, "width": 267},
+                "element": "actions_panel_container",
+                "slot": "panel.container",
+                "position": {"z": 14000},
                 "fill_color": "#FFFFFF",
                 "border_color": "#DFE1E2"
             },
             # Actions Panel Accent Bar
             {
                 "type": "shape",
-                "position": {"x": 965, "y": 134, "z": 14500, "height": 275, "width": 3},
+                "element": "actions_accent_bar",
+                "slot": "panel.accent",
+                "position": {"z": 14500},
                 "fill_color": "#005EA2",
                 "border_color": None
             },
@@ -3101,7 +4048,30 @@ PAGE_CONFIGS = {
             {
                 "type": "textbox",
                 "text": "Recommended Actions",
-                "position": {"x": 978, "y": 144, "z": 14600, "height": 19, "width": 248}
+                "element": "actions_title",
+                "slot": "panel.title",
+                "position": {"z": 14600}
+            },
+            # Actions Panel Toggle Buttons (apply the Actions_Expanded/Collapsed bookmarks)
+            {
+                "type": "action_button",
+                "element": "expand_button",
+                "button_type": "bookmark",
+                "bookmark": "Actions_Expanded",
+                "text": "Actions \u276f",
+                "slot": "panel.expand_button",
+                "position": {"z": 14700},
+                "tooltip": "Show recommended actions"
+            },
+            {
+                "type": "action_button",
+                "element": "collapse_button",
+                "button_type": "bookmark",
+                "bookmark": "Actions_Collapsed",
+                "text": "\u276e Collapse",
+                "slot": "panel.collapse_button",
+                "position": {"z": 14800},
+                "tooltip": "Hide recommended actions"
             },
         ]
     },
@@ -3111,225 +4081,733 @@ PAGE_CONFIGS = {
 # GENERATOR CLASS
 # =============================================================================
 
+def _element_entry(visual_json: Dict) -> Tuple[str, str, bool]:
+    """(visual name, visual type, hidden) of a generated visual, for bookmarks and groups."""
+    return (visual_json["name"], visual_json.get("visual", {}).get("visualType", ""),
+            bool(visual_json.get("isHidden")))
+
 class VisualGenerator:
-    def __init__(self, base_path: Path, dry_run: bool = False):
+    def __init__(
+        self,
+        base_path: Path,
+        dry_run: bool = False,
+        incremental: bool = False,
+        id_mode: str = "random",
+        entity_map: Optional[Dict[str, str]] = None,
+        template_cache: Optional[Dict] = None,
+        output_format: str = "pretty",
+        fsync: bool = False,
+        model_index: Optional[ModelIndex] = None,
+        max_queries: Optional[int] = None,
+        grid: str = DEFAULT_GRID,
+        layout_mode: str = DEFAULT_MODE,
+        bookmarks: Optional[List[Dict[str, Any]]] = None
+    ):
+        if id_mode not in ID_MODES:
+            raise ValueError(f"Unknown ID mode: {id_mode}. Available: {list(ID_MODES)}")
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}. Available: {list(OUTPUT_FORMATS)}")
+        if grid not in LAYOUT_GRIDS:
+            raise ValueError(f"Unknown grid: {grid}. Available: {sorted(LAYOUT_GRIDS)}")
+        if layout_mode not in LAYOUT_MODES:
+            raise ValueError(f"Unknown layout mode: {layout_mode}. Available: {list(LAYOUT_MODES)}")
         self.base_path = base_path
         self.dry_run = dry_run
+        self.incremental = incremental
+        self.id_mode = id_mode
+        self.entity_map = entity_map or {}
+        # Built visuals keyed by config fingerprint, shared across generators in batch mode
+        self.template_cache = template_cache
+        self.output_format = output_format
+        self.fsync = fsync
+        self._pending_fsync: List[Path] = []
+        # When set, every field a visual references is checked against the model before writing
+        self.model_index = model_index
+        # When set, pages issuing more DAX queries than this on load are rejected
+        self.max_queries = max_queries
+        # Grid and mode that visual "slot" names are solved against
+        self.grid = grid
+        self.layout_mode = layout_mode
+        # Bookmark specs (see BOOKMARKS & VISUAL GROUPS); page_bookmarks collects
+        # each generated page's element -> visual mapping for write_bookmarks()
+        self.bookmarks = load_bookmark_specs() if bookmarks is None else bookmarks
+        self.page_bookmarks: Dict[str, Dict[str, Any]] = {}
+        # Visuals built during validation, keyed by (seed, fingerprint), awaiting their write
+        self._prebuilt: Dict[Tuple[str, str], Dict] = {}
         self.generated_count = 0
         self.skipped_count = 0
+        self.removed_count = 0
+        self.manifest = load_manifest(base_path) if incremental else None
 
-    def generate_page(self, page_key: str) -> List[str]:
-        """Generate all visuals for a page."""
-        if page_key not in PAGE_CONFIGS:
-            raise ValueError(f"Unknown page: {page_key}. Available: {list(PAGE_CONFIGS.keys())}")
+    def apply_layout(self, page_configs: Dict[str, Dict]) -> Dict[str, Dict]:
+        """Solve every slotted visual's position for this generator's grid and mode."""
+        try:
+            return apply_layout(page_configs, self.grid, self.layout_mode)
+        except LayoutError as e:
+            raise ConfigValidationError(e.errors)
 
-        config = PAGE_CONFIGS[page_key]
+    def bind_bookmarks(self, page_key: str, config: Dict) -> Dict:
+        """Fill in bookmark names and visual groups for this generator's layout mode."""
+        return bind_bookmarks(page_key, config, self.bookmarks, self.layout_mode)
+
+    def validate(self, page_configs: Dict[str, Dict]) -> None:
+        """
+        Validate page configs before anything is written.
+
+        Checks every visual config against its registered schema, every
+        field the built visual references (when a model index is attached)
+        and each page's query count (when max_queries is set).
+        Raises ConfigValidationError listing all problems found, or
+        QueryBudgetError when the configs are valid but a page is over budget.
+
+        Visuals built for these checks are kept and written as-is by
+        generate_page, so each visual is built once.
+        """
+        errors = validate_page_configs(page_configs)
+        if errors or (self.model_index is None and self.max_queries is None):
+            if errors:
+                raise ConfigValidationError(errors)
+            return
+        built = self._prebuild(page_configs)
+        if self.model_index is not None:
+            errors = self._validate_fields(page_configs, built)
+            if errors:
+                raise ConfigValidationError(errors)
+        if self.max_queries is not None:
+            errors = check_query_budget(page_configs, self.max_queries, built)
+            if errors:
+                raise QueryBudgetError(errors)
+
+    def _prebuild(self, page_configs: Dict[str, Dict]) -> Dict[str, List[Dict]]:
+        """
+        Build every visual exactly as generate_page would, keeping the results.
+
+        Returns page key -> visual.json list (config order); each result is
+        also stored in self._prebuilt under its (seed, fingerprint) so the
+        write step picks it up instead of building it again.
+        """
+        built = {}
+        for page_key, page_config in page_configs.items():
+            visuals = self.bind_bookmarks(page_key, page_config)["visuals"]
+            page_built = []
+            for visual_config, seed in zip(visuals, page_id_seeds(page_key, visuals)):
+                visual_json = self._build_visual(visual_config, seed)
+                if visual_json is not None:
+                    self._prebuilt[(seed, fingerprint_visual_config(visual_config))] = visual_json
+                page_built.append(visual_json)
+            built[page_key] = page_built
+        return built
+
+    def _validate_fields(self, page_configs: Dict[str, Dict], built: Dict[str, List[Dict]]) -> List[str]:
+        """Check the field references of every built visual against the model."""
+        errors = []
+        for page_key, page_config in page_configs.items():
+            for index, (visual_config, visual_json) in enumerate(zip(page_config.get("visuals", []), built[page_key])):
+                if visual_json is None:
+                    continue
+                for error in check_visual_fields(visual_json, self.model_index):
+                    errors.append(f"{page_key}[{index}] {visual_config['type']}: {error}")
+        return errors
+
+    def generate_page(self, page_key: str, config: Optional[Dict] = None, validate: bool = True) -> List[str]:
+        """Generate all visuals for a page (from PAGE_CONFIGS unless a config is given)."""
+        if config is None:
+            if page_key not in PAGE_CONFIGS:
+                raise ValueError(f"Unknown page: {page_key}. Available: {list(PAGE_CONFIGS.keys())}")
+            config = PAGE_CONFIGS[page_key]
+        config = self.apply_layout({page_key: config})[page_key]
+
+        if validate:
+            self.validate({page_key: config})
+
+        config = self.bind_bookmarks(page_key, config)
         page_id = config["page_id"]
         created_files = []
+        elements: Dict[str, Tuple[str, str, bool]] = {}
 
         print(f"\n{'='*60}")
         print(f"Generating visuals for: {config['display_name']}")
         print(f"Page ID: {page_id}")
         print(f"{'='*60}")
 
-        for visual_config in config["visuals"]:
-            visual_json = self._generate_visual(visual_config)
+        seeds = page_id_seeds(page_key, config["visuals"])
+
+        if self.incremental:
+            created_files = self._generate_page_incremental(page_id, config["visuals"], seeds, elements)
+        else:
+            for visual_config, seed in zip(config["visuals"], seeds):
+                visual_json = self._build_visual(visual_config, seed)
+                if visual_json:
+                    file_path = self._write_visual(page_id, visual_json)
+                    created_files.append(file_path)
+                    if visual_config.get("element"):
+                        elements[visual_config["element"]] = _element_entry(visual_json)
+
+        created_files.extend(self._write_groups(page_key, page_id, config["visuals"], elements))
+        if self._prebuilt:
+            # Drop prebuilt visuals the write step did not need (e.g. unchanged in incremental mode)
+            prefix = f"{page_key}|"
+            self._prebuilt = {key: value for key, value in self._prebuilt.items() if not key[0].startswith(prefix)}
+        self.flush()
+        return created_files
+
+    def _write_groups(self, page_key: str, page_id: str, visuals: List[Dict],
+                      elements: Dict[str, Tuple[str, str, bool]]) -> List[str]:
+        """Write the page's visual group containers and record it for write_bookmarks()."""
+        positions = {v["element"]: v["position"] for v in visuals if v.get("element") in elements}
+        groups = {
+            group: [element for element in members if element in elements]
+            for group, members in bookmark_groups(self.bookmarks).items()
+        }
+        groups = {group: members for group, members in groups.items() if members}
+
+        created_files = []
+        for group, members in groups.items():
+            group_json = generate_visual_group(group, [positions[element] for element in members])
+            if all(elements[element][2] for element in members):
+                group_json["isHidden"] = True
+            created_files.append(self._write_visual(page_id, group_json))
+
+        if elements:
+            self.page_bookmarks[page_key] = {
+                "page_id": page_id,
+                "elements": {element: entry[:2] for element, entry in elements.items()},
+                "groups": groups
+            }
+        return created_files
+
+    def flush(self) -> None:
+        """fsync every file written since the last flush (only with fsync enabled)."""
+        if self._pending_fsync:
+            fsync_paths(self._pending_fsync)
+            self._pending_fsync = []
+
+    def _generate_page_incremental(self, page_id: str, visuals: List[Dict], seeds: List[str],
+                                   elements: Dict[str, Tuple[str, str, bool]]) -> List[str]:
+        """
+        Generate only the visuals whose fingerprint changed since the last run.
+
+        Unchanged visuals keep their existing visual.json untouched; changed
+        visuals are rewritten in place under their previous visual ID (matched
+        by element name or layout slot, see visual_slot_key). Named elements
+        are recorded in `elements` either way. Folders of visuals the manifest
+        recorded but the config no longer has are removed.
+        """
+        previous_slots = self.manifest["pages"].get(page_id, {})
+        current_slots = {}
+        created_files = []
+
+        slots = visual_slot_keys(visuals)
+        matches = [previous_slots.get(slot) for slot in slots]
+        # Manifests written with older key formats: fall back to content and index
+        # keys, never taking an ID a current key already matched
+        claimed_ids = {entry.get("visual_id") for entry in matches if entry}
+        for index, content_slot in enumerate(visual_slot_keys(visuals, content_slot_key)):
+            if matches[index] is not None:
+                continue
+            for key in (content_slot, legacy_slot_key(index, visuals[index])):
+                entry = previous_slots.get(key)
+                if entry and entry.get("visual_id") not in claimed_ids:
+                    matches[index] = entry
+                    claimed_ids.add(entry.get("visual_id"))
+                    break
+
+        for visual_config, seed, slot, previous in zip(visuals, seeds, slots, matches):
+            fingerprint = fingerprint_visual_config(
+                visual_config,
+                {"entity_map": self.entity_map, "output_format": self.output_format}
+            )
+            previous_id = previous.get("visual_id") if previous else None
+
+            if previous_id and previous.get("fingerprint") == fingerprint:
+                file_path = self.base_path / page_id / "visuals" / previous_id / "visual.json"
+                if file_path.exists():
+                    print(f"  UNCHANGED: {previous_id}")
+                    current_slots[slot] = previous
+                    created_files.append(str(file_path))
+                    self.skipped_count += 1
+                    if visual_config.get("element"):
+                        with open(file_path, 'r', encoding='utf-8') as f:
+                            elements[visual_config["element"]] = _element_entry(json.load(f))
+                    continue
+
+            visual_json = self._build_visual(visual_config, seed, visual_id=previous_id)
             if visual_json:
                 file_path = self._write_visual(page_id, visual_json)
                 created_files.append(file_path)
+                current_slots[slot] = {
+                    "fingerprint": fingerprint,
+                    "visual_id": visual_json["name"]
+                }
+                if visual_config.get("element"):
+                    elements[visual_config["element"]] = _element_entry(visual_json)
+
+        kept_ids = {entry["visual_id"] for entry in current_slots.values()}
+        for entry in previous_slots.values():
+            if entry.get("visual_id") and entry["visual_id"] not in kept_ids:
+                self._remove_visual(page_id, entry["visual_id"])
 
+        self.manifest["pages"][page_id] = current_slots
         return created_files
 
-    def _generate_visual(self, config: Dict) -> Optional[Dict]:
-        """Generate a single visual based on config."""
-        visual_type = config.get("type")
+    def _remove_visual(self, page_id: str, visual_id: str) -> None:
+        """Delete a generated visual's folder (the config no longer produces it)."""
+        visual_folder = self.base_path / page_id / "visuals" / visual_id
+        if not visual_folder.is_dir():
+            return
+        if self.dry_run:
+            print(f"  DRY-RUN: Would remove {visual_id}")
+        else:
+            shutil.rmtree(visual_folder)
+            print(f"  REMOVED: {visual_id}")
+        self.removed_count += 1
 
-        if visual_type == "kpi_card":
-            return generate_kpi_card(
-                measure=config["measure"],
-                title=config["title"],
-                position=config["position"],
-                mom_label=config.get("mom_label"),
-                mom_color=config.get("mom_color"),
-                alt_text=config.get("alt_text")
-            )
-        elif visual_type == "bar_chart":
-            return generate_bar_chart(
-                category_column=config["category_column"],
-                category_entity=config["category_entity"],
-                measure=config["measure"],
-                title=config["title"],
-                position=config["position"],
-                exclude_blanks=config.get("exclude_blanks", True),
-                top_n=config.get("top_n")
-            )
-        elif visual_type == "stacked_bar_chart":
-            return generate_stacked_bar_chart(
-                category_column=config["category_column"],
-                category_entity=config["category_entity"],
-                measure=config["measure"],
-                title=config["title"],
-                position=config["position"]
-            )
-        elif visual_type == "table":
-            return generate_table(
-                columns=config["columns"],
-                measures=config["measures"],
-                title=config["title"],
-                position=config["position"]
-            )
-        elif visual_type == "map":
-            return generate_map_visual(
-                location_column=config["location_column"],
-                location_entity=config["location_entity"],
-                size_measure=config["size_measure"],
-                title=config["title"],
-                position=config["position"]
-            )
-        elif visual_type == "line_chart":
-            return generate_line_chart(
-                axis_column=config["axis_column"],
-                axis_entity=config["axis_entity"],
-                measures=config["measures"],
-                title=config["title"],
-                position=config["position"]
-            )
-        elif visual_type == "area_chart":
-            return generate_area_chart(
-                axis_column=config["axis_column"],
-                axis_entity=config["axis_entity"],
-                measure=config["measure"],
-                title=config["title"],
-                position=config["position"]
-            )
-        elif visual_type == "treemap":
-            return generate_treemap(
-                category_column=config["category_column"],
-                category_entity=config["category_entity"],
-                measure=config["measure"],
-                title=config["title"],
-                position=config["position"]
-            )
-        elif visual_type == "html":
-            return generate_html_visual(
-                measure=config["measure"],
-                title=config.get("title", ""),
-                position=config["position"]
-            )
-        elif visual_type == "slicer":
-            return generate_slicer(
-                column=config["column"],
-                entity=config["entity"],
-                title=config.get("title", ""),
-                position=config["position"],
-                slicer_mode=config.get("slicer_mode", "Between"),
-                sync_group=config.get("sync_group")
-            )
-        elif visual_type == "action_button":
-            return generate_action_button(
-                button_type=config["button_type"],
-                position=config["position"],
-                icon=config.get("icon"),
-                text=config.get("text"),
-                tooltip=config.get("tooltip"),
-                navigation_page=config.get("navigation_page")
-            )
-        elif visual_type == "textbox":
-            return generate_textbox(
-                text=config["text"],
-                position=config["position"],
-                font_size=config.get("font_size", 9),
-                font_color=config.get("font_color", "#565C65")
-            )
-        elif visual_type == "shape":
-            return generate_shape(
-                position=config["position"],
-                fill_color=config.get("fill_color", "#FFFFFF"),
-                border_color=config.get("border_color", "#DFE1E2"),
-                border_width=config.get("border_width", 1)
-            )
-        elif visual_type == "matrix":
-            return generate_matrix(
-                rows=config["rows"],
-                values=config["values"],
-                title=config["title"],
-                position=config["position"],
-                columns=config.get("columns")
-            )
-        elif visual_type == "gauge":
-            return generate_gauge(
-                measure=config["measure"],
-                title=config["title"],
-                position=config["position"],
-                min_value=config.get("min_value", 0),
-                max_value=config.get("max_value", 100),
-                target_value=config.get("target_value")
-            )
-        elif visual_type == "scatter":
-            return generate_scatter(
-                x_measure=config["x_measure"],
-                y_measure=config["y_measure"],
-                title=config["title"],
-                position=config["position"],
-                legend_column=config.get("legend_column"),
-                legend_entity=config.get("legend_entity"),
-                size_measure=config.get("size_measure")
-            )
-        elif visual_type == "combo_chart":
-            return generate_combo_chart(
-                axis_column=config["axis_column"],
-                axis_entity=config["axis_entity"],
-                column_measures=config["column_measures"],
-                line_measures=config["line_measures"],
-                title=config["title"],
-                position=config["position"]
-            )
-        elif visual_type == "funnel":
-            return generate_funnel(
-                category_column=config["category_column"],
-                category_entity=config["category_entity"],
-                measure=config["measure"],
-                title=config["title"],
-                position=config["position"]
-            )
-        elif visual_type == "stacked_bar_100":
-            return generate_stacked_bar_chart(
-                category_column=config["category_column"],
-                category_entity=config["category_entity"],
-                measure=config["measure"],
-                title=config["title"],
-                position=config["position"]
-            )
+    def save_manifest(self) -> None:
+        """Persist the incremental manifest (no-op outside incremental mode or in dry-run)."""
+        if self.incremental and not self.dry_run:
+            save_manifest(self.base_path, self.manifest)
+
+    def _build_visual(self, config: Dict, seed: str, visual_id: Optional[str] = None) -> Optional[Dict]:
+        """
+        Generate a visual, deriving its IDs from `seed` in deterministic mode.
+
+        When a template cache is attached, a visual already built for an
+        identical config (by any generator sharing the cache) is reused and
+        only the entity remapping is applied. In random ID mode the reused
+        copy gets a fresh visual ID, so report variants do not share IDs.
+        A visual already built by validate() is returned as-is.
+        """
+        if visual_id is None and self._prebuilt:
+            prebuilt = self._prebuilt.pop((seed, fingerprint_visual_config(config)), None)
+            if prebuilt is not None:
+                return prebuilt
+
+        cache_key = None
+        if self.template_cache is not None:
+            cache_key = (self.id_mode, seed, visual_id, fingerprint_visual_config(config))
+            cached = self.template_cache.get(cache_key)
+            if cached is not None:
+                visual_json = remap_entities(cached, self.entity_map)
+                if self.id_mode == "random" and visual_id is None:
+                    visual_json["name"] = generate_visual_id()
+                return visual_json
+
+        if self.id_mode == "deterministic":
+            with deterministic_ids(seed):
+                visual_json = self._generate_visual(config, visual_id=visual_id)
         else:
+            visual_json = self._generate_visual(config, visual_id=visual_id)
+
+        if visual_json is None:
+            return None
+        if cache_key is not None:
+            self.template_cache[cache_key] = visual_json
+            return remap_entities(visual_json, self.entity_map)
+        if self.entity_map:
+            return remap_entities(visual_json, self.entity_map)
+        return visual_json
+
+    def _generate_visual(self, config: Dict, visual_id: Optional[str] = None) -> Optional[Dict]:
+        """Generate a single visual based on config, optionally reusing a visual ID."""
+        visual_type = config.get("type")
+        spec = VISUAL_BUILDERS.get(visual_type)
+        if spec is None:
             print(f"  WARNING: Unknown visual type: {visual_type}")
             return None
+        return build_visual(config, visual_id)
+
+    def write_bookmarks(self) -> List[str]:
+        """
+        Write every generated page's bookmarks and register them in bookmarks.json.
+
+        Bookmarks live in definition/bookmarks next to the pages folder;
+        unchanged files are left untouched and bookmarks already listed in
+        bookmarks.json (including hand-made ones) keep their order.
+        """
+        bookmarks_dir = self.base_path.parent / "bookmarks"
+        names = []
+        for page_key, page in self.page_bookmarks.items():
+            for bookmark in self.bookmarks:
+                name = page_bookmark_name(bookmark, page_key)
+                bookmark_json = build_bookmark_json(bookmark, name, page["page_id"],
+                                                    page["elements"], page["groups"])
+                if bookmark_json is None:
+                    continue
+                self._write_bookmark_file(bookmarks_dir / f"{name}.bookmark.json",
+                                          serialize_visual(bookmark_json, self.output_format))
+                names.append(name)
+
+        if names:
+            metadata_path = bookmarks_dir / "bookmarks.json"
+            existing = None
+            if metadata_path.exists():
+                with open(metadata_path, 'r', encoding='utf-8') as f:
+                    existing = json.load(f)
+            metadata = merge_bookmarks_metadata(existing, names)
+            self._write_bookmark_file(metadata_path, json.dumps(metadata, indent=2).encode("utf-8"))
+        return names
+
+    def _write_bookmark_file(self, file_path: Path, data: bytes) -> None:
+        if file_matches(file_path, data):
+            print(f"  UNCHANGED: {file_path.name}")
+        elif self.dry_run:
+            print(f"  DRY-RUN: Would write {file_path.name}")
+        else:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            write_file_atomic(file_path, data)
+            print(f"  BOOKMARK: {file_path.name}")
 
     def _write_visual(self, page_id: str, visual_json: Dict) -> str:
-        """Write visual.json to the correct folder."""
+        """
+        Write visual.json to the correct folder.
+
+        The visual is serialized in memory first; if an identical file is
+        already on disk the write is skipped (mtime untouched) and counted
+        in skipped_count.
+        """
         visual_id = visual_json["name"]
         visual_folder = self.base_path / page_id / "visuals" / visual_id
         file_path = visual_folder / "visual.json"
+        data = serialize_visual(visual_json, self.output_format)
+
+        if file_matches(file_path, data):
+            print(f"  UNCHANGED: {visual_id}")
+            self.skipped_count += 1
+            return str(file_path)
 
         if self.dry_run:
             print(f"  DRY-RUN: Would create {visual_id}")
             print(f"           Title: {visual_json.get('visual', {}).get('visualContainerObjects', {}).get('title', [{}])[0].get('properties', {}).get('text', {}).get('expr', {}).get('Literal', {}).get('Value', 'N/A')}")
         else:
             visual_folder.mkdir(parents=True, exist_ok=True)
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(visual_json, f, indent=2)
+            write_file_atomic(file_path, data)
+            if self.fsync:
+                self._pending_fsync.append(file_path)
             print(f"  CREATED: {visual_id}")
             print(f"           {file_path}")
 
         self.generated_count += 1
         return str(file_path)
 
-    def generate_all(self) -> Dict[str, List[str]]:
+    def generate_all(self, jobs: int = 1) -> Dict[str, List[str]]:
         """Generate visuals for all pages."""
+        return self.generate_pages(PAGE_CONFIGS, jobs=jobs)
+
+    def generate_pages(self, page_configs: Dict[str, Dict], jobs: int = 1) -> Dict[str, List[str]]:
+        """
+        Generate visuals for several pages, optionally across a process pool.
+
+        With jobs > 1 each page is built and written in a worker process; its
+        console output is buffered and replayed in page order, and the
+        generated/skipped counters and manifest entries are merged back here.
+        A template cache is shared with the workers: each page job gets the
+        page's cached templates and hands back the ones it built.
+
+        Every visual on every page is validated before anything is written.
+        """
+        page_configs = self.apply_layout(page_configs)
+        self.validate(page_configs)
+
+        if jobs <= 1 or len(page_configs) <= 1:
+            return {
+                page_key: self.generate_page(page_key, config, validate=False)
+                for page_key, config in page_configs.items()
+            }
+
+        options = self._worker_options()
         results = {}
-        for page_key in PAGE_CONFIGS:
-            results[page_key] = self.generate_page(page_key)
+        with ProcessPoolExecutor(max_workers=min(jobs, len(page_configs))) as executor:
+            futures = []
+            for page_key, config in page_configs.items():
+                page_manifest = None
+                if self.incremental:
+                    page_manifest = self.manifest["pages"].get(config["page_id"], {})
+                prefix = f"{page_key}|"
+                page_templates = None
+                if self.template_cache is not None:
+                    page_templates = {key: value for key, value in self.template_cache.items()
+                                      if key[1].startswith(prefix)}
+                page_prebuilt = {key: self._prebuilt.pop(key) for key in list(self._prebuilt)
+                                 if key[0].startswith(prefix)}
+                futures.append(executor.submit(
+                    _generate_page_job, self.base_path, options, page_key, config, page_manifest,
+                    page_templates, page_prebuilt
+                ))
+
+            # Collect in submission order so the log reads the same as a serial run
+            for future in futures:
+                job = future.result()
+                print(job["output"], end="")
+                results[job["page_key"]] = job["files"]
+                self.generated_count += job["generated_count"]
+                self.skipped_count += job["skipped_count"]
+                self.removed_count += job["removed_count"]
+                self.page_bookmarks.update(job["page_bookmarks"])
+                if self.template_cache is not None:
+                    self.template_cache.update(job["templates"])
+                if self.incremental:
+                    self.manifest["pages"][job["page_id"]] = job["page_manifest"]
+
         return results
 
+    def _worker_options(self) -> Dict[str, Any]:
+        """Constructor options needed to recreate this generator in a worker process."""
+        return {
+            "dry_run": self.dry_run,
+            "incremental": self.incremental,
+            "id_mode": self.id_mode,
+            "entity_map": self.entity_map,
+            "output_format": self.output_format,
+            "fsync": self.fsync,
+            "grid": self.grid,
+            "layout_mode": self.layout_mode,
+            "bookmarks": self.bookmarks
+        }
+
+def _generate_page_job(
+    base_path: Path,
+    options: Dict[str, Any],
+    page_key: str,
+    config: Dict,
+    page_manifest: Optional[Dict],
+    page_templates: Optional[Dict] = None,
+    page_prebuilt: Optional[Dict] = None
+) -> Dict[str, Any]:
+    """Process-pool entry point: generate one page and report its results."""
+    generator = VisualGenerator(base_path, template_cache=page_templates, **options)
+    generator._prebuilt = page_prebuilt or {}
+    known_templates = set(page_templates or ())
+    if generator.incremental:
+        generator.manifest["pages"] = {config["page_id"]: page_manifest or {}}
+
+    output = io.StringIO()
+    with redirect_stdout(output):
+        files = generator.generate_page(page_key, config, validate=False)
+
+    return {
+        "page_key": page_key,
+        "page_id": config["page_id"],
+        "files": files,
+        "output": output.getvalue(),
+        "generated_count": generator.generated_count,
+        "skipped_count": generator.skipped_count,
+        "removed_count": generator.removed_count,
+        "page_bookmarks": generator.page_bookmarks,
+        "templates": {key: value for key, value in (page_templates or {}).items() if key not in known_templates},
+        "page_manifest": generator.manifest["pages"].get(config["page_id"], {}) if generator.incremental else None
+    }
+
+# =============================================================================
+# BATCH GENERATION (tenant/agency report variants)
+# =============================================================================
+
+def load_batch_manifest(manifest_path: Path) -> List[Dict[str, Any]]:
+    """
+    Load a batch manifest and return its fully resolved targets.
+
+    Manifest format:
+        {
+          "defaults": {"measure_entity": "...", "entity_names": {...}, "theme": "..."},
+          "targets": [
+            {
+              "name": "acf",
+              "report": "path/to/ACF Live Events.Report",
+              "pages": ["executive_summary", "explorer"],      (optional, default all)
+              "page_ids": {"executive_summary": "<page id>"},   (optional)
+              "measure_entity": "Measures_ACF",                 (optional)
+              "entity_names": {"ga4-pages": "acf-ga4-pages"},   (optional)
+              "theme": "themes/acf_theme.json",                 (optional)
+              "grid": "1080p",                                  (optional, default 720p)
+              "mode": "collapsed"                               (optional, default expanded)
+            }
+          ]
+        }
+
+    Relative paths are resolved against the manifest's folder; per-target
+    values override the defaults (entity_names dicts are merged).
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    root = manifest_path.parent
+    defaults = manifest.get("defaults", {})
+    targets = []
+
+    for index, target in enumerate(manifest.get("targets", [])):
+        if "report" not in target:
+            raise ValueError(f"Batch target #{index} is missing 'report'")
+
+        resolved = {**defaults, **target}
+        resolved["entity_names"] = {**defaults.get("entity_names", {}), **target.get("entity_names", {})}
+        resolved["report"] = root / resolved["report"]
+        resolved.setdefault("name", resolved["report"].stem)
+        if resolved.get("theme"):
+            resolved["theme"] = root / resolved["theme"]
+
+        if resolved.get("grid", DEFAULT_GRID) not in LAYOUT_GRIDS:
+            raise ValueError(f"Batch target '{resolved['name']}' has unknown grid: {resolved['grid']}")
+        if resolved.get("mode", DEFAULT_MODE) not in LAYOUT_MODES:
+            raise ValueError(f"Batch target '{resolved['name']}' has unknown layout mode: {resolved['mode']}")
+
+        unknown_pages = [key for key in resolved.get("pages", []) if key not in PAGE_CONFIGS]
+        if unknown_pages:
+            raise ValueError(f"Batch target '{resolved['name']}' lists unknown pages: {unknown_pages}")
+
+        targets.append(resolved)
+
+    return targets
+
+def build_entity_map(target: Dict[str, Any]) -> Dict[str, str]:
+    """Entity rename map for a batch target (measure entity + table overrides)."""
+    entity_map = dict(target.get("entity_names", {}))
+    measure_entity = target.get("measure_entity")
+    if measure_entity and measure_entity != DEFAULT_MEASURE_ENTITY:
+        entity_map[DEFAULT_MEASURE_ENTITY] = measure_entity
+    return entity_map
+
+def resolve_target_pages(target: Dict[str, Any], base_path: Path, persist_index: bool = True) -> Dict[str, Dict]:
+    """Page configs for a batch target, with page IDs resolved against its pages.json."""
+    page_keys = target.get("pages") or list(PAGE_CONFIGS.keys())
+    page_ids = target.get("page_ids", {})
+    mapping = get_page_id_mapping(base_path, persist=persist_index)
+
+    page_configs = {}
+    for page_key in page_keys:
+        config = PAGE_CONFIGS[page_key]
+        display_name = config["display_name"]
+        page_id = (
+            page_ids.get(page_key)
+            or mapping.get(display_name)
+            or mapping.get(display_name.lower().replace(" ", "_"))
+            or config["page_id"]
+        )
+        page_configs[page_key] = {**config, "page_id": page_id}
+    return page_configs
+
+def apply_theme(report_root: Path, theme_path: Path, dry_run: bool = False) -> None:
+    """Register a custom theme JSON with a report (RegisteredResources + report.json)."""
+    theme_name = theme_path.name
+    if dry_run:
+        print(f"  DRY-RUN: Would apply theme {theme_name}")
+        return
+
+    resources_dir = report_root / "StaticResources" / "RegisteredResources"
+    resources_dir.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(theme_path, resources_dir / theme_name)
+
+    report_json_path = report_root / "definition" / "report.json"
+    with open(report_json_path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+
+    theme_collection = report.setdefault("themeCollection", {})
+    custom_theme = theme_collection.get("customTheme", {})
+    custom_theme.update({"name": theme_name, "type": "RegisteredResources"})
+    theme_collection["customTheme"] = custom_theme
+
+    packages = report.setdefault("resourcePackages", [])
+    registered = next((p for p in packages if p.get("type") == "RegisteredResources"), None)
+    if registered is None:
+        registered = {"name": "RegisteredResources", "type": "RegisteredResources", "items": []}
+        packages.append(registered)
+    registered["items"] = [item for item in registered.get("items", []) if item.get("type") != "CustomTheme"]
+    registered["items"].insert(0, {"name": theme_name, "path": theme_name, "type": "CustomTheme"})
+
+    # Drop a SharedResources custom theme that would otherwise shadow the new one
+    for package in packages:
+        if package.get("type") == "SharedResources":
+            package["items"] = [item for item in package.get("items", []) if item.get("type") != "CustomTheme"]
+
+    with open(report_json_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"  THEME: {theme_name}")
+
+def run_batch(
+    manifest_path: Path,
+    dry_run: bool = False,
+    incremental: bool = False,
+    id_mode: str = "random",
+    jobs: int = 1,
+    output_format: str = "pretty",
+    fsync: bool = False,
+    validate_fields: bool = True,
+    max_queries: Optional[int] = None
+) -> List[Tuple[str, VisualGenerator]]:
+    """
+    Generate every target in a batch manifest within one process.
+
+    All targets share one template cache, so each distinct visual config is
+    built once and later targets only pay for the entity remap and write.
+    Targets may retarget the grid and layout mode (e.g. 1080p collapsed);
+    each (grid, mode) layout is solved once for the whole batch.
+    """
+    targets = load_batch_manifest(manifest_path)
+
+    # Every target draws from PAGE_CONFIGS, so validate them all before writing anything
+    page_keys = {key for target in targets for key in (target.get("pages") or PAGE_CONFIGS)}
+    page_configs = {key: PAGE_CONFIGS[key] for key in PAGE_CONFIGS if key in page_keys}
+    errors = validate_page_configs(page_configs)
+    for layout in sorted({(t.get("grid", DEFAULT_GRID), t.get("mode", DEFAULT_MODE)) for t in targets}):
+        try:
+            apply_layout(page_configs, *layout)
+        except LayoutError as e:
+            errors.extend(e.errors)
+    if errors:
+        raise ConfigValidationError(errors)
+    if max_queries is not None:
+        errors = check_query_budget(page_configs, max_queries)
+        if errors:
+            raise QueryBudgetError(errors)
+
+    template_cache: Dict = {}
+    model_indexes: Dict[Path, Optional[ModelIndex]] = {}
+    generators = []
+
+    for target in targets:
+        report_root = target["report"]
+        base_path = report_root / "definition" / "pages"
+        print(f"\n{'#'*60}")
+        print(f"Batch target: {target['name']}")
+        print(f"Report: {report_root}")
+        print(f"{'#'*60}")
+
+        if not base_path.exists() and not dry_run:
+            print(f"  ERROR: Report pages folder not found: {base_path}")
+            continue
+
+        model_index = None
+        if validate_fields:
+            model_path = find_semantic_model(report_root)
+            if model_path is None:
+                print("  NOTE: No semantic model found for this report; field validation skipped")
+            else:
+                if model_path not in model_indexes:
+                    model_indexes[model_path] = load_model_index(model_path)
+                model_index = model_indexes[model_path]
+
+        generator = VisualGenerator(
+            base_path,
+            dry_run=dry_run,
+            incremental=incremental,
+            id_mode=id_mode,
+            entity_map=build_entity_map(target),
+            template_cache=template_cache,
+            output_format=output_format,
+            fsync=fsync,
+            model_index=model_index,
+            grid=target.get("grid", DEFAULT_GRID),
+            layout_mode=target.get("mode", DEFAULT_MODE)
+        )
+        generator.generate_pages(resolve_target_pages(target, base_path, persist_index=not dry_run), jobs=jobs)
+        generator.save_manifest()
+        generator.write_bookmarks()
+
+        if target.get("theme"):
+            apply_theme(report_root, target["theme"], dry_run=dry_run)
+
+        generators.append((target["name"], generator))
+
+    return generators
+
 # =============================================================================
 # MAIN
 # =============================================================================
@@ -3342,7 +4820,14 @@ def main():
 Examples:
   python generate_visuals.py --page executive_summary
   python generate_visuals.py --all --dry-run
+  python generate_visuals.py --all --incremental
+  python generate_visuals.py --all --id-mode deterministic
+  python generate_visuals.py --all --jobs 4
+  python generate_visuals.py --batch variants.json
+  python generate_visuals.py --all --output-format compact --fsync
+  python generate_visuals.py --all --grid 1080p --layout-mode collapsed
   python generate_visuals.py --blueprint blueprints/executive_summary.json
+  python generate_visuals.py --blueprints "blueprints/*.json" --jobs 4
   python generate_visuals.py --show-mapping
 
 Field Reference Formats (in blueprint files):
@@ -3378,6 +4863,77 @@ Field Reference Formats (in blueprint files):
         metavar="PATH",
         help="Load page config from a JSON blueprint file"
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(f"Only rewrite visuals whose config changed since the last run (tracked in {MANIFEST_FILENAME}); "
+              "visuals keep their IDs by element name or layout slot")
+    )
+    parser.add_argument(
+        "--id-mode",
+        choices=ID_MODES,
+        default="random",
+        help="How visual/filter/field IDs are generated: random (default) or "
+             "deterministic (derived from page key + visual role + position)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Generate pages concurrently in N worker processes (default: 1)"
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=OUTPUT_FORMATS,
+        default="pretty",
+        help="visual.json layout: pretty (indent=2, default), compact (minified) "
+             "or canonical (sorted keys, stable separators)"
+    )
+    parser.add_argument(
+        "--grid",
+        choices=sorted(LAYOUT_GRIDS),
+        default=DEFAULT_GRID,
+        help=f"Grid that visual slots are solved against (default: {DEFAULT_GRID})"
+    )
+    parser.add_argument(
+        "--layout-mode",
+        choices=LAYOUT_MODES,
+        default=DEFAULT_MODE,
+        help=f"Content width for slotted visuals: expanded (actions panel shown) or collapsed "
+             f"(default: {DEFAULT_MODE})"
+    )
+    parser.add_argument(
+        "--fsync",
+        action="store_true",
+        help="fsync written files once per page so output survives a crash/power loss"
+    )
+    parser.add_argument(
+        "--no-validate-fields",
+        action="store_true",
+        help="Skip checking measure/column references against the semantic model's TMDL files"
+    )
+    parser.add_argument(
+        "--max-queries",
+        type=int,
+        metavar="N",
+        help="Fail if any page would issue more than N DAX queries on load"
+    )
+    parser.add_argument(
+        "--batch",
+        type=str,
+        metavar="MANIFEST",
+        help="Generate every report variant listed in a batch manifest JSON"
+    )
+    parser.add_argument(
+        "--blueprints",
+        type=str,
+        nargs="?",
+        const=str(BLUEPRINTS_DIR),
+        metavar="DIR_OR_GLOB",
+        help="Load every blueprint in a folder or matching a glob and generate them in one run "
+             f"(default folder: {BLUEPRINTS_DIR.name}/)"
+    )
     parser.add_argument(
         "--show-mapping",
         action="store_true",
@@ -3390,7 +4946,7 @@ Field Reference Formats (in blueprint files):
     if args.show_mapping:
         print("\nPage ID Mapping (from pages.json):")
         print("-" * 50)
-        mapping = get_page_id_mapping()
+        mapping = get_page_id_mapping(persist=False)
         if mapping:
             # Filter to unique display names (not normalized versions)
             seen_ids = set()
@@ -3411,63 +4967,96 @@ Field Reference Formats (in blueprint files):
             print(f"  {key}: {config['display_name']} ({missing} to generate, {existing} existing)")
         return
 
-    # Load from external blueprint if specified
-    if args.blueprint:
-        blueprint_path = Path(args.blueprint)
-        if not blueprint_path.exists():
-            print(f"ERROR: Blueprint file not found: {blueprint_path}")
-            return
-
-        print(f"\nLoading blueprint from: {blueprint_path}")
-        blueprint = load_blueprint(blueprint_path)
-
-        # Get page ID - try mapping first, then use provided ID
-        page_spec = blueprint.get("page", blueprint)
-        display_name = page_spec.get("displayName", "")
-        page_id = page_spec.get("page_id", "")
-
-        if not page_id and display_name:
-            mapping = get_page_id_mapping()
-            page_id = mapping.get(display_name) or mapping.get(display_name.lower().replace(" ", "_"))
+    # Field validation against the report's semantic model (TMDL index)
+    model_index = None if args.no_validate_fields else load_report_model_index(BASE_PATH)
 
-        if not page_id:
-            print(f"ERROR: Could not determine page ID. Specify 'page_id' in blueprint or ensure displayName matches pages.json")
+    # Batch mode: many report variants in one process
+    if args.batch:
+        manifest_path = Path(args.batch)
+        if not manifest_path.exists():
+            print(f"ERROR: Batch manifest not found: {manifest_path}")
             return
 
-        # Create temp config
-        temp_config = {
-            "blueprint_page": {
-                "page_id": page_id,
-                "display_name": display_name or "Blueprint Page",
-                "visuals": page_spec.get("visuals", [])
-            }
-        }
+        generators = run_batch(
+            manifest_path,
+            dry_run=args.dry_run,
+            incremental=args.incremental,
+            id_mode=args.id_mode,
+            jobs=args.jobs,
+            output_format=args.output_format,
+            fsync=args.fsync,
+            validate_fields=not args.no_validate_fields,
+            max_queries=args.max_queries
+        )
+
+        print(f"\n{'='*60}")
+        print(f"Batch Summary ({len(generators)} targets):")
+        for name, target_generator in generators:
+            print(f"  {name:30} generated {target_generator.generated_count}, "
+                  f"skipped {target_generator.skipped_count}")
+        print(f"  Total generated: {sum(g.generated_count for _, g in generators)}")
+        print(f"  Total skipped (unchanged): {sum(g.skipped_count for _, g in generators)}")
+        if args.dry_run:
+            print("  (DRY-RUN mode - no files were written)")
+        print(f"{'='*60}")
+        return
 
-        generator = VisualGenerator(BASE_PATH, dry_run=args.dry_run)
-        # Temporarily add to PAGE_CONFIGS
-        PAGE_CONFIGS["blueprint_page"] = temp_config["blueprint_page"]
-        results = {"blueprint_page": generator.generate_page("blueprint_page")}
-        del PAGE_CONFIGS["blueprint_page"]
+    # Load from external blueprint file(s) if specified
+    if args.blueprint or args.blueprints:
+        if args.blueprint:
+            blueprint_paths = [Path(args.blueprint)]
+            if not blueprint_paths[0].exists():
+                print(f"ERROR: Blueprint file not found: {blueprint_paths[0]}")
+                return
+        else:
+            blueprint_paths = find_blueprints(args.blueprints)
+            if not blueprint_paths:
+                print(f"ERROR: No blueprint files match: {args.blueprints}")
+                return
+
+        for blueprint_path in blueprint_paths:
+            print(f"Loading blueprint from: {blueprint_path}")
+        page_configs = load_blueprint_pages(blueprint_paths, persist_index=not args.dry_run)
+
+        generator = VisualGenerator(BASE_PATH, dry_run=args.dry_run, incremental=args.incremental,
+                                    id_mode=args.id_mode, output_format=args.output_format,
+                                    fsync=args.fsync, model_index=model_index,
+                                    max_queries=args.max_queries, grid=args.grid,
+                                    layout_mode=args.layout_mode)
+        results = generator.generate_pages(page_configs, jobs=args.jobs)
 
     elif not args.page and not args.all:
         parser.print_help()
         return
 
     else:
-        generator = VisualGenerator(BASE_PATH, dry_run=args.dry_run)
+        generator = VisualGenerator(BASE_PATH, dry_run=args.dry_run, incremental=args.incremental,
+                                    id_mode=args.id_mode, output_format=args.output_format,
+                                    fsync=args.fsync, model_index=model_index,
+                                    max_queries=args.max_queries, grid=args.grid,
+                                    layout_mode=args.layout_mode)
 
         if args.all:
-            results = generator.generate_all()
+            results = generator.generate_all(jobs=args.jobs)
         else:
             results = {args.page: generator.generate_page(args.page)}
 
+    generator.save_manifest()
+    generator.write_bookmarks()
+
     print(f"\n{'='*60}")
     print(f"Summary:")
     print(f"  Generated: {generator.generated_count}")
-    print(f"  Skipped (existing): {generator.skipped_count}")
+    print(f"  Skipped (unchanged): {generator.skipped_count}")
+    if generator.removed_count:
+        print(f"  Removed (no longer in config): {generator.removed_count}")
     if args.dry_run:
         print("  (DRY-RUN mode - no files were written)")
     print(f"{'='*60}")
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    except ConfigValidationError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+HHS Live Events Dashboard - Monthly Partition Builder (Incremental Refresh)
+
+Every CSV-backed table loads one whole export through a single import
+partition, so each refresh re-reads all history. This tool splits the dated
+exports (tables with a Date column, e.g. ga4-daily2 and gsc-chart) into one
+cleaned CSV per calendar month and generates one TMDL partition per month.
+
+Each slice is hashed (SHA-256 of the cleaned file) and recorded in a
+manifest. A run reports which months are new, changed or removed, and can
+write a TMSL refresh command that processes only those partitions over the
+XMLA endpoint; unchanged months keep their loaded data.
+
+Rows are streamed through csv_pipeline's reader with each table's own load
+options, so cleaning and typing match the single-file pipeline.
+
+Generated partitions are annotated with the raw export's load spec, so
+after --apply this tool and the other csv_pipeline consumers still read the
+full export rather than one monthly slice.
+
+Usage:
+    python incremental_partitions.py --list
+    python incremental_partitions.py --input datasets
+    python incremental_partitions.py --table ga4-daily2 --apply
+    python incremental_partitions.py --tmsl refresh.json
+"""
+
+import re
+import csv
+import json
+import codecs
+import hashlib
+import argparse
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+from csv_pipeline import (
+    DEFAULT_INPUT_DIR, RAW_EXPORT_ANNOTATION, column_converters, partition_m, raw_export_spec, read_chunks,
+    table_specs
+)
+from tmdl_index import DEFAULT_MODEL_PATH, load_model_index, quote_tmdl_name, tables_dir_for
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Source columns treated as the slicing date when a table has one
+DATE_COLUMN_NAMES = ("date", "day", "event date")
+
+# Records slice hashes per table (stored in the output folder)
+PARTITION_MANIFEST_FILENAME = ".partition_manifest.json"
+
+# Bump whenever slicing rules change so existing slices are rebuilt
+PARTITION_VERSION = 1
+
+# =============================================================================
+# SLICING
+# =============================================================================
+
+def find_date_column(spec: Dict[str, Any]) -> Optional[str]:
+    """Source column a table is sliced on: a dateTime column or one named like a date."""
+    for name in spec["types"]:
+        if name.lower() in DATE_COLUMN_NAMES:
+            return name
+    for name, data_type in spec["types"].items():
+        if data_type == "dateTime":
+            return name
+    return None
+
+def month_key(value: Any) -> Optional[str]:
+    """YYYY-MM for a date value (YYYYMMDD integers accepted)."""
+    if isinstance(value, int):
+        try:
+            value = datetime.strptime(str(value), "%Y%m%d").date()
+        except ValueError:
+            return None
+    if isinstance(value, date):
+        return f"{value.year:04d}-{value.month:02d}"
+    return None
+
+def partition_name(table_name: str, month: str) -> str:
+    return f"{table_name}-{month}"
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def split_by_month(
+    source: Path,
+    spec: Dict[str, Any],
+    date_column: str,
+    slice_dir: Path,
+    table_name: str
+) -> Tuple[List[str], Dict[str, Dict[str, Any]], int]:
+    """
+    Stream a raw export into one cleaned temp CSV per month.
+
+    Returns (header, {month: {"path": temp path, "rows": n}}, undated rows).
+    Rows without a parseable date are counted and left out.
+    """
+    header, chunks = read_chunks(source, spec)
+    if date_column not in header:
+        raise ValueError(f"date column {date_column!r} not in {source.name} header")
+    position = header.index(date_column)
+    slices: Dict[str, Dict[str, Any]] = {}
+    undated = 0
+
+    try:
+        for chunk in chunks:
+            for row in chunk:
+                month = month_key(row[position])
+                if month is None:
+                    undated += 1
+                    continue
+                target = slices.get(month)
+                if target is None:
+                    path = slice_dir / f"{partition_name(table_name, month)}.csv.tmp"
+                    handle = open(path, "w", encoding="utf-8", newline="")
+                    writer = csv.writer(handle)
+                    writer.writerow(header)
+                    target = slices[month] = {"path": path, "rows": 0, "handle": handle, "writer": writer}
+                target["writer"].writerow(
+                    "" if value is None else value.isoformat() if isinstance(value, date) else value
+                    for value in row
+                )
+                target["rows"] += 1
+    finally:
+        for target in slices.values():
+            target.pop("writer")
+            target.pop("handle").close()
+
+    return header, dict(sorted(slices.items())), undated
+
+def commit_slices(
+    slices: Dict[str, Dict[str, Any]],
+    previous: Dict[str, Dict[str, Any]],
+    slice_dir: Path,
+    table_name: str
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, List[str]]]:
+    """
+    Hash the new slices and keep only the ones whose content changed.
+
+    Returns (manifest entries by month, {"new"|"changed"|"unchanged"|"removed": [months]}).
+    """
+    entries: Dict[str, Dict[str, Any]] = {}
+    status: Dict[str, List[str]] = {"new": [], "changed": [], "unchanged": [], "removed": []}
+
+    for month, target in slices.items():
+        destination = slice_dir / f"{partition_name(table_name, month)}.csv"
+        digest = _file_hash(target["path"])
+        entries[month] = {"hash": digest, "rows": target["rows"]}
+        old = previous.get(month)
+        if old is not None and old.get("hash") == digest and destination.exists():
+            target["path"].unlink()
+            status["unchanged"].append(month)
+        else:
+            target["path"].replace(destination)
+            status["changed" if old is not None else "new"].append(month)
+
+    for month in sorted(set(previous) - set(slices)):
+        stale = slice_dir / f"{partition_name(table_name, month)}.csv"
+        if stale.exists():
+            stale.unlink()
+        status["removed"].append(month)
+
+    return entries, status
+
+# =============================================================================
+# TMDL OUTPUT
+# =============================================================================
+
+def _indent(text: str, tabs: int) -> str:
+    return "\n".join(("\t" * tabs + line) if line.strip() else "" for line in text.splitlines())
+
+def partitions_tmdl(
+    table_name: str,
+    months: List[str],
+    header: List[str],
+    types: List[str],
+    folder: str,
+    spec: Dict[str, Any]
+) -> str:
+    """
+    One import partition per month, each loading its slice (relative to pDatasetsFolder).
+
+    Every partition is annotated with the raw export's load spec, so later
+    runs (and csv_pipeline.table_specs) still resolve the full export.
+    """
+    blocks = []
+    for month in months:
+        name = partition_name(table_name, month)
+        relative_path = f"{folder}\\{table_name}\\{name}.csv"
+        blocks.append("\n".join([
+            f"\tpartition {quote_tmdl_name(name)} = m",
+            "\t\tmode: import",
+            "\t\tsource =",
+            _indent(partition_m(header, types, relative_path, "csv"), 4),
+            "",
+            f"\t\tannotation {RAW_EXPORT_ANNOTATION} = {raw_export_spec(spec)}",
+            ""
+        ]))
+    return "\n".join(blocks)
+
+def replace_partitions(text: str, new_partitions: str) -> str:
+    """
+    Swap every partition block in a table's TMDL for new_partitions.
+
+    A partition block runs from its `partition` line to the next line at
+    table depth (one tab) or below; the new blocks go where the first
+    removed one was.
+    """
+    lines = text.splitlines()
+    kept: List[str] = []
+    insert_at = None
+    in_partition = False
+    for line in lines:
+        stripped = line.strip()
+        depth = len(line) - len(line.lstrip("\t"))
+        if stripped and depth <= 1:
+            in_partition = depth == 1 and stripped.startswith("partition ")
+            if in_partition and insert_at is None:
+                insert_at = len(kept)
+        if not in_partition:
+            kept.append(line)
+    if insert_at is None:
+        raise ValueError("table has no partition to replace")
+    block = new_partitions.rstrip("\n").split("\n") + [""]
+    result = kept[:insert_at] + block + kept[insert_at:]
+    return "\n".join(result) + ("\n" if text.endswith("\n") else "")
+
+def apply_partitions(table_path: Path, new_partitions: str) -> None:
+    """Rewrite a table's .tmdl with new_partitions, keeping its BOM and line endings."""
+    raw = table_path.read_bytes()
+    bom = codecs.BOM_UTF8 if raw.startswith(codecs.BOM_UTF8) else b""
+    text = raw[len(bom):].decode("utf-8")
+    newline = "\r\n" if "\r\n" in text else "\n"
+    updated = replace_partitions(text.replace("\r\n", "\n"), new_partitions)
+    table_path.write_bytes(bom + updated.replace("\n", newline).encode("utf-8"))
+
+def tmsl_refresh(database: str, partitions: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """TMSL command that refreshes only the given (table, partition) pairs."""
+    return {
+        "refresh": {
+            "type": "full",
+            "objects": [
+                {"database": database, "table": table_name, "partition": name}
+                for table_name, name in partitions
+            ]
+        }
+    }
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def _file_stamp(path: Path) -> List[int]:
+    stat = path.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Split dated CSV exports into monthly slices and per-month TMDL partitions"
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default=str(DEFAULT_MODEL_PATH),
+        metavar="PATH",
+        help="Path to the .SemanticModel folder"
+    )
+    parser.add_argument(
+        "--input",
+        type=str,
+        default=str(DEFAULT_INPUT_DIR),
+        metavar="DIR",
+        help="Folder holding the raw exports (the model's pDatasetsFolder)"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        metavar="DIR",
+        help="Folder for the monthly slices (default: <input>/partitions)"
+    )
+    parser.add_argument(
+        "--table",
+        action="append",
+        help="Only process this table (repeatable)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-split sources even if the export file is unchanged"
+    )
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="Replace the partitions in each table's .tmdl file with the monthly partitions"
+    )
+    parser.add_argument(
+        "--tmsl",
+        type=str,
+        metavar="FILE",
+        help="Write a TMSL refresh command for new and changed partitions"
+    )
+    parser.add_argument(
+        "--list",
+        action="store_true",
+        help="List dated CSV-backed tables and their slicing column"
+    )
+
+    args = parser.parse_args()
+    model_path = Path(args.model)
+    specs = table_specs(model_path)
+    dated = {name: (spec, find_date_column(spec)) for name, spec in specs.items()}
+    dated = {name: value for name, value in dated.items() if value[1] is not None}
+
+    if args.list:
+        for table_name, (spec, date_column) in dated.items():
+            note = f"  (left to Power Query: {', '.join(spec['unsupported'])})" if spec["unsupported"] else ""
+            print(f"  {table_name:34} {spec['file']:32} by month of [{date_column}]{note}")
+        return
+
+    if args.table:
+        unknown = [name for name in args.table if name not in dated]
+        if unknown:
+            parser.error(f"not a dated CSV-backed table: {', '.join(unknown)} (available: {', '.join(dated)})")
+        dated = {name: dated[name] for name in args.table}
+
+    index = load_model_index(model_path)
+    input_dir = Path(args.input)
+    output_dir = Path(args.output) if args.output else input_dir / "partitions"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / PARTITION_MANIFEST_FILENAME
+    manifest: Dict[str, Any] = {}
+    if manifest_path.exists():
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+
+    to_refresh: List[Tuple[str, str]] = []
+    for table_name, (spec, date_column) in dated.items():
+        source = input_dir / spec["file"]
+        if spec["unsupported"]:
+            print(f"  SKIP: {table_name} (reshaped in Power Query: {', '.join(spec['unsupported'])})")
+            continue
+        if not source.exists():
+            print(f"  MISSING: {source}")
+            continue
+
+        previous = manifest.get(table_name, {})
+        stamp = _file_stamp(source)
+        if (not args.force and previous.get("stamp") == stamp
+                and previous.get("version") == PARTITION_VERSION and not args.apply):
+            print(f"  UNCHANGED: {table_name} ({len(previous.get('slices', {}))} monthly partitions)")
+            continue
+
+        slice_dir = output_dir / table_name
+        slice_dir.mkdir(parents=True, exist_ok=True)
+        header, slices, undated = split_by_month(source, spec, date_column, slice_dir, table_name)
+        old_slices = previous.get("slices", {}) if previous.get("version") == PARTITION_VERSION else {}
+        entries, status = commit_slices(slices, old_slices, slice_dir, table_name)
+        manifest[table_name] = {"stamp": stamp, "version": PARTITION_VERSION, "slices": entries}
+
+        print(f"\n  {table_name}: {sum(e['rows'] for e in entries.values()):,} rows in {len(entries)} months")
+        for key in ("new", "changed", "removed"):
+            if status[key]:
+                print(f"    {key:9} {', '.join(status[key])}")
+        print(f"    unchanged {len(status['unchanged'])} month(s)")
+        if undated:
+            print(f"    WARNING: {undated:,} row(s) without a parseable [{date_column}] were left out")
+        to_refresh.extend((table_name, partition_name(table_name, m)) for m in status["new"] + status["changed"])
+
+        types = [data_type for data_type, _ in column_converters(header, spec)]
+        tmdl = partitions_tmdl(table_name, list(entries), header, types, output_dir.name, spec)
+        (output_dir / f"{table_name}.partitions.tmdl").write_text(tmdl, encoding="utf-8")
+        if args.apply:
+            table_path = tables_dir_for(model_path) / index.tables[table_name]["file"]
+            apply_partitions(table_path, tmdl)
+            print(f"    Applied {len(entries)} partitions to {table_path.name}")
+        else:
+            print(f"    Wrote: {output_dir / table_name}.partitions.tmdl")
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    if args.tmsl:
+        database = re.sub(r"\.SemanticModel$", "", model_path.resolve().name)
+        with open(args.tmsl, "w", encoding="utf-8") as f:
+            json.dump(tmsl_refresh(database, to_refresh), f, indent=2)
+        print(f"\nWrote TMSL refresh for {len(to_refresh)} partition(s): {args.tmsl}")
+    else:
+        print(f"\nPartitions to refresh: {len(to_refresh)}")
+        for table_name, name in to_refresh:
+            print(f"  {table_name} / {name}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+HHS Live Events Dashboard - Slot Layout Engine
+
+Visual configs name a slot instead of pixel coordinates, and x/y/width/height
+are solved from a grid definition for a given layout mode:
+
+    "slot": "kpi[2]"               KPI row, third card
+    "slot": "section_1.full"       full content width of section 1
+    "slot": "section_2.left"       left half of a 2-up row ("right" likewise)
+    "slot": "section_1.third[1]"   middle column of a 3-up row
+    "slot": "header.date_slicer"   fixed chrome (header controls, actions panel)
+
+A config's own "position" still supplies z and tabOrder; the slot owns the
+rectangle. Configs without a slot keep their absolute position.
+
+Grids describe the canvas, content span per mode (the actions panel narrows
+the content area when expanded), gap, KPI row, section bands and fixed
+chrome rectangles. Solving a (grid, mode) pair is memoized, so producing
+720p/1080p x expanded/collapsed variants of every page solves each layout once.
+
+Usage:
+    python layout_engine.py --list
+    python layout_engine.py --grid 1080p --mode collapsed
+    python layout_engine.py --grid 720p --slot section_2.right
+"""
+
+import argparse
+from functools import lru_cache
+from typing import Dict, List, Any, Tuple
+
+# =============================================================================
+# GRID DEFINITIONS
+# =============================================================================
+
+# "expanded" leaves room for the actions panel; "collapsed" hides it
+LAYOUT_MODES = ("expanded", "collapsed")
+
+# Rects are [x, y, width, height]
+LAYOUT_GRIDS: Dict[str, Dict[str, Any]] = {
+    # The 1280x720 grid PAGE_CONFIGS was authored against (see GRID)
+    "720p": {
+        "canvas": {"width": 1280, "height": 720},
+        "content_start_x": 56,
+        "content_end": {"expanded": 953, "collapsed": 1232},
+        "gap": 8,
+        "kpi_row": {"y": 83, "height": 67, "width": 197, "x_positions": [56, 261, 465, 670]},
+        "sections": {
+            "section_1": {"y": 176, "height": 254},
+            "section_2": {"y": 456, "height": 220},
+        },
+        "fixed": {
+            "header.page_slicer": [600, 34, 120, 28],
+            "header.date_slicer": [728, 34, 120, 28],
+            "header.info": [856, 34, 28, 28],
+            "header.reset": [892, 34, 28, 28],
+            "header.refresh": [1083, 31, 133, 10],
+            "panel.container": [965, 134, 267, 275],
+            "panel.accent": [965, 134, 3, 275],
+            "panel.title": [978, 144, 248, 19],
+            "panel.body": [978, 169, 241, 230],
+            "panel.expand_button": [990, 82, 106, 40],
+            "panel.collapse_button": [1102, 82, 106, 40],
+        },
+    },
+    # The 1920x1080 spec (hhs_live_events_1920x1080.json layout + kpiRowTemplate)
+    "1080p": {
+        "canvas": {"width": 1920, "height": 1080},
+        "content_start_x": 84,
+        "content_end": {"expanded": 1430, "collapsed": 1848},
+        "gap": 12,
+        "kpi_row": {"y": 124, "height": 100, "width": 295, "x_positions": [84, 391, 698, 1005]},
+        "sections": {
+            "section_1": {"y": 264, "height": 381},
+            "section_2": {"y": 684, "height": 330},
+        },
+        "fixed": {
+            "header.date_slicer": [84, 26, 200, 50],
+            "header.page_slicer": [296, 26, 200, 50],
+            "header.reset": [1401, 26, 50, 50],
+            "header.info": [1461, 26, 50, 50],
+            "header.refresh": [1523, 43, 200, 16],
+            "panel.container": [1448, 201, 400, 412],
+            "panel.accent": [1448, 201, 4, 412],
+            "panel.title": [1467, 216, 372, 28],
+            "panel.body": [1467, 258, 361, 310],
+            "panel.expand_button": [1485, 123, 159, 60],
+            "panel.collapse_button": [1653, 123, 159, 60],
+        },
+    },
+}
+
+DEFAULT_GRID = "720p"
+DEFAULT_MODE = "expanded"
+
+# Position keys a slot owns; anything else in a config's position is kept
+SLOT_KEYS = ("x", "y", "width", "height")
+
+
+class LayoutError(ValueError):
+    """Raised when visual configs name unknown grids, modes or slots."""
+
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        super().__init__(f"{len(errors)} layout error(s):\n  " + "\n  ".join(errors))
+
+# =============================================================================
+# SOLVING
+# =============================================================================
+
+def _rect(x: int, y: int, width: int, height: int) -> Dict[str, int]:
+    return {"x": x, "y": y, "width": width, "height": height}
+
+def _columns(start: int, end: int, gap: int, count: int) -> List[Tuple[int, int]]:
+    """Split [start, end) into `count` columns; the last column absorbs rounding."""
+    width = (end - start - gap * (count - 1)) // count
+    columns = []
+    for i in range(count):
+        x = start + i * (width + gap)
+        columns.append((x, width if i < count - 1 else end - x))
+    return columns
+
+@lru_cache(maxsize=None)
+def solve_layout(grid: str = DEFAULT_GRID, mode: str = DEFAULT_MODE) -> Dict[str, Dict[str, int]]:
+    """
+    Every slot rectangle for a grid in a layout mode (memoized).
+
+    The returned mapping is shared between callers; copy a rect before
+    changing it.
+    """
+    if grid not in LAYOUT_GRIDS:
+        raise LayoutError([f"unknown grid {grid!r} (available: {sorted(LAYOUT_GRIDS)})"])
+    if mode not in LAYOUT_MODES:
+        raise LayoutError([f"unknown layout mode {mode!r} (available: {list(LAYOUT_MODES)})"])
+
+    spec = LAYOUT_GRIDS[grid]
+    start = spec["content_start_x"]
+    end = spec["content_end"][mode]
+    gap = spec["gap"]
+    slots: Dict[str, Dict[str, int]] = {}
+
+    kpi = spec["kpi_row"]
+    for i, x in enumerate(kpi["x_positions"]):
+        slots[f"kpi[{i}]"] = _rect(x, kpi["y"], kpi["width"], kpi["height"])
+
+    halves = _columns(start, end, gap, 2)
+    thirds = _columns(start, end, gap, 3)
+    for name, band in spec["sections"].items():
+        y, height = band["y"], band["height"]
+        slots[f"{name}.full"] = _rect(start, y, end - start, height)
+        slots[f"{name}.left"] = _rect(halves[0][0], y, halves[0][1], height)
+        slots[f"{name}.right"] = _rect(halves[1][0], y, halves[1][1], height)
+        for i, (x, width) in enumerate(thirds):
+            slots[f"{name}.third[{i}]"] = _rect(x, y, width, height)
+
+    for name, (x, y, width, height) in spec["fixed"].items():
+        slots[name] = _rect(x, y, width, height)
+    return slots
+
+def resolve_position(config: Dict, grid: str = DEFAULT_GRID, mode: str = DEFAULT_MODE) -> Dict:
+    """A config's position with its slot (if any) solved for the grid and mode."""
+    position = config.get("position", {})
+    slot = config.get("slot")
+    if slot is None:
+        return position
+    slots = solve_layout(grid, mode)
+    if slot not in slots:
+        raise LayoutError([f"unknown slot {slot!r} for grid {grid}"])
+    resolved = dict(slots[slot])
+    resolved.update((key, value) for key, value in position.items() if key not in SLOT_KEYS)
+    return resolved
+
+def apply_layout(page_configs: Dict[str, Dict], grid: str = DEFAULT_GRID,
+                 mode: str = DEFAULT_MODE) -> Dict[str, Dict]:
+    """
+    Page configs with every slotted visual's position solved.
+
+    Returns new page and visual dicts (the inputs are not modified); raises
+    LayoutError listing every unknown slot.
+    """
+    slots = solve_layout(grid, mode)
+    errors = []
+    resolved_pages = {}
+    for page_key, page_config in page_configs.items():
+        visuals = []
+        for index, config in enumerate(page_config.get("visuals", [])):
+            slot = config.get("slot")
+            if slot is None:
+                visuals.append(config)
+            elif slot not in slots:
+                errors.append(f"{page_key}[{index}] {config.get('type')}: unknown slot {slot!r} for grid {grid}")
+            else:
+                visuals.append({**config, "position": resolve_position(config, grid, mode)})
+        resolved_pages[page_key] = {**page_config, "visuals": visuals}
+    if errors:
+        raise LayoutError(errors)
+    return resolved_pages
+
+def slot_names(grid: str = DEFAULT_GRID, mode: str = DEFAULT_MODE) -> List[str]:
+    """Slot names available on a grid, in definition order."""
+    return list(solve_layout(grid, mode))
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Show the slot rectangles solved for a layout grid and mode"
+    )
+    parser.add_argument(
+        "--grid",
+        choices=sorted(LAYOUT_GRIDS),
+        default=DEFAULT_GRID,
+        help=f"Grid definition (default: {DEFAULT_GRID})"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=LAYOUT_MODES,
+        default=DEFAULT_MODE,
+        help=f"Layout mode (default: {DEFAULT_MODE})"
+    )
+    parser.add_argument(
+        "--slot",
+        action="append",
+        help="Only show this slot (repeatable)"
+    )
+    parser.add_argument(
+        "--list",
+        action="store_true",
+        help="List grids with their canvas size and content span per mode"
+    )
+
+    args = parser.parse_args()
+
+    if args.list:
+        for name, spec in LAYOUT_GRIDS.items():
+            canvas = spec["canvas"]
+            spans = ", ".join(f"{mode} {spec['content_start_x']}-{end}" for mode, end in spec["content_end"].items())
+            print(f"  {name:6} {canvas['width']}x{canvas['height']}  content {spans}")
+        return
+
+    slots = solve_layout(args.grid, args.mode)
+    names = args.slot or list(slots)
+    unknown = [name for name in names if name not in slots]
+    if unknown:
+        parser.error(f"unknown slot(s) for grid {args.grid}: {', '.join(unknown)}")
+
+    print(f"Grid {args.grid} ({args.mode}):")
+    for name in names:
+        rect = slots[name]
+        print(f"  {name:22} x={rect['x']:5} y={rect['y']:5} w={rect['width']:5} h={rect['height']:5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+HHS Live Events Dashboard - Visual Layout Linter
+
+Checks every page's visual rectangles, stacking order and tab order, so
+layering mistakes are caught before the report is opened in Desktop. Runs
+over PAGE_CONFIGS (solved for any grid and layout mode) or over built
+report folders (visual.json files, canvas size from page.json).
+
+Rules:
+    LAY001 overlap            Visuals overlap without one being a background for the other
+    LAY002 covered            Background visual stacked above the content it contains
+    LAY003 off-canvas         Visual extends past the page canvas (or has no area)
+    LAY004 duplicate-z        Two visuals on a page share a z value
+    LAY005 duplicate-taborder Two visuals on a page share a tabOrder
+
+A visual counts as a background for another when it is a shape, textbox or
+blank-icon button that fully contains it. Hidden visuals (toggled in by
+bookmarks) are not checked for overlaps.
+
+Overlaps are found with a sweep over x and two segment-tree indexes over the
+compressed y coordinates, so a page costs O((n + k) log n) for n visuals
+and k overlapping pairs rather than comparing every pair.
+
+Usage:
+    python layout_lint.py                                   # PAGE_CONFIGS, 720p expanded
+    python layout_lint.py --grid 1080p --layout-mode collapsed
+    python layout_lint.py --report "LiveEventsGenerated/LiveEventsGenerated.Report"
+    python layout_lint.py --json --fail-on warning          # Non-zero exit for CI
+"""
+
+import sys
+import json
+import heapq
+import argparse
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Set, Tuple
+
+from generate_visuals import PAGE_CONFIGS, bind_bookmarks, build_visual, load_bookmark_specs
+from layout_engine import DEFAULT_GRID, DEFAULT_MODE, LAYOUT_GRIDS, LAYOUT_MODES, apply_layout
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+SEVERITIES = ("info", "warning", "error")
+
+RULES = {
+    "LAY001": ("overlap", "warning"),
+    "LAY002": ("covered", "warning"),
+    "LAY003": ("off-canvas", "error"),
+    "LAY004": ("duplicate-z", "warning"),
+    "LAY005": ("duplicate-taborder", "info"),
+}
+
+# Visual types that only decorate (containers, labels) and may sit behind content
+BACKGROUND_TYPES = {"shape", "basicShape", "textbox", "image"}
+
+# =============================================================================
+# RECTANGLES
+# =============================================================================
+
+def is_background(visual_json: Dict) -> bool:
+    """True for decorative visuals: shapes, textboxes and blank, link-less buttons."""
+    visual = visual_json.get("visual", {})
+    visual_type = visual.get("visualType")
+    if visual_type in BACKGROUND_TYPES:
+        return True
+    if visual_type != "actionButton":
+        return False
+    icons = visual.get("objects", {}).get("icon", [])
+    blank = any(
+        entry.get("properties", {}).get("shapeType", {}).get("expr", {}).get("Literal", {}).get("Value") == "'blank'"
+        for entry in icons
+    )
+    links = visual.get("visualContainerObjects", {}).get("visualLink", [])
+    linked = any(
+        entry.get("properties", {}).get("show", {}).get("expr", {}).get("Literal", {}).get("Value") == "true"
+        for entry in links
+    )
+    return blank and not linked
+
+def visual_rect(label: str, visual_json: Dict) -> Optional[Dict[str, Any]]:
+    """Layout record for a visual.json (None for groups and visuals without a position)."""
+    position = visual_json.get("position")
+    if not position or "visual" not in visual_json:
+        return None
+    x, y = position.get("x", 0), position.get("y", 0)
+    return {
+        "label": label,
+        "type": visual_json["visual"].get("visualType"),
+        "x": x,
+        "y": y,
+        "x2": x + position.get("width", 0),
+        "y2": y + position.get("height", 0),
+        "z": position.get("z", 0),
+        "tabOrder": position.get("tabOrder"),
+        "background": is_background(visual_json),
+        "hidden": bool(visual_json.get("isHidden")),
+    }
+
+# =============================================================================
+# OVERLAP SWEEP
+# =============================================================================
+
+class _SegmentIndex:
+    """
+    Bottom-up segment tree over m compressed coordinates holding id sets.
+
+    add_span/stab: register an id over a coordinate range, then report
+    every id whose range covers a point. add_point/span: register an id
+    at one coordinate, then report every id inside a range. Both report
+    in O(log m + k).
+    """
+
+    def __init__(self, size: int):
+        self.size = 1
+        while self.size < max(size, 1):
+            self.size *= 2
+        self.nodes: Dict[int, Set[int]] = defaultdict(set)
+
+    def _cover(self, lo: int, hi: int) -> Iterable[int]:
+        lo += self.size
+        hi += self.size
+        while lo < hi:
+            if lo & 1:
+                yield lo
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                yield hi
+            lo >>= 1
+            hi >>= 1
+
+    def _path(self, index: int) -> Iterable[int]:
+        node = index + self.size
+        while node:
+            yield node
+            node >>= 1
+
+    def add_span(self, item: int, lo: int, hi: int) -> None:
+        for node in self._cover(lo, hi):
+            self.nodes[node].add(item)
+
+    def remove_span(self, item: int, lo: int, hi: int) -> None:
+        for node in self._cover(lo, hi):
+            self.nodes[node].discard(item)
+
+    def stab(self, index: int) -> Iterable[int]:
+        for node in self._path(index):
+            yield from self.nodes.get(node, ())
+
+    def add_point(self, item: int, index: int) -> None:
+        for node in self._path(index):
+            self.nodes[node].add(item)
+
+    def remove_point(self, item: int, index: int) -> None:
+        for node in self._path(index):
+            self.nodes[node].discard(item)
+
+    def span(self, lo: int, hi: int) -> Iterable[int]:
+        for node in self._cover(lo, hi):
+            yield from self.nodes.get(node, ())
+
+def find_overlaps(rects: List[Dict[str, Any]]) -> List[Tuple[int, int]]:
+    """
+    Index pairs (i, j) of rectangles whose interiors intersect.
+
+    Sweeps left to right over x; rectangles whose x range is still open are
+    indexed by y start (ys[i] in [c, d) means "starts inside") and by y span
+    ("covers my start"). Those two cases are disjoint, so every
+    overlapping pair is reported exactly once. Shared edges do not count.
+    """
+    live = [i for i, r in enumerate(rects) if r["x2"] > r["x"] and r["y2"] > r["y"]]
+    ys = sorted({rects[i]["y"] for i in live})
+    starts = _SegmentIndex(len(ys))
+    spans = _SegmentIndex(len(ys))
+    ending: List[Tuple[float, int]] = []
+    pairs = []
+
+    for i in sorted(live, key=lambda i: rects[i]["x"]):
+        rect = rects[i]
+        while ending and ending[0][0] <= rect["x"]:
+            _, j = heapq.heappop(ending)
+            other = rects[j]
+            starts.remove_point(j, bisect_left(ys, other["y"]))
+            spans.remove_span(j, bisect_left(ys, other["y"]), bisect_left(ys, other["y2"]))
+
+        start = bisect_left(ys, rect["y"])
+        # Open rectangles that start at or above this one and still cover its top edge
+        for j in spans.stab(start):
+            pairs.append((j, i))
+        # Open rectangles that start strictly inside this one's y range
+        for j in starts.span(bisect_right(ys, rect["y"]), bisect_left(ys, rect["y2"])):
+            pairs.append((j, i))
+
+        starts.add_point(i, start)
+        spans.add_span(i, start, bisect_left(ys, rect["y2"]))
+        heapq.heappush(ending, (rect["x2"], i))
+    return pairs
+
+def _contains(outer: Dict[str, Any], inner: Dict[str, Any]) -> bool:
+    return (outer["x"] <= inner["x"] and outer["y"] <= inner["y"]
+            and outer["x2"] >= inner["x2"] and outer["y2"] >= inner["y2"])
+
+# =============================================================================
+# CHECKS
+# =============================================================================
+
+def check_page(rects: List[Dict[str, Any]], canvas: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Findings for one page's visual records against its canvas."""
+    findings = []
+
+    def add(rule: str, rect: Dict[str, Any], message: str, other: Optional[Dict[str, Any]] = None) -> None:
+        findings.append({"rule": rule, "visual": rect["label"],
+                         "other": other["label"] if other else None, "message": message})
+
+    width, height = canvas.get("width", 0), canvas.get("height", 0)
+    for rect in rects:
+        if rect["x2"] <= rect["x"] or rect["y2"] <= rect["y"]:
+            add("LAY003", rect, f"{rect['type']} has no area ({rect['x2'] - rect['x']}x{rect['y2'] - rect['y']})")
+        elif rect["x"] < 0 or rect["y"] < 0 or rect["x2"] > width or rect["y2"] > height:
+            add("LAY003", rect, f"{rect['type']} at ({rect['x']}, {rect['y']})-({rect['x2']}, {rect['y2']}) "
+                                f"extends past the {width}x{height} canvas")
+
+    shown = [rect for rect in rects if not rect["hidden"]]
+    for i, j in find_overlaps(shown):
+        first, second = shown[i], shown[j]
+        back, front = (first, second) if first["z"] <= second["z"] else (second, first)
+        if back["background"] and _contains(back, front):
+            continue
+        if front["background"] and _contains(front, back):
+            add("LAY002", front, f"{front['type']} (z {front['z']}) is stacked above {back['type']} "
+                                 f"(z {back['z']}) that it contains", back)
+            continue
+        overlap_w = min(first["x2"], second["x2"]) - max(first["x"], second["x"])
+        overlap_h = min(first["y2"], second["y2"]) - max(first["y"], second["y"])
+        add("LAY001", front, f"{front['type']} overlaps {back['type']} by {overlap_w}x{overlap_h}", back)
+
+    for key, rule in (("z", "LAY004"), ("tabOrder", "LAY005")):
+        by_value: Dict[Any, List[Dict[str, Any]]] = defaultdict(list)
+        for rect in rects:
+            if rect[key] is not None:
+                by_value[rect[key]].append(rect)
+        for value, group in by_value.items():
+            for rect in group[1:]:
+                add(rule, rect, f"{key} {value} is also used by {group[0]['label']}", group[0])
+    return findings
+
+def page_config_pages(page_configs: Dict[str, Dict], grid: str = DEFAULT_GRID,
+                      mode: str = DEFAULT_MODE) -> Iterable[Tuple[str, Dict[str, Any], List[Dict[str, Any]]]]:
+    """(page label, canvas, visual records) for PAGE_CONFIGS solved on a grid."""
+    canvas = LAYOUT_GRIDS[grid]["canvas"]
+    bookmarks = load_bookmark_specs()
+    for page_key, page_config in apply_layout(page_configs, grid, mode).items():
+        # Panel elements start hidden in the mode's bookmark (e.g. collapsed)
+        page_config = bind_bookmarks(page_key, page_config, bookmarks, mode)
+        rects = []
+        for index, config in enumerate(page_config.get("visuals", [])):
+            rect = visual_rect(f"{page_key}[{index}] {config['type']}", build_visual(config))
+            if rect is not None:
+                rects.append(rect)
+        yield page_key, canvas, rects
+
+def report_pages(report_path: Path) -> Iterable[Tuple[str, Dict[str, Any], List[Dict[str, Any]]]]:
+    """(page label, canvas, visual records) for every page in a report folder."""
+    pages_dir = report_path / "definition" / "pages"
+    for page_json_path in sorted(pages_dir.glob("*/page.json")):
+        with open(page_json_path, 'r', encoding='utf-8') as f:
+            page = json.load(f)
+        rects = []
+        for visual_path in sorted(page_json_path.parent.glob("visuals/*/visual.json")):
+            try:
+                with open(visual_path, 'r', encoding='utf-8') as f:
+                    visual_json = json.load(f)
+            except (OSError, ValueError):
+                print(f"  WARNING: Could not read {visual_path}")
+                continue
+            rect = visual_rect(visual_json.get("name", visual_path.parent.name), visual_json)
+            if rect is not None:
+                rects.append(rect)
+        canvas = {"width": page.get("width", 1280), "height": page.get("height", 720)}
+        yield page.get("displayName", page_json_path.parent.name), canvas, rects
+
+def lint(pages: Iterable[Tuple[str, Dict[str, Any], List[Dict[str, Any]]]]) -> Dict[str, Any]:
+    """Run every check over the given pages."""
+    findings = []
+    page_count = visual_count = 0
+    for page_label, canvas, rects in pages:
+        page_count += 1
+        visual_count += len(rects)
+        for finding in check_page(rects, canvas):
+            rule = finding["rule"]
+            findings.append({
+                "rule": rule,
+                "name": RULES[rule][0],
+                "severity": RULES[rule][1],
+                "page": page_label,
+                **finding
+            })
+    return {
+        "pages": page_count,
+        "visuals": visual_count,
+        "summary": dict(sorted(Counter(f["rule"] for f in findings).items())),
+        "findings": findings
+    }
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Flag overlapping, off-canvas and mis-ordered visuals on every page"
+    )
+    parser.add_argument(
+        "--report",
+        action="append",
+        metavar="PATH",
+        help="Report folder to check (repeatable; default: PAGE_CONFIGS)"
+    )
+    parser.add_argument(
+        "--grid",
+        choices=sorted(LAYOUT_GRIDS),
+        default=DEFAULT_GRID,
+        help=f"Grid PAGE_CONFIGS slots are solved against (default: {DEFAULT_GRID})"
+    )
+    parser.add_argument(
+        "--layout-mode",
+        choices=LAYOUT_MODES,
+        default=DEFAULT_MODE,
+        help=f"Layout mode PAGE_CONFIGS slots are solved for (default: {DEFAULT_MODE})"
+    )
+    parser.add_argument(
+        "--rule",
+        action="append",
+        choices=sorted(RULES),
+        help="Only report these rules (repeatable)"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the report as JSON"
+    )
+    parser.add_argument(
+        "--fail-on",
+        choices=SEVERITIES,
+        help="Exit with status 1 if any finding has this severity or higher"
+    )
+
+    args = parser.parse_args()
+    if args.report:
+        pages = (page for report in args.report for page in report_pages(Path(report)))
+    else:
+        pages = page_config_pages(PAGE_CONFIGS, args.grid, args.layout_mode)
+    report = lint(pages)
+
+    if args.rule:
+        report["findings"] = [f for f in report["findings"] if f["rule"] in args.rule]
+        report["summary"] = dict(sorted(Counter(f["rule"] for f in report["findings"]).items()))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for finding in report["findings"]:
+            print(f"{finding['page']}: {finding['severity']} {finding['rule']} "
+                  f"[{finding['visual']}] {finding['message']}")
+        print(f"\n{report['visuals']} visuals on {report['pages']} page(s), "
+              f"{len(report['findings'])} finding(s)")
+        for rule, count in report["summary"].items():
+            print(f"  {rule} {RULES[rule][0]:18} {count}")
+
+    if args.fail_on:
+        threshold = SEVERITIES.index(args.fail_on)
+        if any(SEVERITIES.index(f["severity"]) >= threshold for f in report["findings"]):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
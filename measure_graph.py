@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+HHS Live Events Dashboard - Measure Dependency Graph
+
+Parses every measure's DAX from the semantic model's TMDL files and builds
+the measure -> measure and measure -> table dependency graph. For each
+measure it reports depth (longest chain of measure references), fan-out,
+fan-in and the iterators (SUMX, RANKX, CONCATENATEX, ...) anywhere beneath
+it; for each visual in PAGE_CONFIGS it rolls those up into a relative
+formula-engine cost, so the most expensive visuals on a page stand out.
+
+Costs are static weights, not measured timings: they rank measures and
+visuals against each other, they do not predict milliseconds.
+
+Usage:
+    python measure_graph.py                       # Cost of every visual, by page
+    python measure_graph.py --page executive_summary
+    python measure_graph.py --measure "Total Engagement (Hours)"
+    python measure_graph.py --top 15              # Most expensive measures
+    python measure_graph.py --json                # Machine-readable output
+"""
+
+import re
+import json
+import argparse
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Set, Tuple
+
+from generate_visuals import PAGE_CONFIGS, build_visual, iter_field_refs
+from tmdl_index import DEFAULT_MODEL_PATH, ModelIndex, load_model_index
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Row-by-row iterators and table functions that drive formula-engine work
+ITERATOR_FUNCTIONS = {
+    "SUMX", "AVERAGEX", "MINX", "MAXX", "COUNTX", "COUNTAX", "PRODUCTX",
+    "RANKX", "CONCATENATEX", "FILTER", "ADDCOLUMNS", "SELECTCOLUMNS",
+    "GENERATE", "GENERATEALL", "TOPN", "SUMMARIZE", "SUMMARIZECOLUMNS"
+}
+
+# Relative cost of one call; anything not listed costs nothing extra
+FUNCTION_COSTS = {
+    "SUMX": 3, "AVERAGEX": 3, "MINX": 3, "MAXX": 3, "COUNTX": 3,
+    "COUNTAX": 3, "PRODUCTX": 3, "FILTER": 3, "ADDCOLUMNS": 3,
+    "SELECTCOLUMNS": 2, "SUMMARIZE": 3, "SUMMARIZECOLUMNS": 3,
+    "TOPN": 4, "RANKX": 5, "CONCATENATEX": 5, "GENERATE": 5, "GENERATEALL": 5,
+    "CALCULATE": 1, "CALCULATETABLE": 2, "SWITCH": 1
+}
+
+# Base cost of evaluating any measure
+MEASURE_BASE_COST = 1
+
+# =============================================================================
+# DAX TOKENIZER
+# =============================================================================
+
+_DAX_TOKEN = re.compile(r"""
+    (?P<comment>//[^\n]*|--[^\n]*|/\*.*?\*/)
+  | (?P<string>"(?:[^"]|"")*")
+  | (?P<table>'(?:[^']|'')*')
+  | (?P<bracket>\[(?:[^\]]|\]\])*\])
+  | (?P<name>[A-Za-z_][A-Za-z0-9_.]*)
+  | (?P<number>\d+(?:\.\d*)?)
+  | (?P<newline>\n)
+  | (?P<space>[ \t\r]+)
+  | (?P<other>.)
+""", re.VERBOSE | re.DOTALL)
+
+def tokenize_dax(expression: str) -> List[Tuple[str, str, int]]:
+    """
+    Split a DAX expression into (kind, value, line) tokens.
+
+    Kinds: "function" (name followed by '('), "name", "table" ('quoted'
+    table, quotes removed), "bracket" ([name], brackets removed), "string",
+    "number" and "op" (any other single character). Comments and
+    whitespace are dropped. Lines are 0-based offsets into the expression.
+    """
+    tokens = []
+    line = 0
+    for match in _DAX_TOKEN.finditer(expression):
+        kind = match.lastgroup
+        value = match.group()
+        if kind == "newline":
+            line += 1
+            continue
+        if kind in ("space", "comment"):
+            line += value.count("\n")
+            continue
+        if kind == "table":
+            value = value[1:-1].replace("''", "'")
+        elif kind == "bracket":
+            value = value[1:-1].replace("]]", "]")
+        elif kind == "name":
+            if expression[match.end():].lstrip().startswith("("):
+                kind = "function"
+                value = value.upper()
+        elif kind == "other":
+            kind = "op"
+        tokens.append((kind, value, line))
+        if kind == "string":
+            line += value.count("\n")
+    return tokens
+
+def extract_references(expression: str) -> Dict[str, Any]:
+    """
+    Collect the raw references in a DAX expression.
+
+    Returns:
+        {
+          "bare": [name, ...],              # [X]: a measure, or a column in row context
+          "qualified": [(table, name), ...],  # Table[X] / 'Table'[X]
+          "tables": [table, ...],           # table references without a column
+          "functions": Counter({FUNCTION: calls})
+        }
+    Names are not resolved against the model here; VAR names are dropped.
+    """
+    tokens = tokenize_dax(expression)
+    variables = {
+        tokens[i + 1][1]
+        for i, (kind, value, _) in enumerate(tokens[:-1])
+        if kind == "name" and value.upper() == "VAR" and tokens[i + 1][0] == "name"
+    }
+
+    result: Dict[str, Any] = {"bare": [], "qualified": [], "tables": [], "functions": Counter()}
+    for i, (kind, value, _) in enumerate(tokens):
+        if kind == "function":
+            result["functions"][value] += 1
+        elif kind in ("table", "name"):
+            if kind == "name" and value in variables:
+                continue
+            if i + 1 < len(tokens) and tokens[i + 1][0] == "bracket":
+                result["qualified"].append((value, tokens[i + 1][1]))
+            else:
+                result["tables"].append(value)
+        elif kind == "bracket" and (i == 0 or tokens[i - 1][0] not in ("table", "name")):
+            result["bare"].append(value)
+    return result
+
+# =============================================================================
+# DEPENDENCY GRAPH
+# =============================================================================
+
+class MeasureGraph:
+    """Measure -> measure / table dependency DAG for a semantic model."""
+
+    def __init__(self, index: ModelIndex):
+        self.index = index
+        # Canonical measure name -> {"table", "measures", "tables", "functions"}
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        for table_name, table in index.tables.items():
+            for measure_name, measure in table["measures"].items():
+                self.nodes[measure_name] = self._resolve(table_name, measure)
+
+        self.fan_in: Counter = Counter()
+        for node in self.nodes.values():
+            self.fan_in.update(node["measures"])
+
+        self._closure: Dict[str, Set[str]] = {}
+        self._path: Dict[str, List[str]] = {}
+        self.cycles: List[List[str]] = []
+
+    def _resolve(self, table_name: str, measure: Dict[str, Any]) -> Dict[str, Any]:
+        """Resolve one measure's raw references against the model."""
+        refs = extract_references(measure["expression"])
+        measures: Set[str] = set()
+        tables: Set[str] = set()
+
+        for name in refs["bare"]:
+            home = self.index.find_measure(name)
+            if home is not None:
+                measures.add(home[1])
+            # Otherwise a column of the table being iterated; its table is counted there
+
+        for entity, name in refs["qualified"]:
+            entity_table = self.index.resolve_table(entity)
+            if entity_table is None:
+                continue
+            if self.index.has_measure(entity_table, name):
+                measures.add(self.index.find_measure(name)[1])
+            else:
+                tables.add(entity_table)
+
+        for entity in refs["tables"]:
+            entity_table = self.index.resolve_table(entity)
+            if entity_table is not None:
+                tables.add(entity_table)
+
+        return {
+            "table": table_name,
+            "line": measure["line"],
+            "measures": measures,
+            "tables": tables,
+            "functions": refs["functions"]
+        }
+
+    def measure_cost(self, name: str) -> int:
+        """Cost of evaluating one measure's own expression (dependencies excluded)."""
+        functions = self.nodes[name]["functions"]
+        return MEASURE_BASE_COST + sum(FUNCTION_COSTS.get(f, 0) * n for f, n in functions.items())
+
+    def closure(self, name: str) -> Set[str]:
+        """Every measure `name` depends on, directly or transitively (excluding itself)."""
+        if name not in self._closure:
+            self._walk(name, [])
+        return self._closure[name]
+
+    def critical_path(self, name: str) -> List[str]:
+        """Longest chain of measure references starting at `name`."""
+        if name not in self._path:
+            self._walk(name, [])
+        return self._path[name]
+
+    def depth(self, name: str) -> int:
+        """Number of measure hops on the critical path (0 = no measure references)."""
+        return len(self.critical_path(name)) - 1
+
+    def _walk(self, name: str, stack: List[str]) -> None:
+        """Depth-first pass filling the closure and critical-path memos."""
+        stack.append(name)
+        closure: Set[str] = set()
+        longest: List[str] = []
+        for dep in sorted(self.nodes[name]["measures"]):
+            if dep in stack:
+                self.cycles.append(stack[stack.index(dep):] + [dep])
+                continue
+            if dep not in self._closure:
+                self._walk(dep, stack)
+            closure.add(dep)
+            closure |= self._closure[dep]
+            if len(self._path[dep]) > len(longest):
+                longest = self._path[dep]
+        stack.pop()
+        closure.discard(name)
+        self._closure[name] = closure
+        self._path[name] = [name] + longest
+
+    def summarize(self, names) -> Dict[str, Any]:
+        """
+        Roll up one or more measures (e.g. everything a visual queries).
+
+        Shared dependencies are counted once, as the formula engine caches
+        them within a single query.
+        """
+        names = [name for name in names if name in self.nodes]
+        involved = set(names)
+        for name in names:
+            involved |= self.closure(name)
+
+        tables: Set[str] = set()
+        iterators: Dict[str, List[str]] = {}
+        for name in sorted(involved):
+            node = self.nodes[name]
+            tables |= node["tables"]
+            for function in node["functions"]:
+                if function in ITERATOR_FUNCTIONS:
+                    iterators.setdefault(function, []).append(name)
+
+        deepest = max(names, key=self.depth, default=None)
+        return {
+            "measures": sorted(names),
+            "depth": self.depth(deepest) if deepest else 0,
+            "critical_path": self.critical_path(deepest) if deepest else [],
+            "dependencies": len(involved) - len(names),
+            "tables": sorted(tables),
+            "iterators": iterators,
+            "cost": sum(self.measure_cost(name) for name in involved)
+        }
+
+    def describe(self, name: str) -> Dict[str, Any]:
+        """Full report for a single measure."""
+        node = self.nodes[name]
+        summary = self.summarize([name])
+        summary.update({
+            "measure": name,
+            "table": node["table"],
+            "line": node["line"],
+            "fan_out": len(node["measures"]),
+            "fan_in": self.fan_in[name],
+            "own_cost": self.measure_cost(name)
+        })
+        return summary
+
+# =============================================================================
+# VISUAL ANALYSIS
+# =============================================================================
+
+def visual_label(config: Dict) -> str:
+    """Short human-readable label for a visual config."""
+    for key in ("title", "measure", "text", "button_type"):
+        if config.get(key):
+            return str(config[key])
+    return ""
+
+def visual_measures(config: Dict) -> List[str]:
+    """Measure names a visual config queries, in first-use order."""
+    names: List[str] = []
+    for _, prop, is_measure in iter_field_refs(build_visual(config)):
+        if is_measure and prop not in names:
+            names.append(prop)
+    return names
+
+def analyze_pages(graph: MeasureGraph, page_configs: Dict[str, Dict]) -> Dict[str, List[Dict[str, Any]]]:
+    """Cost summary of every data visual on every page, most expensive first."""
+    report = {}
+    for page_key, page_config in page_configs.items():
+        rows = []
+        for index, config in enumerate(page_config.get("visuals", [])):
+            measures = visual_measures(config)
+            if not measures:
+                continue
+            row = {"index": index, "type": config["type"], "label": visual_label(config)}
+            row.update(graph.summarize(measures))
+            rows.append(row)
+        rows.sort(key=lambda row: row["cost"], reverse=True)
+        report[page_key] = rows
+    return report
+
+def format_iterators(iterators: Dict[str, List[str]]) -> str:
+    return ", ".join(f"{name} x{len(owners)}" for name, owners in sorted(iterators.items())) or "-"
+
+def print_measure_tree(graph: MeasureGraph, name: str, indent: int = 0, seen: Optional[Set[str]] = None) -> None:
+    """Print a measure's dependency tree with each node's own iterators."""
+    seen = set() if seen is None else seen
+    node = graph.nodes[name]
+    own = [f for f in sorted(node["functions"]) if f in ITERATOR_FUNCTIONS]
+    tables = ", ".join(sorted(node["tables"]))
+    details = "; ".join(part for part in (", ".join(own), tables) if part)
+    repeat = " (see above)" if name in seen and node["measures"] else ""
+    print(f"  {'    ' * indent}[{name}]" + (f"  {{{details}}}" if details else "") + repeat)
+    if repeat:
+        return
+    seen.add(name)
+    for dep in sorted(node["measures"]):
+        print_measure_tree(graph, dep, indent + 1, seen)
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure dependency graph and per-visual formula-engine cost"
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default=str(DEFAULT_MODEL_PATH),
+        metavar="PATH",
+        help="Path to the .SemanticModel folder"
+    )
+    parser.add_argument(
+        "--page",
+        type=str,
+        help="Only analyze this PAGE_CONFIGS page"
+    )
+    parser.add_argument(
+        "--measure",
+        type=str,
+        help="Show the dependency tree and cost of one measure"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        metavar="N",
+        help="List the N most expensive measures in the model"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the report as JSON"
+    )
+
+    args = parser.parse_args()
+    graph = MeasureGraph(load_model_index(Path(args.model)))
+
+    if args.measure:
+        home = graph.index.find_measure(args.measure)
+        if home is None:
+            parser.error(f"unknown measure: {args.measure}")
+        report = graph.describe(home[1])
+        if args.json:
+            print(json.dumps(report, indent=2))
+            return
+        print(f"\n[{report['measure']}]  ({report['table']}, line {report['line']})")
+        print(f"  Depth: {report['depth']}  Fan-out: {report['fan_out']}  Fan-in: {report['fan_in']}")
+        print(f"  Cost: {report['cost']} (own {report['own_cost']}, {report['dependencies']} dependencies)")
+        print(f"  Critical path: {' -> '.join(report['critical_path'])}")
+        print(f"  Tables: {', '.join(report['tables']) or '-'}")
+        print(f"  Iterators: {format_iterators(report['iterators'])}\n")
+        print_measure_tree(graph, report["measure"])
+        return
+
+    if args.top:
+        reports = sorted((graph.describe(name) for name in graph.nodes), key=lambda r: r["cost"], reverse=True)
+        reports = reports[:args.top]
+        if args.json:
+            print(json.dumps(reports, indent=2))
+            return
+        print(f"\n{'Measure':50} {'Cost':>5} {'Depth':>5} {'Out':>4} {'In':>4}  Iterators")
+        for report in reports:
+            print(f"{report['measure'][:50]:50} {report['cost']:5} {report['depth']:5} "
+                  f"{report['fan_out']:4} {report['fan_in']:4}  {format_iterators(report['iterators'])}")
+        return
+
+    if args.page:
+        if args.page not in PAGE_CONFIGS:
+            parser.error(f"unknown page: {args.page} (available: {', '.join(PAGE_CONFIGS)})")
+        page_configs = {args.page: PAGE_CONFIGS[args.page]}
+    else:
+        page_configs = PAGE_CONFIGS
+
+    report = analyze_pages(graph, page_configs)
+    for name in graph.nodes:
+        graph.closure(name)  # Surface cycles anywhere in the model
+
+    if args.json:
+        print(json.dumps({"pages": report, "cycles": graph.cycles}, indent=2))
+        return
+
+    for page_key, rows in report.items():
+        print(f"\n{page_key} ({PAGE_CONFIGS[page_key]['page_id']})")
+        print(f"  {'#':>3} {'Visual':18} {'Label':32} {'Cost':>5} {'Depth':>5}  Iterators")
+        for row in rows:
+            print(f"  {row['index']:3} {row['type']:18} {row['label'][:32]:32} "
+                  f"{row['cost']:5} {row['depth']:5}  {format_iterators(row['iterators'])}")
+
+    if graph.cycles:
+        print("\nCircular measure references:")
+        for cycle in graph.cycles:
+            print("  " + " -> ".join(cycle))
+
+if __name__ == "__main__":
+    main()
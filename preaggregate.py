@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+HHS Live Events Dashboard - Pre-Aggregation Builder
+
+Builds aggregate tables for the ga4-daily* family offline: each aggregate
+streams a source CSV (a raw export read with its partition's load options,
+or any exported CSV with declared column types), groups it at a coarser
+grain (day/week/month/year and optional dimensions) and writes a small CSV
+together with a matching TMDL table definition and relationship.
+
+It also proposes measure rewrites: measures that only read the base table
+through SUM/MIN/MAX of aggregated columns are rewritten to hit the
+aggregate. Day-grain aggregates replace the measure; coarser grains add a
+suffixed measure, since they only answer correctly at that grain or above.
+
+Aggregates are configured in DEFAULT_AGGREGATES or a JSON file (--config)
+with the same shape.
+
+Usage:
+    python preaggregate.py --list
+    python preaggregate.py --input datasets
+    python preaggregate.py --input datasets --aggregate "ga4-daily Monthly"
+    python preaggregate.py --rewrites-only
+"""
+
+import re
+import csv
+import json
+import uuid
+import argparse
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+from csv_pipeline import DEFAULT_INPUT_DIR, partition_m, read_chunks, table_specs
+from measure_graph import tokenize_dax
+from tmdl_index import DEFAULT_MODEL_PATH, ModelIndex, load_model_index, quote_tmdl_name
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Each aggregate:
+#   base_table:  model table whose measures are rewritten to use the aggregate
+#   source:      CSV-backed model table (its raw export) or {"file": ..., "types": {column: dataType}}
+#   date_column: source column holding the date; grain: day | week | month | year
+#   min_date:    optional ISO date; earlier source rows are dropped. Set it to the base
+#                table's own date filter so rewritten measures return the same totals
+#   group_by:    extra source columns kept as dimensions
+#   columns:     output column -> [aggregation, source column(s)]
+#                aggregations: sum, min, max, count (rows), ratio (sum of first / sum of second)
+#   measure_suffix: name suffix for rewritten measures when grain is coarser than a day
+DEFAULT_AGGREGATES: Dict[str, Dict[str, Any]] = {
+    "ga4-daily Monthly": {
+        "base_table": "ga4-daily",
+        "source": "ga4-daily2",
+        "date_column": "Date",
+        # ga4-daily (GA4 connector) keeps [Date] >= #date(2025, 2, 13); the raw export does not
+        "min_date": "2025-02-13",
+        "grain": "month",
+        "group_by": [],
+        "columns": {
+            "Views": ["sum", "Views"],
+            "Sessions": ["sum", "Sessions"],
+            "Total users": ["sum", "Total users"],
+            "Engaged sessions": ["sum", "Engaged sessions"],
+            "Engagement rate": ["ratio", "Engaged sessions", "Sessions"],
+            "Peak daily users": ["max", "Total users"],
+            "Days": ["count"]
+        },
+        "measure_suffix": " (Monthly)"
+    }
+}
+
+GRAINS = ("day", "week", "month", "year")
+
+# Aggregation -> TMDL dataType of the output column (None = same as the source column)
+AGGREGATION_TYPES = {"sum": None, "min": None, "max": None, "count": "int64", "ratio": "double"}
+
+# Aggregations whose values add up across groups; other columns (ratios, peaks)
+# get summarizeBy: none so visuals without the grain do not sum them
+ADDITIVE_AGGREGATIONS = ("sum", "count")
+
+# DAX aggregators that can be answered from an aggregate column built with the same function
+REWRITABLE_FUNCTIONS = {"SUM": "sum", "MIN": "min", "MAX": "max"}
+
+# Namespace for deterministic lineage tags (regenerating a table keeps its tags)
+LINEAGE_NAMESPACE = uuid.UUID("6f1c1d62-8a4e-4f7e-9a57-2b7d5e0c9a31")
+
+# =============================================================================
+# AGGREGATION
+# =============================================================================
+
+def grain_start(value: Any, grain: str) -> Optional[date]:
+    """First day of the grain period containing a date (YYYYMMDD integers accepted)."""
+    if value is None:
+        return None
+    if isinstance(value, int):
+        try:
+            value = datetime.strptime(str(value), "%Y%m%d").date()
+        except ValueError:
+            return None
+    if grain == "week":
+        return value - timedelta(days=value.weekday())
+    if grain == "month":
+        return value.replace(day=1)
+    if grain == "year":
+        return value.replace(month=1, day=1)
+    return value
+
+def aggregate_min_date(aggregate: Dict[str, Any]) -> Optional[date]:
+    """The aggregate's min_date as a date (None when it keeps every row)."""
+    value = aggregate.get("min_date")
+    return date.fromisoformat(value) if value else None
+
+def source_spec(aggregate: Dict[str, Any], specs: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """csv_pipeline load spec for an aggregate's source."""
+    source = aggregate["source"]
+    if isinstance(source, str):
+        if source not in specs:
+            raise ValueError(f"source table {source!r} is not loaded from a CSV file")
+        return specs[source]
+    return {
+        "file": source["file"],
+        "encoding": source.get("encoding", "utf-8-sig"),
+        "columns": None,
+        "quote_none": False,
+        "skip_rows": source.get("skip_rows", 0),
+        "skip_after_header": 0,
+        "ctr_columns": source.get("ctr_columns", []),
+        "unsupported": [],
+        "types": source["types"]
+    }
+
+def build_aggregate(path: Path, aggregate: Dict[str, Any], spec: Dict[str, Any]) -> Tuple[List[str], List[List[Any]], int]:
+    """
+    Stream a source file into grouped rows.
+
+    Returns (header, rows sorted by group key, source rows read). Memory is
+    bounded by the number of groups, not the size of the source.
+    """
+    header, chunks = read_chunks(path, spec)
+    position = {name: i for i, name in enumerate(header)}
+    missing = [name for name in [aggregate["date_column"], *aggregate["group_by"]] if name not in position]
+    for _, (function, *sources) in aggregate["columns"].items():
+        missing.extend(name for name in sources if name not in position)
+    if missing:
+        raise ValueError(f"{path.name}: missing column(s) {sorted(set(missing))}")
+
+    date_index = position[aggregate["date_column"]]
+    min_date = aggregate_min_date(aggregate)
+    group_indexes = [position[name] for name in aggregate["group_by"]]
+    # Distinct source columns accumulated per group: sums for sum/ratio, else min/max
+    sums = sorted({name for function, *sources in aggregate["columns"].values()
+                   if function in ("sum", "ratio") for name in sources})
+    extremes = {(function, sources[0]) for function, *sources in aggregate["columns"].values()
+                if function in ("min", "max")}
+
+    groups: Dict[Tuple, Dict[str, Any]] = {}
+    read = 0
+    for chunk in chunks:
+        for row in chunk:
+            read += 1
+            day = grain_start(row[date_index], "day")
+            if day is None:
+                continue  # Rollup/total rows have no date
+            if min_date is not None and day < min_date:
+                continue  # Outside the base table's date filter
+            period = grain_start(day, aggregate["grain"])
+            key = (period, *(row[i] for i in group_indexes))
+            state = groups.get(key)
+            if state is None:
+                state = groups[key] = {"count": 0, **{name: 0 for name in sums}}
+            state["count"] += 1
+            for name in sums:
+                value = row[position[name]]
+                if value is not None:
+                    state[name] += value
+            for function, name in extremes:
+                value = row[position[name]]
+                slot = f"{function}:{name}"
+                if value is not None and (slot not in state or (value < state[slot]) == (function == "min")):
+                    state[slot] = value
+
+    rows = []
+    for key in sorted(groups, key=lambda k: tuple("" if v is None else v for v in k)):
+        state = groups[key]
+        row = list(key)
+        for function, *sources in aggregate["columns"].values():
+            if function == "sum":
+                row.append(state[sources[0]])
+            elif function == "count":
+                row.append(state["count"])
+            elif function == "ratio":
+                denominator = state[sources[1]]
+                row.append(state[sources[0]] / denominator if denominator else None)
+            else:
+                row.append(state.get(f"{function}:{sources[0]}"))
+        rows.append(row)
+
+    output_header = [aggregate["date_column"], *aggregate["group_by"], *aggregate["columns"]]
+    return output_header, rows, read
+
+def output_types(aggregate: Dict[str, Any], spec: Dict[str, Any]) -> List[str]:
+    """TMDL dataType of every output column."""
+    types = ["dateTime"] + [spec["types"].get(name, "string") for name in aggregate["group_by"]]
+    for function, *sources in aggregate["columns"].values():
+        types.append(AGGREGATION_TYPES[function] or spec["types"].get(sources[0], "double"))
+    return types
+
+def write_csv(path: Path, header: List[str], rows: List[List[Any]]) -> None:
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow("" if v is None else v.isoformat() if isinstance(v, date) else v for v in row)
+    temp_path.replace(path)
+
+# =============================================================================
+# TMDL OUTPUT
+# =============================================================================
+
+def lineage_tag(*parts: str) -> str:
+    return str(uuid.uuid5(LINEAGE_NAMESPACE, "/".join(parts)))
+
+def _indent(text: str, tabs: int) -> str:
+    return "\n".join(("\t" * tabs + line) if line.strip() else "" for line in text.splitlines())
+
+def table_tmdl(name: str, aggregate: Dict[str, Any], header: List[str], types: List[str], relative_path: str) -> str:
+    """TMDL table definition loading an aggregate CSV."""
+    dimensions = {aggregate["date_column"], *aggregate["group_by"]}
+    grain = aggregate["grain"]
+    lines = [
+        f"/// Pre-aggregated {aggregate['base_table']} at {grain} grain (generated by preaggregate.py)",
+        f"table {quote_tmdl_name(name)}",
+        f"\tlineageTag: {lineage_tag(name)}",
+        ""
+    ]
+    for column, data_type in zip(header, types):
+        additive = column not in dimensions and aggregate["columns"][column][0] in ADDITIVE_AGGREGATIONS
+        lines.append(f"\tcolumn {quote_tmdl_name(column)}")
+        lines.append(f"\t\tdataType: {data_type}")
+        if data_type == "dateTime":
+            lines.append("\t\tformatString: Long Date")
+        elif data_type == "int64":
+            lines.append("\t\tformatString: 0")
+        lines.append(f"\t\tlineageTag: {lineage_tag(name, column)}")
+        lines.append(f"\t\tsummarizeBy: {'sum' if additive else 'none'}")
+        lines.append(f"\t\tsourceColumn: {column}")
+        lines.append("")
+        lines.append("\t\tannotation SummarizationSetBy = Automatic")
+        lines.append("")
+
+    lines.append(f"\tpartition {quote_tmdl_name(name)} = m")
+    lines.append("\t\tmode: import")
+    lines.append("\t\tsource =")
+    lines.append(_indent(partition_m(header, types, relative_path, "csv"), 4))
+    lines.append("")
+    lines.append("\tannotation PBI_ResultType = Table")
+    lines.append("")
+    return "\n".join(lines)
+
+def relationship_tmdl(name: str, aggregate: Dict[str, Any]) -> str:
+    """Relationship from the aggregate's date column to DimDate[Date]."""
+    slug = re.sub(r"[^A-Za-z0-9]", "", name)
+    return (
+        f"relationship Rel_{slug}_DimDate\n"
+        f"\tfromColumn: {quote_tmdl_name(name)}.{quote_tmdl_name(aggregate['date_column'])}\n"
+        "\ttoColumn: DimDate.Date\n"
+    )
+
+# =============================================================================
+# MEASURE REWRITES
+# =============================================================================
+
+def dax_table_ref(name: str) -> str:
+    """DAX reference to a table, quoted unless it is a plain identifier."""
+    return name if re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", name) else "'" + name.replace("'", "''") + "'"
+
+def propose_rewrites(index: ModelIndex, name: str, aggregate: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Rewrite measures that read the base table only through SUM/MIN/MAX of
+    columns the aggregate carries with the same aggregation.
+
+    Returns one entry per measure touching the base table, with either the
+    rewritten expression or the reason it cannot use the aggregate.
+    """
+    base = aggregate["base_table"]
+    base_ref = r"(?:'" + re.escape(base.replace("'", "''")) + r"'" + (
+        "|" + re.escape(base) if re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", base) else "") + ")"
+    call = re.compile(r"\b(SUM|MIN|MAX)\s*\(\s*" + base_ref + r"\s*\[([^\]]+)\]\s*\)", re.IGNORECASE)
+    # Base column -> output column carrying it with a given aggregation
+    available = {(function, sources[0]): output for output, (function, *sources) in aggregate["columns"].items()
+                 if function in ("sum", "min", "max")}
+    aggregate_ref = dax_table_ref(name)
+
+    proposals = []
+    for table_name, table in sorted(index.tables.items()):
+        for measure_name, measure in table["measures"].items():
+            expression = measure["expression"]
+            if not any(kind in ("table", "name") and value == base for kind, value, _ in tokenize_dax(expression)):
+                continue
+
+            problems = []
+
+            def replace(match):
+                function, column = match.group(1).upper(), match.group(2)
+                output = available.get((REWRITABLE_FUNCTIONS[function], column))
+                if output is None:
+                    problems.append(f"{function}({dax_table_ref(base)}[{column}]) has no matching aggregate column")
+                    return match.group(0)
+                return f"{function}({aggregate_ref}[{output}])"
+
+            rewritten = call.sub(replace, expression)
+            leftover = [value for kind, value, _ in tokenize_dax(rewritten) if kind in ("table", "name") and value == base]
+            if leftover and not problems:
+                problems.append(f"uses '{base}' outside SUM/MIN/MAX (filters, ALL, iterators or AVERAGE)")
+
+            entry = {"table": table_name, "measure": measure_name, "file": table["file"], "line": measure["line"]}
+            if problems:
+                entry["reason"] = "; ".join(problems)
+            else:
+                replace_in_place = aggregate["grain"] == "day"
+                entry.update({
+                    "action": "replace" if replace_in_place else "add",
+                    "name": measure_name if replace_in_place else measure_name + aggregate["measure_suffix"],
+                    "expression": rewritten
+                })
+            proposals.append(entry)
+    return proposals
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def load_aggregates(config_path: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    if not config_path:
+        return DEFAULT_AGGREGATES
+    with open(config_path, 'r', encoding='utf-8') as f:
+        aggregates = json.load(f)
+    for name, aggregate in aggregates.items():
+        aggregate.setdefault("group_by", [])
+        aggregate.setdefault("measure_suffix", f" ({aggregate['grain'].title()})")
+        if aggregate["grain"] not in GRAINS:
+            raise ValueError(f"{name}: grain must be one of {GRAINS}")
+        try:
+            aggregate_min_date(aggregate)
+        except (TypeError, ValueError):
+            raise ValueError(f"{name}: min_date must be an ISO date (YYYY-MM-DD)")
+    return aggregates
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build pre-aggregated tables, TMDL definitions and measure rewrites"
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default=str(DEFAULT_MODEL_PATH),
+        metavar="PATH",
+        help="Path to the .SemanticModel folder"
+    )
+    parser.add_argument(
+        "--input",
+        type=str,
+        default=str(DEFAULT_INPUT_DIR),
+        metavar="DIR",
+        help="Folder holding the source CSVs (the model's pDatasetsFolder)"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        metavar="DIR",
+        help="Folder for aggregate CSVs and .tmdl files (default: <input>/agg)"
+    )
+    parser.add_argument(
+        "--config",
+        type=str,
+        metavar="FILE",
+        help="JSON file of aggregates (same shape as DEFAULT_AGGREGATES)"
+    )
+    parser.add_argument(
+        "--aggregate",
+        action="append",
+        help="Only build this aggregate (repeatable)"
+    )
+    parser.add_argument(
+        "--list",
+        action="store_true",
+        help="List configured aggregates"
+    )
+    parser.add_argument(
+        "--rewrites-only",
+        action="store_true",
+        help="Only print the measure rewrites (no source files needed)"
+    )
+
+    args = parser.parse_args()
+    model_path = Path(args.model)
+    aggregates = load_aggregates(args.config)
+    if args.aggregate:
+        unknown = [name for name in args.aggregate if name not in aggregates]
+        if unknown:
+            parser.error(f"unknown aggregate(s): {', '.join(unknown)} (available: {', '.join(aggregates)})")
+        aggregates = {name: aggregates[name] for name in args.aggregate}
+
+    if args.list:
+        for name, aggregate in aggregates.items():
+            source = aggregate["source"] if isinstance(aggregate["source"], str) else aggregate["source"]["file"]
+            group = " x ".join([aggregate["grain"], *aggregate["group_by"]])
+            since = f"  since {aggregate['min_date']}" if aggregate.get("min_date") else ""
+            print(f"  {name:28} {aggregate['base_table']:18} from {source:24} by {group}{since}")
+        return
+
+    index = load_model_index(model_path)
+    specs = table_specs(model_path)
+    input_dir = Path(args.input)
+    output_dir = Path(args.output) if args.output else input_dir / "agg"
+
+    for name, aggregate in aggregates.items():
+        print(f"\n{'='*60}")
+        print(f"Aggregate: {name}  ({aggregate['base_table']} at {aggregate['grain']} grain)")
+        print(f"{'='*60}")
+
+        if not args.rewrites_only:
+            spec = source_spec(aggregate, specs)
+            source = input_dir / spec["file"]
+            if spec["unsupported"]:
+                print(f"  SKIP: {spec['file']} (reshaped in Power Query: {', '.join(spec['unsupported'])})")
+            elif not source.exists():
+                print(f"  MISSING: {source}")
+            else:
+                output_dir.mkdir(parents=True, exist_ok=True)
+                header, rows, read = build_aggregate(source, aggregate, spec)
+                file_name = re.sub(r"[^A-Za-z0-9]+", "-", name).strip("-").lower()
+                write_csv(output_dir / f"{file_name}.csv", header, rows)
+                tmdl = table_tmdl(name, aggregate, header, output_types(aggregate, spec),
+                                  f"{output_dir.name}\\{file_name}.csv")
+                (output_dir / f"{file_name}.tmdl").write_text(tmdl, encoding="utf-8")
+                (output_dir / f"{file_name}.relationship.tmdl").write_text(
+                    relationship_tmdl(name, aggregate), encoding="utf-8")
+                ratio = read / len(rows) if rows else 0
+                print(f"  {read:,} source rows -> {len(rows):,} aggregate rows ({ratio:,.1f}x smaller)")
+                print(f"  Wrote: {output_dir / file_name}.csv / .tmdl / .relationship.tmdl")
+                print(f"  Add to model.tmdl: ref table {quote_tmdl_name(name)}")
+
+        proposals = propose_rewrites(index, name, aggregate)
+        rewritable = [p for p in proposals if "expression" in p]
+        print(f"\n  Measure rewrites: {len(rewritable)} of {len(proposals)} measures on '{aggregate['base_table']}'")
+        for proposal in rewritable:
+            print(f"    {proposal['action'].upper():8} [{proposal['name']}] = {proposal['expression']}")
+        for proposal in proposals:
+            if "reason" in proposal:
+                print(f"    KEEP     [{proposal['measure']}]  {proposal['reason']}")
+
+if __name__ == "__main__":
+    main()
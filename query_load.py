@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+HHS Live Events Dashboard - Page Query-Load Estimator
+
+Estimates what each page in PAGE_CONFIGS asks of the model when it loads:
+one DAX query per visual bound to model fields, the distinct measures those
+queries evaluate (directly and through measure dependencies), the distinct
+tables they scan and a relative formula-engine cost from measure_graph.py.
+Pages over budget are flagged and the exit code is 1, so the check can
+gate generation in CI.
+
+Usage:
+    python query_load.py
+    python query_load.py --page executive_summary
+    python query_load.py --max-queries 8 --max-tables 6
+    python query_load.py --json
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any
+
+from generate_visuals import PAGE_CONFIGS, page_queries
+from measure_graph import MeasureGraph, visual_label
+from tmdl_index import DEFAULT_MODEL_PATH, load_model_index
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# Default per-page budgets (override on the command line). They match the
+# heaviest page as shipped (executive_summary issues 11 queries), so the
+# default run passes and any page that grows past today's load fails.
+DEFAULT_BUDGET = {
+    "queries": 11,     # DAX queries issued on page load
+    "measures": 40,    # Distinct measures evaluated, dependencies included
+    "tables": 10,      # Distinct model tables scanned
+    "cost": 150        # Summed relative formula-engine cost of all queries
+}
+
+# =============================================================================
+# ESTIMATION
+# =============================================================================
+
+def estimate_page_load(graph: MeasureGraph, page_config: Dict) -> Dict[str, Any]:
+    """
+    Estimate the load of one page.
+
+    Each querying visual is costed on its own (queries do not share
+    formula-engine caches), while measure and table counts are distinct
+    across the whole page.
+    """
+    queries: List[Dict[str, Any]] = []
+    measures = set()
+    evaluated = set()
+    tables = set()
+
+    visuals = page_config.get("visuals", [])
+    for index, refs in page_queries(page_config):
+        config = visuals[index]
+        visual_measures = []
+        for entity, prop, is_measure in refs:
+            if not is_measure:
+                tables.add(graph.index.resolve_table(entity) or entity)
+            elif prop not in visual_measures:
+                visual_measures.append(prop)
+
+        summary = graph.summarize(visual_measures)
+        measures.update(summary["measures"])
+        evaluated.update(summary["measures"])
+        for name in summary["measures"]:
+            evaluated |= graph.closure(name)
+        tables.update(summary["tables"])
+        queries.append({
+            "index": index,
+            "type": config["type"],
+            "label": visual_label(config),
+            "measures": len(visual_measures),
+            "cost": summary["cost"]
+        })
+
+    return {
+        "page_id": page_config.get("page_id", ""),
+        "visuals": len(page_config.get("visuals", [])),
+        "queries": len(queries),
+        "measures": len(measures),
+        "evaluated_measures": len(evaluated),
+        "tables": sorted(tables),
+        "cost": sum(query["cost"] for query in queries),
+        "query_detail": queries
+    }
+
+def check_budget(load: Dict[str, Any], budget: Dict[str, int]) -> List[str]:
+    """Budget violations for one page estimate."""
+    actual = {
+        "queries": load["queries"],
+        "measures": load["evaluated_measures"],
+        "tables": len(load["tables"]),
+        "cost": load["cost"]
+    }
+    return [
+        f"{key} {actual[key]} > {limit}"
+        for key, limit in budget.items()
+        if limit is not None and actual[key] > limit
+    ]
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Estimate DAX queries, measures and tables per page on load"
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default=str(DEFAULT_MODEL_PATH),
+        metavar="PATH",
+        help="Path to the .SemanticModel folder"
+    )
+    parser.add_argument(
+        "--page",
+        type=str,
+        help="Only estimate this PAGE_CONFIGS page"
+    )
+    for key, default in DEFAULT_BUDGET.items():
+        parser.add_argument(
+            f"--max-{key}",
+            type=int,
+            default=default,
+            metavar="N",
+            help=f"Per-page {key} budget (default: {default})"
+        )
+    parser.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="List every query on each page"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the report as JSON"
+    )
+
+    args = parser.parse_args()
+    graph = MeasureGraph(load_model_index(Path(args.model)))
+    budget = {key: getattr(args, f"max_{key}") for key in DEFAULT_BUDGET}
+
+    if args.page:
+        if args.page not in PAGE_CONFIGS:
+            parser.error(f"unknown page: {args.page} (available: {', '.join(PAGE_CONFIGS)})")
+        page_configs = {args.page: PAGE_CONFIGS[args.page]}
+    else:
+        page_configs = PAGE_CONFIGS
+
+    report = {}
+    for page_key, page_config in page_configs.items():
+        load = estimate_page_load(graph, page_config)
+        load["over_budget"] = check_budget(load, budget)
+        report[page_key] = load
+    over = [page_key for page_key, load in report.items() if load["over_budget"]]
+
+    if args.json:
+        print(json.dumps({"budget": budget, "pages": report}, indent=2))
+        return 1 if over else 0
+
+    print("\nBudget per page: " + ", ".join(f"{key} <= {limit}" for key, limit in budget.items()))
+    print(f"\n{'Page':18} {'Visuals':>7} {'Queries':>7} {'Measures':>8} {'Eval':>5} {'Tables':>6} {'Cost':>5}  Status")
+    for page_key, load in report.items():
+        status = "OVER: " + "; ".join(load["over_budget"]) if load["over_budget"] else "ok"
+        print(f"{page_key:18} {load['visuals']:7} {load['queries']:7} {load['measures']:8} "
+              f"{load['evaluated_measures']:5} {len(load['tables']):6} {load['cost']:5}  {status}")
+        if args.verbose:
+            for query in load["query_detail"]:
+                print(f"    {query['index']:3} {query['type']:18} {query['label'][:32]:32} "
+                      f"{query['measures']:3} measures  cost {query['cost']}")
+            print(f"    tables: {', '.join(load['tables'])}")
+
+    if over:
+        print(f"\n{len(over)} page(s) over budget: {', '.join(over)}")
+    return 1 if over else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
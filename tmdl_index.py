@@ -0,0 +1,517 @@
+#!/usr/bin/env python3
+"""
+HHS Live Events Dashboard - TMDL Model Index
+
+Fast line-based parser for the semantic model's TMDL table files. Indexes
+every table's measures, columns and partitions so generated visuals can be
+checked against the real model before Power BI Desktop ever opens them.
+
+The index is cached on disk (.tmdl_index.json next to the tables folder)
+per .tmdl file, keyed by mtime and size; only changed files are re-parsed.
+
+Usage:
+    python tmdl_index.py --summary
+    python tmdl_index.py --list-measures
+    python tmdl_index.py --check "Sessions by City"
+    python tmdl_index.py --check "DimDate[Date]"
+"""
+
+import re
+import json
+import argparse
+import difflib
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+SCRIPT_DIR = Path(__file__).parent
+DEFAULT_MODEL_PATH = SCRIPT_DIR / "HHS Live Events Performance Dashboard.SemanticModel"
+
+# Cache file (stored in the model's definition folder, next to tables/)
+INDEX_CACHE_FILENAME = ".tmdl_index.json"
+
+# Bump whenever the parsed structure changes so stale caches are discarded
+INDEX_VERSION = 4
+
+# Column properties kept in the index
+COLUMN_PROPERTIES = ("dataType", "sourceColumn", "formatString", "summarizeBy", "isHidden", "sortByColumn")
+
+# Measure properties kept in the index
+MEASURE_PROPERTIES = ("formatString", "displayFolder", "isHidden")
+
+# =============================================================================
+# TMDL PARSING
+# =============================================================================
+
+def _indent_depth(line: str) -> int:
+    """Number of leading tabs on a TMDL line."""
+    return len(line) - len(line.lstrip("\t"))
+
+def parse_object_name(text: str) -> Tuple[str, str]:
+    """
+    Split a TMDL object declaration into (name, remainder).
+
+    Handles quoted names ('Total users', with '' as an escaped quote) and
+    bare names. The remainder starts after the name, e.g. "= SUM(...)".
+    """
+    text = text.strip()
+    if text.startswith("'"):
+        chars = []
+        i = 1
+        while i < len(text):
+            if text[i] == "'":
+                if text[i + 1:i + 2] == "'":
+                    chars.append("'")
+                    i += 2
+                    continue
+                return "".join(chars), text[i + 1:].strip()
+            chars.append(text[i])
+            i += 1
+        return "".join(chars), ""
+
+    name, _, rest = text.partition(" ")
+    if "=" in name:
+        name, _, tail = name.partition("=")
+        rest = f"={tail} {rest}".strip()
+    return name, rest.strip()
+
+def _read_expression(lines: List[str], start: int, inline: str, depth: int) -> Tuple[str, int, int]:
+    """
+    Read an expression that begins after '=' on line `start`.
+
+    Returns (expression, index of the next unread line, 1-based line number
+    of the expression's first line). Multi-line bodies are the following
+    lines indented at least two tabs deeper than the declaration (or fenced
+    with ```), with that indentation stripped.
+    """
+    inline = inline.strip()
+    index = start + 1
+    first_line = start + 1
+
+    if inline.startswith("```"):
+        inline = inline[3:]
+        body = [inline] if inline.strip() else []
+        if not body:
+            first_line += 1
+        while index < len(lines):
+            line = lines[index]
+            index += 1
+            if line.strip().endswith("```"):
+                body.append(line.strip()[:-3])
+                break
+            body.append(line[depth + 2:] if _indent_depth(line) >= depth + 2 else line.strip())
+    else:
+        body = [inline] if inline else []
+        if not body:
+            first_line += 1
+        while index < len(lines):
+            line = lines[index]
+            if line.strip() and _indent_depth(line) < depth + 2:
+                break
+            body.append(line[depth + 2:] if line.strip() else "")
+            index += 1
+
+    # Leading blank lines are stripped from the expression; keep the line number in step
+    while body and not body[0].strip():
+        body.pop(0)
+        first_line += 1
+    return "\n".join(body).strip(), index, first_line
+
+def parse_tmdl_tables(text: str, file_name: str = "") -> List[Dict[str, Any]]:
+    """
+    Parse the tables declared in one .tmdl document.
+
+    Returns a list of table dicts:
+        {
+          "name": ..., "file": ..., "line": ...,
+          "measures": {name: {"line", "expression", "expression_line", "description", <MEASURE_PROPERTIES>}},
+          "columns": {name: {"line", "expression", <COLUMN_PROPERTIES>}},
+          "partitions": [{"name", "line", "kind", "mode", "source", "annotations"}],
+          "hierarchies": {name: {"line", "columns"}}
+        }
+
+    Line numbers are 1-based.
+    """
+    lines = text.splitlines()
+    tables: List[Dict[str, Any]] = []
+    table: Optional[Dict[str, Any]] = None
+    current: Optional[Dict[str, Any]] = None
+    current_kind = ""
+    description: List[str] = []
+    index = 0
+
+    while index < len(lines):
+        line = lines[index]
+        stripped = line.strip()
+        depth = _indent_depth(line)
+
+        if not stripped:
+            index += 1
+            continue
+
+        if depth == 0:
+            current = None
+            if stripped.startswith("table "):
+                name, _ = parse_object_name(stripped[len("table "):])
+                table = {
+                    "name": name,
+                    "file": file_name,
+                    "line": index + 1,
+                    "measures": {},
+                    "columns": {},
+                    "partitions": [],
+                    "hierarchies": {}
+                }
+                tables.append(table)
+            elif not stripped.startswith("///"):
+                table = None
+            index += 1
+            continue
+
+        if table is None:
+            index += 1
+            continue
+
+        if depth == 1:
+            current = None
+            if stripped.startswith("///"):
+                description.append(stripped[3:].strip())
+                index += 1
+                continue
+
+            keyword, _, declaration = stripped.partition(" ")
+            name, rest = parse_object_name(declaration)
+            expression = ""
+            expression_line = index + 1
+            next_index = index + 1
+            if rest.startswith("="):
+                expression, next_index, expression_line = _read_expression(lines, index, rest[1:], depth)
+
+            if keyword == "measure":
+                current = {
+                    "line": index + 1,
+                    "expression": expression,
+                    "expression_line": expression_line,
+                    "description": " ".join(description)
+                }
+                table["measures"][name] = current
+            elif keyword == "column":
+                current = {"line": index + 1, "expression": expression}
+                table["columns"][name] = current
+            elif keyword == "partition":
+                current = {"name": name, "line": index + 1, "kind": expression, "mode": "", "source": "", "annotations": {}}
+                table["partitions"].append(current)
+            elif keyword == "hierarchy":
+                current = {"line": index + 1, "columns": []}
+                table["hierarchies"][name] = current
+            current_kind = keyword
+            description = []
+            index = next_index
+            continue
+
+        # Object properties (depth 2) and anything nested below them
+        if current is not None and depth == 2:
+            key, sep, value = stripped.partition(":")
+            if sep and " " not in key:
+                keep = {
+                    "measure": MEASURE_PROPERTIES,
+                    "column": COLUMN_PROPERTIES,
+                    "partition": ("mode",)
+                }.get(current_kind, ())
+                if key in keep:
+                    current[key] = value.strip()
+            elif current_kind == "partition" and stripped.startswith("source") and "=" in stripped:
+                source, index, _ = _read_expression(lines, index, stripped.partition("=")[2], depth)
+                current["source"] = source
+                continue
+            elif current_kind == "partition" and stripped.startswith("annotation "):
+                name, rest = parse_object_name(stripped[len("annotation "):])
+                if rest.startswith("="):
+                    current["annotations"][name] = rest[1:].strip()
+
+        # Hierarchy levels (depth 3): "column: Name"
+        elif current is not None and current_kind == "hierarchy" and depth == 3 and stripped.startswith("column:"):
+            current["columns"].append(parse_object_name(stripped[len("column:"):])[0])
+
+        index += 1
+
+    return tables
+
+def quote_tmdl_name(name: str) -> str:
+    """TMDL object name, quoted when it is not a bare identifier (inverse of parse_object_name)."""
+    if re.fullmatch(r"[A-Za-z_][A-Za-z0-9_-]*", name):
+        return name
+    return "'" + name.replace("'", "''") + "'"
+
+def parse_column_ref(text: str) -> Tuple[str, str]:
+    """Split a TMDL Table.Column reference (either part may be quoted) into (table, column)."""
+    text = text.strip()
+    if text.startswith("'"):
+        table, rest = parse_object_name(text)
+        return table, parse_object_name(rest[1:])[0]
+    table, _, column = text.partition(".")
+    return table, parse_object_name(column)[0]
+
+def parse_tmdl_relationships(text: str) -> List[Dict[str, Any]]:
+    """
+    Parse relationships.tmdl.
+
+    Returns [{"name", "line", "fromTable", "fromColumn", "toTable", "toColumn", "isActive"}].
+    """
+    relationships: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    for number, line in enumerate(text.splitlines(), start=1):
+        stripped = line.strip()
+        if _indent_depth(line) == 0 and stripped.startswith("relationship "):
+            current = {"name": parse_object_name(stripped[len("relationship "):])[0], "line": number, "isActive": True}
+            relationships.append(current)
+        elif current is not None and _indent_depth(line) == 1:
+            key, _, value = stripped.partition(":")
+            if key in ("fromColumn", "toColumn"):
+                table, column = parse_column_ref(value)
+                current[key.replace("Column", "Table")] = table
+                current[key] = column
+            elif key == "isActive":
+                current["isActive"] = value.strip().lower() != "false"
+    return relationships
+
+# =============================================================================
+# MODEL INDEX
+# =============================================================================
+
+class ModelIndex:
+    """Lookup of tables, measures and columns in a semantic model."""
+
+    def __init__(self, tables: Dict[str, Dict[str, Any]], relationships: Optional[List[Dict[str, Any]]] = None):
+        self.tables = tables
+        self.relationships = relationships or []
+        # Power BI resolves object names case-insensitively
+        self._tables_ci = {name.lower(): name for name in tables}
+        self._measure_home = {}
+        for table_name, table in tables.items():
+            for measure_name in table["measures"]:
+                self._measure_home.setdefault(measure_name.lower(), (table_name, measure_name))
+
+    def resolve_table(self, entity: str) -> Optional[str]:
+        """Canonical table name for an entity reference, or None."""
+        return self._tables_ci.get(entity.lower())
+
+    def find_measure(self, name: str) -> Optional[Tuple[str, str]]:
+        """(home table, canonical name) of a measure anywhere in the model."""
+        return self._measure_home.get(name.lower())
+
+    def has_measure(self, entity: str, name: str) -> bool:
+        home = self.find_measure(name)
+        return home is not None and home[0] == self.resolve_table(entity)
+
+    def has_column(self, entity: str, name: str) -> bool:
+        table_name = self.resolve_table(entity)
+        if table_name is None:
+            return False
+        return name.lower() in (column.lower() for column in self.tables[table_name]["columns"])
+
+    def measure_count(self) -> int:
+        return len(self._measure_home)
+
+    def column_count(self) -> int:
+        return sum(len(table["columns"]) for table in self.tables.values())
+
+    def check_field(self, entity: str, prop: str, is_measure: bool) -> Optional[str]:
+        """
+        Check a field reference against the model.
+
+        Returns None if it resolves, otherwise an error message with the
+        closest known names as suggestions.
+        """
+        table_name = self.resolve_table(entity)
+        if table_name is None:
+            return f"unknown table '{entity}'{_suggest(entity, self.tables)}"
+
+        if is_measure:
+            if self.has_measure(table_name, prop):
+                return None
+            home = self.find_measure(prop)
+            if home is not None:
+                return f"measure [{prop}] is defined in '{home[0]}', not '{entity}'"
+            if self.has_column(table_name, prop):
+                return f"'{entity}'[{prop}] is a column, not a measure"
+            return f"unknown measure '{entity}'[{prop}]{_suggest(prop, self.tables[table_name]['measures'])}"
+
+        if self.has_column(table_name, prop):
+            return None
+        if self.has_measure(table_name, prop):
+            return f"'{entity}'[{prop}] is a measure, not a column"
+        return f"unknown column '{entity}'[{prop}]{_suggest(prop, self.tables[table_name]['columns'])}"
+
+def _suggest(name: str, candidates) -> str:
+    """Format 'did you mean' suggestions for a misspelled name."""
+    matches = difflib.get_close_matches(name, list(candidates), n=3, cutoff=0.6)
+    if not matches:
+        return ""
+    return " (did you mean: " + ", ".join(matches) + "?)"
+
+# =============================================================================
+# LOADING AND CACHING
+# =============================================================================
+
+def tables_dir_for(model_path: Path) -> Path:
+    """tables/ folder of a .SemanticModel folder."""
+    return model_path / "definition" / "tables"
+
+def find_semantic_model(report_path: Path) -> Optional[Path]:
+    """
+    Locate the semantic model a report is bound to.
+
+    Accepts a .Report folder or any folder below it (e.g. definition/pages)
+    and follows datasetReference.byPath in definition.pbir.
+    """
+    for folder in [report_path, *report_path.parents]:
+        pbir_path = folder / "definition.pbir"
+        if pbir_path.exists():
+            with open(pbir_path, 'r', encoding='utf-8') as f:
+                pbir = json.load(f)
+            relative = pbir.get("datasetReference", {}).get("byPath", {}).get("path")
+            if not relative:
+                return None
+            model_path = (folder / relative).resolve()
+            return model_path if tables_dir_for(model_path).exists() else None
+    return None
+
+def _file_stamp(path: Path) -> List[int]:
+    stat = path.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+def load_model_index(model_path: Path = DEFAULT_MODEL_PATH, use_cache: bool = True) -> ModelIndex:
+    """
+    Build (or load from cache) the index for a .SemanticModel folder.
+
+    Each .tmdl file (tables plus relationships.tmdl) is cached separately,
+    so editing one table only re-parses that file.
+    """
+    tables_dir = tables_dir_for(model_path)
+    if not tables_dir.exists():
+        raise FileNotFoundError(f"TMDL tables folder not found: {tables_dir}")
+
+    cache_path = tables_dir.parent / INDEX_CACHE_FILENAME
+    cached_files: Dict[str, Any] = {}
+    if use_cache and cache_path.exists():
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get("version") == INDEX_VERSION:
+                cached_files = cache.get("files", {})
+        except (OSError, ValueError):
+            cached_files = {}
+
+    files: Dict[str, Any] = {}
+    changed = False
+    sources = [(path.name, path) for path in sorted(tables_dir.glob("*.tmdl"))]
+    relationships_path = tables_dir.parent / "relationships.tmdl"
+    if relationships_path.exists():
+        sources.append(("../relationships.tmdl", relationships_path))
+
+    for key, tmdl_path in sources:
+        stamp = _file_stamp(tmdl_path)
+        entry = cached_files.get(key)
+        if entry is None or entry.get("stamp") != stamp:
+            text = tmdl_path.read_text(encoding="utf-8-sig")
+            if tmdl_path == relationships_path:
+                entry = {"stamp": stamp, "relationships": parse_tmdl_relationships(text)}
+            else:
+                entry = {"stamp": stamp, "tables": parse_tmdl_tables(text, tmdl_path.name)}
+            changed = True
+        files[key] = entry
+
+    if use_cache and (changed or set(files) != set(cached_files)):
+        try:
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "files": files}, f)
+        except OSError:
+            pass  # Read-only checkout: the index is still usable for this run
+
+    tables = {}
+    relationships = []
+    for entry in files.values():
+        for table in entry.get("tables", []):
+            tables[table["name"]] = table
+        relationships.extend(entry.get("relationships", []))
+    return ModelIndex(tables, relationships)
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Index measures and columns from the semantic model's TMDL files"
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default=str(DEFAULT_MODEL_PATH),
+        metavar="PATH",
+        help="Path to the .SemanticModel folder"
+    )
+    parser.add_argument(
+        "--summary",
+        action="store_true",
+        help="Show table/measure/column counts"
+    )
+    parser.add_argument(
+        "--list-measures",
+        action="store_true",
+        help="List every measure with its table and source line"
+    )
+    parser.add_argument(
+        "--check",
+        type=str,
+        metavar="FIELD",
+        help="Check a field reference: \"Measure\", \"[Measure]\" or \"Table[Column]\""
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and do not write the on-disk index cache"
+    )
+
+    args = parser.parse_args()
+    index = load_model_index(Path(args.model), use_cache=not args.no_cache)
+
+    if args.list_measures:
+        for table_name, table in sorted(index.tables.items()):
+            for measure_name, measure in table["measures"].items():
+                print(f"  {table_name}[{measure_name}]  ({table['file']}:{measure['line']})")
+        return
+
+    if args.check:
+        field = args.check
+        if "[" in field and not field.startswith("["):
+            entity, _, rest = field.partition("[")
+            entity, prop = entity.strip("'"), rest.rstrip("]")
+            is_measure = index.has_measure(entity, prop)
+        else:
+            # Bare or [bracketed] names are measures, wherever they live
+            prop = field.strip("[]")
+            home = index.find_measure(prop)
+            entity, is_measure = (home[0] if home else "Measures_Livecast"), True
+
+        error = index.check_field(entity, prop, is_measure)
+        if error:
+            print(f"INVALID: {error}")
+        else:
+            print(f"OK: '{entity}'[{prop}] ({'measure' if is_measure else 'column'})")
+        return
+
+    print(f"\nModel: {args.model}")
+    print(f"  Tables:   {len(index.tables)}")
+    print(f"  Measures: {index.measure_count()}")
+    print(f"  Columns:  {index.column_count()}")
+    if args.summary:
+        for table_name, table in sorted(index.tables.items()):
+            print(f"    {table_name:40} {len(table['measures']):4} measures {len(table['columns']):4} columns")
+
+if __name__ == "__main__":
+    main()
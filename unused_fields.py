@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+HHS Live Events Dashboard - Unused Model Objects Report
+
+Cross-references the semantic model against everything that can reach it:
+every visual.json / page.json / report.json under the report folders,
+every visual in PAGE_CONFIGS, and transitively every measure dependency,
+calculated column, calculated table, sort-by column, hierarchy level and
+relationship key those reach. Lists the measures, columns and whole tables
+nothing reaches; imported columns among them are the ones worth dropping
+first, since each costs VertiPaq memory and refresh time.
+
+Usage:
+    python unused_fields.py
+    python unused_fields.py --imported-only
+    python unused_fields.py --report "LiveEventsGenerated/LiveEventsGenerated.Report"
+    python unused_fields.py --json
+"""
+
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Set, Tuple
+
+from generate_visuals import PAGE_CONFIGS, build_visual, iter_field_refs
+from measure_graph import extract_references
+from tmdl_index import DEFAULT_MODEL_PATH, ModelIndex, load_model_index
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+SCRIPT_DIR = Path(__file__).parent
+
+# Report folders scanned by default (every .Report folder in the repository)
+DEFAULT_REPORTS = sorted(SCRIPT_DIR.glob("**/*.Report"))
+
+# =============================================================================
+# ROOT REFERENCES
+# =============================================================================
+
+def iter_hierarchy_refs(node: Any):
+    """Yield (entity, hierarchy) for hierarchy references in report JSON."""
+    if isinstance(node, dict):
+        ref = node.get("Hierarchy")
+        if isinstance(ref, dict) and "Hierarchy" in ref:
+            entity = ref.get("Expression", {}).get("SourceRef", {}).get("Entity")
+            if entity is not None:
+                yield entity, ref["Hierarchy"]
+        for value in node.values():
+            yield from iter_hierarchy_refs(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from iter_hierarchy_refs(item)
+
+def report_documents(report_path: Path) -> Iterable[Tuple[str, Any]]:
+    """(path, parsed JSON) for every JSON document in a report's definition folder."""
+    for json_path in sorted((report_path / "definition").rglob("*.json")):
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                yield str(json_path), json.load(f)
+        except (OSError, ValueError):
+            print(f"  WARNING: Could not read {json_path}")
+
+def page_config_documents(page_configs: Dict[str, Dict]) -> Iterable[Tuple[str, Any]]:
+    """(label, built visual JSON) for every visual in the page configs."""
+    for page_key, page_config in page_configs.items():
+        for index, config in enumerate(page_config.get("visuals", [])):
+            yield f"PAGE_CONFIGS[{page_key}][{index}]", build_visual(config)
+
+# =============================================================================
+# REACHABILITY
+# =============================================================================
+
+class UsageAnalyzer:
+    """Marks every model object reachable from a set of report documents."""
+
+    def __init__(self, index: ModelIndex):
+        self.index = index
+        self.measures: Set[str] = set()
+        self.columns: Set[Tuple[str, str]] = set()
+        self.tables: Set[str] = set()
+        self.unresolved: Dict[str, Set[str]] = {}
+        self._pending: List[Tuple[str, Any]] = []
+
+    def _column_name(self, table_name: str, column: str):
+        """Canonical column name in a table (case-insensitive), or None."""
+        for name in self.index.tables[table_name]["columns"]:
+            if name.lower() == column.lower():
+                return name
+        return None
+
+    def add_document(self, source: str, document: Any) -> None:
+        """Mark the fields a report document references."""
+        for entity, prop, is_measure in iter_field_refs(document):
+            table_name = self.index.resolve_table(entity)
+            if table_name is None:
+                self.unresolved.setdefault(f"'{entity}'[{prop}]", set()).add(source)
+            elif is_measure:
+                home = self.index.find_measure(prop)
+                if home is None:
+                    self.unresolved.setdefault(f"'{entity}'[{prop}]", set()).add(source)
+                else:
+                    self._mark_measure(home[1])
+            else:
+                column = self._column_name(table_name, prop)
+                if column is None:
+                    self.unresolved.setdefault(f"'{entity}'[{prop}]", set()).add(source)
+                else:
+                    self._mark_column(table_name, column)
+        for entity, hierarchy in iter_hierarchy_refs(document):
+            table_name = self.index.resolve_table(entity)
+            levels = self.index.tables[table_name]["hierarchies"].get(hierarchy) if table_name else None
+            for column in (levels or {}).get("columns", []):
+                self._mark_column(table_name, column)
+        self._drain()
+
+    def _mark_measure(self, name: str) -> None:
+        if name not in self.measures:
+            self.measures.add(name)
+            home = self.index.find_measure(name)
+            self._mark_table(home[0])
+            measure = self.index.tables[home[0]]["measures"][home[1]]
+            self._pending.append((home[0], measure["expression"]))
+
+    def _mark_column(self, table_name: str, column: str) -> None:
+        if (table_name, column) in self.columns:
+            return
+        self.columns.add((table_name, column))
+        self._mark_table(table_name)
+        definition = self.index.tables[table_name]["columns"][column]
+        if definition.get("expression"):
+            self._pending.append((table_name, definition["expression"]))
+        sort_by = definition.get("sortByColumn")
+        if sort_by:
+            sort_column = self._column_name(table_name, sort_by.strip("'"))
+            if sort_column:
+                self._mark_column(table_name, sort_column)
+
+    def _mark_table(self, table_name: str) -> None:
+        if table_name in self.tables:
+            return
+        self.tables.add(table_name)
+        # Calculated tables are built from other tables at refresh time
+        for partition in self.index.tables[table_name]["partitions"]:
+            if partition["kind"] == "calculated" and partition["source"]:
+                self._pending.append((table_name, partition["source"]))
+
+    def _mark_dax(self, home_table: str, expression: str) -> None:
+        """Mark everything a DAX expression references."""
+        refs = extract_references(expression)
+        scanned = {home_table}
+
+        for entity in refs["tables"]:
+            table_name = self.index.resolve_table(entity)
+            if table_name is not None:
+                scanned.add(table_name)
+                self._mark_table(table_name)
+
+        for entity, name in refs["qualified"]:
+            table_name = self.index.resolve_table(entity)
+            if table_name is None:
+                continue
+            scanned.add(table_name)
+            column = self._column_name(table_name, name)
+            if column is not None:
+                self._mark_column(table_name, column)
+            elif self.index.has_measure(table_name, name):
+                self._mark_measure(self.index.find_measure(name)[1])
+
+        for name in refs["bare"]:
+            home = self.index.find_measure(name)
+            if home is not None:
+                self._mark_measure(home[1])
+                continue
+            # Row-context column: attribute it to any table the expression touches
+            for table_name in scanned:
+                column = self._column_name(table_name, name)
+                if column is not None:
+                    self._mark_column(table_name, column)
+
+    def _drain(self) -> None:
+        """Process queued expressions, then relationships, until nothing new is reached."""
+        while True:
+            while self._pending:
+                self._mark_dax(*self._pending.pop())
+            before = len(self.columns)
+            for relationship in self.active_relationships():
+                for side in ("from", "to"):
+                    table_name = self.index.resolve_table(relationship[f"{side}Table"])
+                    column = self._column_name(table_name, relationship[f"{side}Column"]) if table_name else None
+                    if column:
+                        self._mark_column(table_name, column)
+            if len(self.columns) == before and not self._pending:
+                return
+
+    def active_relationships(self) -> List[Dict[str, Any]]:
+        """Relationships whose tables are both reached (their key columns are needed)."""
+        return [
+            relationship for relationship in self.index.relationships
+            if self.index.resolve_table(relationship["fromTable"]) in self.tables
+            and self.index.resolve_table(relationship["toTable"]) in self.tables
+        ]
+
+    def report(self) -> Dict[str, Any]:
+        """Unused tables, measures, columns and relationships."""
+        unused_tables = sorted(name for name in self.index.tables if name not in self.tables)
+        unused_measures = []
+        unused_columns = []
+        for table_name, table in sorted(self.index.tables.items()):
+            for name, measure in table["measures"].items():
+                if name not in self.measures:
+                    unused_measures.append({"table": table_name, "measure": name,
+                                            "file": table["file"], "line": measure["line"]})
+            for name, column in table["columns"].items():
+                if (table_name, name) not in self.columns:
+                    unused_columns.append({
+                        "table": table_name, "column": name,
+                        "file": table["file"], "line": column["line"],
+                        "imported": not column.get("expression"),
+                        "dataType": column.get("dataType", "")
+                    })
+        used = self.active_relationships()
+        return {
+            "used": {"tables": len(self.tables), "measures": len(self.measures), "columns": len(self.columns)},
+            "unused_tables": unused_tables,
+            "unused_measures": unused_measures,
+            "unused_columns": unused_columns,
+            "unused_relationships": [r["name"] for r in self.index.relationships if r not in used],
+            "unresolved_references": {ref: sorted(sources) for ref, sources in sorted(self.unresolved.items())}
+        }
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="List measures, columns and tables nothing in the reports reaches"
+    )
+    parser.add_argument(
+        "--model",
+        type=str,
+        default=str(DEFAULT_MODEL_PATH),
+        metavar="PATH",
+        help="Path to the .SemanticModel folder"
+    )
+    parser.add_argument(
+        "--report",
+        action="append",
+        metavar="PATH",
+        help="Report folder to scan (repeatable; default: every .Report folder in the repo)"
+    )
+    parser.add_argument(
+        "--no-page-configs",
+        action="store_true",
+        help="Do not count PAGE_CONFIGS visuals as references"
+    )
+    parser.add_argument(
+        "--imported-only",
+        action="store_true",
+        help="Only list imported (non-calculated) columns"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the report as JSON"
+    )
+
+    args = parser.parse_args()
+    index = load_model_index(Path(args.model))
+    analyzer = UsageAnalyzer(index)
+
+    reports = [Path(p) for p in args.report] if args.report else DEFAULT_REPORTS
+    documents = 0
+    for report_path in reports:
+        for source, document in report_documents(report_path):
+            analyzer.add_document(source, document)
+            documents += 1
+    if not args.no_page_configs:
+        for source, document in page_config_documents(PAGE_CONFIGS):
+            analyzer.add_document(source, document)
+            documents += 1
+
+    report = analyzer.report()
+    if args.imported_only:
+        report["unused_columns"] = [c for c in report["unused_columns"] if c["imported"]]
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"\nScanned {documents} documents from {len(reports)} report folder(s)"
+          + ("" if args.no_page_configs else " and PAGE_CONFIGS"))
+    print(f"  Reached: {report['used']['tables']} tables, {report['used']['measures']} measures, "
+          f"{report['used']['columns']} columns")
+
+    print(f"\nUnused tables ({len(report['unused_tables'])}):")
+    for table_name in report["unused_tables"]:
+        print(f"  {table_name}")
+
+    print(f"\nUnused measures ({len(report['unused_measures'])}):")
+    for item in report["unused_measures"]:
+        print(f"  {item['table']}[{item['measure']}]  ({item['file']}:{item['line']})")
+
+    print(f"\nUnused columns ({len(report['unused_columns'])}):")
+    for item in report["unused_columns"]:
+        kind = "imported" if item["imported"] else "calculated"
+        print(f"  {item['table']}[{item['column']}]  {kind} {item['dataType']}  ({item['file']}:{item['line']})")
+
+    if report["unused_relationships"]:
+        print(f"\nRelationships to unused tables ({len(report['unused_relationships'])}):")
+        for name in report["unused_relationships"]:
+            print(f"  {name}")
+
+    if report["unresolved_references"]:
+        print(f"\nReferences not found in the model ({len(report['unresolved_references'])}):")
+        for ref, sources in report["unresolved_references"].items():
+            print(f"  {ref}  ({len(sources)} document(s))")
+
+if __name__ == "__main__":
+    main()